@@ -1344,6 +1344,30 @@ class PairwiseAligner(_aligners.PairwiseAligner):
     -EVL-
     <BLANKLINE>
 
+    For long and similar sequences, the alignment can be restricted to a band
+    of diagonals, such that the time and memory needed are proportional to
+    the sequence length times the band width.  The band consists of the
+    diagonals within a distance "band" from "band_diagonal", which is the
+    position in the target minus the position in the query (0 by default,
+    or for example the offset of a seed match).  In global mode, the band is
+    widened to include the start and the end of both sequences.
+
+    >>> aligner = Align.PairwiseAligner()
+    >>> aligner.mode = "local"
+    >>> aligner.mismatch = -1
+    >>> aligner.gap_score = -1
+    >>> print(aligner.score("AACCGGTT", "CCGGTTAA"))
+    6.0
+    >>> aligner.band = 1
+    >>> print(aligner.score("AACCGGTT", "CCGGTTAA"))
+    1.0
+    >>> aligner.band_diagonal = 2
+    >>> print(aligner.score("AACCGGTT", "CCGGTTAA"))
+    6.0
+
+    Set the band to None (the default) to consider all diagonals.
+    Banded alignments are not available with gap score functions.
+
     """
 
     def align(self, seqA, seqB):
@@ -1353,11 +1377,75 @@ class PairwiseAligner(_aligners.PairwiseAligner):
         alignments = PairwiseAlignments(seqA, seqB, score, paths)
         return alignments
 
+    def align_linear(self, seqA, seqB):
+        """Return one optimal global alignment, using linear memory.
+
+        Instead of storing the full traceback matrices, as the align method
+        does, this uses Myers and Miller's divide-and-conquer algorithm
+        (Hirschberg's algorithm, extended to affine gap scores), which needs
+        memory proportional to the sum of the sequence lengths, at the cost
+        of calculating most scores about twice.  This allows long sequences
+        to be aligned, but only a single PairwiseAlignment is returned, with
+        the same score as the alignments found by the align method.  This is
+        only available in global mode, without gap score functions or a band.
+        """
+        seqA = str(seqA)
+        seqB = str(seqB)
+        score, path = _aligners.PairwiseAligner.align_linear(self, seqA, seqB)
+        return PairwiseAlignment(seqA, seqB, path, score)
+
     def score(self, seqA, seqB):
         seqA = str(seqA)
         seqB = str(seqB)
         return _aligners.PairwiseAligner.score(self, seqA, seqB)
 
+    def score_many(self, query, targets):
+        """Return a NumPy array of the scores of a query against many targets.
+
+        Each score is the same as aligner.score(target, query), but the
+        query is prepared only once, and the targets are scored in C. The
+        GIL is released while scoring (unless gap functions are used), so
+        a list of targets can be split between several threads.
+        This requires NumPy.
+
+        """
+        try:
+            import numpy
+        except ImportError:
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Please install NumPy if you want to use score_many.")
+        query = str(query)
+        targets = [str(target) for target in targets]
+        scores = numpy.empty(len(targets))
+        _aligners.PairwiseAligner.score_many(self, query, targets, scores)
+        return scores
+
+    def score_all(self, queries, targets=None):
+        """Return a NumPy array of the scores of each query against each target.
+
+        Element [i, j] of the array is the score of queries[i] against
+        targets[j], as given by aligner.score(targets[j], queries[i]).
+        If no targets are given, the queries are scored all-vs-all.
+        This requires NumPy.
+
+        """
+        queries = [str(query) for query in queries]
+        if targets is None:
+            targets = queries
+        else:
+            targets = [str(target) for target in targets]
+        try:
+            import numpy
+        except ImportError:
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError(
+                "Please install NumPy if you want to use score_all.")
+        scores = numpy.empty((len(queries), len(targets)))
+        for query, row in zip(queries, scores):
+            _aligners.PairwiseAligner.score_many(self, query, targets, row)
+        return scores
+
 
 if __name__ == "__main__":
     from Bio._utils import run_doctest
@@ -130,7 +130,8 @@ _create_path_needleman_wunsch_smith_waterman(Cell** M, int i, int j) {
     n = 0;
     while (1) {
         path = M[i][j].path;
-        if (path != direction) {
+        if (path != direction || n == 0) {
+            /* always include the start, even if there is no path from it */
             row = PyTuple_New(2);
             if (!row) break;
 #if PY_MAJOR_VERSION >= 3
@@ -200,7 +201,8 @@ _create_path_gotoh(Cell** M, Cell** Ix, Cell** Iy, int i, int j) {
     n = 0;
     path = M[i][j].path;
     while (1) {
-        if (path != direction) {
+        if (path != direction || n == 0) {
+            /* always include the start, even if there is no path from it */
             row = PyTuple_New(2);
             if (!row) break;
 #if PY_MAJOR_VERSION >= 3
@@ -346,6 +348,17 @@ _create_path_waterman_smith_beyer(CellM** M, CellXY** Ix, CellXY** Iy,
     return NULL;
 }
 
+/* Banded alignments only consider cells (i, j) of the dynamic programming
+ * matrices for which i - j lies between lower and upper. */
+typedef struct {
+    int lower;
+    int upper;
+} Band;
+
+/* First and last column of row i inside the band */
+#define BAND_START(band, i) ((i) > (band).upper ? (i) - (band).upper : 0)
+#define BAND_END(band, i, nB) ((i) - (band).lower < (nB) ? (i) - (band).lower : (nB))
+
 typedef struct {
     PyObject_HEAD
     union { Cell** affine; CellM** general; } M; 
@@ -357,6 +370,7 @@ typedef struct {
     int iB;
     Mode mode;
     Algorithm algorithm;
+    Band band;
     double threshold;
     Py_ssize_t length;
 } PathGenerator;
@@ -384,6 +398,8 @@ typedef struct {
     PyObject* query_gap_function;
     double substitution_matrix[26][26]; /* 26 letters in the alphabet */
     int* letters;
+    int band; /* -1 if the alignment is not banded */
+    int band_diagonal;
 } Aligner;
 
 static int
@@ -425,6 +441,8 @@ Aligner_init(Aligner *self, PyObject *args, PyObject *kwds)
     self->substitution_matrix[i][i] = 0.0;
     self->letters = NULL;
     self->algorithm = Unknown;
+    self->band = -1;
+    self->band_diagonal = 0;
     return 0;
 }
 
@@ -543,6 +561,12 @@ Aligner_str(Aligner* self)
         case Local: n = sprintf(p, "  mode: local\n"); break;
     }
     p += n;
+    if (self->band >= 0) {
+        n = sprintf(p, "  band: %d\n", self->band);
+        p += n;
+        n = sprintf(p, "  band diagonal: %d\n", self->band_diagonal);
+        p += n;
+    }
 #if PY_MAJOR_VERSION >= 3
     if (self->target_gap_function || self->query_gap_function)
         return PyUnicode_FromFormat(text, self->target_gap_function, self->query_gap_function);
@@ -2348,6 +2372,75 @@ Aligner_set_epsilon(Aligner* self, PyObject* value, void* closure)
     return 0;
 }
 
+static char Aligner_band__doc__[] = "band width for banded alignments (None if the alignment is not banded)";
+
+static PyObject*
+Aligner_get_band(Aligner* self, void* closure)
+{
+    if (self->band < 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+#if PY_MAJOR_VERSION >= 3
+    return PyLong_FromLong(self->band);
+#else
+    return PyInt_FromLong(self->band);
+#endif
+}
+
+static int
+Aligner_set_band(Aligner* self, PyObject* value, void* closure)
+{
+    long band;
+    if (value == Py_None) {
+        self->band = -1;
+        return 0;
+    }
+#if PY_MAJOR_VERSION >= 3
+    band = PyLong_AsLong(value);
+#else
+    band = PyInt_AsLong(value);
+#endif
+    if (band == -1 && PyErr_Occurred()) return -1;
+    if (band < 0 || band > INT_MAX) {
+        PyErr_SetString(PyExc_ValueError,
+                        "band should be a non-negative integer or None");
+        return -1;
+    }
+    self->band = (int)band;
+    return 0;
+}
+
+static char Aligner_band_diagonal__doc__[] = "diagonal at the center of the band, as the target position minus the query position";
+
+static PyObject*
+Aligner_get_band_diagonal(Aligner* self, void* closure)
+{
+#if PY_MAJOR_VERSION >= 3
+    return PyLong_FromLong(self->band_diagonal);
+#else
+    return PyInt_FromLong(self->band_diagonal);
+#endif
+}
+
+static int
+Aligner_set_band_diagonal(Aligner* self, PyObject* value, void* closure)
+{
+    long diagonal;
+#if PY_MAJOR_VERSION >= 3
+    diagonal = PyLong_AsLong(value);
+#else
+    diagonal = PyInt_AsLong(value);
+#endif
+    if (diagonal == -1 && PyErr_Occurred()) return -1;
+    if (diagonal < INT_MIN || diagonal > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "band diagonal is too large");
+        return -1;
+    }
+    self->band_diagonal = (int)diagonal;
+    return 0;
+}
+
 static Algorithm _get_algorithm(Aligner* self)
 {
     Algorithm algorithm = self->algorithm;
@@ -2632,6 +2725,14 @@ static PyGetSetDef Aligner_getset[] = {
         (getter)Aligner_get_epsilon,
         (setter)Aligner_set_epsilon,
         Aligner_epsilon__doc__, NULL},
+    {"band",
+        (getter)Aligner_get_band,
+        (setter)Aligner_set_band,
+        Aligner_band__doc__, NULL},
+    {"band_diagonal",
+        (getter)Aligner_get_band_diagonal,
+        (setter)Aligner_set_band_diagonal,
+        Aligner_band_diagonal__doc__, NULL},
     {"algorithm",
         (getter)Aligner_get_algorithm,
         (setter)NULL,
@@ -2831,85 +2932,141 @@ static PyGetSetDef Aligner_getset[] = {
 
 /* -------------- allocation & deallocation ------------- */
 
+static Band
+_get_band(const Aligner* self, Py_ssize_t nA, Py_ssize_t nB)
+{
+    Band band;
+    Py_ssize_t lower;
+    Py_ssize_t upper;
+    const Py_ssize_t width = self->band;
+
+    if (width < 0) {
+        band.lower = (int)(-nB);
+        band.upper = (int)nA;
+        return band;
+    }
+    lower = self->band_diagonal;
+    upper = self->band_diagonal;
+    if (self->mode == Global) {
+        /* The band should include both ends of the alignment */
+        if (lower > 0) lower = 0;
+        if (lower > nA - nB) lower = nA - nB;
+        if (upper < 0) upper = 0;
+        if (upper < nA - nB) upper = nA - nB;
+    }
+    lower -= width;
+    upper += width;
+    if (lower < -nB) lower = -nB;
+    else if (lower > nA + 1) lower = nA + 1;
+    if (upper > nA) upper = nA;
+    else if (upper < -nB - 1) upper = -nB - 1;
+    band.lower = (int)lower;
+    band.upper = (int)upper;
+    return band;
+}
+
+/* Each matrix is stored in a single block of memory, holding for each row
+ * the cells inside the band with one extra cell on either side.  Row 0
+ * always includes column 0, as cell (0, 0) is used to flag the path
+ * generator as done.  The cells that are not inside the band are never
+ * part of an alignment, and are initialized with a score of -DBL_MAX and
+ * an empty trace.  The row pointers are offset such that M[i][j] is cell
+ * (i, j), and M[0] - 1 is the start of the memory block.
+ */
+
 static void
-_deallocate_needlemanwunsch_smithwaterman_matrix(Py_ssize_t nA, Cell** M)
+_deallocate_banded_matrix(Cell** M)
 {
-    int i;
     if (!M) return;
-    for (i = 0; i <= nA; i++) {
-        if (!M[i]) break;
-        PyMem_Free(M[i]);
-    }
+    PyMem_Free(M[0] - 1);
     PyMem_Free(M);
 }
 
 static Cell**
-_allocate_needlemanwunsch_smithwaterman_matrix(Py_ssize_t nA, Py_ssize_t nB)
+_allocate_banded_matrix(Py_ssize_t nA, Py_ssize_t nB, Band band)
 {
     int i;
+    int j;
+    int start;
+    int end;
+    int first;
+    int last;
+    size_t size = 0;
+    Cell* cells;
     Cell** M = PyMem_Malloc((nA+1)*sizeof(Cell*));
     if (!M) return NULL;
     for (i = 0; i <= nA; i++) {
-        M[i] = PyMem_Malloc((nB+1)*sizeof(Cell));
-        if (!M[i]) goto exit;
+        start = BAND_START(band, i);
+        end = BAND_END(band, i, nB);
+        first = (i == 0) ? -1 : start - 1;
+        last = (end < start) ? start : end + 1;
+        if (i == 0 && last < 1) last = 1;
+        size += last - first + 1;
+    }
+    cells = PyMem_Malloc(size*sizeof(Cell));
+    if (!cells) {
+        PyMem_Free(M);
+        return NULL;
+    }
+    for (i = 0; i <= nA; i++) {
+        start = BAND_START(band, i);
+        end = BAND_END(band, i, nB);
+        first = (i == 0) ? -1 : start - 1;
+        last = (end < start) ? start : end + 1;
+        if (i == 0 && last < 1) last = 1;
+        M[i] = cells - first;
+        cells += last - first + 1;
+        for (j = first; j <= last; j++) {
+            if (j == start && end >= start) j = end + 1;
+            M[i][j].score = -DBL_MAX;
+            M[i][j].trace = 0;
+            M[i][j].path = 0;
+            M[i][j].count = 0;
+        }
     }
     return M;
-exit:
-    _deallocate_needlemanwunsch_smithwaterman_matrix(nA, M);
-    return NULL;
 }
 
 static void
-_deallocate_gotoh_matrices(Py_ssize_t nA, Cell** M, Cell** Ix, Cell** Iy)
+_deallocate_needlemanwunsch_smithwaterman_matrix(Cell** M)
 {
-    int i;
-    if (M) {
-        if (Ix) {
-            if (Iy) {
-                for (i = 0; i <= nA; i++) {
-                    if (!M[i]) break;
-                    PyMem_Free(M[i]);
-                    if (!Ix[i]) break;
-                    PyMem_Free(Ix[i]);
-                    if (!Iy[i]) break;
-                    PyMem_Free(Iy[i]);
-                }
-                PyMem_Free(Iy);
-            }
-            PyMem_Free(Ix);
-        }
-        PyMem_Free(M);
-    }
+    _deallocate_banded_matrix(M);
+}
+
+static Cell**
+_allocate_needlemanwunsch_smithwaterman_matrix(Py_ssize_t nA, Py_ssize_t nB,
+                                               Band band)
+{
+    return _allocate_banded_matrix(nA, nB, band);
+}
+
+static void
+_deallocate_gotoh_matrices(Cell** M, Cell** Ix, Cell** Iy)
+{
+    _deallocate_banded_matrix(M);
+    _deallocate_banded_matrix(Ix);
+    _deallocate_banded_matrix(Iy);
 }
 
 static int
-_allocate_gotoh_matrices(Py_ssize_t nA, Py_ssize_t nB,
+_allocate_gotoh_matrices(Py_ssize_t nA, Py_ssize_t nB, Band band,
                          Cell*** pM, Cell*** pIx, Cell*** pIy)
 {
-    int i;
     Cell** M = NULL;
     Cell** Ix = NULL;
     Cell** Iy = NULL;
-    M = PyMem_Malloc((nA+1)*sizeof(Cell*));
+    M = _allocate_banded_matrix(nA, nB, band);
     if (!M) goto exit;
-    Ix = PyMem_Malloc((nA+1)*sizeof(Cell*));
+    Ix = _allocate_banded_matrix(nA, nB, band);
     if (!Ix) goto exit;
-    Iy = PyMem_Malloc((nA+1)*sizeof(Cell*));
+    Iy = _allocate_banded_matrix(nA, nB, band);
     if (!Iy) goto exit;
-    for (i = 0; i <= nA; i++) {
-        M[i] = PyMem_Malloc((nB+1)*sizeof(Cell));
-        if (!M[i]) goto exit;
-        Ix[i] = PyMem_Malloc((nB+1)*sizeof(Cell));
-        if (!Ix[i]) goto exit;
-        Iy[i] = PyMem_Malloc((nB+1)*sizeof(Cell));
-        if (!Iy[i]) goto exit;
-    }
     *pM = M;
     *pIx = Ix;
     *pIy = Iy;
     return 1;
 exit:
-    _deallocate_gotoh_matrices(nA, M, Ix, Iy);
+    _deallocate_gotoh_matrices(M, Ix, Iy);
     return 0;
 }
 
@@ -3053,227 +3210,796 @@ exit:
 
 /* ----------------- alignment algorithms ----------------- */
 
-static PyObject*
-Aligner_needlemanwunsch_score(Aligner* self, const char* sA, Py_ssize_t nA,
-                                             const char* sB, Py_ssize_t nB)
+/* ----------------- score-only algorithms ----------------- */
+
+/* The score-only algorithms keep a single row of each dynamic programming
+ * matrix, and take sequence B as an array of substitution matrix indices.
+ * They do not call into Python, so they can run without holding the GIL.
+ * The buffer should have space for 3*(nB+1) doubles.
+ */
+
+static void
+_convert_sequence_indices(const char* s, Py_ssize_t n, int* indices)
+{
+    char c;
+    Py_ssize_t i;
+    for (i = 0; i < n; i++) indices[i] = CHARINDEX(s[i]);
+}
+
+static double
+_needlemanwunsch_score(const Aligner* self, const char* sA, Py_ssize_t nA,
+                                            const int* kB, Py_ssize_t nB,
+                                            double* F)
 {
     char c;
     int i;
     int j;
     int kA;
-    int kB;
+    int start;
+    int end;
+    int previous;
     const double gap_extend_A = self->target_extend_gap_score;
     const double gap_extend_B = self->query_extend_gap_score;
     const double left_gap_extend_A = self->target_left_extend_gap_score;
     const double right_gap_extend_A = self->target_right_extend_gap_score;
     const double left_gap_extend_B = self->query_left_extend_gap_score;
     const double right_gap_extend_B = self->query_right_extend_gap_score;
-    double** F;
+    const Band band = _get_band(self, nA, nB);
+    double gap_A;
+    double gap_B;
+    double diagonal;
     double score;
     double temp;
-    PyObject* result = NULL;
 
     /* Needleman-Wunsch algorithm */
-    F = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!F) goto exit;
-    for (i = 0; i <= nA; i++) {
-        F[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!F[i]) goto exit;
-    }
-
-    /* The top row of the score matrix is a special case,
-     * as there are no previously aligned characters.
-     */
-    F[0][0] = 0.0;
-    for (j = 1; j <= nB; j++)
-        F[0][j] = j * left_gap_extend_A;
-    for (i = 1; i < nA; i++) {
+    end = BAND_END(band, 0, nB);
+    F[0] = 0.0;
+    for (j = 1; j <= end; j++)
+        F[j] = j * left_gap_extend_A;
+    for (i = 1; i <= nA; i++) {
         kA = CHARINDEX(sA[i-1]);
-        F[i][0] = i * left_gap_extend_B;
-        for (j = 1; j < nB; j++) {
-            kB = CHARINDEX(sB[j-1]);
-            SELECT_SCORE_GLOBAL(F[i-1][j-1] + self->substitution_matrix[kA][kB],
-                                F[i-1][j] + gap_extend_B,
-                                F[i][j-1] + gap_extend_A);
-            F[i][j] = score;
-        }
-        kB = CHARINDEX(sB[nB-1]);
-        SELECT_SCORE_GLOBAL(F[i-1][nB-1] + self->substitution_matrix[kA][kB],
-                            F[i-1][nB] + right_gap_extend_B,
-                            F[i][nB-1] + gap_extend_A);
-        F[i][nB] = score;
-    }
-    kA = CHARINDEX(sA[nA-1]);
-    F[nA][0] = nA * right_gap_extend_B;
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        SELECT_SCORE_GLOBAL(F[nA-1][j-1] + self->substitution_matrix[kA][kB],
-                            F[nA-1][j] + gap_extend_B,
-                            F[nA][j-1] + right_gap_extend_A);
-        F[nA][j] = score;
-    }
-    kB = CHARINDEX(sB[nB-1]);
-    SELECT_SCORE_GLOBAL(F[nA-1][nB-1] + self->substitution_matrix[kA][kB],
-                        F[nA-1][nB] + right_gap_extend_B,
-                        F[nA][nB-1] + right_gap_extend_A);
-    F[nA][nB] = score;
-    result = PyFloat_FromDouble(score);
-exit:
-    if (F) {
-        for (i = 0; i <= nA; i++) {
-            if (!F[i]) break;
-            PyMem_Free(F[i]);
+        gap_A = (i == nA) ? right_gap_extend_A : gap_extend_A;
+        start = BAND_START(band, i);
+        previous = end;
+        end = BAND_END(band, i, nB);
+        /* Cells outside the band are not part of any alignment */
+        if (end > previous) F[end] = -DBL_MAX;
+        if (start == 0) {
+            diagonal = F[0];
+            F[0] = i * ((i == nA) ? right_gap_extend_B : left_gap_extend_B);
+            j = 1;
+        }
+        else {
+            diagonal = F[start-1];
+            F[start-1] = -DBL_MAX;
+            j = start;
+        }
+        for ( ; j <= end; j++) {
+            gap_B = (j == nB) ? right_gap_extend_B : gap_extend_B;
+            SELECT_SCORE_GLOBAL(diagonal + self->substitution_matrix[kA][kB[j-1]],
+                                F[j] + gap_B,
+                                F[j-1] + gap_A);
+            diagonal = F[j];
+            F[j] = score;
         }
-        PyMem_Free(F);
     }
-    if (!result) PyErr_SetString(PyExc_MemoryError, "Out of memory");
-    return result;
+    return F[nB];
 }
 
-static PyObject*
-Aligner_smithwaterman_score(Aligner* self, const char* sA, Py_ssize_t nA,
-                                           const char* sB, Py_ssize_t nB)
+static double
+_smithwaterman_score(const Aligner* self, const char* sA, Py_ssize_t nA,
+                                          const int* kB, Py_ssize_t nB,
+                                          double* F)
 {
     char c;
     int i;
     int j;
     int kA;
-    int kB;
+    int start;
+    int end;
+    int previous;
     const double gap_extend_A = self->target_extend_gap_score;
     const double gap_extend_B = self->query_extend_gap_score;
-    double** F;
+    const Band band = _get_band(self, nA, nB);
+    double diagonal;
     double score;
     double temp;
     double maximum = 0;
-    PyObject* result = NULL;
 
     /* Smith-Waterman algorithm */
-    F = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!F) goto exit;
-    for (i = 0; i <= nA; i++) {
-        F[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!F[i]) goto exit;
+    end = BAND_END(band, 0, nB);
+    for (j = 0; j <= end; j++)
+        F[j] = 0;
+    for (i = 1; i <= nA; i++) {
+        kA = CHARINDEX(sA[i-1]);
+        start = BAND_START(band, i);
+        previous = end;
+        end = BAND_END(band, i, nB);
+        if (start > end) continue;
+        /* Cells outside the band are not part of any alignment */
+        if (end > previous) F[end] = (previous < 0) ? 0 : -DBL_MAX;
+        if (start == 0) {
+            diagonal = 0;
+            j = 1;
+        }
+        else {
+            diagonal = F[start-1];
+            F[start-1] = -DBL_MAX;
+            j = start;
+        }
+        for ( ; j <= end; j++) {
+            if (i == nA || j == nB) {
+                SELECT_SCORE_LOCAL1(diagonal + self->substitution_matrix[kA][kB[j-1]]);
+            }
+            else {
+                SELECT_SCORE_LOCAL3(diagonal + self->substitution_matrix[kA][kB[j-1]],
+                                    F[j] + gap_extend_B,
+                                    F[j-1] + gap_extend_A);
+            }
+            diagonal = F[j];
+            F[j] = score;
+        }
     }
+    return maximum;
+}
 
-    /* The top row of the score matrix is a special case,
-     * as there are no previously aligned characters.
-     */
-    for (j = 0; j <= nB; j++)
-        F[0][j] = 0;
-    for (i = 1; i < nA; i++) {
+static double
+_gotoh_global_score(const Aligner* self, const char* sA, Py_ssize_t nA,
+                                         const int* kB, Py_ssize_t nB,
+                                         double* buffer)
+{
+    char c;
+    int i;
+    int j;
+    int kA;
+    int start;
+    int end;
+    int previous;
+    const double gap_open_A = self->target_open_gap_score;
+    const double gap_open_B = self->query_open_gap_score;
+    const double gap_extend_A = self->target_extend_gap_score;
+    const double gap_extend_B = self->query_extend_gap_score;
+    const double left_gap_open_A = self->target_left_open_gap_score;
+    const double left_gap_open_B = self->query_left_open_gap_score;
+    const double left_gap_extend_A = self->target_left_extend_gap_score;
+    const double left_gap_extend_B = self->query_left_extend_gap_score;
+    const double right_gap_open_A = self->target_right_open_gap_score;
+    const double right_gap_open_B = self->query_right_open_gap_score;
+    const double right_gap_extend_A = self->target_right_extend_gap_score;
+    const double right_gap_extend_B = self->query_right_extend_gap_score;
+    const Band band = _get_band(self, nA, nB);
+    double* M = buffer;
+    double* Ix = buffer + (nB+1);
+    double* Iy = buffer + 2*(nB+1);
+    double open_A, extend_A;
+    double open_B, extend_B;
+    double M_diagonal, Ix_diagonal, Iy_diagonal;
+    double M_score, Ix_score, Iy_score;
+    double score;
+    double temp;
+
+    /* Gotoh algorithm with three states */
+    end = BAND_END(band, 0, nB);
+    M[0] = 0;
+    Ix[0] = -DBL_MAX;
+    Iy[0] = -DBL_MAX;
+    for (j = 1; j <= end; j++) {
+        M[j] = -DBL_MAX;
+        Ix[j] = -DBL_MAX;
+        Iy[j] = left_gap_open_A + left_gap_extend_A * (j-1);
+    }
+    for (i = 1; i <= nA; i++) {
         kA = CHARINDEX(sA[i-1]);
-        F[i][0] = 0;
-        for (j = 1; j < nB; j++) {
-            kB = CHARINDEX(sB[j-1]);
-            SELECT_SCORE_LOCAL3(F[i-1][j-1] + self->substitution_matrix[kA][kB],
-                                F[i-1][j] + gap_extend_B,
-                                F[i][j-1] + gap_extend_A);
-            F[i][j] = score;
-        }
-        kB = CHARINDEX(sB[nB-1]);
-        SELECT_SCORE_LOCAL1(F[i-1][nB-1] + self->substitution_matrix[kA][kB]);
-        F[i][nB] = score;
-    }
-    kA = CHARINDEX(sA[nA-1]);
-    F[nA][0] = 0;
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        SELECT_SCORE_LOCAL1(F[nA-1][j-1] + self->substitution_matrix[kA][kB]);
-        F[nA][j] = score;
-    }
-    kB = CHARINDEX(sB[nB-1]);
-    SELECT_SCORE_LOCAL1(F[nA-1][nB-1] + self->substitution_matrix[kA][kB]);
-    F[nA][nB] = score;
-    result = PyFloat_FromDouble(maximum);
-exit:
-    if (F) {
-        for (i = 0; i <= nA; i++) {
-            if (!F[i]) break;
-            PyMem_Free(F[i]);
+        open_A = (i == nA) ? right_gap_open_A : gap_open_A;
+        extend_A = (i == nA) ? right_gap_extend_A : gap_extend_A;
+        start = BAND_START(band, i);
+        previous = end;
+        end = BAND_END(band, i, nB);
+        /* Cells outside the band are not part of any alignment */
+        if (end > previous) {
+            M[end] = -DBL_MAX;
+            Ix[end] = -DBL_MAX;
+            Iy[end] = -DBL_MAX;
+        }
+        if (start == 0) {
+            M_diagonal = M[0];
+            Ix_diagonal = Ix[0];
+            Iy_diagonal = Iy[0];
+            M[0] = -DBL_MAX;
+            Ix[0] = left_gap_open_B + left_gap_extend_B * (i-1);
+            Iy[0] = -DBL_MAX;
+            j = 1;
+        }
+        else {
+            M_diagonal = M[start-1];
+            Ix_diagonal = Ix[start-1];
+            Iy_diagonal = Iy[start-1];
+            M[start-1] = -DBL_MAX;
+            Ix[start-1] = -DBL_MAX;
+            Iy[start-1] = -DBL_MAX;
+            j = start;
+        }
+        for ( ; j <= end; j++) {
+            open_B = (j == nB) ? right_gap_open_B : gap_open_B;
+            extend_B = (j == nB) ? right_gap_extend_B : gap_extend_B;
+            SELECT_SCORE_GLOBAL(M[j] + open_B,
+                                Ix[j] + extend_B,
+                                Iy[j] + open_B);
+            Ix_score = score;
+            SELECT_SCORE_GLOBAL(M[j-1] + open_A,
+                                Iy[j-1] + extend_A,
+                                Ix[j-1] + open_A);
+            Iy_score = score;
+            SELECT_SCORE_GLOBAL(M_diagonal, Ix_diagonal, Iy_diagonal);
+            M_score = score + self->substitution_matrix[kA][kB[j-1]];
+            M_diagonal = M[j];
+            Ix_diagonal = Ix[j];
+            Iy_diagonal = Iy[j];
+            M[j] = M_score;
+            Ix[j] = Ix_score;
+            Iy[j] = Iy_score;
         }
-        PyMem_Free(F);
     }
-    if (!result) PyErr_SetString(PyExc_MemoryError, "Out of memory");
-    return result;
+    SELECT_SCORE_GLOBAL(M[nB], Ix[nB], Iy[nB]);
+    return score;
 }
 
-static PyObject* _next_needlemanwunsch(PathGenerator* self)
+static double
+_gotoh_local_score(const Aligner* self, const char* sA, Py_ssize_t nA,
+                                        const int* kB, Py_ssize_t nB,
+                                        double* buffer)
 {
-    int i = 0;
-    int j = 0;
-    int path;
-    int trace = 0;
-    const int nA = self->nA;
-    const int nB = self->nB;
-    Cell** M = self->M.affine;
+    char c;
+    int i;
+    int j;
+    int kA;
+    int start;
+    int end;
+    int previous;
+    const double gap_open_A = self->target_open_gap_score;
+    const double gap_open_B = self->query_open_gap_score;
+    const double gap_extend_A = self->target_extend_gap_score;
+    const double gap_extend_B = self->query_extend_gap_score;
+    const Band band = _get_band(self, nA, nB);
+    double* M = buffer;
+    double* Ix = buffer + (nB+1);
+    double* Iy = buffer + 2*(nB+1);
+    double M_diagonal, Ix_diagonal, Iy_diagonal;
+    double M_score, Ix_score, Iy_score;
+    double score;
+    double temp;
+    double maximum = 0.0;
 
-    path = M[i][j].path;
-    if (path == DONE) return NULL;
-    if (path == 0) {
-        /* Generate the first path. */
-        i = nA;
-        j = nB;
+    /* Gotoh algorithm with three states */
+    end = BAND_END(band, 0, nB);
+    M[0] = 0;
+    Ix[0] = -DBL_MAX;
+    Iy[0] = -DBL_MAX;
+    for (j = 1; j <= end; j++) {
+        M[j] = -DBL_MAX;
+        Ix[j] = -DBL_MAX;
+        Iy[j] = 0;
     }
-    else {
-        /* We already have a path. Prune the path to see if there are
-         * any alternative paths. */
-        while (1) {
-            if (path == HORIZONTAL) {
-                trace = M[i][++j].trace;
-                if (trace & VERTICAL) {
-                    M[--i][j].path = VERTICAL;
-                    break;
-                }
-                if (trace & DIAGONAL) {
-                    M[--i][--j].path = DIAGONAL;
-                    break;
-                }
-            }
-            else if (path == VERTICAL) {
-                trace = M[++i][j].trace;
-                if (trace & DIAGONAL) {
-                    M[--i][--j].path = DIAGONAL;
-                    break;
-                }
-            }
-            else /* DIAGONAL */ {
-                i++;
-                j++;
+    for (i = 1; i <= nA; i++) {
+        kA = CHARINDEX(sA[i-1]);
+        start = BAND_START(band, i);
+        previous = end;
+        end = BAND_END(band, i, nB);
+        if (start > end) continue;
+        /* Cells outside the band are not part of any alignment */
+        if (end > previous) {
+            M[end] = -DBL_MAX;
+            Ix[end] = -DBL_MAX;
+            Iy[end] = -DBL_MAX;
+        }
+        if (start == 0) {
+            M_diagonal = M[0];
+            Ix_diagonal = Ix[0];
+            Iy_diagonal = Iy[0];
+            M[0] = -DBL_MAX;
+            Ix[0] = 0;
+            Iy[0] = -DBL_MAX;
+            j = 1;
+        }
+        else {
+            M_diagonal = M[start-1];
+            Ix_diagonal = Ix[start-1];
+            Iy_diagonal = Iy[start-1];
+            M[start-1] = -DBL_MAX;
+            Ix[start-1] = -DBL_MAX;
+            Iy[start-1] = -DBL_MAX;
+            j = start;
+        }
+        for ( ; j <= end; j++) {
+            if (i == nA || j == nB) {
+                Ix_score = 0;
+                Iy_score = 0;
             }
-            path = M[i][j].path;
-            if (!path) {
-                /* we reached the end of the alignment without finding
-                 * an alternative path */
-                M[0][0].path = DONE;
-                return NULL;
+            else {
+                SELECT_SCORE_LOCAL3(M[j] + gap_open_B,
+                                    Ix[j] + gap_extend_B,
+                                    Iy[j] + gap_open_B);
+                Ix_score = score;
+                SELECT_SCORE_LOCAL3(M[j-1] + gap_open_A,
+                                    Iy[j-1] + gap_extend_A,
+                                    Ix[j-1] + gap_open_A);
+                Iy_score = score;
             }
+            SELECT_SCORE_GOTOH_LOCAL_ALIGN(M_diagonal,
+                                           Ix_diagonal,
+                                           Iy_diagonal,
+                                           self->substitution_matrix[kA][kB[j-1]]);
+            M_score = score;
+            M_diagonal = M[j];
+            Ix_diagonal = Ix[j];
+            Iy_diagonal = Iy[j];
+            M[j] = M_score;
+            Ix[j] = Ix_score;
+            Iy[j] = Iy_score;
         }
     }
-    /* Follow the traceback until we reach the origin. */
-    while (1) {
-        trace = M[i][j].trace;
-        if (trace & HORIZONTAL) M[i][--j].path = HORIZONTAL;
-        else if (trace & VERTICAL) M[--i][j].path = VERTICAL;
-        else if (trace & DIAGONAL) M[--i][--j].path = DIAGONAL;
-        else break;
-    }
-    return _create_path_needleman_wunsch_smith_waterman(M, 0, 0);
+    return maximum;
 }
 
-static PyObject* _next_smithwaterman(PathGenerator* self)
-{
-    int trace = 0;
-    int i = self->iA;
-    int j = self->iB;
-    const int nA = self->nA;
-    const int nB = self->nB;
-    const double threshold = self->threshold;
-    Cell** M = self->M.affine;
-    int path = M[0][0].path;
+/* ----------------- striped local alignment score ----------------- */
 
-    if (path == DONE) return NULL;
+/* For local alignments with integer scores and affine gap scores, the score
+ * can be calculated with vector instructions, using Farrar's striped
+ * algorithm with 8-bit or 16-bit saturating scores.  If the scores saturate,
+ * we fall back to 16-bit scores, and then to the scalar algorithm above.
+ */
 
-    path = M[i][j].path;
+typedef enum {NoVectors, SSE2, AVX2} Instructions;
+
+typedef struct {
+    Instructions instructions;
+    int bias;
+    int target_open;
+    int target_extend;
+    int query_open;
+    int query_extend;
+    Py_ssize_t segments8;
+    Py_ssize_t segments16;
+    void* profile8;
+    void* profile16;
+    void* buffer;
+    void* memory;
+} Striped;
+
+#if defined(__GNUC__) && (defined(__x86_64__) || defined(__amd64__))
+#include <immintrin.h>
+#define STRIPED_SSE2
+#if defined(__clang__) || __GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 9)
+#define STRIPED_AVX2
+#endif
+#endif
+
+#ifdef STRIPED_SSE2
+
+#define STRIPED_TARGET
+#define VECTOR __m128i
+#define V_ZERO _mm_setzero_si128()
+#define V_ALL_ZERO(v) \
+    (_mm_movemask_epi8(_mm_cmpeq_epi8(v, _mm_setzero_si128())) == 0xFFFF)
+
+#define STRIPED_SCORE _striped_sse2_8
+#define STRIPED_PROFILE profile8
+#define STRIPED_SEGMENTS segments8
+#define STRIPED_LIMIT 255
+#define LANES 16
+#define ELEMENT unsigned char
+#define V_SET(x) _mm_set1_epi8((char)(x))
+#define V_ADDS(a, b) _mm_adds_epu8(a, b)
+#define V_SUBS(a, b) _mm_subs_epu8(a, b)
+#define V_MAX(a, b) _mm_max_epu8(a, b)
+#define V_SHIFT(v) _mm_slli_si128(v, 1)
+#define V_ANY_EQUAL(a, b) _mm_movemask_epi8(_mm_cmpeq_epi8(a, b))
+#include "_striped.h"
+#undef STRIPED_SCORE
+#undef STRIPED_PROFILE
+#undef STRIPED_SEGMENTS
+#undef STRIPED_LIMIT
+#undef LANES
+#undef ELEMENT
+#undef V_SET
+#undef V_ADDS
+#undef V_SUBS
+#undef V_MAX
+#undef V_SHIFT
+#undef V_ANY_EQUAL
+
+#define STRIPED_SCORE _striped_sse2_16
+#define STRIPED_PROFILE profile16
+#define STRIPED_SEGMENTS segments16
+#define STRIPED_LIMIT 32767
+#define LANES 8
+#define ELEMENT short
+#define V_SET(x) _mm_set1_epi16((short)(x))
+#define V_ADDS(a, b) _mm_adds_epi16(a, b)
+#define V_SUBS(a, b) _mm_subs_epu16(a, b)
+#define V_MAX(a, b) _mm_max_epi16(a, b)
+#define V_SHIFT(v) _mm_slli_si128(v, 2)
+#define V_ANY_EQUAL(a, b) _mm_movemask_epi8(_mm_cmpeq_epi16(a, b))
+#include "_striped.h"
+#undef STRIPED_SCORE
+#undef STRIPED_PROFILE
+#undef STRIPED_SEGMENTS
+#undef STRIPED_LIMIT
+#undef LANES
+#undef ELEMENT
+#undef V_SET
+#undef V_ADDS
+#undef V_SUBS
+#undef V_MAX
+#undef V_SHIFT
+#undef V_ANY_EQUAL
+
+#undef STRIPED_TARGET
+#undef VECTOR
+#undef V_ZERO
+#undef V_ALL_ZERO
+
+#endif
+
+#ifdef STRIPED_AVX2
+
+#define STRIPED_TARGET __attribute__((target("avx2")))
+#define VECTOR __m256i
+#define V_ZERO _mm256_setzero_si256()
+#define V_ALL_ZERO(v) \
+    (_mm256_movemask_epi8(_mm256_cmpeq_epi8(v, _mm256_setzero_si256())) == -1)
+/* Shift across the two 128-bit halves, which _mm256_slli_si256 does not do */
+#define V_SHIFT_BYTES(v, n) \
+    _mm256_alignr_epi8(v, _mm256_permute2x128_si256(v, v, 0x08), 16 - n)
+
+#define STRIPED_SCORE _striped_avx2_8
+#define STRIPED_PROFILE profile8
+#define STRIPED_SEGMENTS segments8
+#define STRIPED_LIMIT 255
+#define LANES 32
+#define ELEMENT unsigned char
+#define V_SET(x) _mm256_set1_epi8((char)(x))
+#define V_ADDS(a, b) _mm256_adds_epu8(a, b)
+#define V_SUBS(a, b) _mm256_subs_epu8(a, b)
+#define V_MAX(a, b) _mm256_max_epu8(a, b)
+#define V_SHIFT(v) V_SHIFT_BYTES(v, 1)
+#define V_ANY_EQUAL(a, b) _mm256_movemask_epi8(_mm256_cmpeq_epi8(a, b))
+#include "_striped.h"
+#undef STRIPED_SCORE
+#undef STRIPED_PROFILE
+#undef STRIPED_SEGMENTS
+#undef STRIPED_LIMIT
+#undef LANES
+#undef ELEMENT
+#undef V_SET
+#undef V_ADDS
+#undef V_SUBS
+#undef V_MAX
+#undef V_SHIFT
+#undef V_ANY_EQUAL
+
+#define STRIPED_SCORE _striped_avx2_16
+#define STRIPED_PROFILE profile16
+#define STRIPED_SEGMENTS segments16
+#define STRIPED_LIMIT 32767
+#define LANES 16
+#define ELEMENT short
+#define V_SET(x) _mm256_set1_epi16((short)(x))
+#define V_ADDS(a, b) _mm256_adds_epi16(a, b)
+#define V_SUBS(a, b) _mm256_subs_epu16(a, b)
+#define V_MAX(a, b) _mm256_max_epi16(a, b)
+#define V_SHIFT(v) V_SHIFT_BYTES(v, 2)
+#define V_ANY_EQUAL(a, b) _mm256_movemask_epi8(_mm256_cmpeq_epi16(a, b))
+#include "_striped.h"
+#undef STRIPED_SCORE
+#undef STRIPED_PROFILE
+#undef STRIPED_SEGMENTS
+#undef STRIPED_LIMIT
+#undef LANES
+#undef ELEMENT
+#undef V_SET
+#undef V_ADDS
+#undef V_SUBS
+#undef V_MAX
+#undef V_SHIFT
+#undef V_ANY_EQUAL
+
+#undef STRIPED_TARGET
+#undef VECTOR
+#undef V_ZERO
+#undef V_ALL_ZERO
+#undef V_SHIFT_BYTES
+
+#endif
+
+/* Set when the module is imported */
+static Instructions _available_instructions = NoVectors;
+
+static Instructions
+_find_instructions(void)
+{
+#ifdef STRIPED_AVX2
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx2")) return AVX2;
+#endif
+#ifdef STRIPED_SSE2
+    return SSE2;
+#else
+    return NoVectors;
+#endif
+}
+
+static int
+_striped_gap_penalty(double score, int* penalty)
+{
+    /* Only integer gap scores between -32767 and 0 are supported */
+    if (!(score <= 0 && score >= -32767)) return 0;
+    *penalty = (int)(-score);
+    return (*penalty == -score);
+}
+
+static void
+_striped_fill_profile(void* profile, size_t size, const Aligner* self,
+                      const int* kB, Py_ssize_t nB,
+                      Py_ssize_t segments, int lanes, int bias)
+{
+    int kA;
+    int k;
+    int value;
+    Py_ssize_t i = 0;
+    Py_ssize_t j;
+    Py_ssize_t p;
+    for (kA = 0; kA < 26; kA++) {
+        for (j = 0; j < segments; j++) {
+            for (k = 0; k < lanes; k++, i++) {
+                /* The query is padded with letters scoring zero */
+                p = k * segments + j;
+                if (p < nB) value = (int)self->substitution_matrix[kA][kB[p]];
+                else value = 0;
+                value += bias;
+                if (size == 1) ((unsigned char*)profile)[i] = value;
+                else ((short*)profile)[i] = value;
+            }
+        }
+    }
+}
+
+static void
+_striped_free(Striped* striped)
+{
+    free(striped->memory);
+    striped->memory = NULL;
+    striped->instructions = NoVectors;
+}
+
+static void
+_striped_prepare(Striped* striped, const Aligner* self, Algorithm algorithm,
+                 const int* kB, Py_ssize_t nB)
+{
+    int i;
+    int j;
+    int lanes8;
+    int lanes16;
+    double value;
+    int minimum = 0;
+    int maximum = 0;
+    int penalty = 0;
+    size_t bytes;
+    size_t size8 = 0;
+    size_t size16;
+    size_t size;
+    char* memory;
+    const size_t alignment = 32;
+    const Instructions instructions = _available_instructions;
+
+    striped->instructions = NoVectors;
+    striped->memory = NULL;
+    switch (instructions) {
+        case SSE2: bytes = 16; break;
+        case AVX2: bytes = 32; break;
+        case NoVectors:
+        default: return;
+    }
+    if (self->mode != Local) return;
+    if (self->band >= 0) return;
+    if (algorithm != NeedlemanWunschSmithWaterman && algorithm != Gotoh)
+        return;
+    if (nB == 0) return;
+    /* Opening a gap should not score better than extending it */
+    if (self->target_open_gap_score > self->target_extend_gap_score) return;
+    if (self->query_open_gap_score > self->query_extend_gap_score) return;
+    if (!_striped_gap_penalty(self->target_open_gap_score,
+                              &striped->target_open)) return;
+    if (!_striped_gap_penalty(self->target_extend_gap_score,
+                              &striped->target_extend)) return;
+    if (!_striped_gap_penalty(self->query_open_gap_score,
+                              &striped->query_open)) return;
+    if (!_striped_gap_penalty(self->query_extend_gap_score,
+                              &striped->query_extend)) return;
+    if (striped->target_open > penalty) penalty = striped->target_open;
+    if (striped->query_open > penalty) penalty = striped->query_open;
+    for (i = 0; i < 26; i++) {
+        for (j = 0; j < 26; j++) {
+            value = self->substitution_matrix[i][j];
+            if (!(value >= -32767 && value <= 32767)) return;
+            if ((int)value != value) return;
+            if (value < minimum) minimum = (int)value;
+            if (value > maximum) maximum = (int)value;
+        }
+    }
+    for (i = 0; i < nB; i++) if (kB[i] < 0 || kB[i] >= 26) return;
+    striped->bias = -minimum;
+    if (striped->bias + maximum >= 32767) return;
+    lanes8 = (int)bytes;
+    lanes16 = (int)(bytes / 2);
+    striped->segments8 = (nB + lanes8 - 1) / lanes8;
+    striped->segments16 = (nB + lanes16 - 1) / lanes16;
+    if (striped->bias + maximum < 255 && penalty < 255)
+        size8 = 26 * striped->segments8 * bytes;
+    size16 = 26 * striped->segments16 * bytes;
+    /* Space for the scores in two columns and the gaps in the query */
+    size = 3 * striped->segments16 * bytes;
+    if (3 * striped->segments8 * bytes > size)
+        size = 3 * striped->segments8 * bytes;
+    memory = malloc(size8 + size16 + size + alignment);
+    if (!memory) return;  /* use the scalar algorithm instead */
+    striped->memory = memory;
+    memory += alignment - ((size_t)memory) % alignment;
+    striped->buffer = memory;
+    memory += size;
+    striped->profile16 = memory;
+    _striped_fill_profile(memory, 2, self, kB, nB,
+                          striped->segments16, lanes16, striped->bias);
+    memory += size16;
+    if (size8) {
+        striped->profile8 = memory;
+        _striped_fill_profile(memory, 1, self, kB, nB,
+                              striped->segments8, lanes8, striped->bias);
+    }
+    else striped->profile8 = NULL;
+    striped->instructions = instructions;
+}
+
+static int
+_striped_score(const Striped* striped, const char* sA, Py_ssize_t nA,
+               double* score)
+{
+    switch (striped->instructions) {
+#ifdef STRIPED_SSE2
+        case SSE2:
+            if (striped->profile8
+             && _striped_sse2_8(striped, sA, nA, score)) return 1;
+            return _striped_sse2_16(striped, sA, nA, score);
+#endif
+#ifdef STRIPED_AVX2
+        case AVX2:
+            if (striped->profile8
+             && _striped_avx2_8(striped, sA, nA, score)) return 1;
+            return _striped_avx2_16(striped, sA, nA, score);
+#endif
+        case NoVectors:
+        default:
+            return 0;
+    }
+}
+
+static double
+_score_sequences(const Aligner* self, Algorithm algorithm,
+                 const char* sA, Py_ssize_t nA,
+                 const int* kB, Py_ssize_t nB, double* buffer,
+                 const Striped* striped)
+{
+    double score;
+    if (striped->instructions && _striped_score(striped, sA, nA, &score))
+        return score;
+    switch (algorithm) {
+        case NeedlemanWunschSmithWaterman:
+            switch (self->mode) {
+                case Global:
+                    return _needlemanwunsch_score(self, sA, nA, kB, nB, buffer);
+                case Local:
+                    return _smithwaterman_score(self, sA, nA, kB, nB, buffer);
+            }
+        case Gotoh:
+            switch (self->mode) {
+                case Global:
+                    return _gotoh_global_score(self, sA, nA, kB, nB, buffer);
+                case Local:
+                    return _gotoh_local_score(self, sA, nA, kB, nB, buffer);
+            }
+        case WatermanSmithBeyer:
+        case Unknown:
+        default:
+            /* The Waterman-Smith-Beyer algorithm calls the gap functions,
+             * and is handled separately. */
+            return 0.0;
+    }
+}
+
+static PyObject* _next_needlemanwunsch(PathGenerator* self)
+{
+    int i = 0;
+    int j = 0;
+    int path;
+    int trace = 0;
+    const int nA = self->nA;
+    const int nB = self->nB;
+    Cell** M = self->M.affine;
+
+    path = M[i][j].path;
+    if (path == DONE) return NULL;
+    if (nA == 0 && nB == 0) {
+        /* Both sequences are empty; the only path is the origin. */
+        PyObject* tuple = _create_path_needleman_wunsch_smith_waterman(M, 0, 0);
+        M[0][0].path = DONE;
+        return tuple;
+    }
+    if (path == 0) {
+        /* Generate the first path. */
+        i = nA;
+        j = nB;
+    }
+    else {
+        /* We already have a path. Prune the path to see if there are
+         * any alternative paths. */
+        while (1) {
+            if (path == HORIZONTAL) {
+                trace = M[i][++j].trace;
+                if (trace & VERTICAL) {
+                    M[--i][j].path = VERTICAL;
+                    break;
+                }
+                if (trace & DIAGONAL) {
+                    M[--i][--j].path = DIAGONAL;
+                    break;
+                }
+            }
+            else if (path == VERTICAL) {
+                trace = M[++i][j].trace;
+                if (trace & DIAGONAL) {
+                    M[--i][--j].path = DIAGONAL;
+                    break;
+                }
+            }
+            else /* DIAGONAL */ {
+                i++;
+                j++;
+            }
+            path = M[i][j].path;
+            if (!path) {
+                /* we reached the end of the alignment without finding
+                 * an alternative path */
+                M[0][0].path = DONE;
+                return NULL;
+            }
+        }
+    }
+    /* Follow the traceback until we reach the origin. */
+    while (1) {
+        trace = M[i][j].trace;
+        if (trace & HORIZONTAL) M[i][--j].path = HORIZONTAL;
+        else if (trace & VERTICAL) M[--i][j].path = VERTICAL;
+        else if (trace & DIAGONAL) M[--i][--j].path = DIAGONAL;
+        else break;
+    }
+    return _create_path_needleman_wunsch_smith_waterman(M, 0, 0);
+}
+
+static PyObject* _next_smithwaterman(PathGenerator* self)
+{
+    int trace = 0;
+    int i = self->iA;
+    int j = self->iB;
+    const int nA = self->nA;
+    const int nB = self->nB;
+    const Band band = self->band;
+    const double threshold = self->threshold;
+    Cell** M = self->M.affine;
+    int path = M[0][0].path;
+
+    if (path == DONE) return NULL;
+
+    path = M[i][j].path;
     if (path) {
         /* We already have a path. Prune the path to see if there are
          * any alternative paths. */
@@ -3309,16 +4035,16 @@ static PyObject* _next_smithwaterman(PathGenerator* self)
         /* Find a suitable end point for a path.
          * Only allow start points ending at the M matrix. */
         while (1) {
-            if (j < nB) j++;
-            else if (i < nA) {
+            j++;
+            while (j > BAND_END(band, i, nB)) {
+                if (i == nA) {
+                    /* we reached the end of the alignment without finding
+                     * an alternative path */
+                    M[0][0].path = DONE;
+                    return NULL;
+                }
                 i++;
-                j = 0;
-            }
-            else {
-                /* we reached the end of the alignment without finding
-                 * an alternative path */
-                M[0][0].path = DONE;
-                return NULL;
+                j = BAND_START(band, i);
             }
             if (M[i][j].score >= threshold) break;
         }
@@ -3355,6 +4081,12 @@ static PyObject* _next_gotoh_global(PathGenerator* self)
     m = M_MATRIX;
     path = M[i][j].path;
     if (path == DONE) return NULL;
+    if (nA == 0 && nB == 0) {
+        /* Both sequences are empty; the only path is the origin. */
+        PyObject* tuple = _create_path_gotoh(M, Ix, Iy, 0, 0);
+        M[0][0].path = DONE;
+        return tuple;
+    }
     if (path == 0) {
         i = nA;
         j = nB;
@@ -3492,6 +4224,7 @@ static PyObject* _next_gotoh_local(PathGenerator* self)
     int iB = self->iB;
     const int nA = self->nA;
     const int nB = self->nB;
+    const Band band = self->band;
     const double threshold = self->threshold;
     Cell** M = self->M.affine;
     Cell** Ix = self->Ix.affine;
@@ -3561,16 +4294,16 @@ static PyObject* _next_gotoh_local(PathGenerator* self)
     if (path == 0) {
         /* Find the starting point for a new path. */
         while (1) {
-            if (iB < nB) iB++;
-            else if (iA < nA) {
+            iB++;
+            while (iB > BAND_END(band, iA, nB)) {
+                if (iA == nA) {
+                    /* we reached the end of the alignment without finding
+                     * an alternative path */
+                    M[0][0].path = DONE;
+                    return NULL;
+                }
                 iA++;
-                iB = 0;
-            }
-            else {
-                /* we reached the end of the alignment without finding
-                 * an alternative path */
-                M[0][0].path = DONE;
-                return NULL;
+                iB = BAND_START(band, iA);
             }
             if (M[iA][iB].score >= threshold) {
                 M[iA][iB].path = 0;
@@ -3639,6 +4372,13 @@ static PyObject* _next_waterman_smith_beyer_global(PathGenerator* self)
     iB = M[0][0].path.j;
     if (iB < 0) return NULL;
 
+    if (nA == 0 && nB == 0) {
+        /* Both sequences are empty; the only path is the origin. */
+        PyObject* tuple = _create_path_waterman_smith_beyer(M, Ix, Iy, 0, 0);
+        M[0][0].path.j = -1;
+        return tuple;
+    }
+
     iA = M[0][0].path.i;
     if (iA >= 0) {
         /* We already have a path. Prune the path to see if there are
@@ -4100,14 +4840,14 @@ PathGenerator_dealloc(PathGenerator* self)
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman: {
             Cell** M = self->M.affine;
-            _deallocate_needlemanwunsch_smithwaterman_matrix(nA, M);
+            _deallocate_needlemanwunsch_smithwaterman_matrix(M);
             break;
         }
         case Gotoh: {
             Cell** M = self->M.affine;
             Cell** Ix = self->Ix.affine;
             Cell** Iy = self->Iy.affine;
-            _deallocate_gotoh_matrices(nA, M, Ix, Iy);
+            _deallocate_gotoh_matrices(M, Ix, Iy);
             break;
         }
         case WatermanSmithBeyer: {
@@ -4180,14 +4920,17 @@ PathGenerator_needlemanwunsch_length(PathGenerator* self)
 {
     int i;
     int j;
+    int end;
     int trace;
     const int nA = self->nA;
     const int nB = self->nB;
+    const Band band = self->band;
     Cell** M = self->M.affine;
     Py_ssize_t term;
     Py_ssize_t count;
     for (i = 0; i <= nA; i++) {
-        for (j = 0; j <= nB; j++) {
+        end = BAND_END(band, i, nB);
+        for (j = BAND_START(band, i); j <= end; j++) {
             if (i==0 && j==0) count = 1;
             else {
                 trace = M[i][j].trace;
@@ -4199,7 +4942,7 @@ PathGenerator_needlemanwunsch_length(PathGenerator* self)
             M[i][j].count = count;
         }
     }
-    return count;
+    return M[nA][nB].count;
 }
 
 static Py_ssize_t
@@ -4207,16 +4950,19 @@ PathGenerator_smithwaterman_length(PathGenerator* self)
 {
     int i;
     int j;
+    int end;
     int trace;
     const int nA = self->nA;
     const int nB = self->nB;
+    const Band band = self->band;
     Cell** M = self->M.affine;
     const double threshold = self->threshold;
     Py_ssize_t term;
     Py_ssize_t count;
     Py_ssize_t total = 0;
     for (i = 0; i <= nA; i++) {
-        for (j = 0; j <= nB; j++) {
+        end = BAND_END(band, i, nB);
+        for (j = BAND_START(band, i); j <= end; j++) {
             trace = M[i][j].trace;
             count = 0;
             if (trace & HORIZONTAL) SAFE_ADD(M[i][j-1].count, count);
@@ -4235,9 +4981,11 @@ PathGenerator_gotoh_global_length(PathGenerator* self)
 {
     int i;
     int j;
+    int end;
     int trace;
     const int nA = self->nA;
     const int nB = self->nB;
+    const Band band = self->band;
     Cell** M = self->M.affine;
     Cell** Ix = self->Ix.affine;
     Cell** Iy = self->Iy.affine;
@@ -4245,7 +4993,8 @@ PathGenerator_gotoh_global_length(PathGenerator* self)
     Py_ssize_t count;
     Py_ssize_t term;
     for (i = 0; i <= nA; i++) {
-        for (j = 0; j <= nB; j++) {
+        end = BAND_END(band, i, nB);
+        for (j = BAND_START(band, i); j <= end; j++) {
             if (i==0 && j==0) count = 1;
             else {
                 count = 0;
@@ -4281,9 +5030,11 @@ PathGenerator_gotoh_local_length(PathGenerator* self)
 {
     int i;
     int j;
+    int end;
     int trace;
     const int nA = self->nA;
     const int nB = self->nB;
+    const Band band = self->band;
     Cell** M = self->M.affine;
     Cell** Ix = self->Ix.affine;
     Cell** Iy = self->Iy.affine;
@@ -4292,7 +5043,8 @@ PathGenerator_gotoh_local_length(PathGenerator* self)
     Py_ssize_t count;
     Py_ssize_t total = 0;
     for (i = 0; i <= nA; i++) {
-        for (j = 0; j <= nB; j++) {
+        end = BAND_END(band, i, nB);
+        for (j = BAND_START(band, i); j <= end; j++) {
             count = 0;
             trace = M[i][j].trace;
             if (trace & M_MATRIX) SAFE_ADD(M[i-1][j-1].count, count);
@@ -4470,6 +5222,10 @@ PathGenerator_waterman_smith_beyer_local_length(PathGenerator* self)
 
 static Py_ssize_t PathGenerator_length(PathGenerator* self) {
     Py_ssize_t length = self->length;
+    if (self->mode == Local && self->threshold <= 0) {
+        /* no solutions were found, as in PathGenerator_reset */
+        return 0;
+    }
     if (length == 0) {
         switch (self->algorithm) {
             case NeedlemanWunschSmithWaterman:
@@ -4578,7 +5334,7 @@ static PyTypeObject PathGenerator_Type = {
 };
 
 static PathGenerator*
-_create_path_generator(const Aligner* aligner, int nA, int nB, double epsilon)
+_create_path_generator(const Aligner* aligner, int nA, int nB, Band band)
 {
     Algorithm algorithm = aligner->algorithm;
     PathGenerator* generator;
@@ -4589,6 +5345,7 @@ _create_path_generator(const Aligner* aligner, int nA, int nB, double epsilon)
     generator->iB = 0;
     generator->nA = nA;
     generator->nB = nB;
+    generator->band = band;
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
         case Gotoh:
@@ -4622,6 +5379,8 @@ Aligner_needlemanwunsch_align(Aligner* self, const char* sA, Py_ssize_t nA,
     char c;
     int i;
     int j;
+    int start;
+    int end;
     int kA;
     int kB;
     const double gap_extend_A = self->target_extend_gap_score;
@@ -4631,57 +5390,50 @@ Aligner_needlemanwunsch_align(Aligner* self, const char* sA, Py_ssize_t nA,
     const double right_gap_extend_A = self->target_right_extend_gap_score;
     const double right_gap_extend_B = self->query_right_extend_gap_score;
     const double epsilon = self->epsilon;
+    const Band band = _get_band(self, nA, nB);
     Cell** M = NULL;
+    double gap_A;
+    double gap_B;
     double score;
     int trace;
     double temp;
     PathGenerator* paths = NULL;
 
     /* Needleman-Wunsch algorithm */
-    M = _allocate_needlemanwunsch_smithwaterman_matrix(nA, nB);
+    M = _allocate_needlemanwunsch_smithwaterman_matrix(nA, nB, band);
     if (!M) goto exit;
-    M[0][0].score = 0;
-    M[0][0].trace = 0;
-    for (j = 1; j <= nB; j++) {
-        M[0][j].score = j * left_gap_extend_A;
-        M[0][j].trace = HORIZONTAL;
-    }
-    for (i = 1; i < nA; i++) {
-        M[i][0].score = i * left_gap_extend_B;
-        M[i][0].trace = VERTICAL;
+    for (i = 0; i <= nA; i++) {
+        start = BAND_START(band, i);
+        end = BAND_END(band, i, nB);
+        if (start > 0) j = start;
+        else {
+            M[i][0].score = i * left_gap_extend_B;
+            M[i][0].trace = (i == 0) ? 0 : VERTICAL;
+            j = 1;
+        }
+        if (i == 0) {
+            for ( ; j <= end; j++) {
+                M[0][j].score = j * left_gap_extend_A;
+                M[0][j].trace = HORIZONTAL;
+            }
+            continue;
+        }
         kA = CHARINDEX(sA[i-1]);
-        for (j = 1; j < nB; j++) {
+        gap_A = (i == nA) ? right_gap_extend_A : gap_extend_A;
+        for ( ; j <= end; j++) {
             kB = CHARINDEX(sB[j-1]);
+            gap_B = (j == nB) ? right_gap_extend_B : gap_extend_B;
             SELECT_TRACE_NEEDLEMAN_WUNSCH(M[i][j],
-                M[i][j-1].score + gap_extend_A,
-                M[i-1][j].score + gap_extend_B,
+                M[i][j-1].score + gap_A,
+                M[i-1][j].score + gap_B,
                 M[i-1][j-1].score + self->substitution_matrix[kA][kB]);
         }
-        kB = CHARINDEX(sB[nB-1]);
-        SELECT_TRACE_NEEDLEMAN_WUNSCH(M[i][nB],
-            M[i][nB-1].score + gap_extend_A,
-            M[i-1][nB].score + right_gap_extend_B,
-            M[i-1][nB-1].score + self->substitution_matrix[kA][kB]);
-    }
-    M[nA][0].score = i * left_gap_extend_B;
-    M[nA][0].trace = VERTICAL;
-    kA = CHARINDEX(sA[nA-1]);
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        SELECT_TRACE_NEEDLEMAN_WUNSCH(M[nA][j],
-            M[nA][j-1].score + right_gap_extend_A,
-            M[nA-1][j].score + gap_extend_B,
-            M[nA-1][j-1].score + self->substitution_matrix[kA][kB]);
-    }
-    kB = CHARINDEX(sB[nB-1]);
-    SELECT_TRACE_NEEDLEMAN_WUNSCH(M[nA][nB],
-        M[nA][nB-1].score + right_gap_extend_A,
-        M[nA-1][nB].score + right_gap_extend_B,
-        M[nA-1][nB-1].score + self->substitution_matrix[kA][kB]);
+    }
     M[0][0].path = 0;
     M[nA][nB].path = 0;
+    score = M[nA][nB].score;
 
-    paths = _create_path_generator(self, nA, nB, epsilon);
+    paths = _create_path_generator(self, nA, nB, band);
     if (paths) {
         PyObject* result;
         paths->M.affine = M;
@@ -4690,7 +5442,7 @@ Aligner_needlemanwunsch_align(Aligner* self, const char* sA, Py_ssize_t nA,
         Py_DECREF(paths);
         return result;
     }
-    else _deallocate_needlemanwunsch_smithwaterman_matrix(nA, M);
+    else _deallocate_needlemanwunsch_smithwaterman_matrix(M);
 
 exit:
     PyErr_SetString(PyExc_MemoryError, "Out of memory");
@@ -4704,11 +5456,14 @@ Aligner_smithwaterman_align(Aligner* self, const char* sA, Py_ssize_t nA,
     char c;
     int i;
     int j;
+    int start;
+    int end;
     int kA;
     int kB;
     const double gap_extend_A = self->target_extend_gap_score;
     const double gap_extend_B = self->query_extend_gap_score;
     const double epsilon = self->epsilon;
+    const Band band = _get_band(self, nA, nB);
     Cell** M = NULL;
     double maximum = 0;
     double score = 0;
@@ -4717,43 +5472,42 @@ Aligner_smithwaterman_align(Aligner* self, const char* sA, Py_ssize_t nA,
     PathGenerator* paths = NULL;
 
     /* Smith-Waterman algorithm */
-    M = _allocate_needlemanwunsch_smithwaterman_matrix(nA, nB);
+    M = _allocate_needlemanwunsch_smithwaterman_matrix(nA, nB, band);
     if (!M) goto exit;
-    M[0][0].score = 0;
-    M[0][0].trace = 0;
-    M[0][0].path = 0;
-    for (j = 1; j <= nB; j++) {
-        M[0][j].score = 0;
-        M[0][j].trace = 0;
-    }
-    for (i = 1; i < nA; i++) {
-        M[i][0].score = 0;
-        M[i][0].trace = 0;
+    for (i = 0; i <= nA; i++) {
+        start = BAND_START(band, i);
+        end = BAND_END(band, i, nB);
+        if (start > 0) j = start;
+        else {
+            M[i][0].score = 0;
+            M[i][0].trace = 0;
+            j = 1;
+        }
+        if (i == 0) {
+            for ( ; j <= end; j++) {
+                M[0][j].score = 0;
+                M[0][j].trace = 0;
+            }
+            continue;
+        }
         kA = CHARINDEX(sA[i-1]);
-        for (j = 1; j < nB; j++) {
+        for ( ; j <= end; j++) {
             kB = CHARINDEX(sB[j-1]);
-            SELECT_TRACE_SMITH_WATERMAN_HVD(M[i][j],
-                M[i][j-1].score + gap_extend_A,
-                M[i-1][j].score + gap_extend_B,
-                M[i-1][j-1].score + self->substitution_matrix[kA][kB]);
+            if (i == nA || j == nB) {
+                SELECT_TRACE_SMITH_WATERMAN_D(M[i][j],
+                    M[i-1][j-1].score + self->substitution_matrix[kA][kB]);
+            }
+            else {
+                SELECT_TRACE_SMITH_WATERMAN_HVD(M[i][j],
+                    M[i][j-1].score + gap_extend_A,
+                    M[i-1][j].score + gap_extend_B,
+                    M[i-1][j-1].score + self->substitution_matrix[kA][kB]);
+            }
         }
-        kB = CHARINDEX(sB[nB-1]);
-        SELECT_TRACE_SMITH_WATERMAN_D(M[i][nB],
-            M[i-1][nB-1].score + self->substitution_matrix[kA][kB]);
-    }
-    M[nA][0].score = 0;
-    M[nA][0].trace = 0;
-    kA = CHARINDEX(sA[nA-1]);
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        SELECT_TRACE_SMITH_WATERMAN_D(M[nA][j],
-            M[nA-1][j-1].score + self->substitution_matrix[kA][kB]);
     }
-    kB = CHARINDEX(sB[nB-1]);
-    SELECT_TRACE_SMITH_WATERMAN_D(M[nA][nB],
-        M[nA-1][nB-1].score + self->substitution_matrix[kA][kB]);
+    M[0][0].path = 0;
 
-    paths = _create_path_generator(self, nA, nB, epsilon);
+    paths = _create_path_generator(self, nA, nB, band);
     if (paths) {
         PyObject* result;
         paths->M.affine = M;
@@ -4763,7 +5517,7 @@ Aligner_smithwaterman_align(Aligner* self, const char* sA, Py_ssize_t nA,
         Py_DECREF(paths);
         return result;
     }
-    else _deallocate_needlemanwunsch_smithwaterman_matrix(nA, M);
+    else _deallocate_needlemanwunsch_smithwaterman_matrix(M);
 
 exit:
     PyErr_SetString(PyExc_MemoryError, "Out of memory");
@@ -4771,12 +5525,14 @@ exit:
 }
 
 static PyObject*
-Aligner_gotoh_global_score(Aligner* self, const char* sA, Py_ssize_t nA,
+Aligner_gotoh_global_align(Aligner* self, const char* sA, Py_ssize_t nA,
                                           const char* sB, Py_ssize_t nB)
 {
     char c;
     int i;
     int j;
+    int start;
+    int end;
     int kA;
     int kB;
     const double gap_open_A = self->target_open_gap_score;
@@ -4791,400 +5547,81 @@ Aligner_gotoh_global_score(Aligner* self, const char* sA, Py_ssize_t nA,
     const double right_gap_open_B = self->query_right_open_gap_score;
     const double right_gap_extend_A = self->target_right_extend_gap_score;
     const double right_gap_extend_B = self->query_right_extend_gap_score;
-    double** M = NULL;
-    double** Ix = NULL;
-    double** Iy = NULL;
+    const double epsilon = self->epsilon;
+    const Band band = _get_band(self, nA, nB);
+    Cell** M = NULL;
+    Cell** Ix = NULL;
+    Cell** Iy = NULL;
+    double open_A, extend_A;
+    double open_B, extend_B;
     double score;
+    int trace;
     double temp;
-    PyObject* result = NULL;
+
+    PathGenerator* paths = NULL;
 
     /* Gotoh algorithm with three states */
-    M = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!M) goto exit;
-    Ix = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!Ix) goto exit;
-    Iy = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!Iy) goto exit;
+    if (!_allocate_gotoh_matrices(nA, nB, band, &M, &Ix, &Iy)) goto exit;
     for (i = 0; i <= nA; i++) {
-        M[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!M[i]) goto exit;
-        Ix[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!Ix[i]) goto exit;
-        Iy[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!Iy[i]) goto exit;
-    }
-
-    /* The top row of the score matrix is a special case,
-     * as there are no previously aligned characters.
-     */
-    M[0][0] = 0;
-    Ix[0][0] = -DBL_MAX;
-    Iy[0][0] = -DBL_MAX;
-    for (i = 1; i <= nA; i++) {
-        M[i][0] = -DBL_MAX;
-        Ix[i][0] = left_gap_open_B + left_gap_extend_B * (i-1);
-        Iy[i][0] = -DBL_MAX;
-    }
-    for (j = 1; j <= nB; j++) {
-        M[0][j] = -DBL_MAX;
-        Ix[0][j] = -DBL_MAX;
-        Iy[0][j] = left_gap_open_A + left_gap_extend_A * (j-1);
-    }
-
-    for (i = 1; i < nA; i++) {
+        start = BAND_START(band, i);
+        end = BAND_END(band, i, nB);
+        if (start > 0) j = start;
+        else {
+            if (i == 0) {
+                M[0][0].score = 0;
+                Ix[0][0].score = -DBL_MAX;
+                Ix[0][0].trace = 0;
+            }
+            else {
+                M[i][0].score = -DBL_MAX;
+                Ix[i][0].score = left_gap_open_B + left_gap_extend_B * (i-1);
+                Ix[i][0].trace = (i == 1) ? M_MATRIX : Ix_MATRIX;
+            }
+            M[i][0].trace = 0;
+            Iy[i][0].score = -DBL_MAX;
+            Iy[i][0].trace = 0;
+            j = 1;
+        }
+        if (i == 0) {
+            for ( ; j <= end; j++) {
+                M[0][j].score = -DBL_MAX;
+                M[0][j].trace = 0;
+                Ix[0][j].score = -DBL_MAX;
+                Ix[0][j].trace = 0;
+                Iy[0][j].score = left_gap_open_A + left_gap_extend_A * (j-1);
+                Iy[0][j].trace = (j == 1) ? M_MATRIX : Iy_MATRIX;
+            }
+            continue;
+        }
         kA = CHARINDEX(sA[i-1]);
-        for (j = 1; j < nB; j++) {
+        open_A = (i == nA) ? right_gap_open_A : gap_open_A;
+        extend_A = (i == nA) ? right_gap_extend_A : gap_extend_A;
+        for ( ; j <= end; j++) {
             kB = CHARINDEX(sB[j-1]);
-            SELECT_SCORE_GLOBAL(M[i-1][j] + gap_open_B,
-                                Ix[i-1][j] + gap_extend_B,
-                                Iy[i-1][j] + gap_open_B);
-            Ix[i][j] = score;
-            SELECT_SCORE_GLOBAL(M[i][j-1] + gap_open_A,
-                                Iy[i][j-1] + gap_extend_A,
-                                Ix[i][j-1] + gap_open_A);
-            Iy[i][j] = score;
-            SELECT_SCORE_GLOBAL(M[i-1][j-1],
-                                Ix[i-1][j-1],
-                                Iy[i-1][j-1]);
-            M[i][j] = score + self->substitution_matrix[kA][kB];
+            open_B = (j == nB) ? right_gap_open_B : gap_open_B;
+            extend_B = (j == nB) ? right_gap_extend_B : gap_extend_B;
+            SELECT_TRACE_GOTOH_GLOBAL_GAP(Ix[i][j],
+                M[i-1][j].score + open_B,
+                Ix[i-1][j].score + extend_B,
+                Iy[i-1][j].score + open_B);
+            SELECT_TRACE_GOTOH_GLOBAL_GAP(Iy[i][j],
+                M[i][j-1].score + open_A,
+                Ix[i][j-1].score + open_A,
+                Iy[i][j-1].score + extend_A);
+            SELECT_TRACE_GOTOH_GLOBAL_ALIGN(M[i][j],
+                M[i-1][j-1].score,
+                Ix[i-1][j-1].score,
+                Iy[i-1][j-1].score,
+                self->substitution_matrix[kA][kB]);
         }
-        kB = CHARINDEX(sB[nB-1]);
-        SELECT_SCORE_GLOBAL(M[i-1][nB] + right_gap_open_B,
-                            Ix[i-1][nB] + right_gap_extend_B,
-                            Iy[i-1][nB] + right_gap_open_B);
-        Ix[i][nB] = score;
-        SELECT_SCORE_GLOBAL(M[i][nB-1] + gap_open_A,
-                            Iy[i][nB-1] + gap_extend_A,
-                            Ix[i][nB-1] + gap_open_A);
-        Iy[i][nB] = score;
-        SELECT_SCORE_GLOBAL(M[i-1][nB-1],
-                            Ix[i-1][nB-1],
-                            Iy[i-1][nB-1]);
-        M[i][nB] = score + self->substitution_matrix[kA][kB];
-    }
-
-    kA = CHARINDEX(sA[nA-1]);
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        SELECT_SCORE_GLOBAL(M[nA-1][j] + gap_open_B,
-                            Ix[nA-1][j] + gap_extend_B,
-                            Iy[nA-1][j] + gap_open_B);
-        Ix[nA][j] = score;
-        SELECT_SCORE_GLOBAL(M[nA][j-1] + right_gap_open_A,
-                            Iy[nA][j-1] + right_gap_extend_A,
-                            Ix[nA][j-1] + right_gap_open_A);
-        Iy[nA][j] = score;
-        SELECT_SCORE_GLOBAL(M[nA-1][j-1],
-                            Ix[nA-1][j-1],
-                            Iy[nA-1][j-1]);
-        M[nA][j] = score + self->substitution_matrix[kA][kB];
-    }
-
-    kB = CHARINDEX(sB[nB-1]);
-    SELECT_SCORE_GLOBAL(M[nA-1][nB] + right_gap_open_B,
-                        Ix[nA-1][nB] + right_gap_extend_B,
-                        Iy[nA-1][nB] + right_gap_open_B);
-    Ix[nA][nB] = score;
-    SELECT_SCORE_GLOBAL(M[nA][nB-1] + right_gap_open_A,
-                        Iy[nA][nB-1] + right_gap_extend_A,
-                        Ix[nA][nB-1] + right_gap_open_A);
-    Iy[nA][nB] = score;
-    SELECT_SCORE_GLOBAL(M[nA-1][nB-1],
-                        Ix[nA-1][nB-1],
-                        Iy[nA-1][nB-1]);
-    M[nA][nB] = score + self->substitution_matrix[kA][kB];
-
-    SELECT_SCORE_GLOBAL(M[nA][nB], Ix[nA][nB], Iy[nA][nB]);
-    result = PyFloat_FromDouble(score);
-
-exit:
-    if (M) {
-        /* If M is NULL, then Ix is also NULL. */
-        if (Ix) {
-            /* If Ix is NULL, then Iy is also NULL. */
-            if (Iy) {
-                /* If Iy is NULL, then M[i], Ix[i], and Iy[i] are also NULL. */
-                for (i = 0; i <= nA; i++) {
-                    if (!M[i]) break;
-                    PyMem_Free(M[i]);
-                    if (!Ix[i]) break;
-                    PyMem_Free(Ix[i]);
-                    if (!Iy[i]) break;
-                    PyMem_Free(Iy[i]);
-                }
-                PyMem_Free(Iy);
-            }
-            PyMem_Free(Ix);
-        }
-        PyMem_Free(M);
-    }
-    if (!result) PyErr_SetString(PyExc_MemoryError, "Out of memory");
-    return result;
-}
-
-static PyObject*
-Aligner_gotoh_local_score(Aligner* self, const char* sA, Py_ssize_t nA,
-                                         const char* sB, Py_ssize_t nB)
-{
-    char c;
-    int i;
-    int j;
-    int kA;
-    int kB;
-    const double gap_open_A = self->target_open_gap_score;
-    const double gap_open_B = self->query_open_gap_score;
-    const double gap_extend_A = self->target_extend_gap_score;
-    const double gap_extend_B = self->query_extend_gap_score;
-    double** M = NULL;
-    double** Ix = NULL;
-    double** Iy = NULL;
-    double score;
-    double temp;
-    double maximum = 0.0;
-    PyObject* result = NULL;
-
-    /* Gotoh algorithm with three states */
-    M = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!M) goto exit;
-    Ix = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!Ix) goto exit;
-    Iy = PyMem_Malloc((nA+1)*sizeof(double*));
-    if (!Iy) goto exit;
-    for (i = 0; i <= nA; i++) {
-        M[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!M[i]) goto exit;
-        Ix[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!Ix[i]) goto exit;
-        Iy[i] = PyMem_Malloc((nB+1)*sizeof(double));
-        if (!Iy[i]) goto exit;
-    }
-
-    /* The top row of the score matrix is a special case,
-     * as there are no previously aligned characters.
-     */
-    M[0][0] = 0;
-    Ix[0][0] = -DBL_MAX;
-    Iy[0][0] = -DBL_MAX;
-    for (i = 1; i <= nA; i++) {
-        M[i][0] = -DBL_MAX;
-        Ix[i][0] = 0;
-        Iy[i][0] = -DBL_MAX;
     }
-    for (j = 1; j <= nB; j++) {
-        M[0][j] = -DBL_MAX;
-        Ix[0][j] = -DBL_MAX;
-        Iy[0][j] = 0;
-    }
-
-    for (i = 1; i < nA; i++) {
-        kA = CHARINDEX(sA[i-1]);
-        for (j = 1; j < nB; j++) {
-            kB = CHARINDEX(sB[j-1]);
-            SELECT_SCORE_LOCAL3(M[i-1][j] + gap_open_B,
-                                Ix[i-1][j] + gap_extend_B,
-                                Iy[i-1][j] + gap_open_B);
-            Ix[i][j] = score;
-            SELECT_SCORE_LOCAL3(M[i][j-1] + gap_open_A,
-                                Iy[i][j-1] + gap_extend_A,
-                                Ix[i][j-1] + gap_open_A);
-            Iy[i][j] = score;
-            SELECT_SCORE_GOTOH_LOCAL_ALIGN(M[i-1][j-1],
-                                           Ix[i-1][j-1],
-                                           Iy[i-1][j-1],
-                                           self->substitution_matrix[kA][kB]);
-            M[i][j] = score;
-        }
-
-        kB = CHARINDEX(sB[nB-1]);
-
-        Ix[i][nB] = 0;
-        Iy[i][nB] = 0;
-        SELECT_SCORE_GOTOH_LOCAL_ALIGN(M[i-1][nB-1],
-                                       Ix[i-1][nB-1],
-                                       Iy[i-1][nB-1],
-                                       self->substitution_matrix[kA][kB]);
-        M[i][nB] = score;
-    }
-
-    kA = CHARINDEX(sA[nA-1]);
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        Ix[nA][j] = 0;
-        Iy[nA][j] = 0;
-        SELECT_SCORE_GOTOH_LOCAL_ALIGN(M[nA-1][j-1],
-                                       Ix[nA-1][j-1],
-                                       Iy[nA-1][j-1],
-                                       self->substitution_matrix[kA][kB]);
-        M[nA][j] = score;
-    }
-
-    kB = CHARINDEX(sB[nB-1]);
-    Ix[nA][nB] = 0;
-    Iy[nA][nB] = 0;
-    SELECT_SCORE_GOTOH_LOCAL_ALIGN(M[nA-1][nB-1],
-                                   Ix[nA-1][nB-1],
-                                   Iy[nA-1][nB-1],
-                                   self->substitution_matrix[kA][kB]);
-    M[nA][nB] = score;
-
-    result = PyFloat_FromDouble(maximum);
-
-exit:
-    if (M) {
-        /* If M is NULL, then Ix is also NULL. */
-        if (Ix) {
-            /* If Ix is NULL, then Iy is also NULL. */
-            if (Iy) {
-                /* If Iy is NULL, then M[i], Ix[i], and Iy[i] are also NULL. */
-                for (i = 0; i <= nA; i++) {
-                    if (!M[i]) break;
-                    PyMem_Free(M[i]);
-                    if (!Ix[i]) break;
-                    PyMem_Free(Ix[i]);
-                    if (!Iy[i]) break;
-                    PyMem_Free(Iy[i]);
-                }
-                PyMem_Free(Iy);
-            }
-            PyMem_Free(Ix);
-        }
-        PyMem_Free(M);
-    }
-    if (!result) PyErr_SetString(PyExc_MemoryError, "Out of memory");
-    return result;
-}
-
-static PyObject*
-Aligner_gotoh_global_align(Aligner* self, const char* sA, Py_ssize_t nA,
-                                          const char* sB, Py_ssize_t nB)
-{
-    char c;
-    int i;
-    int j;
-    int kA;
-    int kB;
-    const double gap_open_A = self->target_open_gap_score;
-    const double gap_open_B = self->query_open_gap_score;
-    const double gap_extend_A = self->target_extend_gap_score;
-    const double gap_extend_B = self->query_extend_gap_score;
-    const double left_gap_open_A = self->target_left_open_gap_score;
-    const double left_gap_open_B = self->query_left_open_gap_score;
-    const double left_gap_extend_A = self->target_left_extend_gap_score;
-    const double left_gap_extend_B = self->query_left_extend_gap_score;
-    const double right_gap_open_A = self->target_right_open_gap_score;
-    const double right_gap_open_B = self->query_right_open_gap_score;
-    const double right_gap_extend_A = self->target_right_extend_gap_score;
-    const double right_gap_extend_B = self->query_right_extend_gap_score;
-    const double epsilon = self->epsilon;
-    Cell** M = NULL;
-    Cell** Ix = NULL;
-    Cell** Iy = NULL;
-    double score;
-    int trace;
-    double temp;
-
-    PathGenerator* paths = NULL;
-
-    /* Gotoh algorithm with three states */
-    if (!_allocate_gotoh_matrices(nA, nB, &M, &Ix, &Iy)) goto exit;
-    M[0][0].score = 0;
-    M[0][0].trace = 0;
-    Ix[0][0].score = -DBL_MAX;
-    Ix[0][0].trace = 0;
-    Iy[0][0].score = -DBL_MAX;
-    Iy[0][0].trace = 0;
-    for (i = 1; i <= nA; i++) {
-        M[i][0].score = -DBL_MAX;
-        M[i][0].trace = 0;
-        Ix[i][0].score = left_gap_open_B + left_gap_extend_B * (i-1);
-        Ix[i][0].trace = Ix_MATRIX;
-        Iy[i][0].score = -DBL_MAX;
-        Iy[i][0].trace = 0;
-    }
-    Ix[1][0].trace = M_MATRIX;
-
-    for (j = 1; j <= nB; j++) {
-        M[0][j].score = -DBL_MAX;
-        M[0][j].trace = 0;
-        Ix[0][j].score = -DBL_MAX;
-        Ix[0][j].trace = 0;
-        Iy[0][j].score = left_gap_open_A + left_gap_extend_A * (j-1);
-        Iy[0][j].trace = 0;
-        Iy[0][j].trace = Iy_MATRIX;
-    }
-    Iy[0][1].trace = M_MATRIX;
-
-    for (i = 1; i < nA; i++) {
-        kA = CHARINDEX(sA[i-1]);
-        for (j = 1; j < nB; j++) {
-            kB = CHARINDEX(sB[j-1]);
-            SELECT_TRACE_GOTOH_GLOBAL_GAP(Ix[i][j],
-                M[i-1][j].score + gap_open_B,
-                Ix[i-1][j].score + gap_extend_B,
-                Iy[i-1][j].score + gap_open_B);
-            SELECT_TRACE_GOTOH_GLOBAL_GAP(Iy[i][j],
-                M[i][j-1].score + gap_open_A,
-                Ix[i][j-1].score + gap_open_A,
-                Iy[i][j-1].score + gap_extend_A);
-            SELECT_TRACE_GOTOH_GLOBAL_ALIGN(M[i][j],
-                M[i-1][j-1].score,
-                Ix[i-1][j-1].score,
-                Iy[i-1][j-1].score,
-                self->substitution_matrix[kA][kB]);
-        }
-        kB = CHARINDEX(sB[nB-1]);
-        SELECT_TRACE_GOTOH_GLOBAL_GAP(Ix[i][nB],
-            M[i-1][nB].score + right_gap_open_B,
-            Ix[i-1][nB].score + right_gap_extend_B,
-            Iy[i-1][nB].score + right_gap_open_B);
-        SELECT_TRACE_GOTOH_GLOBAL_GAP(Iy[i][nB],
-            M[i][nB-1].score + gap_open_A,
-            Ix[i][nB-1].score + gap_open_A,
-            Iy[i][nB-1].score + gap_extend_A);
-        SELECT_TRACE_GOTOH_GLOBAL_ALIGN(M[i][nB],
-            M[i-1][nB-1].score,
-            Ix[i-1][nB-1].score,
-            Iy[i-1][nB-1].score,
-            self->substitution_matrix[kA][kB]);
-    }
-    kA = CHARINDEX(sA[nA-1]);
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        SELECT_TRACE_GOTOH_GLOBAL_GAP(Ix[nA][j],
-            M[nA-1][j].score + gap_open_B,
-            Ix[nA-1][j].score + gap_extend_B,
-            Iy[nA-1][j].score + gap_open_B);
-        SELECT_TRACE_GOTOH_GLOBAL_GAP(Iy[nA][j],
-            M[nA][j-1].score + right_gap_open_A,
-            Ix[nA][j-1].score + right_gap_open_A,
-            Iy[nA][j-1].score + right_gap_extend_A);
-        SELECT_TRACE_GOTOH_GLOBAL_ALIGN(M[nA][j],
-            M[nA-1][j-1].score,
-            Ix[nA-1][j-1].score,
-            Iy[nA-1][j-1].score,
-            self->substitution_matrix[kA][kB]);
-    }
-    kB = CHARINDEX(sB[nB-1]);
-    SELECT_TRACE_GOTOH_GLOBAL_GAP(Ix[nA][nB],
-        M[nA-1][nB].score + right_gap_open_B,
-        Ix[nA-1][nB].score + right_gap_extend_B,
-        Iy[nA-1][nB].score + right_gap_open_B);
-    SELECT_TRACE_GOTOH_GLOBAL_GAP(Iy[nA][nB],
-        M[nA][nB-1].score + right_gap_open_A,
-        Ix[nA][nB-1].score + right_gap_open_A,
-        Iy[nA][nB-1].score + right_gap_extend_A);
-    SELECT_TRACE_GOTOH_GLOBAL_ALIGN(M[nA][nB],
-        M[nA-1][nB-1].score,
-        Ix[nA-1][nB-1].score,
-        Iy[nA-1][nB-1].score,
-        self->substitution_matrix[kA][kB]);
     M[0][0].path = 0;
     M[nA][nB].path = 0;
     Ix[nA][nB].path = 0;
     Iy[nA][nB].path = 0;
 
     /* traceback */
-    paths = _create_path_generator(self, nA, nB, epsilon);
+    paths = _create_path_generator(self, nA, nB, band);
     if (paths) {
         PyObject* result;
         SELECT_SCORE_GLOBAL(M[nA][nB].score,
@@ -5198,7 +5635,7 @@ Aligner_gotoh_global_align(Aligner* self, const char* sA, Py_ssize_t nA,
         Py_DECREF(paths);
         return result;
     }
-    else _deallocate_gotoh_matrices(nA, M, Ix, Iy);
+    else _deallocate_gotoh_matrices(M, Ix, Iy);
 exit:
     PyErr_SetString(PyExc_MemoryError, "Out of memory");
     return NULL;
@@ -5211,6 +5648,8 @@ Aligner_gotoh_local_align(Aligner* self, const char* sA, Py_ssize_t nA,
     char c;
     int i;
     int j;
+    int start;
+    int end;
     int kA;
     int kB;
     const double gap_open_A = self->target_open_gap_score;
@@ -5218,6 +5657,7 @@ Aligner_gotoh_local_align(Aligner* self, const char* sA, Py_ssize_t nA,
     const double gap_extend_A = self->target_extend_gap_score;
     const double gap_extend_B = self->query_extend_gap_score;
     const double epsilon = self->epsilon;
+    const Band band = _get_band(self, nA, nB);
     Cell** M = NULL;
     Cell** Ix = NULL;
     Cell** Iy = NULL;
@@ -5228,86 +5668,61 @@ Aligner_gotoh_local_align(Aligner* self, const char* sA, Py_ssize_t nA,
     PathGenerator* paths = NULL;
 
     /* Gotoh algorithm with three states */
-    if (!_allocate_gotoh_matrices(nA, nB, &M, &Ix, &Iy)) goto exit;
-    M[0][0].score = 0;
-    M[0][0].trace = 0;
-    M[0][0].path = 0;
-    Ix[0][0].score = -DBL_MAX;
-    Ix[0][0].trace = 0;
-    Iy[0][0].score = -DBL_MAX;
-    Iy[0][0].trace = 0;
-    for (i = 1; i <= nA; i++) {
-        M[i][0].score = 0;
-        M[i][0].trace = 0;
-        Ix[i][0].score = -DBL_MAX;
-        Ix[i][0].trace = 0;
-        Iy[i][0].score = -DBL_MAX;
-        Iy[i][0].trace = 0;
-    }
-
-    for (j = 1; j <= nB; j++) {
-        M[0][j].score = 0;
-        M[0][j].trace = 0;
-        Ix[0][j].score = -DBL_MAX;
-        Ix[0][j].trace = 0;
-        Iy[0][j].score = -DBL_MAX;
-        Iy[0][j].trace = 0;
-    }
-    for (i = 1; i < nA; i++) {
+    if (!_allocate_gotoh_matrices(nA, nB, band, &M, &Ix, &Iy)) goto exit;
+    for (i = 0; i <= nA; i++) {
+        start = BAND_START(band, i);
+        end = BAND_END(band, i, nB);
+        if (start > 0) j = start;
+        else {
+            M[i][0].score = 0;
+            M[i][0].trace = 0;
+            Ix[i][0].score = -DBL_MAX;
+            Ix[i][0].trace = 0;
+            Iy[i][0].score = -DBL_MAX;
+            Iy[i][0].trace = 0;
+            j = 1;
+        }
+        if (i == 0) {
+            for ( ; j <= end; j++) {
+                M[0][j].score = 0;
+                M[0][j].trace = 0;
+                Ix[0][j].score = -DBL_MAX;
+                Ix[0][j].trace = 0;
+                Iy[0][j].score = -DBL_MAX;
+                Iy[0][j].trace = 0;
+            }
+            continue;
+        }
         kA = CHARINDEX(sA[i-1]);
-        for (j = 1; j < nB; j++) {
+        for ( ; j <= end; j++) {
             kB = CHARINDEX(sB[j-1]);
-            SELECT_TRACE_GOTOH_LOCAL_GAP(Ix[i][j],
-                                     M[i-1][j].score + gap_open_B,
-                                     Ix[i-1][j].score + gap_extend_B,
-                                     Iy[i-1][j].score + gap_open_B);
-            SELECT_TRACE_GOTOH_LOCAL_GAP(Iy[i][j],
-                                     M[i][j-1].score + gap_open_A,
-                                     Ix[i][j-1].score + gap_open_A,
-                                     Iy[i][j-1].score + gap_extend_A);
+            if (i == nA || j == nB) {
+                Ix[i][j].score = 0;
+                Ix[i][j].trace = 0;
+                Iy[i][j].score = 0;
+                Iy[i][j].trace = 0;
+            }
+            else {
+                SELECT_TRACE_GOTOH_LOCAL_GAP(Ix[i][j],
+                                         M[i-1][j].score + gap_open_B,
+                                         Ix[i-1][j].score + gap_extend_B,
+                                         Iy[i-1][j].score + gap_open_B);
+                SELECT_TRACE_GOTOH_LOCAL_GAP(Iy[i][j],
+                                         M[i][j-1].score + gap_open_A,
+                                         Ix[i][j-1].score + gap_open_A,
+                                         Iy[i][j-1].score + gap_extend_A);
+            }
             SELECT_TRACE_GOTOH_LOCAL_ALIGN(M[i][j],
                                            M[i-1][j-1].score,
                                            Ix[i-1][j-1].score,
                                            Iy[i-1][j-1].score,
                                            self->substitution_matrix[kA][kB]);
         }
-        kB = CHARINDEX(sB[nB-1]);
-        Ix[i][nB].score = 0;
-        Ix[i][nB].trace = 0;
-        Iy[i][nB].score = 0;
-        Iy[i][nB].trace = 0;
-        SELECT_TRACE_GOTOH_LOCAL_ALIGN(M[i][nB],
-                                       M[i-1][nB-1].score,
-                                       Ix[i-1][nB-1].score,
-                                       Iy[i-1][nB-1].score,
-                                       self->substitution_matrix[kA][kB]);
-    }
-    kA = CHARINDEX(sA[nA-1]);
-    for (j = 1; j < nB; j++) {
-        kB = CHARINDEX(sB[j-1]);
-        Ix[nA][j].score = 0;
-        Ix[nA][j].trace = 0;
-        Iy[nA][j].score = 0;
-        Iy[nA][j].trace = 0;
-        SELECT_TRACE_GOTOH_LOCAL_ALIGN(M[nA][j],
-                                       M[nA-1][j-1].score,
-                                       Ix[nA-1][j-1].score,
-                                       Iy[nA-1][j-1].score,
-                                       self->substitution_matrix[kA][kB]);
-    }
-    kB = CHARINDEX(sB[nB-1]);
-    Ix[nA][nB].score = 0;
-    Ix[nA][nB].trace = 0;
-    Iy[nA][nB].score = 0;
-    Iy[nA][nB].trace = 0;
-    SELECT_TRACE_GOTOH_LOCAL_ALIGN(M[nA][nB],
-                                   M[nA-1][nB-1].score,
-                                   Ix[nA-1][nB-1].score,
-                                   Iy[nA-1][nB-1].score,
-                                   self->substitution_matrix[kA][kB]);
+    }
+    M[0][0].path = 0;
 
     /* traceback */
-    paths = _create_path_generator(self, nA, nB, epsilon);
+    paths = _create_path_generator(self, nA, nB, band);
     if (paths) {
         PyObject* result;
         paths->M.affine = M;
@@ -5319,7 +5734,7 @@ Aligner_gotoh_local_align(Aligner* self, const char* sA, Py_ssize_t nA,
         Py_DECREF(paths);
         return result;
     }
-    else _deallocate_gotoh_matrices(nA, M, Ix, Iy);
+    else _deallocate_gotoh_matrices(M, Ix, Iy);
 exit:
     PyErr_SetString(PyExc_MemoryError, "Out of memory");
     return NULL;
@@ -5581,7 +5996,7 @@ Aligner_waterman_smith_beyer_global_align(Aligner* self,
     M[nA][nB].path.j = -1;
     Ix[nA][nB].path.i = -1;
     Iy[nA][nB].path.i = -1;
-    paths = _create_path_generator(self, nA, nB, epsilon);
+    paths = _create_path_generator(self, nA, nB, _get_band(self, nA, nB));
     if (paths) {
         PyObject* result;
         paths->M.general = M;
@@ -5841,7 +6256,7 @@ Aligner_waterman_smith_beyer_local_align(Aligner* self,
     }
 
     /* traceback */
-    paths = _create_path_generator(self, nA, nB, epsilon);
+    paths = _create_path_generator(self, nA, nB, _get_band(self, nA, nB));
     if (paths) {
         PyObject* result;
         paths->M.general = M;
@@ -5861,6 +6276,497 @@ exit:
     return NULL;
 }
  
+/* ----------------- linear-space global alignment ----------------- */
+
+/* Myers and Miller's divide-and-conquer algorithm (CABIOS 4: 11-17, 1988),
+ * which extends Hirschberg's algorithm to affine gap scores, finds a single
+ * optimal global alignment using memory proportional to nA + nB.  The rows
+ * from i1 to i2 and columns from j1 to j2 are split at the middle row; the
+ * scores of the upper half are calculated forwards from cell (i1, j1), and
+ * those of the lower half backwards from cell (i2, j2).  The cell and state
+ * in the middle row with the highest total score lie on an optimal path,
+ * and the two halves are then aligned recursively.  The state of a cell is
+ * M_MATRIX, Ix_MATRIX, or Iy_MATRIX if the path arrived there by a diagonal,
+ * vertical, or horizontal step, respectively.  Small blocks are aligned
+ * with a full traceback.
+ */
+
+#define LINEAR_BASE_CELLS 4096
+#define LINEAR_ANY_STATE 0
+
+#define MAX3(a, b, c) \
+    ((a) >= (b) ? ((a) >= (c) ? (a) : (c)) : ((b) >= (c) ? (b) : (c)))
+
+typedef struct {
+    const Aligner* aligner;
+    const char* sA;
+    const char* sB;
+    int nA;
+    int nB;
+    double* forward;
+    double* backward;
+    double* block;
+    int* path;  /* row and column of each cell on the path */
+    int n;      /* number of cells on the path */
+} Linear;
+
+/* Gap scores for a horizontal step in row i, and a vertical step in column j */
+#define LINEAR_GAP_SCORES_A(L, i) \
+    if ((i) == 0) { \
+        open_A = (L)->aligner->target_left_open_gap_score; \
+        extend_A = (L)->aligner->target_left_extend_gap_score; \
+    } \
+    else if ((i) == (L)->nA) { \
+        open_A = (L)->aligner->target_right_open_gap_score; \
+        extend_A = (L)->aligner->target_right_extend_gap_score; \
+    } \
+    else { \
+        open_A = (L)->aligner->target_open_gap_score; \
+        extend_A = (L)->aligner->target_extend_gap_score; \
+    }
+
+#define LINEAR_GAP_SCORES_B(L, j) \
+    if ((j) == 0) { \
+        open_B = (L)->aligner->query_left_open_gap_score; \
+        extend_B = (L)->aligner->query_left_extend_gap_score; \
+    } \
+    else if ((j) == (L)->nB) { \
+        open_B = (L)->aligner->query_right_open_gap_score; \
+        extend_B = (L)->aligner->query_right_extend_gap_score; \
+    } \
+    else { \
+        open_B = (L)->aligner->query_open_gap_score; \
+        extend_B = (L)->aligner->query_extend_gap_score; \
+    }
+
+static void
+_linear_forward(const Linear* L, int i1, int j1, int i2, int j2, int start)
+{
+    char c;
+    int i;
+    int j;
+    int kA;
+    int kB;
+    const int n = L->nB + 1;
+    double* M = L->forward;
+    double* Ix = M + n;
+    double* Iy = Ix + n;
+    double open_A, extend_A;
+    double open_B, extend_B;
+    double M_diagonal, Ix_diagonal, Iy_diagonal;
+    double M_score, Ix_score, Iy_score;
+
+    LINEAR_GAP_SCORES_A(L, i1);
+    M[j1] = (start == M_MATRIX) ? 0 : -DBL_MAX;
+    Ix[j1] = (start == Ix_MATRIX) ? 0 : -DBL_MAX;
+    Iy[j1] = (start == Iy_MATRIX) ? 0 : -DBL_MAX;
+    for (j = j1 + 1; j <= j2; j++) {
+        M[j] = -DBL_MAX;
+        Ix[j] = -DBL_MAX;
+        Iy[j] = MAX3(M[j-1] + open_A, Ix[j-1] + open_A, Iy[j-1] + extend_A);
+    }
+    for (i = i1 + 1; i <= i2; i++) {
+        kA = CHARINDEX(L->sA[i-1]);
+        LINEAR_GAP_SCORES_A(L, i);
+        LINEAR_GAP_SCORES_B(L, j1);
+        M_diagonal = M[j1];
+        Ix_diagonal = Ix[j1];
+        Iy_diagonal = Iy[j1];
+        Ix[j1] = MAX3(M[j1] + open_B, Ix[j1] + extend_B, Iy[j1] + open_B);
+        M[j1] = -DBL_MAX;
+        Iy[j1] = -DBL_MAX;
+        for (j = j1 + 1; j <= j2; j++) {
+            kB = CHARINDEX(L->sB[j-1]);
+            LINEAR_GAP_SCORES_B(L, j);
+            Ix_score = MAX3(M[j] + open_B, Ix[j] + extend_B, Iy[j] + open_B);
+            Iy_score = MAX3(M[j-1] + open_A, Ix[j-1] + open_A,
+                            Iy[j-1] + extend_A);
+            M_score = MAX3(M_diagonal, Ix_diagonal, Iy_diagonal)
+                    + L->aligner->substitution_matrix[kA][kB];
+            M_diagonal = M[j];
+            Ix_diagonal = Ix[j];
+            Iy_diagonal = Iy[j];
+            M[j] = M_score;
+            Ix[j] = Ix_score;
+            Iy[j] = Iy_score;
+        }
+    }
+}
+
+static void
+_linear_backward(const Linear* L, int i1, int j1, int i2, int j2, int end)
+{
+    char c;
+    int i;
+    int j;
+    int kA;
+    int kB;
+    const int n = L->nB + 1;
+    double* M = L->backward;
+    double* Ix = M + n;
+    double* Iy = Ix + n;
+    double open_A, extend_A;
+    double open_B, extend_B;
+    double M_diagonal;
+    double diagonal, vertical, horizontal;
+
+    /* M[j], Ix[j], Iy[j] are the highest scores from cell (i, j), reached
+     * in that state, to cell (i2, j2) */
+    LINEAR_GAP_SCORES_A(L, i2);
+    M[j2] = (end == LINEAR_ANY_STATE || end == M_MATRIX) ? 0 : -DBL_MAX;
+    Ix[j2] = (end == LINEAR_ANY_STATE || end == Ix_MATRIX) ? 0 : -DBL_MAX;
+    Iy[j2] = (end == LINEAR_ANY_STATE || end == Iy_MATRIX) ? 0 : -DBL_MAX;
+    for (j = j2 - 1; j >= j1; j--) {
+        horizontal = Iy[j+1];
+        M[j] = open_A + horizontal;
+        Ix[j] = open_A + horizontal;
+        Iy[j] = extend_A + horizontal;
+    }
+    for (i = i2 - 1; i >= i1; i--) {
+        kA = CHARINDEX(L->sA[i]);
+        LINEAR_GAP_SCORES_A(L, i);
+        LINEAR_GAP_SCORES_B(L, j2);
+        M_diagonal = M[j2];
+        vertical = Ix[j2];
+        M[j2] = open_B + vertical;
+        Ix[j2] = extend_B + vertical;
+        Iy[j2] = open_B + vertical;
+        for (j = j2 - 1; j >= j1; j--) {
+            kB = CHARINDEX(L->sB[j]);
+            LINEAR_GAP_SCORES_B(L, j);
+            diagonal = M_diagonal + L->aligner->substitution_matrix[kA][kB];
+            vertical = Ix[j];
+            horizontal = Iy[j+1];
+            M_diagonal = M[j];
+            M[j] = MAX3(diagonal, open_B + vertical, open_A + horizontal);
+            Ix[j] = MAX3(diagonal, extend_B + vertical, open_A + horizontal);
+            Iy[j] = MAX3(diagonal, open_B + vertical, extend_A + horizontal);
+        }
+    }
+}
+
+static int
+_linear_block(Linear* L, int i1, int j1, int i2, int j2, int start, int end)
+{
+    char c;
+    int i;
+    int j;
+    int k;
+    int kA;
+    int kB;
+    int state;
+    int first;
+    int temp;
+    const int n = j2 - j1 + 1;
+    const size_t size = (size_t)(i2 - i1 + 1) * n;
+    double* M = L->block;
+    double* Ix = M + size;
+    double* Iy = Ix + size;
+    double open_A, extend_A;
+    double open_B, extend_B;
+    double substitution;
+    double score;
+
+    /* Fill in the scores of the block, with cell (i, j) at M[k] with
+     * k = (i - i1) * n + (j - j1) */
+    LINEAR_GAP_SCORES_A(L, i1);
+    M[0] = (start == M_MATRIX) ? 0 : -DBL_MAX;
+    Ix[0] = (start == Ix_MATRIX) ? 0 : -DBL_MAX;
+    Iy[0] = (start == Iy_MATRIX) ? 0 : -DBL_MAX;
+    for (k = 1; k < n; k++) {
+        M[k] = -DBL_MAX;
+        Ix[k] = -DBL_MAX;
+        /* Written out separately, as some compilers vectorize the general
+         * recurrence incorrectly here */
+        if (k == 1)
+            Iy[k] = MAX3(M[0] + open_A, Ix[0] + open_A, Iy[0] + extend_A);
+        else
+            Iy[k] = Iy[k-1] + extend_A;
+    }
+    for (i = i1 + 1; i <= i2; i++) {
+        kA = CHARINDEX(L->sA[i-1]);
+        LINEAR_GAP_SCORES_A(L, i);
+        for (j = j1; j <= j2; j++) {
+            k = (i - i1) * n + (j - j1);
+            LINEAR_GAP_SCORES_B(L, j);
+            Ix[k] = MAX3(M[k-n] + open_B, Ix[k-n] + extend_B, Iy[k-n] + open_B);
+            if (j == j1) {
+                M[k] = -DBL_MAX;
+                Iy[k] = -DBL_MAX;
+                continue;
+            }
+            kB = CHARINDEX(L->sB[j-1]);
+            Iy[k] = MAX3(M[k-1] + open_A, Ix[k-1] + open_A, Iy[k-1] + extend_A);
+            M[k] = MAX3(M[k-n-1], Ix[k-n-1], Iy[k-n-1])
+                 + L->aligner->substitution_matrix[kA][kB];
+        }
+    }
+
+    /* Trace back from cell (i2, j2) to cell (i1, j1), storing the cells
+     * on the path in reverse order */
+    k = size - 1;
+    state = end;
+    if (state == LINEAR_ANY_STATE) {
+        state = M_MATRIX;
+        score = M[k];
+        if (Ix[k] > score) {
+            state = Ix_MATRIX;
+            score = Ix[k];
+        }
+        if (Iy[k] > score) state = Iy_MATRIX;
+    }
+    first = L->n;
+    i = i2;
+    j = j2;
+    while (i > i1 || j > j1) {
+        L->path[2*L->n] = i;
+        L->path[2*L->n+1] = j;
+        L->n++;
+        k = (i - i1) * n + (j - j1);
+        switch (state) {
+            case M_MATRIX:
+                kA = CHARINDEX(L->sA[i-1]);
+                kB = CHARINDEX(L->sB[j-1]);
+                substitution = L->aligner->substitution_matrix[kA][kB];
+                score = M[k];
+                k -= n + 1;
+                i--;
+                j--;
+                if (M[k] + substitution == score) state = M_MATRIX;
+                else if (Ix[k] + substitution == score) state = Ix_MATRIX;
+                else if (Iy[k] + substitution == score) state = Iy_MATRIX;
+                else return 0;
+                break;
+            case Ix_MATRIX:
+                LINEAR_GAP_SCORES_B(L, j);
+                score = Ix[k];
+                k -= n;
+                i--;
+                if (M[k] + open_B == score) state = M_MATRIX;
+                else if (Ix[k] + extend_B == score) state = Ix_MATRIX;
+                else if (Iy[k] + open_B == score) state = Iy_MATRIX;
+                else return 0;
+                break;
+            case Iy_MATRIX:
+                LINEAR_GAP_SCORES_A(L, i);
+                score = Iy[k];
+                k--;
+                j--;
+                if (M[k] + open_A == score) state = M_MATRIX;
+                else if (Ix[k] + open_A == score) state = Ix_MATRIX;
+                else if (Iy[k] + extend_A == score) state = Iy_MATRIX;
+                else return 0;
+                break;
+            default:
+                return 0;
+        }
+    }
+    if (state != start) return 0;
+    /* Put the cells in the right order */
+    for (i = first, j = L->n - 1; i < j; i++, j--) {
+        temp = L->path[2*i];
+        L->path[2*i] = L->path[2*j];
+        L->path[2*j] = temp;
+        temp = L->path[2*i+1];
+        L->path[2*i+1] = L->path[2*j+1];
+        L->path[2*j+1] = temp;
+    }
+    return 1;
+}
+
+static int
+_linear_align(Linear* L, int i1, int j1, int i2, int j2, int start, int end)
+{
+    int i;
+    int j;
+    int state = 0;
+    int column = j1;
+    double score;
+    double maximum = -DBL_MAX;
+    const int n = L->nB + 1;
+    const double* M;
+    const double* Ix;
+    const double* Iy;
+    const double* bM;
+    const double* bIx;
+    const double* bIy;
+
+    if (i2 - i1 <= 1
+     || (size_t)(i2 - i1 + 1) * (j2 - j1 + 1) <= LINEAR_BASE_CELLS)
+        return _linear_block(L, i1, j1, i2, j2, start, end);
+    i = (i1 + i2) / 2;
+    _linear_forward(L, i1, j1, i, j2, start);
+    _linear_backward(L, i, j1, i2, j2, end);
+    M = L->forward;
+    Ix = M + n;
+    Iy = Ix + n;
+    bM = L->backward;
+    bIx = bM + n;
+    bIy = bIx + n;
+    for (j = j1; j <= j2; j++) {
+        score = M[j] + bM[j];
+        if (score > maximum) {
+            maximum = score;
+            column = j;
+            state = M_MATRIX;
+        }
+        score = Ix[j] + bIx[j];
+        if (score > maximum) {
+            maximum = score;
+            column = j;
+            state = Ix_MATRIX;
+        }
+        score = Iy[j] + bIy[j];
+        if (score > maximum) {
+            maximum = score;
+            column = j;
+            state = Iy_MATRIX;
+        }
+    }
+    if (state == 0) return 0;
+    if (!_linear_align(L, i1, j1, i, column, start, state)) return 0;
+    return _linear_align(L, i, column, i2, j2, state, end);
+}
+
+static const char Aligner_align_linear__doc__[] =
+"finds one optimal global alignment of two sequences using linear memory,\n"
+"returning the score and the path";
+
+static PyObject*
+Aligner_align_linear(Aligner* self, PyObject* args, PyObject* keywords)
+{
+    char c;
+    const char* sA;
+    const char* sB;
+    Py_ssize_t nA;
+    Py_ssize_t nB;
+    int i;
+    int j;
+    int k;
+    int kA;
+    int kB;
+    int ok;
+    int step;
+    int previous;
+    size_t size;
+    double open_A, extend_A;
+    double open_B, extend_B;
+    double score = 0;
+    Aligner aligner;
+    Linear linear;
+    PyObject* path;
+    PyObject* point;
+    const Algorithm algorithm = _get_algorithm(self);
+    static char *kwlist[] = {"sequenceA", "sequenceB", NULL};
+
+    if(!PyArg_ParseTupleAndKeywords(args, keywords, "s#s#", kwlist,
+                                    &sA, &nA, &sB, &nB))
+        return NULL;
+    if (self->mode != Global) {
+        PyErr_SetString(PyExc_ValueError,
+            "linear-space alignments are only available in global mode");
+        return NULL;
+    }
+    if (algorithm != NeedlemanWunschSmithWaterman && algorithm != Gotoh) {
+        PyErr_SetString(PyExc_ValueError,
+            "linear-space alignments are not supported with gap functions");
+        return NULL;
+    }
+    if (self->band >= 0) {
+        PyErr_SetString(PyExc_ValueError,
+            "linear-space alignments cannot be banded");
+        return NULL;
+    }
+    if (nA >= INT_MAX / 2 || nB >= INT_MAX / 2) {
+        PyErr_SetString(PyExc_ValueError, "sequences are too long");
+        return NULL;
+    }
+
+    /* Use a copy of the scores, as another thread may change them */
+    aligner = *self;
+    linear.aligner = &aligner;
+    linear.sA = sA;
+    linear.sB = sB;
+    linear.nA = (int)nA;
+    linear.nB = (int)nB;
+    linear.n = 0;
+    size = 2 * (nB + 1);
+    if (size < LINEAR_BASE_CELLS) size = LINEAR_BASE_CELLS;
+    linear.forward = PyMem_Malloc(3*(nB+1)*sizeof(double));
+    linear.backward = PyMem_Malloc(3*(nB+1)*sizeof(double));
+    linear.block = PyMem_Malloc(3*size*sizeof(double));
+    linear.path = PyMem_Malloc(2*(nA+nB+1)*sizeof(int));
+    if (!linear.forward || !linear.backward || !linear.block || !linear.path) {
+        PyMem_Free(linear.forward);
+        PyMem_Free(linear.backward);
+        PyMem_Free(linear.block);
+        PyMem_Free(linear.path);
+        return PyErr_NoMemory();
+    }
+    linear.path[0] = 0;
+    linear.path[1] = 0;
+    linear.n = 1;
+    Py_BEGIN_ALLOW_THREADS
+    ok = _linear_align(&linear, 0, 0, linear.nA, linear.nB,
+                       M_MATRIX, LINEAR_ANY_STATE);
+    Py_END_ALLOW_THREADS
+    PyMem_Free(linear.forward);
+    PyMem_Free(linear.backward);
+    PyMem_Free(linear.block);
+    if (!ok) {
+        PyMem_Free(linear.path);
+        PyErr_SetString(PyExc_RuntimeError, "failed to find the traceback");
+        return NULL;
+    }
+
+    /* Add up the score along the path, and store the cells where the path
+     * changes direction */
+    path = PyList_New(0);
+    if (!path) goto exit;
+    previous = -1;
+    for (k = 0; k < linear.n; k++) {
+        i = linear.path[2*k];
+        j = linear.path[2*k+1];
+        if (k == linear.n - 1) step = 0;
+        else if (linear.path[2*k+2] == i) step = HORIZONTAL;
+        else if (linear.path[2*k+3] == j) step = VERTICAL;
+        else step = DIAGONAL;
+        if (step != previous) {
+            point = Py_BuildValue("(ii)", i, j);
+            if (!point) goto exit;
+            ok = PyList_Append(path, point);
+            Py_DECREF(point);
+            if (ok == -1) goto exit;
+        }
+        switch (step) {
+            case HORIZONTAL:
+                LINEAR_GAP_SCORES_A(&linear, i);
+                score += (previous == HORIZONTAL) ? extend_A : open_A;
+                break;
+            case VERTICAL:
+                LINEAR_GAP_SCORES_B(&linear, j);
+                score += (previous == VERTICAL) ? extend_B : open_B;
+                break;
+            case DIAGONAL:
+                kA = CHARINDEX(sA[i]);
+                kB = CHARINDEX(sB[j]);
+                score += aligner.substitution_matrix[kA][kB];
+                break;
+        }
+        previous = step;
+    }
+    PyMem_Free(linear.path);
+    point = PyList_AsTuple(path);
+    Py_DECREF(path);
+    if (!point) return NULL;
+    return Py_BuildValue("fN", score, point);
+
+exit:
+    PyMem_Free(linear.path);
+    Py_XDECREF(path);
+    return NULL;
+}
+
 static const char Aligner_score__doc__[] = "calculates the alignment score";
 
 static PyObject*
@@ -5870,6 +6776,11 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
     const char* sB;
     Py_ssize_t nA;
     Py_ssize_t nB;
+    int* kB;
+    double* buffer;
+    double score;
+    Aligner aligner;
+    Striped striped;
     const Mode mode = self->mode;
     const Algorithm algorithm = _get_algorithm(self);
 
@@ -5880,20 +6791,14 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
 
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
-            switch (mode) {
-                case Global:
-                    return Aligner_needlemanwunsch_score(self, sA, nA, sB, nB);
-                case Local:
-                    return Aligner_smithwaterman_score(self, sA, nA, sB, nB);
-            }
         case Gotoh:
-            switch (mode) {
-                case Global:
-                    return Aligner_gotoh_global_score(self, sA, nA, sB, nB);
-                case Local:
-                    return Aligner_gotoh_local_score(self, sA, nA, sB, nB);
-            }
+            break;
         case WatermanSmithBeyer:
+            if (self->band >= 0) {
+                PyErr_SetString(PyExc_ValueError,
+                    "banded alignments are not supported with gap functions");
+                return NULL;
+            }
             switch (mode) {
                 case Global:
                     return Aligner_waterman_smith_beyer_global_score(self, sA, nA, sB, nB);
@@ -5905,6 +6810,146 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
             PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
             return NULL;
     }
+
+    kB = PyMem_Malloc((nB+1)*sizeof(int));
+    buffer = PyMem_Malloc(3*(nB+1)*sizeof(double));
+    if (!kB || !buffer) {
+        PyMem_Free(kB);
+        PyMem_Free(buffer);
+        return PyErr_NoMemory();
+    }
+    _convert_sequence_indices(sB, nB, kB);
+    /* Use a copy of the scores, as another thread may change them */
+    aligner = *self;
+    Py_BEGIN_ALLOW_THREADS
+    _striped_prepare(&striped, &aligner, algorithm, kB, nB);
+    score = _score_sequences(&aligner, algorithm, sA, nA, kB, nB, buffer,
+                             &striped);
+    _striped_free(&striped);
+    Py_END_ALLOW_THREADS
+    PyMem_Free(kB);
+    PyMem_Free(buffer);
+    return PyFloat_FromDouble(score);
+}
+
+static const char Aligner_score_many__doc__[] =
+"calculates the alignment scores of many target sequences against a query,\n"
+"storing them in a writable buffer of doubles";
+
+static PyObject*
+Aligner_score_many(Aligner* self, PyObject* args, PyObject* keywords)
+{
+    const char* sB;
+    Py_ssize_t nB;
+    PyObject* targets;
+    PyObject* sequence = NULL;
+    PyObject** items;
+    PyObject* result = NULL;
+    Py_buffer view;
+    const char** sA = NULL;
+    Py_ssize_t* nA = NULL;
+    int* kB = NULL;
+    double* buffer = NULL;
+    double* scores;
+    double score;
+    Aligner aligner;
+    Striped striped;
+    Py_ssize_t i;
+    Py_ssize_t n;
+    const Mode mode = self->mode;
+    const Algorithm algorithm = _get_algorithm(self);
+
+    static char *kwlist[] = {"query", "targets", "scores", NULL};
+    if(!PyArg_ParseTupleAndKeywords(args, keywords, "s#Ow*", kwlist,
+                                    &sB, &nB, &targets, &view))
+        return NULL;
+
+    sequence = PySequence_Fast(targets, "targets should be a sequence");
+    if (!sequence) goto exit;
+    n = PySequence_Fast_GET_SIZE(sequence);
+    items = PySequence_Fast_ITEMS(sequence);
+    if (view.len != n * (Py_ssize_t)sizeof(double)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "expected space for one score per target");
+        goto exit;
+    }
+    scores = view.buf;
+    sA = PyMem_Malloc((n+1)*sizeof(const char*));
+    nA = PyMem_Malloc((n+1)*sizeof(Py_ssize_t));
+    if (!sA || !nA) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    /* The targets keep a reference to their data until we are done */
+    for (i = 0; i < n; i++)
+        if (!PyArg_Parse(items[i], "s#", &sA[i], &nA[i])) goto exit;
+
+    switch (algorithm) {
+        case NeedlemanWunschSmithWaterman:
+        case Gotoh:
+            break;
+        case WatermanSmithBeyer:
+            if (self->band >= 0) {
+                PyErr_SetString(PyExc_ValueError,
+                    "banded alignments are not supported with gap functions");
+                goto exit;
+            }
+            /* The gap functions are Python callables, so keep the GIL */
+            for (i = 0; i < n; i++) {
+                switch (mode) {
+                    case Global:
+                        result = Aligner_waterman_smith_beyer_global_score(
+                            self, sA[i], nA[i], sB, nB);
+                        break;
+                    case Local:
+                        result = Aligner_waterman_smith_beyer_local_score(
+                            self, sA[i], nA[i], sB, nB);
+                        break;
+                }
+                if (!result) goto exit;
+                score = PyFloat_AsDouble(result);
+                Py_DECREF(result);
+                result = NULL;
+                if (score == -1.0 && PyErr_Occurred()) goto exit;
+                scores[i] = score;
+            }
+            Py_INCREF(Py_None);
+            result = Py_None;
+            goto exit;
+        case Unknown:
+        default:
+            PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
+            goto exit;
+    }
+
+    kB = PyMem_Malloc((nB+1)*sizeof(int));
+    buffer = PyMem_Malloc(3*(nB+1)*sizeof(double));
+    if (!kB || !buffer) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    /* The query is converted to indices into the substitution matrix once,
+     * and the row buffers are reused for each target. */
+    _convert_sequence_indices(sB, nB, kB);
+    aligner = *self;
+    Py_BEGIN_ALLOW_THREADS
+    _striped_prepare(&striped, &aligner, algorithm, kB, nB);
+    for (i = 0; i < n; i++)
+        scores[i] = _score_sequences(&aligner, algorithm,
+                                     sA[i], nA[i], kB, nB, buffer, &striped);
+    _striped_free(&striped);
+    Py_END_ALLOW_THREADS
+    Py_INCREF(Py_None);
+    result = Py_None;
+
+exit:
+    PyMem_Free(kB);
+    PyMem_Free(buffer);
+    PyMem_Free(sA);
+    PyMem_Free(nA);
+    Py_XDECREF(sequence);
+    PyBuffer_Release(&view);
+    return result;
 }
 
 static const char Aligner_align__doc__[] = "align two sequences";
@@ -5939,6 +6984,11 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
                     return Aligner_gotoh_local_align(self, sA, nA, sB, nB);
             }
         case WatermanSmithBeyer:
+            if (self->band >= 0) {
+                PyErr_SetString(PyExc_ValueError,
+                    "banded alignments are not supported with gap functions");
+                return NULL;
+            }
             switch (mode) {
                 case Global:
                     return Aligner_waterman_smith_beyer_global_align(self, sA, nA, sB, nB);
@@ -5961,11 +7011,21 @@ static PyMethodDef Aligner_methods[] = {
      METH_VARARGS | METH_KEYWORDS,
      Aligner_score__doc__
     },
+    {"score_many",
+     (PyCFunction)Aligner_score_many,
+     METH_VARARGS | METH_KEYWORDS,
+     Aligner_score_many__doc__
+    },
     {"align",
      (PyCFunction)Aligner_align,
      METH_VARARGS | METH_KEYWORDS,
      Aligner_align__doc__
     },
+    {"align_linear",
+     (PyCFunction)Aligner_align_linear,
+     METH_VARARGS | METH_KEYWORDS,
+     Aligner_align_linear__doc__
+    },
     {NULL}  /* Sentinel */
 };
 
@@ -6044,6 +7104,7 @@ init_aligners(void)
   PyObject* module;
 
   AlignerType.tp_new = PyType_GenericNew;
+  _available_instructions = _find_instructions();
 
   if (PyType_Ready(&AlignerType) < 0
    || PyType_Ready(&PathGenerator_Type) < 0)
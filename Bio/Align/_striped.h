@@ -0,0 +1,115 @@
+/* Copyright 2018 by Michiel de Hoon.  All rights reserved.
+ * This file is part of the Biopython distribution and governed by your
+ * choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+ * Please see the LICENSE file that should have been included as part of this
+ * package.
+ */
+
+/* Striped local alignment score (Farrar, Bioinformatics 23: 156-161, 2007).
+ *
+ * This file is included by _aligners.c once for each combination of vector
+ * instruction set and score size, with these macros defined:
+ *
+ * STRIPED_SCORE        name of the function to define
+ * STRIPED_TARGET       function attribute selecting the instruction set
+ * STRIPED_PROFILE      Striped member holding the query profile
+ * STRIPED_SEGMENTS     Striped member holding the number of segments
+ * STRIPED_LIMIT        saturation value of the additions
+ * VECTOR, LANES        vector type, and the number of scores it holds
+ * ELEMENT              type of a single score
+ * V_SET, V_ZERO        vector with all scores equal to a value, or zero
+ * V_ADDS               saturating addition
+ * V_SUBS               unsigned saturating subtraction (clamps at zero)
+ * V_MAX                maximum
+ * V_SHIFT              shift the scores up by one lane, shifting in zero
+ * V_ANY_EQUAL          true if any score in two vectors is the same
+ * V_ALL_ZERO           true if all scores in a vector are zero
+ *
+ * Scores are stored as unsigned numbers clamped at zero, and the query
+ * profile stores each substitution score plus the bias.  The function
+ * returns 0 if the scores saturated or the target contains letters that
+ * are not in the profile, in which case the caller should try again using
+ * larger scores or the scalar algorithm.
+ */
+
+STRIPED_TARGET static int
+STRIPED_SCORE(const Striped* striped, const char* sA, Py_ssize_t nA,
+              double* score)
+{
+    char c;
+    int kA;
+    int k;
+    Py_ssize_t i;
+    Py_ssize_t j;
+    const Py_ssize_t n = striped->STRIPED_SEGMENTS;
+    const VECTOR* profile = striped->STRIPED_PROFILE;
+    VECTOR* pvHStore = striped->buffer;
+    VECTOR* pvHLoad = pvHStore + n;
+    VECTOR* pvE = pvHLoad + n;
+    VECTOR* pvSwap;
+    const VECTOR* vP;
+    const VECTOR vZero = V_ZERO;
+    const VECTOR vBias = V_SET(striped->bias);
+    const VECTOR vLimit = V_SET(STRIPED_LIMIT);
+    const VECTOR vTargetOpen = V_SET(striped->target_open);
+    const VECTOR vTargetExtend = V_SET(striped->target_extend);
+    const VECTOR vQueryOpen = V_SET(striped->query_open);
+    const VECTOR vQueryExtend = V_SET(striped->query_extend);
+    VECTOR vH;
+    VECTOR vE;
+    VECTOR vF;
+    VECTOR vMax = vZero;
+    ELEMENT values[LANES];
+    int maximum = 0;
+
+    for (j = 0; j < n; j++) {
+        pvHStore[j] = vZero;
+        pvHLoad[j] = vZero;
+        pvE[j] = vZero;
+    }
+    for (i = 0; i < nA; i++) {
+        kA = CHARINDEX(sA[i]);
+        if (kA < 0 || kA >= 26) return 0;
+        vP = profile + kA * n;
+        vF = vZero;
+        vH = V_SHIFT(pvHStore[n-1]);
+        pvSwap = pvHLoad;
+        pvHLoad = pvHStore;
+        pvHStore = pvSwap;
+        for (j = 0; j < n; j++) {
+            vH = V_SUBS(V_ADDS(vH, vP[j]), vBias);
+            vE = pvE[j];
+            vH = V_MAX(vH, vE);
+            vH = V_MAX(vH, vF);
+            vMax = V_MAX(vMax, vH);
+            pvHStore[j] = vH;
+            /* Gaps in the query, continued with the next target letter */
+            pvE[j] = V_MAX(V_SUBS(vE, vQueryExtend), V_SUBS(vH, vQueryOpen));
+            /* Gaps in the target, continued with the next query letter */
+            vF = V_MAX(V_SUBS(vF, vTargetExtend), V_SUBS(vH, vTargetOpen));
+            vH = pvHLoad[j];
+        }
+        /* Gaps in the target crossing from one lane to the next were not
+         * included yet; this loop usually finishes in the first segment. */
+        for (k = 0; k < LANES; k++) {
+            vF = V_SHIFT(vF);
+            for (j = 0; j < n; j++) {
+                vH = pvHStore[j];
+                if (V_ALL_ZERO(V_SUBS(vF, V_SUBS(vH, vTargetOpen))))
+                    goto lazy_done;
+                vH = V_MAX(vH, vF);
+                vMax = V_MAX(vMax, vH);
+                pvHStore[j] = vH;
+                pvE[j] = V_MAX(pvE[j], V_SUBS(vH, vQueryOpen));
+                vF = V_SUBS(vF, vTargetExtend);
+            }
+        }
+lazy_done:
+        if (V_ANY_EQUAL(V_ADDS(vMax, vBias), vLimit)) return 0;
+    }
+    memcpy(values, &vMax, sizeof(values));
+    for (k = 0; k < LANES; k++)
+        if (values[k] > maximum) maximum = values[k];
+    *score = maximum;
+    return 1;
+}
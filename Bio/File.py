@@ -22,8 +22,14 @@ import os
 import sys
 import contextlib
 import itertools
+import mmap
+import struct
+import tempfile
+import warnings
 
+from Bio import BiopythonWarning
 from Bio._py3k import basestring
+from Bio._py3k import _as_string
 
 try:
     from collections import UserDict as _dict_base
@@ -229,6 +235,69 @@ class UndoHandle(object):
 
 
 # The rest of this file defines code used in Bio.SeqIO and Bio.SearchIO
+class _SequenceLayout(object):
+    """Where the letters of a sequence are in a file (PRIVATE).
+
+    Used by the FileSeq object from Bio.Seq to read the letters of a
+    sequence on demand. The sequence is assumed to be split over lines
+    of a fixed width (except the last line), as in the FASTA files used
+    with samtools faidx, where letter i of the sequence is found at:
+
+        offset + (i // line_bases) * line_width + i % line_bases
+
+    Arguments:
+     - read - Function taking a file offset and a size in bytes, which
+       returns the bytes read from the file.
+     - offset - File offset of the first letter.
+     - line_bases - Number of letters on each line.
+     - line_width - Number of bytes on each line, including the newline.
+     - prefix - Number of bytes at the start of each line before the
+       letters (e.g. the position number in GenBank files).
+     - group - Number of letters in each block on a line, where the
+       blocks are separated by a single space (e.g. 10 in GenBank files),
+       or zero for no blocks.
+     - upper - Should the letters be made upper case?
+    """
+
+    def __init__(self, read, offset, line_bases, line_width,
+                 prefix=0, group=0, upper=False):
+        """Initialize the class."""
+        self._read = read
+        self._offset = offset
+        self._line_bases = line_bases
+        self._line_width = line_width
+        self._prefix = prefix
+        self._group = group
+        self._upper = upper
+        if prefix:
+            # Remove the position numbers as well as the white space
+            self._delete = b"\t\n\r 0123456789"
+        else:
+            self._delete = b"\t\n\r "
+
+    def _file_offset(self, index):
+        """Return the file offset of the given letter (PRIVATE)."""
+        line, column = divmod(index, self._line_bases)
+        if self._group:
+            column += column // self._group
+        return self._offset + line * self._line_width + self._prefix + column
+
+    def read(self, start, end):
+        """Return the letters from start to end (zero based) as a string."""
+        if start >= end:
+            return ""
+        first = self._file_offset(start)
+        data = self._read(first, self._file_offset(end - 1) + 1 - first)
+        data = data.translate(None, self._delete)
+        if len(data) != end - start:
+            raise ValueError("Expected %i letters at offset %i, got %i; "
+                             "has the file changed?"
+                             % (end - start, first, len(data)))
+        if self._upper:
+            data = data.upper()
+        return _as_string(data)
+
+
 # for indexing
 
 class _IndexedSeqFileProxy(object):
@@ -488,6 +557,302 @@ class _IndexedSeqFileDict(_dict_base):
         self._proxy._handle.close()
 
 
+# Binary offset cache files, as used by Bio.SeqIO.index(..., cache=True).
+# All integers are little endian. A fixed size header gives a magic marker,
+# the size and modification time of the indexed file (to spot a stale cache),
+# the number of records and the length of the key data, and the file format.
+# Then come three arrays of unsigned 64 bit integers, each one entry per
+# record: the end of each key within the key data (sorted by key), the
+# matching record offsets, and the sorted position of each record in file
+# order. Finally the key data itself, the UTF-8 encoded keys in sorted order.
+_offset_cache_magic = b"BioIdx1\x00"
+_offset_cache_header = struct.Struct("<8sQdQQ32s")
+
+if sys.version_info[0] >= 3:
+    def _key_to_bytes(key):
+        return key.encode("utf-8")
+
+    def _bytes_to_key(data):
+        return data.decode("utf-8")
+else:
+    _key_to_bytes = _bytes_to_key = str
+
+
+class _UInt64Array(object):
+    """Read only little endian unsigned 64 bit integer array view (PRIVATE).
+
+    Fallback for when memoryview casting can't be used (Python 2, or on
+    big endian machines).
+    """
+
+    def __init__(self, data, start):
+        """Initialize the class."""
+        self._data = data
+        self._start = start
+
+    def __getitem__(self, i):
+        """Return the i-th value."""
+        return struct.unpack_from("<Q", self._data, self._start + 8 * i)[0]
+
+    def release(self):
+        """Drop the reference to the underlying data."""
+        self._data = None
+
+
+def _uint64_array(data, start, count):
+    """Return a view of little endian unsigned 64 bit integers in data (PRIVATE)."""
+    if sys.byteorder == "little" and hasattr(memoryview, "cast"):
+        return memoryview(data)[start:start + 8 * count].cast("Q")
+    return _UInt64Array(data, start)
+
+
+def _write_offset_cache(cache_filename, filename, format, entries):
+    """Write a binary offset cache file for Bio.SeqIO.index (PRIVATE).
+
+    Takes a list of (key bytes, offset) tuples in file order, and raises
+    a ValueError for duplicate keys.
+    """
+    stat = os.stat(filename)
+    order = sorted(range(len(entries)), key=lambda i: entries[i][0])
+    position = [0] * len(entries)
+    key_ends = []
+    offsets = []
+    end = 0
+    previous = None
+    for i, j in enumerate(order):
+        key, offset = entries[j]
+        if key == previous:
+            raise ValueError("Duplicate key '%s'" % _bytes_to_key(key))
+        previous = key
+        end += len(key)
+        key_ends.append(end)
+        offsets.append(offset)
+        position[j] = i
+    # Write to a uniquely named temporary file in the same directory, so we
+    # never leave behind a partial cache, nor clash with another process
+    # writing the same cache, and then replace any old cache in one step.
+    fd, temp_filename = tempfile.mkstemp(
+        suffix=".tmp", prefix=os.path.basename(cache_filename) + ".",
+        dir=os.path.dirname(cache_filename) or os.curdir)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(_offset_cache_header.pack(
+                _offset_cache_magic, stat.st_size, stat.st_mtime,
+                len(entries), end, format.encode("ascii")))
+            for values in (key_ends, offsets, position):
+                handle.write(struct.pack("<%iQ" % len(values), *values))
+            for j in order:
+                handle.write(entries[j][0])
+        _replace_file(temp_filename, cache_filename)
+    except Exception:
+        os.remove(temp_filename)
+        raise
+
+
+try:
+    _replace_file = os.replace
+except AttributeError:
+    # Python 2
+    def _replace_file(source, destination):
+        """Rename the source file, replacing any destination file (PRIVATE)."""
+        if sys.platform == "win32" and os.path.isfile(destination):
+            # Needed on Windows, where os.rename won't replace a file
+            os.remove(destination)
+        os.rename(source, destination)
+
+
+class _OffsetCache(object):
+    """Read only mapping of keys to offsets using an offset cache file (PRIVATE).
+
+    The cache file is memory mapped, and keys are found by a binary search
+    of the sorted key table, so opening the cache is almost instant no
+    matter how many records there are.
+    """
+
+    def __init__(self, cache_filename):
+        """Initialize the class, mapping the cache file into memory."""
+        with open(cache_filename, "rb") as handle:
+            self._data = data = mmap.mmap(handle.fileno(), 0,
+                                          access=mmap.ACCESS_READ)
+        try:
+            if len(data) < _offset_cache_header.size:
+                raise ValueError("Not a Biopython offset cache file")
+            magic, size, mtime, count, key_length, format = \
+                _offset_cache_header.unpack_from(data, 0)
+            if magic != _offset_cache_magic:
+                raise ValueError("Not a Biopython offset cache file")
+            self.size = size
+            self.mtime = mtime
+            self.format = format.rstrip(b"\x00").decode("ascii")
+            self._count = count
+            start = _offset_cache_header.size
+            self._keys = start + 24 * count
+            if len(data) != self._keys + key_length:
+                raise ValueError("Truncated offset cache file")
+        except Exception:
+            data.close()
+            raise
+        self._key_ends = _uint64_array(data, start, count)
+        self._offsets = _uint64_array(data, start + 8 * count, count)
+        self._order = _uint64_array(data, start + 16 * count, count)
+
+    def _key(self, i):
+        """Return the i-th key in sorted order, as bytes (PRIVATE)."""
+        if i:
+            start = self._keys + self._key_ends[i - 1]
+        else:
+            start = self._keys
+        return self._data[start:self._keys + self._key_ends[i]]
+
+    def _find(self, key):
+        """Return the sorted position of the key, or -1 if missing (PRIVATE)."""
+        try:
+            key = _key_to_bytes(key)
+        except (AttributeError, TypeError, UnicodeError):
+            # Not a string, so can't be one of our keys
+            return -1
+        # Binary search, with self._key(middle) inlined for speed
+        data = self._data
+        keys = self._keys
+        key_ends = self._key_ends
+        low = 0
+        high = self._count
+        while low < high:
+            middle = (low + high) // 2
+            if middle:
+                start = keys + key_ends[middle - 1]
+            else:
+                start = keys
+            if data[start:keys + key_ends[middle]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key(low) == key:
+            return low
+        return -1
+
+    def __contains__(self, key):
+        """Return True if the key is present."""
+        return self._find(key) != -1
+
+    def __getitem__(self, key):
+        """Return the offset for the key."""
+        i = self._find(key)
+        if i == -1:
+            raise KeyError(key)
+        return self._offsets[i]
+
+    def __len__(self):
+        """Return the number of keys."""
+        return self._count
+
+    def __iter__(self):
+        """Iterate over the keys, in the order of the indexed file."""
+        order = self._order
+        for j in range(self._count):
+            yield _bytes_to_key(self._key(order[j]))
+
+    def items(self):
+        """Iterate over the (key, offset) pairs, in the order of the indexed file."""
+        order = self._order
+        offsets = self._offsets
+        for j in range(self._count):
+            i = order[j]
+            yield _bytes_to_key(self._key(i)), offsets[i]
+
+    def close(self):
+        """Release the memory mapped file."""
+        # Must release any views before closing the memory map
+        for view in (self._key_ends, self._offsets, self._order):
+            view.release()
+        self._data.close()
+
+
+class _CachedSeqFileDict(_IndexedSeqFileDict):
+    """Read only dictionary interface to a sequential record file, with a cache.
+
+    This works like the _IndexedSeqFileDict class, except the record
+    identifiers and offsets are saved to a compact binary cache file on
+    disk (see the _OffsetCache class). When the cache is present and its
+    recorded size and modification time match the indexed file, it is
+    used directly rather than scanning the whole file again.
+
+    If a key_function is used, the cache still holds the record
+    identifiers, and the dictionary of transformed keys is built from
+    the cache in memory.
+    """
+
+    def __init__(self, random_access_proxy, key_function,
+                 repr, obj_repr, filename, format, cache_filename):
+        """Initialize the class."""
+        self._proxy = random_access_proxy
+        self._key_function = key_function
+        self._repr = repr
+        self._obj_repr = obj_repr
+        offsets = None
+        if os.path.isfile(cache_filename):
+            try:
+                offsets = _OffsetCache(cache_filename)
+            except ValueError as err:
+                warnings.warn("Ignoring offset cache %s: %s"
+                              % (cache_filename, err), BiopythonWarning)
+            else:
+                stat = os.stat(filename)
+                if offsets.size != stat.st_size or \
+                        offsets.mtime != stat.st_mtime or \
+                        offsets.format != format:
+                    # Out of date, or for another file format
+                    offsets.close()
+                    offsets = None
+        if offsets is None:
+            entries = [(_key_to_bytes(key), offset)
+                       for key, offset, length in random_access_proxy]
+            try:
+                _write_offset_cache(cache_filename, filename, format, entries)
+                offsets = _OffsetCache(cache_filename)
+            except ValueError:
+                # Duplicate keys
+                random_access_proxy._handle.close()
+                raise
+            except (IOError, OSError) as err:
+                warnings.warn("Could not save offset cache %s: %s"
+                              % (cache_filename, err), BiopythonWarning)
+                offsets = dict((_bytes_to_key(key), offset)
+                               for key, offset in entries)
+        if key_function:
+            # Need to apply the key function to every identifier
+            mapped = {}
+            for key, offset in offsets.items():
+                key = key_function(key)
+                if key in mapped:
+                    random_access_proxy._handle.close()
+                    raise ValueError("Duplicate key '%s'" % key)
+                mapped[key] = offset
+            if isinstance(offsets, _OffsetCache):
+                offsets.close()
+            offsets = mapped
+        self._offsets = offsets
+
+    def close(self):
+        """Close the file handle being used to read the data, and the cache."""
+        self._proxy._handle.close()
+        if isinstance(self._offsets, _OffsetCache):
+            self._offsets.close()
+
+
+def _scan_file_for_index(task):
+    """Return the file number and list of record offsets for a file (PRIVATE).
+
+    Used in worker processes when building an SQLite index in parallel.
+    """
+    proxy_factory, format, file_number, filename = task
+    random_access_proxy = proxy_factory(format, filename)
+    try:
+        return file_number, list(random_access_proxy)
+    finally:
+        random_access_proxy._handle.close()
+
+
 class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     """Read only dictionary interface to many sequential record files.
 
@@ -501,11 +866,18 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     There are OS limits on the number of files that can be open at once,
     so a pool are kept. If a record is required from a closed file, then
     one of the open handles is closed first.
+
+    When building a new index of several files, workers > 1 means the files
+    are scanned concurrently in a pool of worker processes (which requires
+    a picklable proxy_factory), with the results written to the database
+    in this process in file order, just as when scanned serially. The
+    optional progress callback is given the filename and number of records
+    after each file has been indexed.
     """
 
     def __init__(self, index_filename, filenames,
                  proxy_factory, format,
-                 key_function, repr, max_open=10):
+                 key_function, repr, max_open=10, workers=1, progress=None):
         """Initialize the class."""
         # TODO? - Don't keep filename list in memory (just in DB)?
         # Should save a chunk of memory if dealing with 1000s of files.
@@ -529,6 +901,10 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         self._repr = repr
         self._max_open = max_open
         self._proxies = {}
+        if workers < 1:
+            raise ValueError("Use workers with a minimum of 1")
+        self._workers = workers
+        self._progress = progress
 
         # Note if using SQLite :memory: trick index filename, this will
         # give $PWD as the relative path (which is fine).
@@ -630,7 +1006,6 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         format = self._format
         key_function = self._key_function
         proxy_factory = self._proxy_factory
-        max_open = self._max_open
         random_access_proxies = self._proxies
 
         if not format or not filenames:
@@ -660,7 +1035,6 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             "CREATE TABLE file_data (file_number INTEGER, name TEXT);")
         con.execute("CREATE TABLE offset_data (key TEXT, "
                     "file_number INTEGER, offset INTEGER, length INTEGER);")
-        count = 0
         for i, filename in enumerate(filenames):
             # Default to storing as an absolute path,
             f = os.path.abspath(filename)
@@ -681,13 +1055,19 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             con.execute(
                 "INSERT INTO file_data (file_number, name) VALUES (?,?);",
                 (i, f))
-            random_access_proxy = proxy_factory(format, filename)
+        if self._workers > 1 and len(filenames) > 1:
+            scanned = self._scan_files_in_parallel()
+        else:
+            scanned = self._scan_files()
+        count = 0
+        for i, offsets in scanned:
             if key_function:
                 offset_iter = ((key_function(k), i, o, l)
-                               for (k, o, l) in random_access_proxy)
+                               for (k, o, l) in offsets)
             else:
                 offset_iter = ((k, i, o, l)
-                               for (k, o, l) in random_access_proxy)
+                               for (k, o, l) in offsets)
+            file_count = 0
             while True:
                 batch = list(itertools.islice(offset_iter, 100))
                 if not batch:
@@ -698,11 +1078,10 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
                     "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
                     batch)
                 con.commit()
-                count += len(batch)
-            if len(random_access_proxies) < max_open:
-                random_access_proxies[i] = random_access_proxy
-            else:
-                random_access_proxy._handle.close()
+                file_count += len(batch)
+            count += file_count
+            if self._progress:
+                self._progress(filenames[i], file_count)
         self._length = count
         # print("About to index %i entries" % count)
         try:
@@ -719,6 +1098,42 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         con.commit()
         # print("Index created")
 
+    def _scan_files(self):
+        """Iterate over the file numbers and record offsets of each file (PRIVATE).
+
+        The files are scanned in turn in this process, and (up to the
+        maximum number of open files) the proxies are kept for later use.
+        """
+        random_access_proxies = self._proxies
+        for i, filename in enumerate(self._filenames):
+            random_access_proxy = self._proxy_factory(self._format, filename)
+            yield i, random_access_proxy
+            if len(random_access_proxies) < self._max_open:
+                random_access_proxies[i] = random_access_proxy
+            else:
+                random_access_proxy._handle.close()
+
+    def _scan_files_in_parallel(self):
+        """Iterate over the file numbers and record offsets of each file (PRIVATE).
+
+        The files are scanned concurrently in a pool of worker processes,
+        but given in file order (as with _scan_files).
+        """
+        import multiprocessing
+        tasks = [(self._proxy_factory, self._format, i, filename)
+                 for i, filename in enumerate(self._filenames)]
+        pool = multiprocessing.Pool(min(self._workers, len(tasks)))
+        try:
+            for result in pool.imap(_scan_file_for_index, tasks):
+                yield result
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+
     def __repr__(self):
         return self._repr
 
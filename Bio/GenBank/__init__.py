@@ -45,6 +45,8 @@ import re
 import sys  # for checking if Python 2
 
 # other Biopython stuff
+from Bio._py3k import intern
+
 from Bio import SeqFeature
 
 # other Bio.GenBank stuff
@@ -648,6 +650,21 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         self._cur_reference = None
         self._cur_feature = None
         self._expected_size = None
+        self._exact_positions = {}
+        self._short_values = {}
+
+    def _exact_position(self, value):
+        """Return an ExactPosition object for an integer, shared if possible (PRIVATE).
+
+        Features often start or end at the same place (e.g. a gene and its
+        CDS), and as the positions are immutable they can share one object.
+        """
+        try:
+            return self._exact_positions[value]
+        except KeyError:
+            position = SeqFeature.ExactPosition(value)
+            self._exact_positions[value] = position
+            return position
 
     def locus(self, locus_name):
         """Set the locus name is set as the name of the Sequence."""
@@ -995,7 +1012,8 @@ class _FeatureConsumer(_BaseGenBankConsumer):
     def feature_key(self, content):
         # start a new feature
         self._cur_feature = SeqFeature.SeqFeature()
-        self._cur_feature.type = content
+        # Interned, as there are only a few different feature types
+        self._cur_feature.type = intern(content)
         self.data.features.append(self._cur_feature)
 
     def location(self, content):
@@ -1036,9 +1054,9 @@ class _FeatureConsumer(_BaseGenBankConsumer):
             # e.g. "123..456"
             s, e = location_line.split("..")
             try:
-                cur_feature.location = SeqFeature.FeatureLocation(int(s) - 1,
-                                                                  int(e),
-                                                                  strand)
+                cur_feature.location = SeqFeature.FeatureLocation(
+                    self._exact_position(int(s) - 1),
+                    self._exact_position(int(e)), strand)
             except ValueError as e:
                 # Could be non-integers, more likely bad origin wrapping
                 import warnings
@@ -1074,9 +1092,9 @@ class _FeatureConsumer(_BaseGenBankConsumer):
             locs = []
             for part in location_line[i + 1:-1].split(","):
                 s, e = part.split("..")
-                locs.append(SeqFeature.FeatureLocation(int(s) - 1,
-                                                       int(e),
-                                                       strand))
+                locs.append(SeqFeature.FeatureLocation(
+                    self._exact_position(int(s) - 1),
+                    self._exact_position(int(e)), strand))
             if len(locs) < 2:
                 # The CompoundLocation will raise a ValueError here!
                 import warnings
@@ -1155,6 +1173,8 @@ class _FeatureConsumer(_BaseGenBankConsumer):
 
         Can receive None, since you can have valueless keys such as /pseudo
         """
+        # Interned, as the same few qualifier names are used repeatedly
+        key = intern(key)
         # Hack to try to preserve historical behaviour of /pseudo etc
         if value is None:
             # if the key doesn't exist yet, add an empty string
@@ -1167,6 +1187,10 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         value = value.replace('"', '')
         if self._feature_cleaner is not None:
             value = self._feature_cleaner.clean_value(key, value)
+        if len(value) <= 32:
+            # Short values are often repeated (e.g. the locus tag of a gene
+            # and its CDS, or the codon table), so share one string object
+            value = self._short_values.setdefault(value, value)
 
         # if the qualifier name exists, append the value
         if key in self._cur_feature.qualifiers:
@@ -23,11 +23,15 @@ from __future__ import print_function
 
 import string  # for maketrans only
 import array
+import operator
 import sys
 import warnings
+from binascii import hexlify, unhexlify
+from bisect import bisect_right
 
 from Bio._py3k import range
 from Bio._py3k import basestring
+from Bio._py3k import _as_bytes, _as_string
 
 from Bio import BiopythonWarning
 from Bio import Alphabet
@@ -61,8 +65,23 @@ def _maketrans(complement_mapping):
         return string.maketrans(before, after)
 
 
+def _bytes_maketrans(complement_mapping):
+    """Make a bytes translation table (PRIVATE).
+
+    As the _maketrans function, but for use with the translate method of a
+    bytes string (as used in the BytesSeq object).
+    """
+    table = bytearray(range(256))
+    for before, after in complement_mapping.items():
+        table[ord(before)] = ord(after)
+        table[ord(before.lower())] = ord(after.lower())
+    return bytes(table)
+
+
 _dna_complement_table = _maketrans(ambiguous_dna_complement)
 _rna_complement_table = _maketrans(ambiguous_rna_complement)
+_dna_complement_bytes_table = _bytes_maketrans(ambiguous_dna_complement)
+_rna_complement_bytes_table = _bytes_maketrans(ambiguous_rna_complement)
 
 
 class Seq(object):
@@ -1790,6 +1809,955 @@ class UnknownSeq(Seq):
             return Seq("", s.alphabet)
 
 
+class BytesSeq(Seq):
+    """Read-only sequence object holding its letters as bytes.
+
+    This behaves just like a Seq object, but stores the sequence as a bytes
+    string (using one byte per letter), and slices of it are views onto the
+    same bytes rather than copies:
+
+    >>> from Bio.Seq import BytesSeq
+    >>> from Bio.Alphabet import generic_dna
+    >>> my_seq = BytesSeq(b"ACGTTGCAACGTAAGCTTGCATTAGC", generic_dna)
+    >>> my_seq
+    BytesSeq('ACGTTGCAACGTAAGCTTGCATTAGC', DNAAlphabet())
+    >>> my_seq[4:12]
+    BytesSeq('TGCAACGT', DNAAlphabet())
+    >>> my_seq[4:12].find("CGT")
+    5
+
+    This is useful when taking many small slices of a large sequence, for
+    example extracting each gene from a chromosome via the features. Only the
+    slices themselves are copied when turned into strings (or when taking
+    a slice with a step, such as the reverse complement):
+
+    >>> print(my_seq[4:12].reverse_complement())
+    ACGTTGCA
+
+    Note that the parent bytes string is kept in memory while any slice
+    of it is in use, so use the tobytes method or str function if you want
+    a copy of just a small part of a large sequence.
+
+    Methods like count, find, startswith and the (reverse) complement work
+    directly on the bytes, and give BytesSeq objects where a Seq would
+    return a new Seq. Other methods (for example translate or split) work
+    via a string, and return ordinary Seq objects.
+    """
+
+    def __init__(self, data, alphabet=Alphabet.generic_alphabet):
+        """Create a BytesSeq object.
+
+        Arguments:
+         - data - Sequence, required (bytes, bytearray or memoryview; a
+           string is also accepted and encoded as Latin-1). A bytearray or
+           memoryview is copied so the sequence can't later change.
+         - alphabet - Optional argument, an Alphabet object from
+           Bio.Alphabet
+        """
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        elif isinstance(data, basestring):
+            data = _as_bytes(data)
+        elif not isinstance(data, bytes):
+            raise TypeError("The sequence data given to a BytesSeq object "
+                            "should be bytes or a string (not another Seq "
+                            "object etc)")
+        self._bytes = data
+        self._start = 0
+        self._end = len(data)
+        self.alphabet = alphabet
+
+    def _view(self, start, end, alphabet):
+        """Return a BytesSeq sharing this object's bytes (PRIVATE).
+
+        The start and end are offsets into the underlying bytes string.
+        """
+        answer = BytesSeq.__new__(BytesSeq)
+        answer._bytes = self._bytes
+        answer._start = start
+        answer._end = end
+        answer.alphabet = alphabet
+        return answer
+
+    def _offsets(self, start, end):
+        """Map start and end arguments to offsets in the bytes (PRIVATE).
+
+        This follows the python string methods, where the start is
+        not capped at the length (so can be beyond the end).
+        """
+        length = self._end - self._start
+        if start is None:
+            start = 0
+        if end is None or end > length:
+            end = length
+        elif end < 0:
+            end = max(0, end + length)
+        if start < 0:
+            start = max(0, start + length)
+        return self._start + start, self._start + end
+
+    def _get_seq_bytes_and_check_alphabet(self, other_sequence):
+        """Convert string/Seq/MutableSeq to bytes, checking alphabet (PRIVATE)."""
+        if isinstance(other_sequence, BytesSeq):
+            self._get_seq_str_and_check_alphabet(
+                Seq("", other_sequence.alphabet))
+            return other_sequence.tobytes()
+        return _as_bytes(self._get_seq_str_and_check_alphabet(other_sequence))
+
+    @property
+    def _data(self):
+        """Sequence as a string, used by some code written for Seq (PRIVATE)."""
+        return str(self)
+
+    def __reduce__(self):
+        """Pickle just this sequence, rather than all the bytes it shares."""
+        return (BytesSeq, (self.tobytes(), self.alphabet))
+
+    def __repr__(self):
+        """Return (truncated) representation of the sequence for debugging."""
+        if len(self) > 60:
+            # As for a Seq, showing the last three letters
+            return "{0}('{1}...{2}', {3!r})".format(self.__class__.__name__,
+                                                    str(self[:54]),
+                                                    str(self[-3:]),
+                                                    self.alphabet)
+        return "{0}('{1}', {2!r})".format(self.__class__.__name__,
+                                          str(self), self.alphabet)
+
+    def __str__(self):
+        """Return the full sequence as a python string, use str(my_seq)."""
+        return _as_string(self.tobytes())
+
+    def tobytes(self):
+        """Return the full sequence as a bytes string.
+
+        >>> from Bio.Seq import BytesSeq
+        >>> BytesSeq(b"ACGTTGCAACGT")[3:6].tobytes() == b"TTG"
+        True
+        """
+        if self._start == 0 and self._end == len(self._bytes):
+            return self._bytes
+        return self._bytes[self._start:self._end]
+
+    def __len__(self):
+        """Return the length of the sequence, use len(my_seq)."""
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        """Return a subsequence of single letter, use my_seq[index].
+
+        A slice (without a step) gives a new BytesSeq sharing the same bytes.
+        """
+        if not isinstance(index, slice):
+            index = operator.index(index)
+            length = self._end - self._start
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("index out of range")
+            index += self._start
+            return _as_string(self._bytes[index:index + 1])
+        start, end, step = index.indices(self._end - self._start)
+        if step == 1:
+            if end < start:
+                end = start
+            return self._view(self._start + start, self._start + end,
+                              self.alphabet)
+        return BytesSeq(self.tobytes()[index], self.alphabet)
+
+    def __add__(self, other):
+        """Add another sequence or string to this sequence.
+
+        Adding two BytesSeq objects gives a new BytesSeq, otherwise
+        this works as for the Seq object.
+        """
+        if isinstance(other, BytesSeq):
+            self._get_seq_str_and_check_alphabet(Seq("", other.alphabet))
+            alphabet = Alphabet._consensus_alphabet([self.alphabet,
+                                                     other.alphabet])
+            return BytesSeq(self.tobytes() + other.tobytes(), alphabet)
+        return Seq.__add__(self, other)
+
+    def count(self, sub, start=0, end=sys.maxsize):
+        """Return a non-overlapping count, like that of a python string.
+
+        See the Seq object's count method for details.
+        """
+        sub = self._get_seq_bytes_and_check_alphabet(sub)
+        start, end = self._offsets(start, end)
+        if start > end:
+            return 0
+        return self._bytes.count(sub, start, end)
+
+    def __contains__(self, char):
+        """Implement the 'in' keyword, like a python string."""
+        return self.find(char) != -1
+
+    def find(self, sub, start=0, end=sys.maxsize):
+        """Find method, like that of a python string.
+
+        See the Seq object's find method for details.
+        """
+        sub = self._get_seq_bytes_and_check_alphabet(sub)
+        start, end = self._offsets(start, end)
+        if start > end:
+            return -1
+        answer = self._bytes.find(sub, start, end)
+        return answer if answer == -1 else answer - self._start
+
+    def rfind(self, sub, start=0, end=sys.maxsize):
+        """Find from right method, like that of a python string.
+
+        See the Seq object's rfind method for details.
+        """
+        sub = self._get_seq_bytes_and_check_alphabet(sub)
+        start, end = self._offsets(start, end)
+        if start > end:
+            return -1
+        answer = self._bytes.rfind(sub, start, end)
+        return answer if answer == -1 else answer - self._start
+
+    def startswith(self, prefix, start=0, end=sys.maxsize):
+        """Return True if the sequence starts with the given prefix, False otherwise.
+
+        See the Seq object's startswith method for details.
+        """
+        if isinstance(prefix, tuple):
+            prefix = tuple(self._get_seq_bytes_and_check_alphabet(p)
+                           for p in prefix)
+        else:
+            prefix = self._get_seq_bytes_and_check_alphabet(prefix)
+        start, end = self._offsets(start, end)
+        if start > end:
+            return False
+        return self._bytes.startswith(prefix, start, end)
+
+    def endswith(self, suffix, start=0, end=sys.maxsize):
+        """Return True if the sequence ends with the given suffix, False otherwise.
+
+        See the Seq object's endswith method for details.
+        """
+        if isinstance(suffix, tuple):
+            suffix = tuple(self._get_seq_bytes_and_check_alphabet(p)
+                           for p in suffix)
+        else:
+            suffix = self._get_seq_bytes_and_check_alphabet(suffix)
+        start, end = self._offsets(start, end)
+        if start > end:
+            return False
+        return self._bytes.endswith(suffix, start, end)
+
+    def upper(self):
+        """Return an upper case copy of the sequence (as a BytesSeq)."""
+        return BytesSeq(self.tobytes().upper(), self.alphabet._upper())
+
+    def lower(self):
+        """Return a lower case copy of the sequence (as a BytesSeq)."""
+        return BytesSeq(self.tobytes().lower(), self.alphabet._lower())
+
+    def complement(self):
+        """Return the complement sequence as a new BytesSeq object.
+
+        >>> from Bio.Seq import BytesSeq
+        >>> from Bio.Alphabet import generic_dna
+        >>> BytesSeq(b"CCCCCgatA-GD", generic_dna).complement()
+        BytesSeq('GGGGGctaT-CH', DNAAlphabet())
+        """
+        base = Alphabet._get_base_alphabet(self.alphabet)
+        data = self.tobytes()
+        if isinstance(base, Alphabet.ProteinAlphabet):
+            raise ValueError("Proteins do not have complements!")
+        if isinstance(base, Alphabet.DNAAlphabet):
+            ttable = _dna_complement_bytes_table
+        elif isinstance(base, Alphabet.RNAAlphabet):
+            ttable = _rna_complement_bytes_table
+        elif (b"U" in data or b"u" in data) \
+                and (b"T" in data or b"t" in data):
+            raise ValueError("Mixed RNA/DNA found")
+        elif b"U" in data or b"u" in data:
+            ttable = _rna_complement_bytes_table
+        else:
+            ttable = _dna_complement_bytes_table
+        return BytesSeq(data.translate(ttable), self.alphabet)
+
+    def transcribe(self):
+        """Return the RNA sequence from a DNA sequence as a new BytesSeq object."""
+        # Offload the alphabet stuff
+        alphabet = Seq("", self.alphabet).transcribe().alphabet
+        return BytesSeq(self.tobytes().replace(b"T", b"U").replace(b"t", b"u"),
+                        alphabet)
+
+    def back_transcribe(self):
+        """Return the DNA sequence from an RNA sequence as a new BytesSeq object."""
+        # Offload the alphabet stuff
+        alphabet = Seq("", self.alphabet).back_transcribe().alphabet
+        return BytesSeq(self.tobytes().replace(b"U", b"T").replace(b"u", b"t"),
+                        alphabet)
+
+
+class FileSeq(Seq):
+    """Read-only sequence object which reads its letters from a file on demand.
+
+    This behaves like a Seq object, but rather than holding the sequence in
+    memory it records where the letters are in a file (much like the DBSeq
+    object in BioSQL records where they are in a database). Taking a slice
+    gives another FileSeq for that region without reading anything, and
+    only turning it into a string reads the bytes for that region:
+
+    >>> from Bio.SeqIO.FastaIO import IndexedFasta
+    >>> fasta = IndexedFasta("GenBank/NC_005816.fna")
+    >>> my_seq = fasta["gi|45478711|ref|NC_005816.1|"]
+    >>> len(my_seq)
+    9609
+    >>> my_seq[60:80]
+    FileSeq('TCTGCTCTCCTGATTCAGGA', SingleLetterAlphabet())
+    >>> print(my_seq[60:80].reverse_complement())
+    TCCTGAATCAGGAGAGCAGA
+    >>> fasta.close()
+
+    You wouldn't normally create a FileSeq object yourself, this is done for
+    you by the IndexedFasta class, or by Bio.SeqIO.index(...) when asked to
+    load the sequences lazily. The file must be kept open while the FileSeq
+    objects are in use, and it must not be changed.
+
+    Any other method (for example translate or find) works via the full
+    sequence as a string, and returns ordinary Seq objects.
+    """
+
+    def __init__(self, layout, alphabet, start, length):
+        """Create a new FileSeq object referring to part of a file.
+
+        Arguments:
+         - layout - An object with a read(start, end) method returning
+           the letters between those (zero based) positions as a string.
+         - alphabet - An Alphabet object from Bio.Alphabet
+         - start - Position of the first letter of this sequence
+         - length - Number of letters in this sequence
+        """
+        self._layout = layout
+        self.alphabet = alphabet
+        self._start = start
+        self._length = length
+
+    @property
+    def _data(self):
+        """Sequence as a string, used by some code written for Seq (PRIVATE)."""
+        return str(self)
+
+    def __reduce__(self):
+        """Pickle as a Seq object, as the file handle can't be pickled."""
+        return (Seq, (str(self), self.alphabet))
+
+    def __str__(self):
+        """Return the full sequence as a python string, use str(my_seq)."""
+        return self._layout.read(self._start, self._start + self._length)
+
+    def __len__(self):
+        """Return the length of the sequence, use len(my_seq)."""
+        return self._length
+
+    def __getitem__(self, index):
+        """Return a subsequence of single letter, use my_seq[index].
+
+        A slice (without a step) gives a new FileSeq for that region.
+        """
+        if not isinstance(index, slice):
+            index = operator.index(index)
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("index out of range")
+            index += self._start
+            return self._layout.read(index, index + 1)
+        start, end, step = index.indices(self._length)
+        if step == 1:
+            return FileSeq(self._layout, self.alphabet, self._start + start,
+                           max(0, end - start))
+        count = len(range(start, end, step))
+        if not count:
+            return Seq("", self.alphabet)
+        # Read just the span covered, from the lowest to the highest letter
+        last = start + step * (count - 1)
+        low = min(start, last)
+        data = self._layout.read(self._start + low,
+                                 self._start + max(start, last) + 1)
+        return Seq(data[start - low::step], self.alphabet)
+
+    def toseq(self):
+        """Return the full sequence as a Seq object."""
+        return Seq(str(self), self.alphabet)
+
+    def __add__(self, other):
+        """Add another sequence or string to this sequence.
+
+        The sequence is first converted to a Seq object before the addition.
+        """
+        return self.toseq() + other
+
+    def __radd__(self, other):
+        """Add a sequence on the left, giving a Seq object."""
+        return other + self.toseq()
+
+    def __mul__(self, other):
+        """Multiply the sequence by an integer, giving a Seq object."""
+        return self.toseq() * other
+
+    def __rmul__(self, other):
+        """Multiply an integer by the sequence, giving a Seq object."""
+        return other * self.toseq()
+
+    def __imul__(self, other):
+        """Multiply the sequence in-place, giving a Seq object."""
+        return self.toseq() * other
+
+
+# Letters for each packed code, in the order used by the UCSC .2bit format
+# for two bits, and as a bit mask of A=1, C=2, G=4 and T=8 for four bits
+# (so the code for an ambiguous letter is the union of its bases):
+_packed_letters = {2: "TCAG", 4: "-ACMGRSVTWYHKDBN"}
+
+
+def _packed_shift(bits, field):
+    """Return the bit shift for a field in a packed byte (PRIVATE).
+
+    The first letter goes in the most significant bits of the byte.
+    """
+    return 8 - bits * (field + 1)
+
+
+def _packing_table(bits, field):
+    """Return a translation table from letters to packed codes (PRIVATE).
+
+    The codes are shifted into place for the given field of the byte, and
+    anything other than a valid letter maps to zero.
+    """
+    table = bytearray(256)
+    for code, letter in enumerate(_packed_letters[bits]):
+        value = code << _packed_shift(bits, field)
+        table[ord(letter)] = table[ord(letter.lower())] = value
+    return bytes(table)
+
+
+def _unpacking_table(bits, field):
+    """Return a translation table from packed bytes to a letter (PRIVATE)."""
+    letters = _packed_letters[bits]
+    shift = _packed_shift(bits, field)
+    mask = (1 << bits) - 1
+    return _as_bytes("".join(letters[(byte >> shift) & mask]
+                             for byte in range(256)))
+
+
+def _packed_byte_table(bits, function, reverse=False):
+    """Return a translation table applying a function to each code (PRIVATE).
+
+    If reverse is true, the order of the codes within each byte is also
+    reversed (as needed for the reverse complement).
+    """
+    per = 8 // bits
+    mask = (1 << bits) - 1
+    table = bytearray(256)
+    for byte in range(256):
+        codes = [(byte >> _packed_shift(bits, field)) & mask
+                 for field in range(per)]
+        if reverse:
+            codes.reverse()
+        for field, code in enumerate(codes):
+            table[byte] |= function(code) << _packed_shift(bits, field)
+    return bytes(table)
+
+
+def _reverse_bits(code):
+    """Reverse the four bits of a code, swapping A with T and C with G (PRIVATE)."""
+    return int("{0:04b}".format(code)[::-1], 2)
+
+
+_packing_tables = dict((bits, [_packing_table(bits, field)
+                               for field in range(8 // bits)])
+                       for bits in (2, 4))
+_unpacking_tables = dict((bits, [_unpacking_table(bits, field)
+                                 for field in range(8 // bits)])
+                         for bits in (2, 4))
+# With two bits the complement just flips the upper bit of each code,
+# while the four bit codes are symmetric (A=1 with T=8, and C=2 with G=4):
+_packed_complement_tables = {
+    2: _packed_byte_table(2, lambda code: code ^ 2),
+    4: _packed_byte_table(4, _reverse_bits)}
+_packed_reverse_complement_tables = {
+    2: _packed_byte_table(2, lambda code: code ^ 2, reverse=True),
+    4: _packed_byte_table(4, _reverse_bits, reverse=True)}
+_packed_count_tables = {}
+# Count the letters in chunks, to limit the size of the temporary copies
+_packed_count_chunk = 1 << 24
+
+
+def _packed_count_table(bits, code):
+    """Return a table giving how often a code occurs in each byte (PRIVATE)."""
+    try:
+        return _packed_count_tables[bits, code]
+    except KeyError:
+        pass
+    table = _packed_byte_table(bits, lambda c: int(c == code))
+    # Add up the (one bit) fields to give the count
+    table = bytes(bytearray(sum((byte >> shift) & 1
+                                for shift in range(0, 8, bits))
+                            for byte in bytearray(table)))
+    _packed_count_tables[bits, code] = table
+    return table
+
+
+def _pack(data, bits):
+    """Pack a bytes string of valid letters into a bytes string (PRIVATE).
+
+    Any final partial byte is padded with zero codes.
+    """
+    per = 8 // bits
+    count = -(-len(data) // per)
+    data += b"\0" * (count * per - len(data))
+    return _add_bytes([data[field::per].translate(table)
+                       for field, table in enumerate(_packing_tables[bits])],
+                      count)
+
+
+def _unpack(packed, bits):
+    """Unpack a bytes string into upper case letters (PRIVATE)."""
+    per = 8 // bits
+    data = bytearray(len(packed) * per)
+    for field, table in enumerate(_unpacking_tables[bits]):
+        data[field::per] = packed.translate(table)
+    return bytes(data)
+
+
+def _blocks_in(starts, ends, start, end):
+    """Yield the parts of sorted blocks which overlap a region (PRIVATE).
+
+    The blocks are given as two arrays of start and end positions, and
+    must not overlap each other. Each block is clipped to the region.
+    """
+    index = bisect_right(ends, start)
+    while index < len(starts) and starts[index] < end:
+        yield max(starts[index], start), min(ends[index], end)
+        index += 1
+
+
+def _flag_table(letters):
+    """Return a translation table mapping the letters to 1, others to 0 (PRIVATE)."""
+    table = bytearray(256)
+    for letter in letters:
+        table[ord(letter)] = 1
+    return bytes(table)
+
+
+_n_flag_table = _flag_table("N")
+_lower_flag_table = _flag_table("abcdefghijklmnopqrstuvwxyz")
+
+
+def _flagged_blocks(data, table):
+    """Return a list of (start, end) blocks of the letters in a table (PRIVATE).
+
+    This uses the find method to skip over the runs, which is much faster
+    than a regular expression for long sequences.
+    """
+    flags = data.translate(table)
+    blocks = []
+    start = flags.find(b"\x01")
+    while start != -1:
+        end = flags.find(b"\x00", start)
+        if end == -1:
+            end = len(flags)
+        blocks.append((start, end))
+        start = flags.find(b"\x01", end)
+    return blocks
+
+
+def _block_arrays(blocks):
+    """Return the start and end arrays for a list of (start, end) blocks (PRIVATE)."""
+    return (array.array("l", [s for s, e in blocks]),
+            array.array("l", [e for s, e in blocks]))
+
+
+class PackedSeq(Seq):
+    """Read-only nucleotide sequence using two or four bits per letter.
+
+    This behaves just like a Seq object, but stores the sequence packed
+    into a bytes string. Unambiguous DNA uses two bits per letter (a
+    quarter of the memory of a string), with any runs of N recorded
+    separately, just like in the UCSC .2bit format. Other IUPAC nucleotide
+    letters (or a gap) need four bits per letter:
+
+    >>> from Bio.Seq import PackedSeq
+    >>> my_seq = PackedSeq("ACGTTGCAACGTNNNNNNNNAAGCTTGCATTAGC")
+    >>> my_seq
+    PackedSeq('ACGTTGCAACGTNNNNNNNNAAGCTTGCATTAGC', DNAAlphabet())
+    >>> my_seq.bits
+    2
+    >>> PackedSeq("ACGTRYKM").bits
+    4
+
+    Any lower case letters (for example the soft masking of repeats in a
+    genome) are also recorded separately. As for the BytesSeq object,
+    slices are views onto the same packed data rather than copies, and
+    methods like count and the (reverse) complement work directly on the
+    packed data, giving PackedSeq objects:
+
+    >>> my_seq = PackedSeq("ACGTTGCAacgtaaGCTTGNNNNCATTAGC")
+    >>> my_seq[4:12]
+    PackedSeq('TGCAacgt', DNAAlphabet())
+    >>> my_seq[4:12].reverse_complement()
+    PackedSeq('acgtTGCA', DNAAlphabet())
+    >>> my_seq.count("a"), my_seq.count("N")
+    (3, 4)
+
+    Other methods (for example translate or find) work via a string, and
+    return ordinary Seq objects.
+    """
+
+    def __init__(self, data, alphabet=Alphabet.generic_dna, bits=None):
+        """Create a PackedSeq object.
+
+        Arguments:
+         - data - Sequence, required (string, bytes or bytearray).
+         - alphabet - Optional argument, an Alphabet object from
+           Bio.Alphabet (default generic DNA).
+         - bits - Optional argument, the number of bits per letter, either
+           2 (only for A, C, G, T and N) or 4 (for any IUPAC nucleotide
+           letter or a gap). By default the smallest possible is used.
+
+        Letters which can't be stored give a ValueError.
+        """
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        elif isinstance(data, basestring):
+            data = _as_bytes(data)
+        elif not isinstance(data, bytes):
+            raise TypeError("The sequence data given to a PackedSeq object "
+                            "should be bytes or a string (not another Seq "
+                            "object etc)")
+        upper = data.upper()
+        if bits is None:
+            bits = 4 if upper.translate(None, b"ACGTN") else 2
+        if bits == 2:
+            invalid = upper.translate(None, b"ACGTN")
+        elif bits == 4:
+            invalid = upper.translate(None, _as_bytes(_packed_letters[4]))
+        else:
+            raise ValueError("bits should be 2 or 4, not %r" % bits)
+        if invalid:
+            raise ValueError("Letter %r can't be stored using %i bits"
+                             % (_as_string(invalid[:1]), bits))
+        self._packed = _pack(upper, bits)
+        self._bits = bits
+        self._start = 0
+        self._end = len(data)
+        if bits == 2 and b"N" in upper:
+            blocks = _flagged_blocks(upper, _n_flag_table)
+        else:
+            blocks = []
+        self._n_starts, self._n_ends = _block_arrays(blocks)
+        if data != upper:
+            blocks = _flagged_blocks(data, _lower_flag_table)
+        else:
+            blocks = []
+        self._mask_starts, self._mask_ends = _block_arrays(blocks)
+        self.alphabet = alphabet
+
+    def _view(self, start, end, alphabet, packed=None, n_blocks=None,
+              mask_blocks=None):
+        """Return a PackedSeq sharing this object's packed data (PRIVATE).
+
+        The start and end are letter offsets into the packed data. The
+        packed data, and the arrays of N and masked (lower case) blocks,
+        can optionally be replaced.
+        """
+        answer = PackedSeq.__new__(PackedSeq)
+        answer._packed = self._packed if packed is None else packed
+        answer._bits = self._bits
+        answer._start = start
+        answer._end = end
+        if n_blocks is None:
+            n_blocks = self._n_starts, self._n_ends
+        if mask_blocks is None:
+            mask_blocks = self._mask_starts, self._mask_ends
+        answer._n_starts, answer._n_ends = n_blocks
+        answer._mask_starts, answer._mask_ends = mask_blocks
+        answer.alphabet = alphabet
+        return answer
+
+    def _offsets(self, start, end):
+        """Map start and end arguments to offsets in the packed data (PRIVATE).
+
+        This follows the python string methods, where the start is
+        not capped at the length (so can be beyond the end).
+        """
+        length = self._end - self._start
+        if start is None:
+            start = 0
+        if end is None or end > length:
+            end = length
+        elif end < 0:
+            end = max(0, end + length)
+        if start < 0:
+            start = max(0, start + length)
+        return self._start + start, self._start + end
+
+    def _unpack(self, start, end):
+        """Return the packed codes between two offsets as letters (PRIVATE).
+
+        This ignores the N and masked blocks, so gives upper case letters.
+        """
+        per = 8 // self._bits
+        first = start // per
+        data = _unpack(self._packed[first:-(-end // per)], self._bits)
+        return data[start - first * per:end - first * per]
+
+    @property
+    def bits(self):
+        """Number of bits used for each letter (2 or 4)."""
+        return self._bits
+
+    @property
+    def _data(self):
+        """Sequence as a string, used by some code written for Seq (PRIVATE)."""
+        return str(self)
+
+    def __reduce__(self):
+        """Pickle just this sequence, rather than all the data it shares."""
+        return (PackedSeq, (str(self), self.alphabet, self._bits))
+
+    def __repr__(self):
+        """Return (truncated) representation of the sequence for debugging."""
+        if len(self) > 60:
+            # As for a Seq, showing the last three letters
+            return "{0}('{1}...{2}', {3!r})".format(self.__class__.__name__,
+                                                    str(self[:54]),
+                                                    str(self[-3:]),
+                                                    self.alphabet)
+        return "{0}('{1}', {2!r})".format(self.__class__.__name__,
+                                          str(self), self.alphabet)
+
+    def __str__(self):
+        """Return the full sequence as a python string, use str(my_seq)."""
+        start = self._start
+        end = self._end
+        data = self._unpack(start, end)
+        n_blocks = list(_blocks_in(self._n_starts, self._n_ends, start, end))
+        mask_blocks = list(_blocks_in(self._mask_starts, self._mask_ends,
+                                      start, end))
+        if n_blocks or mask_blocks:
+            data = bytearray(data)
+            for s, e in n_blocks:
+                data[s - start:e - start] = b"N" * (e - s)
+            for s, e in mask_blocks:
+                data[s - start:e - start] = data[s - start:e - start].lower()
+            data = bytes(data)
+        return _as_string(data)
+
+    def __len__(self):
+        """Return the length of the sequence, use len(my_seq)."""
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        """Return a subsequence of single letter, use my_seq[index].
+
+        A slice (without a step) gives a new PackedSeq sharing the same data.
+        """
+        if not isinstance(index, slice):
+            index = operator.index(index)
+            length = self._end - self._start
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("index out of range")
+            index += self._start
+            return str(self._view(index, index + 1, self.alphabet))
+        start, end, step = index.indices(self._end - self._start)
+        if step == 1:
+            if end < start:
+                end = start
+            return self._view(self._start + start, self._start + end,
+                              self.alphabet)
+        return PackedSeq(str(self)[index], self.alphabet, self._bits)
+
+    def __add__(self, other):
+        """Add another sequence or string to this sequence, giving a Seq object."""
+        return self.toseq() + other
+
+    def __radd__(self, other):
+        """Add a sequence on the left, giving a Seq object."""
+        return other + self.toseq()
+
+    def toseq(self):
+        """Return the full sequence as a Seq object."""
+        return Seq(str(self), self.alphabet)
+
+    def _count_code(self, code, start, end):
+        """Count a packed code between two offsets (PRIVATE).
+
+        This ignores the N and masked blocks.
+        """
+        per = 8 // self._bits
+        first = -(-start // per)
+        last = end // per
+        if first >= last:
+            letter = _as_bytes(_packed_letters[self._bits][code])
+            return self._unpack(start, end).count(letter)
+        table = _packed_count_table(self._bits, code)
+        total = 0
+        for chunk in range(first, last, _packed_count_chunk):
+            counts = self._packed[chunk:min(last, chunk + _packed_count_chunk)]
+            counts = counts.translate(table)
+            for n in range(1, per + 1):
+                total += n * counts.count(_as_bytes(chr(n)))
+        # Now the letters in any partial bytes at either end
+        return (total + self._count_code(code, start, first * per) +
+                self._count_code(code, last * per, end))
+
+    def _n_masked_blocks(self, start, end):
+        """Yield the N blocks between two offsets which are masked (PRIVATE)."""
+        for s, e in _blocks_in(self._n_starts, self._n_ends, start, end):
+            for block in _blocks_in(self._mask_starts, self._mask_ends, s, e):
+                yield block
+
+    def count(self, sub, start=0, end=sys.maxsize):
+        """Return a non-overlapping count, like that of a python string.
+
+        Counting a single letter works directly on the packed data,
+        otherwise this works via a string. See the Seq object's count
+        method for details.
+        """
+        sub_str = self._get_seq_str_and_check_alphabet(sub)
+        if len(sub_str) != 1:
+            return Seq.count(self, sub_str, start, end)
+        start, end = self._offsets(start, end)
+        if start > end:
+            return 0
+        letter = sub_str.upper()
+        letters = _packed_letters[self._bits]
+        if letter == "N" and self._bits == 2:
+            total = sum(e - s for s, e in _blocks_in(self._n_starts,
+                                                     self._n_ends, start, end))
+            masked = sum(e - s for s, e in self._n_masked_blocks(start, end))
+        elif letter in letters:
+            code = letters.index(letter)
+            total = self._count_code(code, start, end)
+            masked = sum(self._count_code(code, s, e)
+                         for s, e in _blocks_in(self._mask_starts,
+                                                self._mask_ends, start, end))
+            # Don't count the codes used as placeholders under any N blocks
+            total -= sum(self._count_code(code, s, e)
+                         for s, e in _blocks_in(self._n_starts, self._n_ends,
+                                                start, end))
+            masked -= sum(self._count_code(code, s, e)
+                          for s, e in self._n_masked_blocks(start, end))
+        else:
+            return 0
+        if letter == letter.lower():
+            # A gap, which has no lower case version
+            return total
+        elif sub_str == letter:
+            return total - masked
+        return masked
+
+    def upper(self):
+        """Return an upper case copy of the sequence (as a PackedSeq)."""
+        return self._view(self._start, self._end, self.alphabet._upper(),
+                          mask_blocks=_block_arrays([]))
+
+    def lower(self):
+        """Return a lower case copy of the sequence (as a PackedSeq)."""
+        return self._view(self._start, self._end, self.alphabet._lower(),
+                          mask_blocks=_block_arrays([(self._start,
+                                                      self._end)]))
+
+    def _transformed(self, tables, reverse):
+        """Apply a byte translation to the packed data of this sequence (PRIVATE).
+
+        Only the bytes covering this sequence are used. If reverse is true
+        these are reversed, and the letter offsets mirrored to match.
+        """
+        if isinstance(Alphabet._get_base_alphabet(self.alphabet),
+                      Alphabet.ProteinAlphabet):
+            raise ValueError("Proteins do not have complements!")
+        per = 8 // self._bits
+        first = self._start // per
+        last = -(-self._end // per)
+        packed = self._packed[first:last].translate(tables[self._bits])
+        if reverse:
+            packed = packed[::-1]
+            offset = len(packed) * per + first * per
+
+            def shift(s, e):
+                return offset - e, offset - s
+        else:
+            offset = first * per
+
+            def shift(s, e):
+                return s - offset, e - offset
+        start, end = shift(self._start, self._end)
+        n_blocks, mask_blocks = [
+            sorted(shift(s, e) for s, e in _blocks_in(starts, ends,
+                                                      self._start, self._end))
+            for starts, ends in ((self._n_starts, self._n_ends),
+                                 (self._mask_starts, self._mask_ends))]
+        return self._view(start, end, self.alphabet, packed,
+                          _block_arrays(n_blocks), _block_arrays(mask_blocks))
+
+    def complement(self):
+        """Return the complement sequence as a new PackedSeq object.
+
+        >>> from Bio.Seq import PackedSeq
+        >>> PackedSeq("CCCCCgatANNGD").complement()
+        PackedSeq('GGGGGctaTNNCH', DNAAlphabet())
+        """
+        return self._transformed(_packed_complement_tables, False)
+
+    def reverse_complement(self):
+        """Return the reverse complement sequence as a new PackedSeq object.
+
+        >>> from Bio.Seq import PackedSeq
+        >>> PackedSeq("CCCCCgatANNGD").reverse_complement()
+        PackedSeq('HCNNTatcGGGGG', DNAAlphabet())
+        """
+        return self._transformed(_packed_reverse_complement_tables, True)
+
+    def _parts(self):
+        """Return the packed data and blocks, starting from the first letter (PRIVATE).
+
+        Returns a tuple of the packed bytes, and lists of the N and masked
+        (start, end) blocks, all relative to the start of this sequence.
+        """
+        per = 8 // self._bits
+        if self._start % per:
+            # Need to realign the packed data
+            return PackedSeq(str(self), self.alphabet, self._bits)._parts()
+        start = self._start
+        end = self._end
+        packed = self._packed[start // per:-(-end // per)]
+        n_blocks, mask_blocks = [
+            [(s - start, e - start) for s, e in _blocks_in(starts, ends,
+                                                           start, end)]
+            for starts, ends in ((self._n_starts, self._n_ends),
+                                 (self._mask_starts, self._mask_ends))]
+        return packed, n_blocks, mask_blocks
+
+
+def _packed_seq(packed, bits, length, n_blocks, mask_blocks,
+                alphabet=Alphabet.generic_dna):
+    """Create a PackedSeq from already packed data (PRIVATE).
+
+    The N and masked (lower case) blocks are each given as a tuple of
+    two sorted arrays of start and end positions.
+    """
+    answer = PackedSeq.__new__(PackedSeq)
+    answer._packed = packed
+    answer._bits = bits
+    answer._start = 0
+    answer._end = length
+    answer._n_starts, answer._n_ends = n_blocks
+    answer._mask_starts, answer._mask_ends = mask_blocks
+    answer.alphabet = alphabet
+    return answer
+
+
 class MutableSeq(object):
     """An editable sequence object (with an alphabet).
 
@@ -2450,6 +3418,123 @@ def back_transcribe(rna):
         return rna.replace('U', 'T').replace('u', 't')
 
 
+# For translation a whole sequence at a time, each codon is given a number
+# using a base six digit per letter (A, C, G, T, U or anything else). The
+# digits are looked up for every first, second and third codon position in
+# one go with bytes.translate, and added up as big integers (each number is
+# under 256, so fits in a byte with no carry over to its neighbours).
+_codon_letters = "ACGTU"
+
+
+def _codon_digit_table(weight):
+    """Make a bytes table mapping letters to their codon digit times weight (PRIVATE)."""
+    table = bytearray([5 * weight]) * 256
+    for i, letter in enumerate(_codon_letters):
+        table[ord(letter)] = i * weight
+    return bytes(table)
+
+
+_codon_digit_tables = [_codon_digit_table(36), _codon_digit_table(6),
+                       _codon_digit_table(1)]
+_codon_lookups = {}
+
+
+def _add_bytes(parts, count):
+    """Add up bytes strings byte by byte, as if they were big numbers (PRIVATE).
+
+    Each of the parts must be count bytes long, and each of the totals must
+    fit in a byte (as there is no carry over between neighbouring bytes).
+    """
+    if not count:
+        return b""
+    total = 0
+    if hasattr(int, "from_bytes"):
+        for part in parts:
+            total += int.from_bytes(part, "big")
+        return total.to_bytes(count, "big")
+    # Python 2 fallback, going via hexadecimal strings
+    for part in parts:
+        total += int(hexlify(part), 16)
+    return unhexlify("%0*x" % (2 * count, total))
+
+
+def _codon_numbers(data):
+    """Return the number of each codon in an upper case bytes string (PRIVATE).
+
+    The result is a bytes string with one byte per (whole) codon.
+    """
+    count = len(data) // 3
+    return _add_bytes([data[i:3 * count:3].translate(digits)
+                       for i, digits in enumerate(_codon_digit_tables)], count)
+
+
+def _codon_lookup(table, stop_symbol, stops):
+    """Return a bytes table giving the amino acid for each codon number (PRIVATE).
+
+    Only codons of the letters A, C, G, T and U are included. All other
+    codons, any which are not valid for this table, and (if stops is true)
+    the stop codons, are given as a null byte meaning they must be
+    translated one by one. Returns None if the stop symbol or amino acids
+    are not single byte characters.
+    """
+    key = (table, stop_symbol, stops)
+    try:
+        return _codon_lookups[key]
+    except KeyError:
+        pass
+    lookup = bytearray(256)
+    for i, first in enumerate(_codon_letters):
+        for j, second in enumerate(_codon_letters):
+            for k, third in enumerate(_codon_letters):
+                codon = first + second + third
+                try:
+                    amino = table.forward_table[codon]
+                except (KeyError, CodonTable.TranslationError):
+                    if stops or codon not in table.stop_codons:
+                        continue
+                    amino = stop_symbol
+                if len(amino) != 1 or not "\x00" < amino < "\x80":
+                    lookup = None
+                    break
+                lookup[36 * i + 6 * j + k] = ord(amino)
+            if lookup is None:
+                break
+        if lookup is None:
+            break
+    if lookup is not None:
+        lookup = bytes(lookup)
+    _codon_lookups[key] = lookup
+    return lookup
+
+
+def _translate_codon(codon, table, stop_symbol, to_stop, cds, pos_stop, gap,
+                     valid_letters):
+    """Translate a single (upper case) codon into an amino acid (PRIVATE).
+
+    Used by _translate_str for any codon not in the lookup table, returns
+    None for a stop codon when translation should stop here (to_stop).
+    """
+    try:
+        return table.forward_table[codon]
+    except (KeyError, CodonTable.TranslationError):
+        if codon in table.stop_codons:
+            if cds:
+                raise CodonTable.TranslationError(
+                    "Extra in frame stop codon found.")
+            if to_stop:
+                return None
+            return stop_symbol
+        elif valid_letters.issuperset(set(codon)):
+            # Possible stop codon (e.g. NNN or TAN)
+            return pos_stop
+        elif gap is not None and codon == gap * 3:
+            # Gapped translation
+            return gap
+        else:
+            raise CodonTable.TranslationError(
+                "Codon '{0}' is invalid".format(codon))
+
+
 def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
                    cds=False, pos_stop="X", gap=None):
     """Translate nucleotide string into a protein string (PRIVATE).
@@ -2567,27 +3652,37 @@ def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
             raise ValueError("Gap character should be a single character "
                              "string.")
 
-    for i in range(0, n - n % 3, 3):
-        codon = sequence[i:i + 3]
+    # Translate all the codons via the lookup table in one go, and then
+    # deal with any it couldn't handle (e.g. ambiguous codons) one by one
+    n -= n % 3
+    lookup = _codon_lookup(table, stop_symbol, to_stop or cds)
+    protein = "\x00" * (n // 3)
+    if lookup is not None:
         try:
-            amino_acids.append(forward_table[codon])
-        except (KeyError, CodonTable.TranslationError):
-            if codon in table.stop_codons:
-                if cds:
-                    raise CodonTable.TranslationError(
-                        "Extra in frame stop codon found.")
-                if to_stop:
-                    break
-                amino_acids.append(stop_symbol)
-            elif valid_letters.issuperset(set(codon)):
-                # Possible stop codon (e.g. NNN or TAN)
-                amino_acids.append(pos_stop)
-            elif gap is not None and codon == gap * 3:
-                # Gapped translation
-                amino_acids.append(gap)
-            else:
-                raise CodonTable.TranslationError(
-                    "Codon '{0}' is invalid".format(codon))
+            protein = _as_string(_codon_numbers(_as_bytes(sequence[:n]))
+                                 .translate(lookup))
+        except UnicodeEncodeError:
+            # Not a plain string, leave it to _translate_codon
+            pass
+    start = 0
+    done = {}
+    i = protein.find("\x00")
+    while i != -1:
+        amino_acids.append(protein[start:i])
+        codon = sequence[3 * i:3 * i + 3]
+        try:
+            amino = done[codon]
+        except KeyError:
+            amino = _translate_codon(codon, table, stop_symbol, to_stop, cds,
+                                     pos_stop, gap, valid_letters)
+            done[codon] = amino
+        if amino is None:
+            # Stop codon with to_stop=True
+            return "".join(amino_acids)
+        amino_acids.append(amino)
+        start = i + 1
+        i = protein.find("\x00", start)
+    amino_acids.append(protein[start:])
     return "".join(amino_acids)
 
 
@@ -2691,19 +3786,86 @@ def translate(sequence, table="Standard", stop_symbol="*", to_stop=False,
         return sequence.toseq().translate(table, stop_symbol, to_stop, cds)
     else:
         # Assume its a string, return a string
-        try:
-            codon_table = CodonTable.ambiguous_generic_by_id[int(table)]
-        except ValueError:
-            codon_table = CodonTable.ambiguous_generic_by_name[table]
-        except (AttributeError, TypeError):
-            if isinstance(table, CodonTable.CodonTable):
-                codon_table = table
-            else:
-                raise ValueError('Bad table argument')
+        codon_table = _get_codon_table(table)
         return _translate_str(sequence, codon_table, stop_symbol, to_stop, cds,
                               gap=gap)
 
 
+def _get_codon_table(table):
+    """Return the CodonTable for a table name, id or object (PRIVATE).
+
+    This uses the ambiguous generic tables, which can be used for either
+    DNA or RNA (as when translating strings).
+    """
+    try:
+        return CodonTable.ambiguous_generic_by_id[int(table)]
+    except ValueError:
+        return CodonTable.ambiguous_generic_by_name[table]
+    except (AttributeError, TypeError):
+        if isinstance(table, CodonTable.CodonTable):
+            return table
+        raise ValueError('Bad table argument')
+
+
+def translate_many(sequences, table="Standard", stop_symbol="*",
+                   to_stop=False, cds=False, gap=None):
+    """Translate many nucleotide sequences into amino acids, giving a list.
+
+    This takes an iterable of strings, Seq or MutableSeq objects, and
+    returns a list of their translations, as strings or Seq objects
+    respectively. The arguments are as for the translate function, and
+    apply to every sequence, e.g.
+
+    >>> from Bio.Seq import translate_many
+    >>> translate_many(["ATGGCCATTGTA", "GTGGCCATTGTAATGGGCCGCTGA"])
+    ['MAIV', 'VAIVMGR*']
+    >>> translate_many(["ATGGCCATTTAG", "GTGGCCATTGTAATGGGCCGCTGA"],
+    ...                table=11, cds=True)
+    ['MAI', 'MAIVMGR']
+
+    This is faster than translating each sequence in turn, especially for
+    short sequences (like sequencing reads), as the table is looked up only
+    once, and (without cds or to_stop) all the sequences are translated in
+    one go. Note that any Seq objects are translated using the ambiguous
+    codon tables (as for strings), whatever their alphabet.
+    """
+    codon_table = _get_codon_table(table)
+    sequences = list(sequences)
+    strings = [str(sequence) for sequence in sequences]
+    if to_stop or cds:
+        proteins = [_translate_str(string, codon_table, stop_symbol,
+                                   to_stop, cds, gap=gap)
+                    for string in strings]
+    else:
+        if any(len(string) % 3 for string in strings):
+            warnings.warn("Partial codon, len(sequence) not a multiple of "
+                          "three. Explicitly trim the sequence or add "
+                          "trailing N before translation. This may become "
+                          "an error in future.", BiopythonWarning)
+        # Translate them all in one go, then split up the result
+        lengths = [len(string) // 3 for string in strings]
+        protein = _translate_str("".join(string[:3 * length] for string, length
+                                         in zip(strings, lengths)),
+                                 codon_table, stop_symbol, gap=gap)
+        proteins = []
+        start = 0
+        for length in lengths:
+            proteins.append(protein[start:start + length])
+            start += length
+    answer = []
+    for sequence, protein in zip(sequences, proteins):
+        if isinstance(sequence, (Seq, MutableSeq)):
+            if gap and gap in protein:
+                alphabet = Alphabet.Gapped(codon_table.protein_alphabet, gap)
+            else:
+                alphabet = codon_table.protein_alphabet
+            if stop_symbol in protein:
+                alphabet = Alphabet.HasStopCodon(alphabet, stop_symbol)
+            protein = Seq(protein, alphabet)
+        answer.append(protein)
+    return answer
+
+
 def reverse_complement(sequence):
     """Return the reverse complement sequence of a nucleotide string.
 
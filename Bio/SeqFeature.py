@@ -60,6 +60,24 @@ from Bio._py3k import _is_int_or_long
 from Bio.Seq import MutableSeq, reverse_complement
 
 
+def _get_slots_state(self):
+    """Return the attributes as a dictionary, used for pickling (PRIVATE).
+
+    This is needed for classes using __slots__ with pickle protocols 0 and 1.
+    """
+    state = dict(self.__dict__)
+    for name in self.__slots__:
+        if name != "__dict__" and hasattr(self, name):
+            state[name] = getattr(self, name)
+    return state
+
+
+def _set_slots_state(self, state):
+    """Restore the attributes from a dictionary, used for unpickling (PRIVATE)."""
+    for name, value in state.items():
+        setattr(self, name, value)
+
+
 class SeqFeature(object):
     """Represent a Sequence Feature on an object.
 
@@ -87,8 +105,15 @@ class SeqFeature(object):
        the dictionary are qualifier names, the values are the qualifier
        values. As of Biopython 1.69 this is an ordered dictionary.
 
+    As there can be hundreds of thousands of features in a genome, the main
+    attributes use __slots__ to save memory. Any other attributes you set
+    are kept in the usual instance dictionary.
     """
 
+    __slots__ = ("location", "type", "id", "qualifiers", "__dict__")
+    __getstate__ = _get_slots_state
+    __setstate__ = _set_slots_state
+
     def __init__(self, location=None, type='', location_operator='',
                  strand=None, id="<unknown id>",
                  qualifiers=None, sub_features=None,
@@ -675,6 +700,10 @@ class FeatureLocation(object):
     would use a BeforePosition object for the start.
     """
 
+    __slots__ = ("_start", "_end", "_strand", "ref", "ref_db", "__dict__")
+    __getstate__ = _get_slots_state
+    __setstate__ = _set_slots_state
+
     def __init__(self, start, end, strand=None, ref=None, ref_db=None):
         """Initialize the class.
 
@@ -1072,6 +1101,10 @@ class FeatureLocation(object):
 class CompoundLocation(object):
     """For handling joins etc where a feature location has several parts."""
 
+    __slots__ = ("operator", "parts", "__dict__")
+    __getstate__ = _get_slots_state
+    __setstate__ = _set_slots_state
+
     def __init__(self, parts, operator="join"):
         """Initialize the class.
 
@@ -1481,6 +1514,9 @@ class CompoundLocation(object):
 class AbstractPosition(object):
     """Abstract base class representing a position."""
 
+    # Subclasses without any attributes can then avoid an instance dictionary
+    __slots__ = ()
+
     def __repr__(self):
         """Represent the AbstractPosition object as a string for debugging."""
         return "%s(...)" % (self.__class__.__name__)
@@ -1521,6 +1557,8 @@ class ExactPosition(int, AbstractPosition):
 
     """
 
+    __slots__ = ()
+
     def __new__(cls, position, extension=0):
         """Create an ExactPosition object."""
         if extension != 0:
@@ -1560,7 +1598,7 @@ class UncertainPosition(ExactPosition):
     XML format explicitly marked as uncertain. Does not apply to GenBank/EMBL.
     """
 
-    pass
+    __slots__ = ()
 
 
 class UnknownPosition(AbstractPosition):
@@ -1691,6 +1729,10 @@ class WithinPosition(int, AbstractPosition):
         obj._right = right
         return obj
 
+    def __getnewargs__(self):
+        """Return the arguments accepted by __new__ (for pickling)."""
+        return (int(self), self._left, self._right)
+
     def __repr__(self):
         """Represent the WithinPosition object as a string for debugging."""
         return "%s(%i, left=%i, right=%i)" \
@@ -1798,6 +1840,10 @@ class BetweenPosition(int, AbstractPosition):
         obj._right = right
         return obj
 
+    def __getnewargs__(self):
+        """Return the arguments accepted by __new__ (for pickling)."""
+        return (int(self), self._left, self._right)
+
     def __repr__(self):
         """Represent the BetweenPosition object as a string for debugging."""
         return "%s(%i, left=%i, right=%i)" \
@@ -1864,6 +1910,8 @@ class BeforePosition(int, AbstractPosition):
     like integers.
     """
 
+    __slots__ = ()
+
     # Subclasses int so can't use __init__
     def __new__(cls, position, extension=0):
         """Create a new instance in BeforePosition object."""
@@ -1939,6 +1987,8 @@ class AfterPosition(int, AbstractPosition):
     like integers.
     """
 
+    __slots__ = ()
+
     # Subclasses int so can't use __init__
     def __new__(cls, position, extension=0):
         """Create a new instance of the AfterPosition object."""
@@ -2039,6 +2089,10 @@ class OneOfPosition(int, AbstractPosition):
         obj.position_choices = choices
         return obj
 
+    def __getnewargs__(self):
+        """Return the arguments accepted by __new__ (for pickling)."""
+        return (int(self), self.position_choices)
+
     @property
     def position(self):
         """Legacy attribute to get (left) position as integer (OBSOLETE)."""
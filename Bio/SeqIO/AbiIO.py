@@ -24,7 +24,7 @@ from os.path import basename
 from Bio import Alphabet
 from Bio.Alphabet.IUPAC import ambiguous_dna, unambiguous_dna
 from Bio.Seq import Seq
-from Bio.SeqRecord import SeqRecord
+from Bio.SeqRecord import SeqRecord, LetterAnnotationArray
 
 from Bio._py3k import _bytes_to_string
 from Bio._py3k import zip
@@ -384,7 +384,7 @@ def AbiIterator(handle, alphabet=None, trim=False):
                     alphabet = unambiguous_dna
         # PCON2 is quality values of base-called sequence
         elif key == 'PCON2':
-            qual = [ord(val) for val in tag_data]
+            qual = LetterAnnotationArray("B", (ord(val) for val in tag_data))
         # SMPL1 is sample id entered before sequencing run
         elif key == 'SMPL1':
             sample_id = tag_data
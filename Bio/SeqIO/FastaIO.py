@@ -14,9 +14,17 @@ You are expected to use this module via the Bio.SeqIO functions.
 
 from __future__ import print_function
 
+import os
+from bisect import bisect_right
+from itertools import chain, repeat
+from operator import itemgetter
+
+from Bio import bgzf
+from Bio._py3k import _as_string, _bytes_to_string, _string_to_bytes, map
 from Bio.Alphabet import single_letter_alphabet
-from Bio.Seq import Seq
-from Bio.SeqRecord import SeqRecord
+from Bio.File import _SequenceLayout
+from Bio.Seq import Seq, FileSeq
+from Bio.SeqRecord import SeqRecord, _RestrictedDict
 from Bio.SeqIO.Interfaces import SequentialSequenceWriter
 from Bio.SeqIO.Interfaces import _clean, _get_seq_string
 
@@ -135,7 +143,301 @@ def FastaTwoLineParser(handle):
     assert not line, "Should be at end of file, but line=%r" % line
 
 
-def FastaIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
+class _EncodedHandle(object):
+    """Binary mode view of a text mode handle, for the block parsers (PRIVATE).
+
+    Each chunk of text read is encoded back into bytes, which is much faster
+    than reading the text a line at a time.
+    """
+
+    def __init__(self, handle):
+        """Initialize the class."""
+        self.handle = handle
+
+    def read(self, size):
+        """Read (up to) size characters, and return them as bytes."""
+        return _string_to_bytes(self.handle.read(size))
+
+
+def _binary_handle(handle):
+    """Return the handle if in binary mode, or an _EncodedHandle (PRIVATE)."""
+    if isinstance(handle.read(0), bytes):
+        return handle
+    return _EncodedHandle(handle)
+
+
+def _fasta_bytes_blocks(handle, chunk_size):
+    """Parse a binary FASTA handle into blocks of records (PRIVATE).
+
+    Yields tuples of two lists for a block of records, the titles (as
+    strings, without trailing whitespace) and the sequences (as bytes,
+    without any white space, as in SimpleFastaParser). Typically each block
+    is the records completed in one chunk of the file. As in
+    SimpleFastaParser, any text before the first record is ignored.
+    """
+    # Pieces of the final (incomplete) record so far, or None before the
+    # first record, are they clean, and was the last piece read the end of
+    # a line?
+    tail = None
+    tail_clean = True
+    new_line = True
+    while True:
+        data = handle.read(chunk_size)
+        if not data:
+            break
+        if not isinstance(data, bytes):
+            raise ValueError("Is this handle in text mode not binary mode?")
+        clean = _clean_bytes(data)
+        # Where does the last record starting in this chunk start?
+        cut = data.rfind(b"\n>") + 1
+        if not cut and not (new_line and data[:1] == b">"):
+            # No record starts in this chunk
+            if tail is not None:
+                tail.append(data)
+                tail_clean = tail_clean and clean
+            new_line = data[-1:] == b"\n"
+            continue
+        if tail is not None:
+            tail.append(data[:cut])
+            block = b"".join(tail)
+            block_clean = tail_clean and clean
+        elif new_line and data[:1] == b">":
+            block = data[:cut]
+            block_clean = clean
+        else:
+            # Skip the text before the first record
+            block = data[data.find(b"\n>") + 1:cut]
+            block_clean = clean
+        new_line = data[-1:] == b"\n"
+        tail = [data[cut:]]
+        tail_clean = clean
+        if block:
+            yield _split_fasta_block(block, block_clean)
+    if tail is not None:
+        yield _split_fasta_block(b"".join(tail), tail_clean)
+
+
+def _split_fasta_block(block, clean):
+    """Split a block of FASTA records into titles and sequences (PRIVATE).
+
+    The block is bytes holding whole records (starting with a ">"), and
+    clean is True if there is no whitespace in it other than new lines and
+    spaces (which are simply removed). This works on the whole block at
+    once, rather than looping over the records in Python.
+    """
+    if clean:
+        # Try treating the block as records with the same number of lines
+        # (usually the case for reads), so that the titles and sequence
+        # lines can be picked out with list slicing
+        lines = block.split(b"\n")
+        if not lines[-1]:
+            del lines[-1]
+        second = block.find(b"\n>")
+        if second == -1:
+            size = len(lines)
+        else:
+            size = block.count(b"\n", 0, second) + 1
+        count = len(lines) // size
+        text = b"\n".join(lines[::size])
+        if size > 1 and size * count == len(lines) \
+                and text.count(b"\n>") == count - 1:
+            if count == 1:
+                sequences = [b"".join(lines[1:])]
+            elif size == 2:
+                sequences = lines[1::2]
+            else:
+                sequences = list(map(b"".join,
+                                     zip(*[lines[i::size]
+                                           for i in range(1, size)])))
+            joined = b"".join(sequences)
+            # Any other line starting with ">" would be a title
+            if b">" not in joined:
+                if b" " in joined:
+                    sequences = [sequence.replace(b" ", b"")
+                                 for sequence in sequences]
+                titles = _bytes_to_string(text)[1:].split("\n>")
+                return list(map(str.rstrip, titles)), sequences
+    records = block[1:].split(b"\n>")
+    titles, new_lines, bodies = zip(*map(bytes.partition, records,
+                                         repeat(b"\n")))
+    titles = list(map(str.rstrip, _decode_titles(titles)))
+    # Join the sequences with a separator which is not in any of them, so
+    # that the white space is removed from all of them at once
+    separator = b"\n\x00"
+    joined = separator.join(bodies)
+    if joined.count(b"\x00") != len(bodies) - 1:
+        return titles, list(map(_clean_fasta_sequence, bodies))
+    if clean:
+        joined = joined.replace(b"\n", b"")
+    else:
+        # As in SimpleFastaParser, remove trailing white space from each line
+        joined = b"".join(map(bytes.rstrip, joined.split(b"\n")))
+        joined = joined.replace(b"\r", b"")
+    return titles, joined.replace(b" ", b"").split(b"\x00")
+
+
+def _clean_fasta_sequence(body):
+    """Remove the white space from a FASTA sequence, as bytes (PRIVATE)."""
+    # As in SimpleFastaParser
+    lines = [line.rstrip() for line in body.split(b"\n")]
+    return b"".join(lines).replace(b" ", b"").replace(b"\r", b"")
+
+
+def _decode_titles(titles):
+    """Decode a list of title lines from bytes to strings, all at once (PRIVATE)."""
+    if not titles:
+        return []
+    return _bytes_to_string(b"\n".join(titles)).split("\n")
+
+
+def _title_names(titles, title2ids):
+    """Return lists of the ids, names and descriptions for some titles (PRIVATE).
+
+    This uses the title2ids function if given, otherwise the first word of
+    each title is the id and name, and the whole title is the description.
+    """
+    if title2ids:
+        names = [tuple(title2ids(title)) for title in titles]
+        if not names:
+            return [], [], []
+        return tuple(zip(*names))
+    try:
+        ids = list(map(itemgetter(0), map(str.split, titles, repeat(None),
+                                          repeat(1))))
+    except IndexError:
+        # At least one title is blank
+        ids = [words[0] if words else ""
+               for words in map(str.split, titles, repeat(None), repeat(1))]
+    return ids, ids, titles
+
+
+def _clean_bytes(data):
+    """Is there no whitespace except new lines and spaces in the data (PRIVATE)."""
+    return not (b"\t" in data or b"\r" in data or
+                b"\x0b" in data or b"\x0c" in data)
+
+
+class _LazyFastaRecord(SeqRecord):
+    """SeqRecord for a FASTA entry, decoded only as needed (PRIVATE).
+
+    The id, name and description are found for a whole block of records at
+    once (see _lazy_fasta_records), and the sequence is held as bytes. The
+    Seq object, the per-letter-annotation dictionary, and the dbxrefs,
+    annotations and features are only created on first access. Once
+    created, this behaves just like a normal SeqRecord, see FastaIterator.
+
+    The settings are a tuple starting with the alphabet, shared by all the
+    records from a file. When pickled, the record is filled in, and the
+    settings and parsed data are left out.
+    """
+
+    # Class level defaults, replaced by instance attributes when first used
+    _seq_object = None
+    _letter_annotations = None
+    _dbxrefs = None
+    _annotations = None
+    _features = None
+
+    # The attributes holding the parsed data, left out when pickling
+    _parsed_attributes = ("_sequence", "_settings")
+
+    def __init__(self, id, name, description, sequence, settings):
+        """Create a SeqRecord from the names and sequence bytes."""
+        self.id = id
+        self.name = name
+        self.description = description
+        self._sequence = sequence
+        self._settings = settings
+
+    def _make_letter_annotations(self):
+        """Return the per-letter-annotation dictionary (PRIVATE)."""
+        return _RestrictedDict(length=len(self))
+
+    def __get_dbxrefs(self):
+        if self._dbxrefs is None:
+            self._dbxrefs = []
+        return self._dbxrefs
+
+    def __set_dbxrefs(self, value):
+        self._dbxrefs = value
+    dbxrefs = property(__get_dbxrefs, __set_dbxrefs,
+                       doc="Database cross references (list of strings).")
+
+    def __get_annotations(self):
+        if self._annotations is None:
+            self._annotations = {}
+        return self._annotations
+
+    def __set_annotations(self, value):
+        self._annotations = value
+    annotations = property(__get_annotations, __set_annotations,
+                           doc="Annotations about the whole sequence (dict).")
+
+    def __get_features(self):
+        if self._features is None:
+            self._features = []
+        return self._features
+
+    def __set_features(self, value):
+        self._features = value
+        self._clear_feature_index()
+    features = property(__get_features, __set_features,
+                        doc="Features (list of SeqFeature objects).")
+
+    def __get_seq(self):
+        if self._seq_object is None:
+            self._seq_object = Seq(_bytes_to_string(self._sequence),
+                                   self._settings[0])
+        return self._seq_object
+
+    def __set_seq(self, value):
+        self._seq_object = value
+
+    # The SeqRecord's seq property and methods use these private attributes
+    _seq = property(__get_seq, __set_seq)
+
+    def __get_letter_annotations(self):
+        if self._letter_annotations is None:
+            self._letter_annotations = self._make_letter_annotations()
+        return self._letter_annotations
+
+    def __set_letter_annotations(self, value):
+        self._letter_annotations = value
+
+    _per_letter_annotations = property(__get_letter_annotations,
+                                       __set_letter_annotations)
+
+    def __getitem__(self, index):
+        """Return a sub-sequence (as a plain SeqRecord) or a single letter."""
+        if isinstance(index, slice):
+            # The SeqRecord slicing code creates a new instance of the same
+            # class, which here would need the raw strings. Use a SeqRecord.
+            record = SeqRecord(self.seq, id=self.id, name=self.name,
+                               description=self.description,
+                               dbxrefs=self.dbxrefs, features=self.features,
+                               annotations=self.annotations)
+            record._per_letter_annotations = self._per_letter_annotations
+            return record[index]
+        return SeqRecord.__getitem__(self, index)
+
+    def __len__(self):
+        """Return the length of the sequence (without creating a Seq)."""
+        if self._seq_object is not None:
+            return len(self._seq_object)
+        return len(self._sequence)
+
+    def __getstate__(self):
+        """Return the state for pickling and copying, as a full record."""
+        state = SeqRecord.__getstate__(self)
+        for name in self._parsed_attributes:
+            state.pop(name, None)
+        state["_seq_object"] = self.seq
+        state["_letter_annotations"] = self.letter_annotations
+        return state
+
+
+def FastaIterator(handle, alphabet=single_letter_alphabet, title2ids=None,
+                  lazy=False):
     """Iterate over Fasta records as SeqRecord objects.
 
     Arguments:
@@ -146,6 +448,11 @@ def FastaIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
        description (in that order) for the record as a tuple of strings.
        If this is not given, then the entire title line will be used
        as the description, and the first word as the id and name.
+     - lazy - Optional boolean, if True the SeqRecord objects only create
+       their Seq object (and other attributes such as the annotations) when
+       first used. The file is then read in large blocks rather than line
+       by line, and the titles and sequences are split out a whole block
+       at a time.
 
     By default this will act like calling Bio.SeqIO.parse(handle, "fasta")
     with no custom handling of the title lines:
@@ -174,6 +481,50 @@ def FastaIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
     ALPHA
     DELTA
 
+    If you only need some of the record attributes, such as the identifiers
+    or sequence lengths, the lazy option avoids the cost of building all
+    the rest of each record:
+
+    >>> with open("Fasta/dups.fasta") as handle:
+    ...     for record in FastaIterator(handle, lazy=True):
+    ...         print("%s %i" % (record.id, len(record)))
+    ...
+    alpha 5
+    beta 4
+    gamma 5
+    alpha 5
+    delta 5
+
+    """
+    if lazy:
+        return _lazy_fasta_records(handle, alphabet, title2ids)
+    return _fasta_records(handle, alphabet, title2ids)
+
+
+def _lazy_fasta_records(handle, alphabet, title2ids):
+    """Iterate over FASTA records as _LazyFastaRecord objects (PRIVATE).
+
+    The records are created by mapping over each block from the parser,
+    so there is no Python level loop over the records.
+    """
+    blocks = _fasta_bytes_blocks(_binary_handle(handle), 1048576)
+    settings = (alphabet,)
+    return chain.from_iterable(_lazy_fasta_block(titles, sequences, title2ids,
+                                                 settings)
+                               for titles, sequences in blocks)
+
+
+def _lazy_fasta_block(titles, sequences, title2ids, settings):
+    """Return an iterator of _LazyFastaRecord objects for a block (PRIVATE)."""
+    ids, names, descriptions = _title_names(titles, title2ids)
+    return map(_LazyFastaRecord, ids, names, descriptions, sequences,
+               repeat(settings))
+
+
+def _fasta_records(handle, alphabet, title2ids):
+    """Iterate over FASTA records as SeqRecord objects (PRIVATE).
+
+    See FastaIterator, this is used unless the lazy option is given.
     """
     if title2ids:
         for title, sequence in SimpleFastaParser(handle):
@@ -397,6 +748,312 @@ def as_fasta_2line(record):
     return ">%s\n%s\n" % (title, data)
 
 
+def build_fai(handle):
+    """Build a samtools style faidx index for a FASTA file.
+
+    Expects a FASTA file opened in binary mode, which may be a plain
+    file or a BgzfReader from Bio.bgzf (in which case the offsets are
+    into the decompressed data).
+
+    Returns a list of tuples, one per record, giving the name (the first
+    word of the title line), the sequence length, the offset of the first
+    base, the number of bases per line, and the number of bytes per line
+    (including the line ending) - the five columns of a .fai file.
+
+    >>> with open("GenBank/NC_005816.fna", "rb") as handle:
+    ...     for entry in build_fai(handle):
+    ...         print("%s %i %i %i %i" % entry)
+    gi|45478711|ref|NC_005816.1| 9609 106 70 71
+
+    As in samtools, every sequence line must be the same length except
+    the last line of each record, otherwise the offset of a given base
+    could not be calculated. This raises a ValueError.
+    """
+    entries = []
+    name = None
+    offset = seq_offset = length = line_bases = line_width = 0
+    short_line = False
+    for line in handle:
+        if line[:1] == b">":
+            if name is not None:
+                entries.append((name, length, seq_offset, line_bases, line_width))
+            try:
+                name = _as_string(line[1:].split(None, 1)[0])
+            except IndexError:
+                raise ValueError("Missing name in FASTA title line at offset %i"
+                                 % offset)
+            seq_offset = offset + len(line)
+            length = 0
+            line_bases = line_width = 0
+            short_line = False
+        elif name is None:
+            if line.strip():
+                raise ValueError("Expected FASTA record starting with '>' "
+                                 "character, got %r" % line)
+        else:
+            bases = len(line.rstrip())
+            if short_line and bases:
+                raise ValueError("Different line lengths in sequence %s, "
+                                 "cannot index this FASTA file" % name)
+            if not length:
+                line_bases = bases
+                line_width = len(line)
+            elif bases > line_bases or \
+                    (bases == line_bases and len(line) != line_width):
+                raise ValueError("Different line lengths in sequence %s, "
+                                 "cannot index this FASTA file" % name)
+            if bases != line_bases or len(line) != line_width:
+                # Must be the last line of the record
+                short_line = True
+            length += bases
+        offset += len(line)
+    if name is not None:
+        entries.append((name, length, seq_offset, line_bases, line_width))
+    return entries
+
+
+def read_fai(handle):
+    """Read a samtools style .fai index, returning a list of tuples as in build_fai."""
+    entries = []
+    for line in handle:
+        line = _as_string(line).rstrip("\r\n")
+        if not line:
+            continue
+        parts = line.split("\t")
+        if len(parts) < 5:
+            raise ValueError("Expected five tab separated columns in FAI "
+                             "line, got %r" % line)
+        try:
+            entries.append((parts[0],) + tuple(int(x) for x in parts[1:5]))
+        except ValueError:
+            raise ValueError("Bad integer in FAI line %r" % line)
+    return entries
+
+
+def write_fai(handle, entries):
+    """Write a samtools style .fai index, given a list of tuples as from build_fai."""
+    for entry in entries:
+        handle.write("%s\t%i\t%i\t%i\t%i\n" % entry)
+
+
+def make_faidx(filename):
+    """Write samtools style index files for a FASTA file, like samtools faidx.
+
+    Writes the .fai index next to the FASTA file, plus a .gzi block
+    index if the FASTA file is BGZF compressed. Returns the list of
+    index entries as from build_fai.
+    """
+    with open(filename, "rb") as handle:
+        compressed = _is_bgzf(handle)
+        if compressed:
+            gzi = bgzf.build_gzi(handle)
+    if compressed:
+        with open(filename + ".gzi", "wb") as handle:
+            bgzf.write_gzi(handle, gzi)
+        with bgzf.BgzfReader(filename, "rb") as handle:
+            entries = build_fai(handle)
+    else:
+        with open(filename, "rb") as handle:
+            entries = build_fai(handle)
+    with open(filename + ".fai", "w") as handle:
+        write_fai(handle, entries)
+    return entries
+
+
+def _is_bgzf(handle):
+    """Check if a binary handle is BGZF compressed, and rewind it (PRIVATE)."""
+    start = handle.read(4)
+    handle.seek(0)
+    if start == bgzf._bgzf_magic:
+        return True
+    elif start[:2] == b"\x1f\x8b":
+        raise ValueError("Cannot index a plain GZIP compressed FASTA file, "
+                         "please use BGZF compression (e.g. bgzip).")
+    return False
+
+
+class IndexedFasta(object):
+    """Random access to regions of a FASTA file via a samtools style index.
+
+    This works like samtools faidx, using a .fai index which records for
+    each sequence its length, the offset of its first base, and the line
+    length. The file offset of any base can therefore be calculated
+    directly, and a region is fetched by reading just those bytes -
+    there is no parsing of the preceding lines or records. The FASTA
+    file may be plain text or BGZF compressed, in which case the .gzi
+    block index is used to find the right BGZF block.
+
+    If the .fai (or .gzi) index file is missing, the index is built in
+    memory by reading the whole file once. Use the make_faidx function
+    to save the index files for next time.
+
+    >>> fasta = IndexedFasta("GenBank/NC_005816.fna")
+    >>> len(fasta)
+    1
+    >>> name = "gi|45478711|ref|NC_005816.1|"
+    >>> fasta.get_length(name)
+    9609
+
+    Regions can be given using zero based Python style coordinates,
+
+    >>> print(fasta.get_seq(name, 60, 80))
+    TCTGCTCTCCTGATTCAGGA
+
+    or as samtools style region strings, with one based inclusive
+    coordinates:
+
+    >>> print(fasta.fetch(name + ":61-80"))
+    TCTGCTCTCCTGATTCAGGA
+
+    Or, you can get the whole sequence as a FileSeq object, which reads
+    the letters from the file on demand, and slice that:
+
+    >>> print(fasta[name][60:80])
+    TCTGCTCTCCTGATTCAGGA
+    >>> fasta.close()
+
+    """
+
+    def __init__(self, filename, alphabet=single_letter_alphabet):
+        """Initialize the class."""
+        self._alphabet = alphabet
+        handle = open(filename, "rb")
+        try:
+            compressed = _is_bgzf(handle)
+        except Exception:
+            handle.close()
+            raise
+        if compressed:
+            if os.path.isfile(filename + ".gzi"):
+                with open(filename + ".gzi", "rb") as gzi_handle:
+                    gzi = bgzf.read_gzi(gzi_handle)
+            else:
+                gzi = bgzf.build_gzi(handle)
+            handle.close()
+            handle = bgzf.BgzfReader(filename, "rb")
+            self._raw_starts = [raw_start for raw_start, data_start in gzi]
+            self._data_starts = [data_start for raw_start, data_start in gzi]
+        self._compressed = compressed
+        self._handle = handle
+        if os.path.isfile(filename + ".fai"):
+            with open(filename + ".fai", "rb") as fai_handle:
+                entries = read_fai(fai_handle)
+        else:
+            entries = build_fai(handle)
+        self._index = {}
+        self._names = []
+        for name, length, offset, line_bases, line_width in entries:
+            if name in self._index:
+                raise ValueError("Duplicate sequence name %r" % name)
+            self._index[name] = (length, offset, line_bases, line_width)
+            self._names.append(name)
+
+    def __len__(self):
+        """Return the number of sequences in the index."""
+        return len(self._names)
+
+    def __iter__(self):
+        """Iterate over the sequence names, in file order."""
+        return iter(self._names)
+
+    def keys(self):
+        """Return a list of the sequence names, in file order."""
+        return list(self._names)
+
+    def __contains__(self, name):
+        """Return True if the named sequence is in the index."""
+        return name in self._index
+
+    def get_length(self, name):
+        """Return the length of the named sequence."""
+        return self._index[name][0]
+
+    def __getitem__(self, name):
+        """Return the named sequence as a FileSeq object.
+
+        Nothing is read from the file until the sequence (or a slice of it)
+        is used, so this is a cheap way to get at regions of a large
+        sequence, e.g. fasta[name][1000000:1000100], but the file must be
+        kept open while the sequence is in use.
+        """
+        length, offset, line_bases, line_width = self._index[name]
+        layout = _SequenceLayout(self._read, offset, line_bases, line_width)
+        return FileSeq(layout, self._alphabet, 0, length)
+
+    def _read(self, offset, size):
+        """Read size bytes from the given (uncompressed) offset (PRIVATE)."""
+        handle = self._handle
+        if self._compressed:
+            i = bisect_right(self._data_starts, offset) - 1
+            handle.seek(bgzf.make_virtual_offset(
+                self._raw_starts[i], offset - self._data_starts[i]))
+        else:
+            handle.seek(offset)
+        return handle.read(size)
+
+    def get_seq(self, name, start=0, end=None):
+        """Return the named sequence (or part of it) as a Seq object.
+
+        The start and end arguments use zero based Python style slice
+        coordinates, and are truncated to the sequence length.
+        """
+        length, offset, line_bases, line_width = self._index[name]
+        start = max(start, 0)
+        if end is None or end > length:
+            end = length
+        if start >= end:
+            return Seq("", self._alphabet)
+        first = offset + (start // line_bases) * line_width + start % line_bases
+        end -= 1
+        last = offset + (end // line_bases) * line_width + end % line_bases
+        data = self._read(first, last + 1 - first)
+        if line_width != line_bases:
+            # Remove the line endings
+            data = data.replace(b"\n", b"").replace(b"\r", b"")
+        if len(data) != end + 1 - start:
+            raise ValueError("Expected %i letters from %s, got %i; "
+                             "is the FASTA index out of date?"
+                             % (end + 1 - start, name, len(data)))
+        return Seq(_as_string(data), self._alphabet)
+
+    def fetch(self, region):
+        """Return a region given as a samtools style string as a Seq object.
+
+        The region is given as name, name:start or name:start-end using
+        one based inclusive coordinates (commas in numbers are ignored),
+        e.g. "chr1:1,000,001-1,000,100" for one hundred bases.
+        """
+        if region in self._index:
+            return self.get_seq(region)
+        name, sep, coords = region.rpartition(":")
+        if not sep or name not in self._index:
+            raise KeyError(region)
+        start, sep, end = coords.replace(",", "").partition("-")
+        try:
+            start = int(start)
+            if end:
+                end = int(end)
+            else:
+                end = None
+        except ValueError:
+            raise ValueError("Bad region %r" % region)
+        if start < 1 or (end is not None and end < start):
+            raise ValueError("Bad region %r" % region)
+        return self.get_seq(name, start - 1, end)
+
+    def close(self):
+        """Close the FASTA file handle."""
+        self._handle.close()
+
+    def __enter__(self):
+        """Open a file operable with WITH statement."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Close a file with WITH statement."""
+        self.close()
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
     run_doctest(verbose=0)
@@ -363,11 +363,19 @@ from __future__ import print_function
 
 from Bio.Alphabet import single_letter_alphabet
 from Bio.Seq import Seq, UnknownSeq
-from Bio.SeqRecord import SeqRecord
+from Bio.SeqRecord import SeqRecord, LetterAnnotationArray, _RestrictedDict
+from Bio.SeqIO.FastaIO import _LazyFastaRecord, _binary_handle
+from Bio.SeqIO.FastaIO import _decode_titles, _title_names
 from Bio.SeqIO.Interfaces import SequentialSequenceWriter
 from Bio.SeqIO.Interfaces import _clean, _get_seq_string
+from Bio._py3k import _as_bytes, _as_string, _bytes_to_string, map
+from Bio.File import as_handle
 
+from array import array
+from itertools import compress, islice, repeat
 from math import log
+import operator
+import random
 import warnings
 from Bio import BiopythonWarning, BiopythonParserWarning
 
@@ -547,6 +555,63 @@ _solexa_to_sanger_quality_str = dict(
     for qs in range(-5, 93 + 1))
 
 
+_offset_tables = {}
+_valid_array_bytes = {}
+
+
+def _offset_table(offset):
+    """Return a translation table adding offset to each byte (PRIVATE).
+
+    Subtracting an offset is done by adding its negative, as the bytes wrap
+    around (so that for a signed array, the byte for -5 plus 64 gives 59).
+    """
+    try:
+        return _offset_tables[offset]
+    except KeyError:
+        table = bytes(bytearray((i + offset) % 256 for i in range(256)))
+        _offset_tables[offset] = table
+        return table
+
+
+def _encode_quality_array(qualities, offset, lowest, highest):
+    """Encode an array of integer qualities as an ASCII string (PRIVATE).
+
+    This is a fast path for LetterAnnotationArray objects (or other arrays
+    of bytes) as made by the parsers, applying the offset to the raw bytes.
+    Returns None for anything else, or if any value is outside the range
+    lowest to highest, in which case the caller must do the conversion.
+    """
+    if not isinstance(qualities, array) or qualities.typecode not in "bB":
+        return None
+    key = (qualities.typecode, lowest, highest)
+    try:
+        valid = _valid_array_bytes[key]
+    except KeyError:
+        if qualities.typecode == "B":
+            valid = bytes(bytearray(range(max(0, lowest), highest + 1)))
+        else:
+            valid = bytes(bytearray(q % 256 for q in range(lowest, highest + 1)))
+        _valid_array_bytes[key] = valid
+    if hasattr(qualities, "tobytes"):
+        data = qualities.tobytes()
+    else:
+        # Python 2
+        data = qualities.tostring()
+    if data.translate(None, valid):
+        return None
+    return _bytes_to_string(data.translate(_offset_table(offset)))
+
+
+def _quality_array(quality_string, offset, typecode="B"):
+    """Decode an ASCII quality string into a LetterAnnotationArray (PRIVATE).
+
+    The quality string should already have been checked for invalid
+    characters. Use typecode "b" (signed) for Solexa scores.
+    """
+    return LetterAnnotationArray(typecode, _as_bytes(quality_string).translate(
+        _offset_table(-offset)))
+
+
 def _get_sanger_quality_str(record):
     """Return a Sanger FASTQ encoded quality string (PRIVATE).
 
@@ -616,6 +681,10 @@ def _get_sanger_quality_str(record):
         # Fall back on solexa scores...
         pass
     else:
+        # Arrays from the parsers can be done in one go:
+        encoded = _encode_quality_array(qualities, SANGER_SCORE_OFFSET, 0, 93)
+        if encoded is not None:
+            return encoded
         # Try and use the precomputed mapping:
         try:
             return "".join(_phred_to_sanger_quality_str[qp]
@@ -685,6 +754,10 @@ def _get_illumina_quality_str(record):
         # Fall back on solexa scores...
         pass
     else:
+        # Arrays from the parsers can be done in one go:
+        encoded = _encode_quality_array(qualities, SOLEXA_SCORE_OFFSET, 0, 62)
+        if encoded is not None:
+            return encoded
         # Try and use the precomputed mapping:
         try:
             return "".join(_phred_to_illumina_quality_str[qp]
@@ -755,6 +828,10 @@ def _get_solexa_quality_str(record):
         # Fall back on PHRED scores...
         pass
     else:
+        # Arrays from the parsers can be done in one go:
+        encoded = _encode_quality_array(qualities, SOLEXA_SCORE_OFFSET, -5, 62)
+        if encoded is not None:
+            return encoded
         # Try and use the precomputed mapping:
         try:
             return "".join(_solexa_to_solexa_quality_str[qs]
@@ -953,7 +1030,829 @@ def FastqGeneralIterator(handle):
         yield (title_line, seq_string, quality_string)
 
 
-def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
+class _BytesLineBuffer(object):
+    """Block-buffered line reader over a binary handle (PRIVATE).
+
+    Reads the handle in large chunks and splits each chunk into lines with
+    a single ``bytes.split`` call, so that callers can walk the lines as a
+    plain list. The final element of ``lines`` is the (possibly empty)
+    partial line at the end of the last chunk, until the end of the file
+    is reached.
+    """
+
+    def __init__(self, handle, chunk_size):
+        """Initialize the class."""
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.lines = [b""]
+        self.pos = 0
+        self.eof = False
+        # Are all the lines free of carriage returns (and other rare
+        # whitespace which would be removed by rstrip)?
+        self.clean = True
+
+    def complete(self):
+        """Return the number of complete lines from the current position."""
+        if self.eof:
+            return len(self.lines) - self.pos
+        return len(self.lines) - 1 - self.pos
+
+    def ensure(self, count):
+        """Read until at least count complete lines are available, or EOF.
+
+        Returns the number of complete lines available.
+        """
+        while not self.eof and len(self.lines) - 1 - self.pos < count:
+            data = self.handle.read(self.chunk_size)
+            lines = self.lines
+            if not data:
+                self.eof = True
+                if not lines[-1]:
+                    # No partial line (file ended with a new line)
+                    del lines[-1]
+                break
+            if not isinstance(data, bytes):
+                raise ValueError("Is this handle in text mode not binary mode?")
+            tail = lines[self.pos:]
+            data = tail.pop() + data
+            self.clean = (self.clean or not tail) and not (
+                b"\r" in data or b"\x0b" in data or b"\x0c" in data)
+            self.lines = tail + data.split(b"\n")
+            self.pos = 0
+        return self.complete()
+
+    def readline(self):
+        """Return the next line (without the new line), or None at EOF."""
+        if not self.ensure(1):
+            return None
+        self.pos += 1
+        return self.lines[self.pos - 1]
+
+    def peek(self):
+        """Return the next line without consuming it, or None at EOF."""
+        if not self.ensure(1):
+            return None
+        return self.lines[self.pos]
+
+
+def FastqBytesIterator(handle, chunk_size=1048576):
+    """Iterate over FASTQ records as bytes tuples, reading in large blocks.
+
+    This is a binary mode counterpart to the FastqGeneralIterator function,
+    intended for large files. The handle must be opened in binary mode, and
+    is read chunk_size bytes at a time rather than line by line. Each record
+    is returned as a tuple of the title, sequence and quality as bytes, with
+    any line breaks in the sequence and quality removed.
+
+    >>> with open("Quality/example.fastq", "rb") as handle:
+    ...     for (title, sequence, quality) in FastqBytesIterator(handle):
+    ...         print(title.decode())
+    ...         print(quality.decode())
+    EAS54_6_R1_2_1_413_324
+    ;;3;;;;;;;;;;;;7;;;;;;;88
+    EAS54_6_R1_2_1_540_792
+    ;;;;;;;;;;;7;;;;;-;;;3;83
+    EAS54_6_R1_2_1_443_348
+    ;;;;;;;;;;;9;7;;.7;393333
+
+    Typical FASTQ files have exactly four lines per record, and these are
+    handled with a fast path which works directly on the lines in the current
+    block. Anything else (multi-line sequences or qualities, or quality lines
+    starting with "@") falls back on the same length based logic used in the
+    FastqGeneralIterator, and the same errors are raised for invalid files:
+
+    >>> with open("Quality/tricky.fastq", "rb") as handle:
+    ...     for (title, sequence, quality) in FastqBytesIterator(handle):
+    ...         print("%s %s" % (sequence.decode(), quality.decode()))
+    TTTCTTGCCCCCATAGACTGAGACCTTCCCTAAATA IIIIIIIIIIIIIIIIIIIIIIIIIIIIICII+III
+    ACCCAGCTAATTTTTGTATTTTTGTTAGAGACAGTG @IIIIIIIIIIIIIIICDIIIII<%<6&-*).(*%+
+    TGTTCTGAAGGAAGGTGTGCGTGCGTGTGTGTGTGT IIIIIIIIIIIICIIGIIIII>IAIIIE65I=II:6
+    TGGGAGGTTTTATGTGGAAAGCAGCAATGTACAAGA IIIIIII.IIIIII1@44@-7.%<&+/$/%4(++(%
+
+    See also the FastqBatchIterator function, which groups records from this
+    parser into columnar batches.
+    """
+    for titles, seqs, quals in _fastq_bytes_blocks(handle, chunk_size):
+        for record in zip(titles, seqs, quals):
+            yield record
+
+
+def _fastq_bytes_blocks(handle, chunk_size):
+    """Parse a binary FASTQ handle into blocks of records (PRIVATE).
+
+    Yields tuples of three lists (titles, sequences and qualities, as bytes),
+    typically covering all the records in one chunk of the file.
+    """
+    buf = _BytesLineBuffer(handle, chunk_size)
+    while True:
+        # The fast path needs four lines, plus one more to confirm the
+        # next line starts a new record (unless at the end of the file).
+        available = buf.ensure(5)
+        if not available:
+            return
+        lines = buf.lines
+        i = buf.pos
+        end = i + available
+        eof = buf.eof
+        if buf.clean:
+            # No carriage returns in this block, so try treating all the
+            # complete lines as four line records, checking and splitting
+            # them with list slicing:
+            count = (end - i) // 4 if eof else (end - i - 1) // 4
+            stop = i + 4 * count
+            titles = lines[i:stop:4]
+            seqs = lines[i + 1:stop:4]
+            quals = lines[i + 3:stop:4]
+            if count and lines[i + 2:stop:4].count(b"+") == count \
+                    and all(map(bytes.startswith, titles, repeat(b"@"))) \
+                    and (stop == end or lines[stop][:1] == b"@") \
+                    and list(map(len, seqs)) == list(map(len, quals)):
+                # Any spaces or tabs in the sequence are an error, and
+                # any trailing spaces or tabs on the other lines need
+                # removing, so leave those to the slower code below:
+                joined = b"".join(seqs) + b"".join(quals)
+                titles_block = b"\n".join(titles) + b"\n"
+                if b" " not in joined and b"\t" not in joined \
+                        and b" \n" not in titles_block \
+                        and b"\t\n" not in titles_block:
+                    buf.pos = stop
+                    yield titles_block[1:-1].split(b"\n@"), seqs, quals
+                    continue
+        # Record by record, still assuming four lines per record
+        titles = []
+        seqs = []
+        quals = []
+        slow = False
+        while True:
+            if i + 4 >= end and not (eof and i + 4 == end):
+                # Need to read more data, unless this is a truncated
+                # record at the end of the file (handled below).
+                slow = eof and i < end
+                break
+            title = lines[i].rstrip()
+            plus = lines[i + 2].rstrip()
+            seq = lines[i + 1].rstrip()
+            qual = lines[i + 3].rstrip()
+            if title[:1] != b"@" or plus[:1] != b"+" or len(seq) != len(qual) \
+                    or (i + 4 < end and lines[i + 4][:1] != b"@") \
+                    or (plus != b"+" and plus[1:] != title[1:]) \
+                    or b" " in seq or b"\t" in seq:
+                # Either an unusual layout, or an error
+                slow = True
+                break
+            titles.append(title[1:])
+            seqs.append(seq)
+            quals.append(qual)
+            i += 4
+        buf.pos = i
+        if titles:
+            yield titles, seqs, quals
+        if slow:
+            # Not a simple four line record, use the general logic
+            title, seq, qual = _read_fastq_record(buf)
+            yield [title], [seq], [qual]
+
+
+def _read_fastq_record(buf):
+    """Read one FASTQ record from a _BytesLineBuffer (PRIVATE).
+
+    This follows the same logic as FastqGeneralIterator, and is used for
+    records which do not have the usual four line layout.
+    """
+    line = buf.readline()
+    if line[:1] != b"@":
+        raise ValueError(
+            "Records in Fastq files should start with '@' character")
+    title_line = line[1:].rstrip()
+    seq_string = (buf.readline() or b"").rstrip()
+    while True:
+        line = buf.readline()
+        if line is None:
+            raise ValueError("End of file without quality information.")
+        if line[:1] == b"+":
+            second_title = line[1:].rstrip()
+            if second_title and second_title != title_line:
+                raise ValueError("Sequence and quality captions differ.")
+            break
+        seq_string += line.rstrip()
+    if b" " in seq_string or b"\t" in seq_string:
+        raise ValueError("Whitespace is not allowed in the sequence.")
+    seq_len = len(seq_string)
+
+    quality_string = (buf.readline() or b"").rstrip()
+    while True:
+        line = buf.peek()
+        if line is None:
+            break  # end of file
+        if line[:1] == b"@" and len(quality_string) >= seq_len:
+            # Start of the next record (see FastqGeneralIterator)
+            break
+        buf.pos += 1
+        quality_string += line.rstrip()
+
+    if seq_len != len(quality_string):
+        raise ValueError("Lengths of sequence and quality values differs "
+                         " for %s (%i and %i)."
+                         % (_as_string(title_line), seq_len,
+                            len(quality_string)))
+    return (title_line, seq_string, quality_string)
+
+
+class FastqBatch(object):
+    """A batch of FASTQ reads held as columnar arrays.
+
+    These are created by the FastqBatchIterator function. Rather than one
+    SeqRecord per read, a batch holds:
+
+     - titles - list of the title lines (strings, without the "@")
+     - sequences - NumPy uint8 array of all the sequence letters, concatenated
+     - qualities - NumPy uint8 array of all the quality scores, concatenated
+     - offsets - NumPy int64 array of length len(batch) + 1, where read i
+       occupies sequences[offsets[i]:offsets[i + 1]] (and likewise for the
+       qualities).
+
+    The quality scores have already had the ASCII offset removed.
+    """
+
+    def __init__(self, titles, sequences, qualities, offsets):
+        """Initialize the class."""
+        self.titles = titles
+        self.sequences = sequences
+        self.qualities = qualities
+        self.offsets = offsets
+
+    def __len__(self):
+        """Return the number of reads in the batch."""
+        return len(self.titles)
+
+    def __repr__(self):
+        """Return a concise summary of the batch."""
+        return "<%s with %i reads and %i bases>" \
+            % (self.__class__.__name__, len(self), len(self.sequences))
+
+    @property
+    def ids(self):
+        """List of the read identifiers (first word of each title)."""
+        return [title.split(None, 1)[0] if title else "" for title in self.titles]
+
+    @property
+    def lengths(self):
+        """Return the read lengths as a NumPy array."""
+        return self.offsets[1:] - self.offsets[:-1]
+
+    def sequence(self, index):
+        """Return the sequence of read number index as a string."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return _as_string(self.sequences[start:end].tobytes())
+
+    def quality(self, index):
+        """Return the quality scores of read number index (as an array view)."""
+        return self.qualities[self.offsets[index]:self.offsets[index + 1]]
+
+
+def FastqBatchIterator(handle, batch_size=10000, offset=SANGER_SCORE_OFFSET,
+                       chunk_size=1048576):
+    """Iterate over a binary FASTQ handle as FastqBatch objects.
+
+    Arguments:
+     - handle - input file, opened in binary mode
+     - batch_size - maximum number of reads per batch
+     - offset - ASCII offset of the quality encoding, 33 (the default) for
+       Sanger style FASTQ files, or 64 for Illumina 1.3 to 1.7 FASTQ files.
+       Old Solexa FASTQ files with negative scores are not supported.
+     - chunk_size - size of the blocks read from the handle
+
+    This uses the same parser as FastqBytesIterator to split the records, then
+    builds NumPy arrays for the whole batch in one go, avoiding a SeqRecord and a list of
+    integers for every read:
+
+    >>> with open("Quality/example.fastq", "rb") as handle:
+    ...     for batch in FastqBatchIterator(handle, batch_size=2):
+    ...         print("%r %s" % (batch, batch.ids))
+    <FastqBatch with 2 reads and 50 bases> ['EAS54_6_R1_2_1_413_324', 'EAS54_6_R1_2_1_540_792']
+    <FastqBatch with 1 reads and 25 bases> ['EAS54_6_R1_2_1_443_348']
+    >>> print(batch.sequence(0))
+    GTTGCTTCTGGCGTGGGTGGGGGGG
+    >>> print(batch.quality(0).tolist())
+    [26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 24, 26, 22, 26, 26, 13, 22, 26, 18, 24, 18, 18, 18, 18]
+
+    As with the FastqPhredIterator, a ValueError is raised for any quality
+    characters outside the range of the encoding.
+    """
+    try:
+        import numpy
+    except ImportError:
+        from Bio import MissingPythonDependencyError
+        raise MissingPythonDependencyError(
+            "Install NumPy if you want to use FastqBatchIterator.")
+    if batch_size < 1:
+        raise ValueError("The batch_size must be at least one.")
+
+    def build(titles, seqs, quals):
+        offsets = numpy.zeros(len(titles) + 1, numpy.int64)
+        numpy.cumsum(list(map(len, seqs)), out=offsets[1:])
+        sequences = numpy.frombuffer(b"".join(seqs), numpy.uint8)
+        qualities = numpy.frombuffer(b"".join(quals), numpy.uint8)
+        if len(qualities) and (qualities.min() < offset or
+                               qualities.max() > 126):
+            raise ValueError("Invalid character in quality string")
+        qualities = qualities - numpy.uint8(offset)
+        titles = _as_string(b"\n".join(titles)).split("\n")
+        return FastqBatch(titles, sequences, qualities, offsets)
+
+    titles = []
+    seqs = []
+    quals = []
+    for block in _fastq_bytes_blocks(handle, chunk_size):
+        titles.extend(block[0])
+        seqs.extend(block[1])
+        quals.extend(block[2])
+        while len(titles) >= batch_size:
+            yield build(titles[:batch_size], seqs[:batch_size],
+                        quals[:batch_size])
+            del titles[:batch_size]
+            del seqs[:batch_size]
+            del quals[:batch_size]
+    if titles:
+        yield build(titles, seqs, quals)
+
+
+def _mate_names(titles):
+    """Return the read names from a list of titles, without any /1 or /2 (PRIVATE)."""
+    names = [title.split(None, 1)[0] if title else b"" for title in titles]
+    return [name[:-2] if name[-2:] in (b"/1", b"/2") else name
+            for name in names]
+
+
+def _paired_fastq_blocks(handle1, handle2, chunk_size):
+    """Parse two binary FASTQ handles in lockstep (PRIVATE).
+
+    Yields pairs of blocks (each a tuple of three lists, as from the
+    _fastq_bytes_blocks function) holding the same number of reads,
+    after checking the mate names agree. Raises a ValueError if one
+    file has more reads than the other.
+    """
+    iterators = [_fastq_bytes_blocks(handle1, chunk_size),
+                 _fastq_bytes_blocks(handle2, chunk_size)]
+    pending = [([], [], []), ([], [], [])]
+    while True:
+        for block, iterator in zip(pending, iterators):
+            if not block[0]:
+                for extra in iterator:
+                    if extra[0]:
+                        for column, values in zip(block, extra):
+                            column.extend(values)
+                        break
+        count = min(len(pending[0][0]), len(pending[1][0]))
+        if count and len(pending[0][0]) == len(pending[1][0]):
+            # Usual case when the files have the same line lengths, the
+            # blocks match up without any more copying
+            blocks = pending
+            pending = [([], [], []), ([], [], [])]
+            _check_mate_names(blocks[0][0], blocks[1][0])
+            yield blocks[0], blocks[1]
+            continue
+        if not count:
+            if pending[0][0]:
+                raise ValueError("First FASTQ file has more reads "
+                                 "than the second file.")
+            if pending[1][0]:
+                raise ValueError("Second FASTQ file has more reads "
+                                 "than the first file.")
+            return
+        blocks = []
+        for block in pending:
+            blocks.append(tuple(column[:count] for column in block))
+            for column in block:
+                del column[:count]
+        _check_mate_names(blocks[0][0], blocks[1][0])
+        yield blocks[0], blocks[1]
+
+
+def _interleaved_fastq_blocks(handle, chunk_size):
+    """Parse a binary interleaved FASTQ handle into pairs of blocks (PRIVATE).
+
+    As the _paired_fastq_blocks function, but with the first and second
+    reads of each pair alternating in the one file. Raises a ValueError
+    if there is an odd number of reads.
+    """
+    pending = ([], [], [])
+    for block in _fastq_bytes_blocks(handle, chunk_size):
+        for column, values in zip(pending, block):
+            column.extend(values)
+        count = len(pending[0]) // 2 * 2
+        if not count:
+            continue
+        block1 = tuple(column[0:count:2] for column in pending)
+        block2 = tuple(column[1:count:2] for column in pending)
+        for column in pending:
+            del column[:count]
+        _check_mate_names(block1[0], block2[0])
+        yield block1, block2
+    if pending[0]:
+        raise ValueError("Interleaved FASTQ file has an odd number of reads.")
+
+
+def _mate_names_key(titles):
+    """Return the read names from a list of titles as one string (PRIVATE).
+
+    Equivalent to joining the output of _mate_names with new lines, but
+    faster in the common case of titles without any description.
+    """
+    joined = b"\n".join(titles) + b"\n"
+    if b" " in joined or b"\t" in joined or b"\n\n" in joined:
+        return b"\n".join(_mate_names(titles))
+    for suffix in (b"/1\n", b"/2\n"):
+        if joined.count(suffix) == len(titles):
+            return joined.replace(suffix, b"\n")[:-1]
+        elif suffix in joined:
+            return b"\n".join(_mate_names(titles))
+    return joined[:-1]
+
+
+def _check_mate_names(titles1, titles2):
+    """Raise a ValueError if the names of the paired reads do not match (PRIVATE)."""
+    if _mate_names_key(titles1) != _mate_names_key(titles2):
+        names1 = _mate_names(titles1)
+        names2 = _mate_names(titles2)
+        for name1, name2 in zip(names1, names2):
+            if name1 != name2:
+                raise ValueError("Paired FASTQ reads do not match "
+                                 "(%s vs %s)."
+                                 % (_as_string(name1), _as_string(name2)))
+
+
+def _write_fastq_block(handle, titles, seqs, quals):
+    """Write a block of reads to a binary handle as four line FASTQ (PRIVATE)."""
+    if not titles:
+        return
+    lines = [b"+"] * (4 * len(titles))
+    lines[0::4] = (b"@" + b"\n@".join(titles)).split(b"\n")
+    lines[1::4] = seqs
+    lines[3::4] = quals
+    lines.append(b"")
+    handle.write(b"\n".join(lines))
+
+
+class FastqPipeline(object):
+    """Streaming filter and trim pipeline for FASTQ reads.
+
+    This applies a series of trimming and filtering steps to the reads in
+    a FASTQ file, working directly on the title, sequence and quality
+    strings (as bytes) a block of reads at a time, without making any
+    SeqRecord objects. Each method adding a step returns the pipeline
+    itself, so they can be chained. The steps are applied in the order
+    they were added.
+
+    For example, trim any bases with PHRED quality below 20 from the end of
+    each read, then only keep reads at least 22 bases long, with no more
+    than one ambiguous base, and a mean PHRED quality of at least 24:
+
+    >>> pipeline = FastqPipeline().trim_quality(20).min_length(22)
+    >>> pipeline = pipeline.max_n(1).min_mean_quality(24)
+    >>> pipeline
+    FastqPipeline(['trim_quality', 'min_length', 'max_n', 'min_mean_quality'])
+    >>> with open("Quality/example.fastq", "rb") as handle:
+    ...     for title, seq, qual in pipeline.iterate(handle):
+    ...         print("%s %s" % (title.decode(), seq.decode()))
+    EAS54_6_R1_2_1_413_324 CCCTTCTTGTCTTCAGCGTTTCTCC
+    EAS54_6_R1_2_1_540_792 TTGGCAGGCCAAGGCCGATGGATC
+
+    The third read was rejected as it was too short after trimming. Use the
+    run method to write the reads which pass straight to a new FASTQ file,
+    which returns the number of reads read and written:
+
+    >>> pipeline.run("Quality/example.fastq", "Quality/temp.fastq")
+    (3, 2)
+
+    For paired end data the reads of the two files are processed in
+    lockstep (checking their names match), with the trimming steps applied
+    to each read, but a pair kept only if both reads pass all the filters.
+    See the iterate_paired and run_paired methods.
+
+    >>> import os
+    >>> os.remove("Quality/temp.fastq")
+
+    The input and output files must use binary mode, or be given as
+    filenames. Only four line FASTQ is written, and as with the
+    FastqBytesIterator the input should use the same quality encoding
+    as given by the offset argument (33 for Sanger FASTQ, or 64 for
+    Illumina 1.3 to 1.7 FASTQ), which is used to interpret the quality
+    thresholds.
+    """
+
+    def __init__(self, offset=SANGER_SCORE_OFFSET, chunk_size=1048576):
+        """Create an empty pipeline, which would keep every read as is."""
+        self.offset = offset
+        self.chunk_size = chunk_size
+        # List of (name, kind, function) tuples, where the function
+        # takes lists of the titles, sequences and qualities. Trimming
+        # steps return new sequences and qualities, and filters return a
+        # list of booleans. For pair filters, the function is called at
+        # the start of each run to get a function taking a read count.
+        self._steps = []
+
+    def __repr__(self):
+        """Return a representation of the pipeline, listing the steps."""
+        return "%s(%r)" % (self.__class__.__name__,
+                           [step[0] for step in self._steps])
+
+    def _low_quality(self, threshold):
+        """Return bytes of all the quality characters below threshold (PRIVATE)."""
+        return bytes(bytearray(range(max(0, min(256, self.offset + threshold)))))
+
+    def trim_quality(self, threshold, ends="right"):
+        """Trim bases with a PHRED quality below threshold from the read ends.
+
+        Arguments:
+         - threshold - lowest PHRED quality to keep
+         - ends - "right" (the default) to trim the end of the read, "left"
+           to trim the start, or "both".
+
+        Trimming stops at the first base with a good enough quality.
+        """
+        if ends not in ("left", "right", "both"):
+            raise ValueError("The ends should be 'left', 'right' or 'both'.")
+        low = self._low_quality(threshold)
+
+        def trim(titles, seqs, quals):
+            if ends != "left":
+                quals = [qual.rstrip(low) for qual in quals]
+                seqs = [seq[:len(qual)] for seq, qual in zip(seqs, quals)]
+            if ends != "right":
+                lengths = list(map(len, quals))
+                quals = [qual.lstrip(low) for qual in quals]
+                seqs = [seq[old - len(qual):] for seq, qual, old
+                        in zip(seqs, quals, lengths)]
+            return seqs, quals
+
+        self._steps.append(("trim_quality", "trim", trim))
+        return self
+
+    def truncate(self, length):
+        """Cut each read down to at most the given length."""
+        def trim(titles, seqs, quals):
+            return ([seq[:length] for seq in seqs],
+                    [qual[:length] for qual in quals])
+
+        self._steps.append(("truncate", "trim", trim))
+        return self
+
+    def min_length(self, length):
+        """Keep only reads with at least the given length."""
+        def keep(titles, seqs, quals):
+            return [len(seq) >= length for seq in seqs]
+
+        self._steps.append(("min_length", "filter", keep))
+        return self
+
+    def max_n(self, count=0):
+        """Keep only reads with at most count ambiguous N bases (default none)."""
+        def keep(titles, seqs, quals):
+            joined = b"".join(seqs)
+            if b"N" not in joined and b"n" not in joined:
+                # Common case, all good
+                return [True] * len(seqs)
+            return [seq.count(b"N") + seq.count(b"n") <= count
+                    for seq in seqs]
+
+        self._steps.append(("max_n", "filter", keep))
+        return self
+
+    def min_mean_quality(self, threshold):
+        """Keep only reads with a mean PHRED quality of at least threshold.
+
+        Empty reads have no mean quality, and are rejected. If NumPy is
+        installed, the means are calculated for the whole block of reads
+        at once (as for the FastqBatch arrays), otherwise read by read.
+        """
+        level = self.offset + threshold
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        # Comparing the totals to the threshold scaled by the lengths
+        # avoids any division.
+        if numpy is None:
+            def keep(titles, seqs, quals):
+                # Summing a bytearray is done in C
+                return [bool(qual) and
+                        sum(bytearray(qual)) >= level * len(qual)
+                        for qual in quals]
+        else:
+            def keep(titles, seqs, quals):
+                if not quals:
+                    return []
+                lengths = numpy.fromiter(map(len, quals), numpy.int64,
+                                         len(quals))
+                starts = numpy.zeros(len(quals), numpy.int64)
+                numpy.cumsum(lengths[:-1], out=starts[1:])
+                # Sum the quality characters of each read in one call, but
+                # numpy.add.reduceat would give empty reads the next value:
+                nonempty = lengths > 0
+                totals = numpy.zeros(len(quals), numpy.int64)
+                if nonempty.any():
+                    scores = numpy.frombuffer(b"".join(quals), numpy.uint8)
+                    totals[nonempty] = numpy.add.reduceat(
+                        scores, starts[nonempty], dtype=numpy.int64)
+                return (nonempty & (totals >= level * lengths)).tolist()
+
+        self._steps.append(("min_mean_quality", "filter", keep))
+        return self
+
+    def subsample(self, fraction, seed=None):
+        """Keep a random subset of the reads (or pairs), roughly the given fraction.
+
+        Give a seed for the random number generator to get the same
+        subset each time the pipeline is used.
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError("The fraction should be between zero and one.")
+
+        def start():
+            rand = random.Random(seed).random
+
+            def keep(count):
+                return [rand() < fraction for i in range(count)]
+            return keep
+
+        self._steps.append(("subsample", "pair", start))
+        return self
+
+    def add_filter(self, function):
+        """Keep only reads where function(title, seq, qual) is true.
+
+        The function is called with the title (without the "@"), sequence
+        and quality string of each read as bytes.
+        """
+        def keep(titles, seqs, quals):
+            return list(map(function, titles, seqs, quals))
+
+        self._steps.append((getattr(function, "__name__", "add_filter"),
+                            "filter", keep))
+        return self
+
+    def _start(self):
+        """Return the list of (kind, function) steps for a new run (PRIVATE)."""
+        return [(kind, function() if kind == "pair" else function)
+                for name, kind, function in self._steps]
+
+    def _process(self, steps, blocks):
+        """Apply the steps to matching blocks of reads (PRIVATE).
+
+        Takes a list of blocks (one per input file, each a tuple of titles,
+        sequences and qualities), and returns the reads kept in the same
+        form, plus the number of reads (or pairs) before filtering.
+        """
+        blocks = [list(block) for block in blocks]
+        total = len(blocks[0][0])
+        for kind, function in steps:
+            if kind == "trim":
+                for block in blocks:
+                    block[1], block[2] = function(*block)
+                continue
+            if kind == "pair":
+                mask = function(len(blocks[0][0]))
+            else:
+                mask = function(*blocks[0])
+                for block in blocks[1:]:
+                    mask = list(map(operator.and_, mask, function(*block)))
+            if all(mask):
+                continue
+            for block in blocks:
+                block[:] = [list(compress(column, mask)) for column in block]
+        return blocks, total
+
+    def iterate(self, handle):
+        """Iterate over the reads passing the pipeline as bytes tuples.
+
+        Yields (title, sequence, quality) tuples like the FastqBytesIterator.
+        """
+        steps = self._start()
+        with as_handle(handle, "rb") as in_handle:
+            for block in _fastq_bytes_blocks(in_handle, self.chunk_size):
+                (block,), total = self._process(steps, [block])
+                for read in zip(*block):
+                    yield read
+
+    def iterate_paired(self, handle1, handle2):
+        """Iterate over the read pairs passing the pipeline.
+
+        Yields tuples of two (title, sequence, quality) tuples. A ValueError
+        is raised if the read names do not match, or one file has more reads
+        than the other.
+        """
+        steps = self._start()
+        with as_handle(handle1, "rb") as in1:
+            with as_handle(handle2, "rb") as in2:
+                for blocks in _paired_fastq_blocks(in1, in2, self.chunk_size):
+                    (block1, block2), total = self._process(steps, blocks)
+                    for pair in zip(zip(*block1), zip(*block2)):
+                        yield pair
+
+    def run(self, in_handle, out_handle):
+        """Filter a FASTQ file, writing the reads which pass to another.
+
+        Returns a tuple of the number of reads read and written.
+        """
+        steps = self._start()
+        count = written = 0
+        with as_handle(in_handle, "rb") as in_handle:
+            with as_handle(out_handle, "wb") as out_handle:
+                for block in _fastq_bytes_blocks(in_handle, self.chunk_size):
+                    (block,), total = self._process(steps, [block])
+                    count += total
+                    written += len(block[0])
+                    _write_fastq_block(out_handle, *block)
+        return count, written
+
+    def run_paired(self, in_handle1, in_handle2, out_handle1, out_handle2):
+        """Filter a pair of FASTQ files, writing the pairs which pass to two others.
+
+        Returns a tuple of the number of pairs read and written.
+        """
+        steps = self._start()
+        count = written = 0
+        with as_handle(in_handle1, "rb") as in1, \
+                as_handle(in_handle2, "rb") as in2, \
+                as_handle(out_handle1, "wb") as out1, \
+                as_handle(out_handle2, "wb") as out2:
+            for blocks in _paired_fastq_blocks(in1, in2, self.chunk_size):
+                (block1, block2), total = self._process(steps, blocks)
+                count += total
+                written += len(block1[0])
+                _write_fastq_block(out1, *block1)
+                _write_fastq_block(out2, *block2)
+        return count, written
+
+
+class _LazyFastqRecord(_LazyFastaRecord):
+    """SeqRecord for a FASTQ entry, decoded only as needed (PRIVATE).
+
+    As for the lazy FASTA records, but also holding the raw quality string
+    as bytes from the _fastq_bytes_blocks parser. The quality is only turned
+    into a LetterAnnotationArray of integers (under the given key of the
+    per-letter-annotation dictionary) when first accessed.
+
+    The settings are a tuple of the alphabet, quality offset and key, shared
+    by all the records from a file.
+    """
+
+    _parsed_attributes = ("_sequence", "_quality", "_settings")
+
+    def __init__(self, id, name, description, sequence, quality, settings):
+        """Create a SeqRecord from the names, sequence and quality bytes."""
+        self.id = id
+        self.name = name
+        self.description = description
+        self._sequence = sequence
+        self._quality = quality
+        self._settings = settings
+
+    def _make_letter_annotations(self):
+        """Return the per-letter-annotation dictionary (PRIVATE)."""
+        annotations = _RestrictedDict(length=len(self._sequence))
+        offset, key = self._settings[1:]
+        # Solexa scores can be negative, so need a signed array:
+        typecode = "b" if key == "solexa_quality" else "B"
+        # Bypassing the length check, as done in FastqGeneralIterator:
+        dict.__setitem__(annotations, key,
+                         _quality_array(self._quality, offset, typecode))
+        return annotations
+
+
+def _lazy_fastq_records(handle, alphabet, title2ids, offset, key, lowest):
+    """Iterate over FASTQ records as _LazyFastqRecord objects (PRIVATE).
+
+    The quality strings are checked for invalid characters (anything
+    below the lowest allowed score, or above the tilde) at once, a block
+    of records at a time, but are not decoded into arrays of integers.
+    The titles are also decoded and split up a block at a time.
+    """
+    # Deleting all the valid characters should leave nothing, this is
+    # much faster than calling min and max on the qualities:
+    valid = bytes(bytearray(range(offset + lowest, 127)))
+    settings = (alphabet, offset, key)
+    blocks = _fastq_bytes_blocks(_binary_handle(handle), 1048576)
+    for titles, seqs, quals in blocks:
+        ids, names, descriptions = _title_names(_decode_titles(titles),
+                                                title2ids)
+        if not b"".join(quals).translate(None, valid):
+            for record in map(_LazyFastqRecord, ids, names, descriptions,
+                              seqs, quals, repeat(settings)):
+                yield record
+            continue
+        # Give the records before the invalid one, then raise
+        for id, name, descr, seq, qual in zip(ids, names, descriptions,
+                                              seqs, quals):
+            if qual.translate(None, valid):
+                raise ValueError("Invalid character in quality string")
+            yield _LazyFastqRecord(id, name, descr, seq, qual, settings)
+
+
+def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None,
+                       lazy=False):
     """Iterate over FASTQ records as SeqRecord objects.
 
     Arguments:
@@ -964,6 +1863,10 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
        description (in that order) for the record as a tuple of strings.
        If this is not given, then the entire title line will be used as
        the description, and the first word as the id and name.
+     - lazy - Optional boolean, if True the SeqRecord objects only create
+       their sequence and quality scores when first used (see below). The
+       file is then read in large blocks, as in the FastqBytesIterator,
+       rather than line by line.
 
     Note that use of title2ids matches that of Bio.SeqIO.FastaIO.
 
@@ -1016,16 +1919,35 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
     >>> print(record.letter_annotations["phred_quality"])
     [26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 24, 26, 22, 26, 26, 13, 22, 26, 18, 24, 18, 18, 18, 18]
 
+    If you only need some of the record attributes, such as the identifiers
+    or read lengths, the lazy option avoids the cost of building a Seq object
+    and a list of quality scores for every read:
+
+    >>> with open("Quality/example.fastq") as handle:
+    ...     for record in FastqPhredIterator(handle, lazy=True):
+    ...         print("%s %i" % (record.id, len(record)))
+    EAS54_6_R1_2_1_413_324 25
+    EAS54_6_R1_2_1_540_792 25
+    EAS54_6_R1_2_1_443_348 25
+
+    These records otherwise behave like normal SeqRecord objects, decoding
+    the sequence and quality scores when first accessed:
+
+    >>> print(record.letter_annotations["phred_quality"])
+    [26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 24, 26, 22, 26, 26, 13, 22, 26, 18, 24, 18, 18, 18, 18]
+
     """
     assert SANGER_SCORE_OFFSET == ord("!")
-    # Originally, I used a list expression for each record:
-    #
-    # qualities = [ord(letter)-SANGER_SCORE_OFFSET for letter in quality_string]
-    #
-    # Precomputing is faster, perhaps partly by avoiding the subtractions.
-    q_mapping = dict()
-    for letter in range(0, 255):
-        q_mapping[chr(letter)] = letter - SANGER_SCORE_OFFSET
+    if lazy:
+        for record in _lazy_fastq_records(handle, alphabet, title2ids,
+                                          SANGER_SCORE_OFFSET, "phred_quality",
+                                          0):
+            yield record
+        return
+    # The qualities are decoded into an array of bytes (using a translation
+    # table to remove the offset), after stripping all the valid characters
+    # to check for anything invalid (much faster than calling min and max).
+    valid = "".join(chr(i) for i in range(SANGER_SCORE_OFFSET, 127))
     for title_line, seq_string, quality_string in FastqGeneralIterator(handle):
         if title2ids:
             id, name, descr = title2ids(title_line)
@@ -1035,9 +1957,9 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
             name = id
         record = SeqRecord(Seq(seq_string, alphabet),
                            id=id, name=name, description=descr)
-        qualities = [q_mapping[letter] for letter in quality_string]
-        if qualities and (min(qualities) < 0 or max(qualities) > 93):
+        if quality_string.strip(valid):
             raise ValueError("Invalid character in quality string")
+        qualities = _quality_array(quality_string, SANGER_SCORE_OFFSET)
         # For speed, will now use a dirty trick to speed up assigning the
         # qualities. We do this to bypass the length check imposed by the
         # per-letter-annotations restricted dict (as this has already been
@@ -1048,7 +1970,8 @@ def FastqPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
         yield record
 
 
-def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
+def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None,
+                        lazy=False):
     r"""Parse old Solexa/Illumina FASTQ like files (which differ in the quality mapping).
 
     The optional arguments are the same as those for the FastqPhredIterator.
@@ -1182,9 +2105,14 @@ def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None)
     As shown above, the poor quality Solexa reads have been mapped to the
     equivalent PHRED score (e.g. -5 to 1 as shown earlier).
     """
-    q_mapping = dict()
-    for letter in range(0, 255):
-        q_mapping[chr(letter)] = letter - SOLEXA_SCORE_OFFSET
+    if lazy:
+        for record in _lazy_fastq_records(handle, alphabet, title2ids,
+                                          SOLEXA_SCORE_OFFSET, "solexa_quality",
+                                          -5):
+            yield record
+        return
+    # Solexa scores go down to -5, as ASCII 59 (the semi-colon):
+    valid = "".join(chr(i) for i in range(SOLEXA_SCORE_OFFSET - 5, 127))
     for title_line, seq_string, quality_string in FastqGeneralIterator(handle):
         if title2ids:
             id, name, descr = title_line
@@ -1194,10 +2122,10 @@ def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None)
             name = id
         record = SeqRecord(Seq(seq_string, alphabet),
                            id=id, name=name, description=descr)
-        qualities = [q_mapping[letter] for letter in quality_string]
-        # DO NOT convert these into PHRED qualities automatically!
-        if qualities and (min(qualities) < -5 or max(qualities) > 62):
+        if quality_string.strip(valid):
             raise ValueError("Invalid character in quality string")
+        # DO NOT convert these into PHRED qualities automatically!
+        qualities = _quality_array(quality_string, SOLEXA_SCORE_OFFSET, "b")
         # Dirty trick to speed up this line:
         # record.letter_annotations["solexa_quality"] = qualities
         dict.__setitem__(record._per_letter_annotations,
@@ -1205,7 +2133,8 @@ def FastqSolexaIterator(handle, alphabet=single_letter_alphabet, title2ids=None)
         yield record
 
 
-def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
+def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=None,
+                          lazy=False):
     """Parse Illumina 1.3 to 1.7 FASTQ like files (which differ in the quality mapping).
 
     The optional arguments are the same as those for the FastqPhredIterator.
@@ -1234,9 +2163,13 @@ def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=Non
 
     NOTE - True Sanger style FASTQ files use PHRED scores with an offset of 33.
     """
-    q_mapping = dict()
-    for letter in range(0, 255):
-        q_mapping[chr(letter)] = letter - SOLEXA_SCORE_OFFSET
+    if lazy:
+        for record in _lazy_fastq_records(handle, alphabet, title2ids,
+                                          SOLEXA_SCORE_OFFSET, "phred_quality",
+                                          0):
+            yield record
+        return
+    valid = "".join(chr(i) for i in range(SOLEXA_SCORE_OFFSET, 127))
     for title_line, seq_string, quality_string in FastqGeneralIterator(handle):
         if title2ids:
             id, name, descr = title2ids(title_line)
@@ -1246,9 +2179,9 @@ def FastqIlluminaIterator(handle, alphabet=single_letter_alphabet, title2ids=Non
             name = id
         record = SeqRecord(Seq(seq_string, alphabet),
                            id=id, name=name, description=descr)
-        qualities = [q_mapping[letter] for letter in quality_string]
-        if qualities and (min(qualities) < 0 or max(qualities) > 62):
+        if quality_string.strip(valid):
             raise ValueError("Invalid character in quality string")
+        qualities = _quality_array(quality_string, SOLEXA_SCORE_OFFSET)
         # Dirty trick to speed up this line:
         # record.letter_annotations["phred_quality"] = qualities
         dict.__setitem__(record._per_letter_annotations,
@@ -1357,6 +2290,13 @@ def QualPhredIterator(handle, alphabet=single_letter_alphabet, title2ids=None):
                            "substituting PHRED zero instead.")
                           % min(qualities), BiopythonParserWarning)
             qualities = [max(0, q) for q in qualities]
+        if not qualities or max(qualities) < 256:
+            qualities = LetterAnnotationArray("B", qualities)
+        elif max(qualities) < 65536:
+            # Scores over 255 can't be held as bytes
+            qualities = LetterAnnotationArray("H", qualities)
+        else:
+            qualities = LetterAnnotationArray("L", qualities)
 
         # Return the record and then continue...
         record = SeqRecord(UnknownSeq(len(qualities), alphabet),
@@ -1905,6 +2845,164 @@ def PairedFastaQualIterator(fasta_handle, qual_handle, alphabet=single_letter_al
     # Done
 
 
+def PairedFastqIterator(handle1, handle2=None, as_records=False,
+                        alphabet=single_letter_alphabet, chunk_size=1048576):
+    r"""Iterate over paired end FASTQ reads, from two files or one interleaved file.
+
+    Arguments:
+     - handle1 - input file of the first reads in each pair, or of both
+       reads in each pair if handle2 is omitted (an interleaved file).
+     - handle2 - optional input file of the second reads in each pair.
+     - as_records - boolean, return SeqRecord objects rather than tuples.
+     - alphabet - optional alphabet, used with as_records.
+     - chunk_size - size of the blocks read from the handles.
+
+    The handles must be opened in binary mode (or given as filenames), and
+    are read in large blocks using the same parser as the FastqBytesIterator
+    function. For example, here is a tiny interleaved file:
+
+    >>> from io import BytesIO
+    >>> handle = BytesIO(b"@read1/1\nACGT\n+\nIIII\n@read1/2\nTTGCA\n+\nIIIII\n"
+    ...                  b"@read2/1\nGGCC\n+\n!!II\n@read2/2\nAAT\n+\nI5I\n")
+    >>> for read1, read2 in PairedFastqIterator(handle):
+    ...     print("%s %s %s" % (read1[0].decode(), read1[1].decode(),
+    ...                         read2[1].decode()))
+    read1/1 ACGT TTGCA
+    read2/1 GGCC AAT
+
+    By default each pair is given as two (title, sequence, quality) tuples
+    of bytes, as from the FastqBytesIterator. Alternatively you can ask for
+    SeqRecord objects, using Sanger style PHRED qualities. These are only
+    fully decoded when needed, as in the lazy mode of FastqPhredIterator:
+
+    >>> handle.seek(0)
+    0
+    >>> for record1, record2 in PairedFastqIterator(handle, as_records=True):
+    ...     print("%s %s" % (record2.id, record2.letter_annotations["phred_quality"]))
+    read1/2 [40, 40, 40, 40, 40]
+    read2/2 [40, 20, 40]
+
+    The names of the reads in each pair are checked to agree (ignoring any
+    trailing /1 or /2 on the identifier), and a ValueError is raised if they
+    do not match, or if one file has more reads than the other (or there is
+    an odd number of reads in an interleaved file).
+
+    See also the PairedFastqWriter class.
+    """
+    with as_handle(handle1, "rb") as in1:
+        if handle2 is None:
+            blocks = _interleaved_fastq_blocks(in1, chunk_size)
+            for pair in _paired_fastq_reads(blocks, as_records, alphabet):
+                yield pair
+        else:
+            with as_handle(handle2, "rb") as in2:
+                blocks = _paired_fastq_blocks(in1, in2, chunk_size)
+                for pair in _paired_fastq_reads(blocks, as_records, alphabet):
+                    yield pair
+
+
+def _paired_fastq_reads(blocks, as_records, alphabet):
+    """Turn pairs of blocks of reads into pairs of tuples or records (PRIVATE)."""
+    if not as_records:
+        for block1, block2 in blocks:
+            for pair in zip(zip(*block1), zip(*block2)):
+                yield pair
+        return
+    # All the printable ASCII characters are valid Sanger qualities
+    valid = bytes(bytearray(range(SANGER_SCORE_OFFSET, 127)))
+    settings = (alphabet, SANGER_SCORE_OFFSET, "phred_quality")
+    for pair in blocks:
+        reads = []
+        for titles, seqs, quals in pair:
+            if b"".join(quals).translate(None, valid):
+                raise ValueError("Invalid character in quality string")
+            ids, names, descriptions = _title_names(_decode_titles(titles),
+                                                    None)
+            reads.append(list(map(_LazyFastqRecord, ids, names, descriptions,
+                                  seqs, quals, repeat(settings))))
+        for pair in zip(*reads):
+            yield pair
+
+
+class PairedFastqWriter(object):
+    r"""Write paired end reads to two FASTQ files, or one interleaved file.
+
+    This is the counterpart to the PairedFastqIterator function, taking
+    the output handle for the first reads in each pair, and optionally a
+    second handle for the second reads (otherwise the pairs are interleaved
+    in the first handle). The handles must be opened in binary mode.
+
+    >>> from io import BytesIO
+    >>> pairs = [((b"read1/1", b"ACGT", b"IIII"), (b"read1/2", b"TTGCA", b"IIIII")),
+    ...          ((b"read2/1", b"GGCC", b"!!II"), (b"read2/2", b"AAT", b"I5I"))]
+    >>> handle = BytesIO()
+    >>> PairedFastqWriter(handle).write_pairs(pairs)
+    2
+    >>> print(handle.getvalue().decode())
+    @read1/1
+    ACGT
+    +
+    IIII
+    @read1/2
+    TTGCA
+    +
+    IIIII
+    @read2/1
+    GGCC
+    +
+    !!II
+    @read2/2
+    AAT
+    +
+    I5I
+    <BLANKLINE>
+
+    Each read can be given as a (title, sequence, quality) tuple of bytes
+    (or strings) as used by the PairedFastqIterator, or as a SeqRecord
+    with PHRED qualities, which is written in Sanger FASTQ format.
+    """
+
+    def __init__(self, handle1, handle2=None):
+        """Initialize the class."""
+        self.handle1 = handle1
+        self.handle2 = handle2
+
+    def _format_read(self, read):
+        """Return a read as a FASTQ entry in bytes (PRIVATE)."""
+        if isinstance(read, SeqRecord):
+            return _as_bytes(as_fastq(read))
+        title, seq, qual = read
+        if not isinstance(title, bytes):
+            title = _as_bytes(title)
+            seq = _as_bytes(seq)
+            qual = _as_bytes(qual)
+        if len(seq) != len(qual):
+            raise ValueError("Sequence and quality lengths differ for %s"
+                             % _as_string(title))
+        return b"".join([b"@", title, b"\n", seq, b"\n+\n", qual, b"\n"])
+
+    def write_pairs(self, pairs):
+        """Write the pairs of reads, returning the number of pairs written."""
+        count = 0
+        pairs = iter(pairs)
+        while True:
+            block = list(islice(pairs, 1000))
+            if not block:
+                break
+            count += len(block)
+            reads1 = [self._format_read(read1) for read1, read2 in block]
+            reads2 = [self._format_read(read2) for read1, read2 in block]
+            if self.handle2 is None:
+                reads = [None] * (2 * len(block))
+                reads[0::2] = reads1
+                reads[1::2] = reads2
+                self.handle1.write(b"".join(reads))
+            else:
+                self.handle1.write(b"".join(reads1))
+                self.handle2.write(b"".join(reads2))
+        return count
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
     run_doctest(verbose=0)
@@ -36,7 +36,7 @@ including the PHRED quality scores.
     E3MFGYR02F7Z7G 219
     >>> print("%s..." % record.seq[:10])
     tcagAATCAT...
-    >>> print("%r..." % (record.letter_annotations["phred_quality"][:10]))
+    >>> print("%s..." % (record.letter_annotations["phred_quality"][:10]))
     [22, 21, 23, 28, 26, 15, 12, 21, 28, 21]...
 
 Notice that the sequence is given in mixed case, the central upper case region
@@ -118,7 +118,7 @@ example above:
     E3MFGYR02F7Z7G 130
     >>> print("%s..." % record.seq[:10])
     AATCATCCAC...
-    >>> print("%r..." % record.letter_annotations["phred_quality"][:10])
+    >>> print("%s..." % record.letter_annotations["phred_quality"][:10])
     [26, 15, 12, 21, 28, 21, 36, 28, 27, 27]...
     >>> len(record.annotations)
     3
@@ -238,7 +238,7 @@ from __future__ import print_function
 from Bio.SeqIO.Interfaces import SequenceWriter
 from Bio import Alphabet
 from Bio.Seq import Seq
-from Bio.SeqRecord import SeqRecord
+from Bio.SeqRecord import SeqRecord, LetterAnnotationArray
 import struct
 import sys
 import re
@@ -625,7 +625,10 @@ def _sff_read_seq_record(handle, number_of_flows_per_read, flow_chars,
     temp_fmt = ">%iB" % seq_len  # used for flow index and quals
     flow_index = handle.read(seq_len)  # unpack later if needed
     seq = _bytes_to_string(handle.read(seq_len))  # TODO - Use bytes in Seq?
-    quals = list(struct.unpack(temp_fmt, handle.read(seq_len)))
+    quals = handle.read(seq_len)
+    if len(quals) != seq_len:
+        raise ValueError("Premature end of file in SFF read %s" % name)
+    quals = LetterAnnotationArray("B", quals)
     # now any padding...
     padding = (read_flow_size + seq_len * 3) % 8
     if padding:
@@ -660,7 +663,7 @@ def _sff_read_seq_record(handle, number_of_flows_per_read, flow_chars,
             warnings.warn("Overlapping clip values in SFF record, trimmed to nothing",
                           BiopythonParserWarning)
             seq = ""
-            quals = []
+            quals = quals[:0]
         else:
             seq = seq[clip_left:clip_right].upper()
             quals = quals[clip_left:clip_right]
@@ -1303,10 +1306,19 @@ class SffWriter(SequenceWriter):
         read_flow_fmt = ">%iH" % self._number_of_flows_per_read
         read_flow_size = struct.calcsize(read_flow_fmt)
         temp_fmt = ">%iB" % seq_len  # used for flow index and quals
+        if isinstance(quals, LetterAnnotationArray) and quals.typecode == "B":
+            # As from the parser, already held as bytes
+            if hasattr(quals, "tobytes"):
+                qual_data = quals.tobytes()
+            else:
+                # Python 2
+                qual_data = quals.tostring()
+        else:
+            qual_data = struct.pack(temp_fmt, *quals)
         data += (struct.pack(read_flow_fmt, *flow_values)
                  + struct.pack(temp_fmt, *flow_index)
                  + seq
-                 + struct.pack(temp_fmt, *quals))
+                 + qual_data)
         # now any final padding...
         padding = (read_flow_size + seq_len * 3) % 8
         if padding:
@@ -0,0 +1,195 @@
+# Copyright 2018 by the Biopython developers.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Bio.SeqIO support for the UCSC "twobit" (.2bit) file format.
+
+This module is for reading and writing .2bit files as SeqRecord objects,
+and is expected to be used via the Bio.SeqIO API.
+
+The .2bit format from the UCSC Genome Browser stores DNA sequences using
+two bits per base, with any runs of N and any masked (lower case) regions
+recorded separately. It is used for whole genomes, see for example:
+http://hgdownload.soe.ucsc.edu/goldenPath/hg38/bigZips/
+
+The file format is described at:
+https://genome.ucsc.edu/FAQ/FAQformat.html#format7
+
+The sequences are loaded as PackedSeq objects, so still use two bits per
+base in memory:
+
+>>> from Bio import SeqIO
+>>> with open("GenBank/NC_005816.fna") as handle:
+...     record = SeqIO.read(handle, "fasta")
+...
+>>> from io import BytesIO
+>>> handle = BytesIO()
+>>> SeqIO.write(record, handle, "twobit")
+1
+>>> handle.seek(0)
+0
+>>> record = SeqIO.read(handle, "twobit")
+>>> print(record.id)
+gi|45478711|ref|NC_005816.1|
+>>> record.seq
+PackedSeq('TGTAACGAACGGTGCAATAGTGATCCACACCCAACGCCTGAAATCAGATCCAGG...CTG', DNAAlphabet())
+
+Only the record identifiers and sequences are stored, and the sequences
+can only contain the letters A, C, G, T and N (in upper or lower case).
+"""
+
+from __future__ import print_function
+
+import struct
+import sys
+from array import array
+
+from Bio._py3k import _as_bytes, _bytes_to_string
+
+from Bio import Alphabet
+from Bio.Seq import PackedSeq, _packed_seq
+from Bio.SeqRecord import SeqRecord
+from .Interfaces import SequenceWriter
+
+
+_signature = 0x1A412743
+
+
+def _read(handle, size):
+    """Read exactly size bytes from the handle (PRIVATE)."""
+    data = handle.read(size)
+    if len(data) != size:
+        raise ValueError("Premature end of file")
+    return data
+
+
+def _read_array(handle, count, endian):
+    """Read an array of unsigned 32 bit integers (PRIVATE)."""
+    values = array("I")
+    data = _read(handle, 4 * count)
+    if hasattr(values, "frombytes"):
+        values.frombytes(data)
+    else:
+        # Python 2
+        values.fromstring(data)
+    if endian != ("<" if sys.byteorder == "little" else ">"):
+        values.byteswap()
+    return values
+
+
+def _read_blocks(handle, endian):
+    """Read the start and end arrays for a list of blocks (PRIVATE)."""
+    count, = struct.unpack(endian + "I", _read(handle, 4))
+    starts = _read_array(handle, count, endian)
+    sizes = _read_array(handle, count, endian)
+    return (array("l", starts),
+            array("l", (start + size for start, size in zip(starts, sizes))))
+
+
+def TwoBitIterator(handle, alphabet=Alphabet.generic_dna):
+    """Iterate over the records in a .2bit file, yielding SeqRecord objects.
+
+    Arguments:
+     - handle - input file, opened in binary mode (and supporting seek).
+     - alphabet - optional alphabet, by default generic DNA.
+
+    Each sequence is a PackedSeq object using two bits per base.
+    """
+    data = handle.read(16)
+    if not data:
+        # Empty file, no records
+        return
+    if len(data) < 16:
+        raise ValueError("Premature end of file")
+    for endian in "<>":
+        if struct.unpack(endian + "I", data[:4])[0] == _signature:
+            break
+    else:
+        raise ValueError("Not a .2bit file, signature %r" % data[:4])
+    version, count, reserved = struct.unpack(endian + "3I", data[4:])
+    if version == 0:
+        offset_format = endian + "I"
+    elif version == 1:
+        # Allows files over 4GB
+        offset_format = endian + "Q"
+    else:
+        raise ValueError("Unsupported .2bit file version %i" % version)
+    offset_size = struct.calcsize(offset_format)
+    index = []
+    for i in range(count):
+        size = ord(_read(handle, 1))
+        name = _bytes_to_string(_read(handle, size))
+        offset, = struct.unpack(offset_format, _read(handle, offset_size))
+        index.append((name, offset))
+    for name, offset in index:
+        handle.seek(offset)
+        length, = struct.unpack(endian + "I", _read(handle, 4))
+        n_blocks = _read_blocks(handle, endian)
+        mask_blocks = _read_blocks(handle, endian)
+        _read(handle, 4)  # reserved
+        packed = handle.read((length + 3) // 4)
+        if len(packed) != (length + 3) // 4:
+            raise ValueError("Premature end of file in %s" % name)
+        seq = _packed_seq(packed, 2, length, n_blocks, mask_blocks, alphabet)
+        yield SeqRecord(seq, id=name, name=name, description="")
+
+
+def _blocks_data(blocks):
+    """Return the block count, starts and sizes as bytes (PRIVATE)."""
+    return struct.pack("<%iI" % (1 + 2 * len(blocks)), len(blocks),
+                       *([s for s, e in blocks] + [e - s for s, e in blocks]))
+
+
+class TwoBitWriter(SequenceWriter):
+    """Write .2bit files (little endian, as done by the UCSC tools)."""
+
+    def write_file(self, records):
+        """Use this to write an entire file containing the given records.
+
+        As the file starts with an index of all the records, these are
+        first packed in memory. Returns the number of records written.
+        Sequences with letters other than A, C, G, T and N are rejected
+        with a ValueError.
+        """
+        names = []
+        blocks = []
+        for record in records:
+            seq = record.seq
+            if not isinstance(seq, PackedSeq) or seq.bits != 2:
+                seq = PackedSeq(self._get_seq_string(record), bits=2)
+            name = _as_bytes(record.id)
+            if not 0 < len(name) < 256:
+                raise ValueError("Record identifiers must have 1 to 255 "
+                                 "characters, not %r" % record.id)
+            packed, n_blocks, mask_blocks = seq._parts()
+            names.append(name)
+            blocks.append(b"".join([struct.pack("<I", len(seq)),
+                                    _blocks_data(n_blocks),
+                                    _blocks_data(mask_blocks),
+                                    struct.pack("<I", 0)]))
+            blocks.append(packed)
+        count = len(names)
+        # Files over 4GB need 64 bit offsets
+        offset = 16 + 5 * count + sum(len(name) for name in names)
+        if offset + sum(len(block) for block in blocks) < 2 ** 32:
+            version = 0
+            offset_format = "<I"
+        else:
+            version = 1
+            offset_format = "<Q"
+            offset += 4 * count
+        self.handle.write(struct.pack("<4I", _signature, version, count, 0))
+        for i, name in enumerate(names):
+            self.handle.write(struct.pack("<B", len(name)) + name +
+                              struct.pack(offset_format, offset))
+            offset += len(blocks[2 * i]) + len(blocks[2 * i + 1])
+        for block in blocks:
+            self.handle.write(block)
+        return count
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest(verbose=0)
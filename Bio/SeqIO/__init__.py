@@ -311,6 +311,8 @@ names are also used in Bio.AlignIO and include the following:
       line holds a record's identifier and sequence. For example,
       this is used as by Aligent's eArray software when saving
       microarray probes in a minimal tab delimited text file.
+    - twobit  - The UCSC .2bit format, storing DNA using two bits per base
+      (with runs of N and lower case masking recorded separately).
     - qual    - A "FASTA like" format holding PHRED quality values from
       sequencing DNA, but no actual sequences (usually provided
       in separate FASTA files).
@@ -326,6 +328,9 @@ making up each alignment as SeqRecords.
 """
 
 from __future__ import print_function
+
+from functools import partial
+
 from Bio._py3k import basestring
 
 # TODO
@@ -387,6 +392,7 @@ from . import SeqXmlIO
 from . import SffIO
 from . import SwissIO
 from . import TabIO
+from . import TwoBitIO
 from . import QualityIO  # FastQ and qual files
 from . import UniprotIO
 
@@ -428,6 +434,7 @@ _FormatToIterator = {"fasta": FastaIO.FastaIterator,
                      "seqxml": SeqXmlIO.SeqXmlIterator,
                      "abi": AbiIO.AbiIterator,
                      "abi-trim": AbiIO._AbiTrimIterator,
+                     "twobit": TwoBitIO.TwoBitIterator,
                      }
 
 _FormatToString = {
@@ -459,9 +466,10 @@ _FormatToWriter = {"fasta": FastaIO.FastaWriter,
                    "sff": SffIO.SffWriter,
                    "seqxml": SeqXmlIO.SeqXmlWriter,
                    "pir": PirIO.PirWriter,
+                   "twobit": TwoBitIO.TwoBitWriter,
                    }
 
-_BinaryFormats = ["sff", "sff-trim", "abi", "abi-trim", "seqxml"]
+_BinaryFormats = ["sff", "sff-trim", "abi", "abi-trim", "seqxml", "twobit"]
 
 
 def write(sequences, handle, format):
@@ -775,7 +783,8 @@ def to_dict(sequences, key_function=None):
     return d
 
 
-def index(filename, format, alphabet=None, key_function=None):
+def index(filename, format, alphabet=None, key_function=None, cache=False,
+          lazy=False):
     """Indexes a sequence file and returns a dictionary like object.
 
     Arguments:
@@ -787,6 +796,11 @@ def index(filename, format, alphabet=None, key_function=None):
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique key for the
        dictionary.
+     - cache - Optional, use True to save the record offsets in a binary
+       cache file next to the indexed file (with the extra extension
+       ".bioidx"), or give the cache filename as a string.
+     - lazy - Optional, use True to give records whose sequence is only read
+       from the file when used (FASTA and GenBank only, see below).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -872,6 +886,48 @@ def index(filename, format, alphabet=None, key_function=None):
     None
     >>> records.close()
 
+    Indexing a large file can be slow, since it must all be scanned to find
+    the records. Using the cache option the record identifiers and offsets
+    are saved to a compact binary file, which is reused next time (provided
+    the size and modification time of the indexed file haven't changed).
+    Reopening the index is then almost instant, with no need for SQLite
+    as in the index_db function. The cache is memory mapped, and looking
+    up a key uses a binary search of the sorted keys.
+
+    >>> import os
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq",
+    ...                       cache="example.fastq.bioidx")
+    >>> print(records["EAS54_6_R1_2_1_540_792"].seq)
+    TTGGCAGGCCAAGGCCGATGGATCA
+    >>> records.close()
+    >>> records = SeqIO.index("Quality/example.fastq", "fastq",
+    ...                       cache="example.fastq.bioidx")
+    >>> len(records)
+    3
+    >>> list(records)
+    ['EAS54_6_R1_2_1_413_324', 'EAS54_6_R1_2_1_540_792', 'EAS54_6_R1_2_1_443_348']
+    >>> records.close()
+    >>> os.remove("example.fastq.bioidx")
+
+    If you only need part of a long sequence, such as a gene from a whole
+    chromosome, the lazy option avoids reading the full sequence into
+    memory. The records then hold a FileSeq object, which works out where
+    the letters are in the file from the (fixed) line lengths, and reads
+    only the region you slice out:
+
+    >>> records = SeqIO.index("GenBank/NC_005816.gb", "genbank", lazy=True)
+    >>> record = records["NC_005816.1"]
+    >>> record.seq
+    FileSeq('TGTAACGAACGGTGCAATAGTGATCCACACCCAACGCCTGAAATCAGATCCAGG...CTG', IUPACAmbiguousDNA())
+    >>> print(record.seq[60:80])
+    TCTGCTCTCCTGATTCAGGA
+    >>> records.close()
+
+    The file must be kept open (i.e. don't close the index) while these
+    sequences are in use. Records where the sequence lines are not of a
+    fixed width, and all records in BGZF compressed files, are loaded as
+    normal.
+
     Another common use case would be indexing an NCBI style FASTA file,
     where you might want to extract the GI number from the FASTA identifier
     to use as the dictionary key.
@@ -900,19 +956,35 @@ def index(filename, format, alphabet=None, key_function=None):
 
     # Map the file format to a sequence iterator:
     from ._index import _FormatToRandomAccess  # Lazy import
-    from Bio.File import _IndexedSeqFileDict
+    from ._index import _FormatToLazyRandomAccess
+    from Bio.File import _IndexedSeqFileDict, _CachedSeqFileDict
     try:
         proxy_class = _FormatToRandomAccess[format]
     except KeyError:
         raise ValueError("Unsupported format %r" % format)
     repr = "SeqIO.index(%r, %r, alphabet=%r, key_function=%r)" \
         % (filename, format, alphabet, key_function)
+    if lazy:
+        try:
+            proxy_class = _FormatToLazyRandomAccess[format]
+        except KeyError:
+            raise ValueError("Format %r not supported with lazy=True" % format)
+        repr = "%s, lazy=True)" % repr[:-1]
+    if cache:
+        if cache is True:
+            cache = filename + ".bioidx"
+        elif not isinstance(cache, basestring):
+            raise TypeError("Need a string for the cache filename (or True)")
+        repr = "%s, cache=%r)" % (repr[:-1], cache)
+        return _CachedSeqFileDict(proxy_class(filename, format, alphabet),
+                                  key_function, repr, "SeqRecord",
+                                  filename, format, cache)
     return _IndexedSeqFileDict(proxy_class(filename, format, alphabet),
                                key_function, repr, "SeqRecord")
 
 
 def index_db(index_filename, filenames=None, format=None, alphabet=None,
-             key_function=None):
+             key_function=None, workers=1, progress=None):
     """Index several sequence files and return a dictionary like object.
 
     The index is stored in an SQLite database rather than in memory (as in the
@@ -931,6 +1003,10 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique
        key for the dictionary.
+     - workers - Optional number of worker processes to use when building
+       a new index of several files (default 1, scan the files in turn).
+     - progress - Optional callback function, called with the filename and
+       number of records after each file has been indexed.
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -958,6 +1034,26 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
     BGZF compressed files are supported, and detected automatically. Ordinary
     GZIP compressed files are not supported.
 
+    Building the index of many files can be sped up using several worker
+    processes to scan the files concurrently, with the results written to
+    the SQLite database by this process. For example, indexing a large set
+    of FASTQ files and reporting progress:
+
+    >>> import glob
+    >>> def report(filename, count):
+    ...     print("Indexed %i records from %s" % (count, filename))
+    >>> files = sorted(glob.glob("Quality/example*.fastq"))
+    >>> records = SeqIO.index_db(":memory:", files, "fastq", workers=2,
+    ...                          progress=report)  # doctest: +SKIP
+    Indexed 3 records from Quality/example.fastq
+    Indexed 3 records from Quality/example_dos.fastq
+    >>> records.close()  # doctest: +SKIP
+
+    The files are added to the index (and reported) in the order given, as
+    without workers. As with any use of the multiprocessing module, on
+    Windows this must be called from within an ``if __name__ == "__main__":``
+    block.
+
     See Also: Bio.SeqIO.index() and Bio.SeqIO.to_dict(), and the Python module
     glob which is useful for building lists of files.
 
@@ -980,22 +1076,92 @@ def index_db(index_filename, filenames=None, format=None, alphabet=None,
                                      isinstance(alphabet, AlphabetEncoder)):
         raise ValueError("Invalid alphabet, %r" % alphabet)
 
-    # Map the file format to a sequence iterator:
-    from ._index import _FormatToRandomAccess  # Lazy import
     from Bio.File import _SQLiteManySeqFilesDict
     repr = ("SeqIO.index_db(%r, filenames=%r, format=%r, alphabet=%r, key_function=%r)"
             % (index_filename, filenames, format, alphabet, key_function))
 
-    def proxy_factory(format, filename=None):
-        """Given a filename returns proxy object, else boolean if format OK."""
-        if filename:
-            return _FormatToRandomAccess[format](filename, format, alphabet)
-        else:
-            return format in _FormatToRandomAccess
+    # Using a partial function (not a closure) so that this can be
+    # pickled for use in worker processes:
+    proxy_factory = partial(_index_db_proxy_factory, alphabet)
 
     return _SQLiteManySeqFilesDict(index_filename, filenames,
                                    proxy_factory, format,
-                                   key_function, repr)
+                                   key_function, repr,
+                                   workers=workers, progress=progress)
+
+
+def _index_db_proxy_factory(alphabet, format, filename=None):
+    """Given a filename returns proxy object, else boolean if format OK (PRIVATE)."""
+    from ._index import _FormatToRandomAccess  # Lazy import
+    if filename:
+        return _FormatToRandomAccess[format](filename, format, alphabet)
+    else:
+        return format in _FormatToRandomAccess
+
+
+def parallel_parse(filename, format, alphabet=None, workers=None, func=None,
+                   ordered=True):
+    """Parse a large sequence file using several worker processes.
+
+    Arguments:
+     - filename - string giving name of file to be parsed
+     - format   - lower case string describing the file format, one of
+       "fasta", "genbank" (or "gb"), "embl", "imgt", or "swiss".
+     - alphabet - optional Alphabet object, useful when the sequence type
+       cannot be automatically inferred from the file itself
+       (e.g. format="fasta")
+     - workers  - optional number of worker processes (default is the
+       number of CPUs).
+     - func     - optional function to call on each SeqRecord in the
+       worker processes, returning the value to give back.
+     - ordered  - return the results in the same order as the records
+       in the file (default), or use False to give them back as soon
+       as they are ready.
+
+    The file is split into byte ranges, each moved forward to start at
+    the next record (e.g. a line starting with ">" for FASTA, or "LOCUS"
+    for GenBank). The worker processes each parse a range at a time, and
+    give back the results of calling func on each record, which this
+    returns as an iterator:
+
+    >>> from Bio import SeqIO
+    >>> lengths = SeqIO.parallel_parse("GenBank/cor6_6.gb", "genbank",
+    ...                                workers=2, func=len)
+    >>> list(lengths)
+    [513, 880, 441, 206, 282, 497]
+
+    Since the results are sent back from the worker processes, doing as
+    much work as possible in func (e.g. extracting a table of features
+    from each GenBank record, rather than returning the whole record) is
+    much faster. The func must be a function which can be pickled, so it
+    must be defined at the top level of a module (not a lambda or nested
+    function). As with any use of the multiprocessing module, on Windows
+    this must be called from within an ``if __name__ == "__main__":``
+    block.
+
+    File formats such as FASTQ where a record start cannot be recognised
+    from a single line are not supported, nor are compressed files.
+    """
+    # Try and give helpful error messages:
+    if not isinstance(filename, basestring):
+        raise TypeError("Need a filename (not a handle)")
+    if not isinstance(format, basestring):
+        raise TypeError("Need a string for the file format (lower case)")
+    if not format:
+        raise ValueError("Format required (lower case string)")
+    if format != format.lower():
+        raise ValueError("Format string '%s' should be lower case" % format)
+    if alphabet is not None and not (isinstance(alphabet, Alphabet) or
+                                     isinstance(alphabet, AlphabetEncoder)):
+        raise ValueError("Invalid alphabet, %r" % alphabet)
+    if workers is None:
+        import multiprocessing
+        workers = multiprocessing.cpu_count()
+    elif workers < 1:
+        raise ValueError("Use workers with a minimum of 1")
+
+    from ._parallel import _parallel_parse  # Lazy import
+    return _parallel_parse(filename, format, alphabet, func, workers, ordered)
 
 
 def convert(in_file, in_format, out_file, out_format, alphabet=None):
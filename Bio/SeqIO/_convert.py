@@ -26,10 +26,20 @@ means that using Bio.SeqIO.convert() may be faster, as well as more convenient.
 All these file format specific optimisations are handled by this (private) module.
 """
 
+import re
+from itertools import repeat
+from operator import itemgetter
+
 from Bio import BiopythonWarning
 from Bio import SeqIO
+from Bio._py3k import _as_bytes, _bytes_to_string
+from Bio._py3k import map, zip
 # NOTE - Lots of lazy imports further on...
 
+# Lines of up to 60 characters of QUAL scores, separated by spaces,
+# and the \x01 characters used to mark the start of each record:
+_qual_lines = re.compile(b"\x01|[^\x01 ][^\x01]{0,59}(?= |\x01|$)")
+
 
 def _genbank_convert_fasta(in_handle, out_handle, alphabet=None):
     """Fast GenBank to FASTA (PRIVATE)."""
@@ -49,42 +59,68 @@ def _embl_convert_fasta(in_handle, out_handle, alphabet=None):
     return SeqIO.write(records, out_handle, "fasta")
 
 
-def _fastq_generic(in_handle, out_handle, mapping):
-    """FASTQ helper function where can't have data loss by truncation (PRIVATE)."""
-    from Bio.SeqIO.QualityIO import FastqGeneralIterator
-    # For real speed, don't even make SeqRecord and Seq objects!
-    count = 0
-    null = chr(0)
-    for title, seq, old_qual in FastqGeneralIterator(in_handle):
-        count += 1
-        # map the qual...
-        qual = old_qual.translate(mapping)
-        if null in qual:
-            raise ValueError("Invalid character in quality string")
-        out_handle.write("@%s\n%s\n+\n%s\n" % (title, seq, qual))
-    return count
+def _fastq_blocks(in_handle):
+    """Parse a FASTQ handle into blocks of records as bytes (PRIVATE).
+
+    Yields tuples of three lists (titles, sequences and qualities, as bytes)
+    from the same parser used by FastqBytesIterator, which raises the same
+    errors as FastqGeneralIterator for malformed files.
+    """
+    from Bio.SeqIO.FastaIO import _binary_handle
+    from Bio.SeqIO.QualityIO import _fastq_bytes_blocks
+    return _fastq_bytes_blocks(_binary_handle(in_handle), 1048576)
 
 
-def _fastq_generic2(in_handle, out_handle, mapping, truncate_char, truncate_msg):
-    """FASTQ helper function where there could be data loss by truncation (PRIVATE)."""
-    from Bio.SeqIO.QualityIO import FastqGeneralIterator
+def _fastq_convert_blocks(in_handle, out_handle, mapping,
+                          truncate_char=None, truncate_msg=None):
+    """Re-encode FASTQ quality strings a block of records at a time (PRIVATE).
+
+    The mapping is a 256 character lookup table from the old quality
+    characters to the new ones, with unexpected characters mapped to null
+    and (optionally) those needing truncation mapped to truncate_char.
+
+    Rather than translating and writing each record in turn, the quality
+    strings of a block of records are joined and translated in one go as
+    bytes, and the whole block is written out at once.
+    """
     # For real speed, don't even make SeqRecord and Seq objects!
+    # Map newline to itself, so it can be used to separate the qualities
+    table = _as_bytes(mapping[:10] + "\n" + mapping[11:])
+    assert len(table) == 256
+    null = b"\x00"
+    if truncate_char:
+        truncate_char = _as_bytes(truncate_char)
     count = 0
-    null = chr(0)
-    for title, seq, old_qual in FastqGeneralIterator(in_handle):
-        count += 1
-        # map the qual...
-        qual = old_qual.translate(mapping)
-        if null in qual:
+    for titles, seqs, quals in _fastq_blocks(in_handle):
+        count += len(titles)
+        quals = b"\n".join(quals).translate(table)
+        if null in quals:
             raise ValueError("Invalid character in quality string")
-        if truncate_char in qual:
-            qual = qual.replace(truncate_char, chr(126))
+        if truncate_char and truncate_char in quals:
+            quals = quals.replace(truncate_char, b"~")
             import warnings
             warnings.warn(truncate_msg, BiopythonWarning)
-        out_handle.write("@%s\n%s\n+\n%s\n" % (title, seq, qual))
+        # Interleave the lines of all the records, and write the lot
+        lines = [b"+"] * (4 * len(titles))
+        lines[0::4] = (b"@" + b"\n@".join(titles)).split(b"\n")
+        lines[1::4] = seqs
+        lines[3::4] = quals.split(b"\n")
+        lines.append(b"")
+        out_handle.write(_bytes_to_string(b"\n".join(lines)))
     return count
 
 
+def _fastq_generic(in_handle, out_handle, mapping):
+    """FASTQ helper function where can't have data loss by truncation (PRIVATE)."""
+    return _fastq_convert_blocks(in_handle, out_handle, mapping)
+
+
+def _fastq_generic2(in_handle, out_handle, mapping, truncate_char, truncate_msg):
+    """FASTQ helper function where there could be data loss by truncation (PRIVATE)."""
+    return _fastq_convert_blocks(in_handle, out_handle, mapping,
+                                 truncate_char, truncate_msg)
+
+
 def _fastq_sanger_convert_fastq_sanger(in_handle, out_handle, alphabet=None):
     """Fast Sanger FASTQ to Sanger FASTQ conversion (PRIVATE).
 
@@ -243,15 +279,21 @@ def _fastq_convert_fasta(in_handle, out_handle, alphabet=None):
     NOTE - This does NOT check the characters used in the FASTQ quality string
     are valid!
     """
-    from Bio.SeqIO.QualityIO import FastqGeneralIterator
     # For real speed, don't even make SeqRecord and Seq objects!
     count = 0
-    for title, seq, qual in FastqGeneralIterator(in_handle):
-        count += 1
-        out_handle.write(">%s\n" % title)
-        # Do line wrapping
-        for i in range(0, len(seq), 60):
-            out_handle.write(seq[i:i + 60] + "\n")
+    for titles, seqs, quals in _fastq_blocks(in_handle):
+        count += len(titles)
+        # Interleave the title lines and the (line wrapped) sequences,
+        lines = [None] * (2 * len(titles))
+        lines[0::2] = (b">" + b"\n>".join(titles)).split(b"\n")
+        lines[1::2] = [b"\n".join([seq[i:i + 60]
+                                   for i in range(0, len(seq), 60)])
+                       for seq in seqs]
+        if not all(seqs):
+            # Empty sequences get no lines at all
+            lines = [line for line in lines if line]
+        lines.append(b"")
+        out_handle.write(_bytes_to_string(b"\n".join(lines)))
     return count
 
 
@@ -264,12 +306,15 @@ def _fastq_convert_tab(in_handle, out_handle, alphabet=None):
     NOTE - This does NOT check the characters used in the FASTQ quality string
     are valid!
     """
-    from Bio.SeqIO.QualityIO import FastqGeneralIterator
     # For real speed, don't even make SeqRecord and Seq objects!
     count = 0
-    for title, seq, qual in FastqGeneralIterator(in_handle):
-        count += 1
-        out_handle.write("%s\t%s\n" % (title.split(None, 1)[0], seq))
+    for titles, seqs, quals in _fastq_blocks(in_handle):
+        count += len(titles)
+        ids = map(itemgetter(0), map(bytes.split, titles, repeat(None),
+                                     repeat(1)))
+        lines = list(map(b"\t".join, zip(ids, seqs)))
+        lines.append(b"")
+        out_handle.write(_bytes_to_string(b"\n".join(lines)))
     return count
 
 
@@ -278,33 +323,53 @@ def _fastq_convert_qual(in_handle, out_handle, mapping):
 
     Mapping should be a dictionary mapping expected ASCII characters from the
     FASTQ quality string to PHRED quality scores (as strings).
+
+    Rather than looking up each quality character in turn, the quality
+    strings of a block of records are joined and translated in one go
+    using three 256 byte lookup tables (a leading space, the tens digit,
+    and the units digit), which are interleaved to give the scores as text.
+    This is then split into lines with a regular expression.
     """
-    from Bio.SeqIO.QualityIO import FastqGeneralIterator
+    # Note even with Sanger encoding max 2 digits, so each character gives
+    # three bytes (with null for a missing tens digit, removed afterwards).
+    # The qualities of each record are preceded by a newline, mapped to \x01.
+    tens = [chr(0)] * 256
+    units = [chr(0)] * 256
+    spaces = [chr(0)] * 256
+    units[10] = chr(1)
+    for ascii, score in mapping.items():
+        assert 1 <= len(score) <= 2
+        if len(score) == 2:
+            tens[ord(ascii)] = score[0]
+        units[ord(ascii)] = score[-1]
+        spaces[ord(ascii)] = " "
+    tens = _as_bytes("".join(tens))
+    units = _as_bytes("".join(units))
+    spaces = _as_bytes("".join(spaces))
+    expected = _as_bytes("".join(mapping) + "\n")
     # For real speed, don't even make SeqRecord and Seq objects!
     count = 0
-    for title, seq, qual in FastqGeneralIterator(in_handle):
-        count += 1
-        out_handle.write(">%s\n" % title)
-        # map the qual... note even with Sanger encoding max 2 digits
-        try:
-            qualities_strs = [mapping[ascii] for ascii in qual]
-        except KeyError:
+    for titles, seqs, quals in _fastq_blocks(in_handle):
+        count += len(titles)
+        quals = b"\n" + b"\n".join(quals)
+        if quals.translate(None, expected):
             raise ValueError("Invalid character in quality string")
-        data = " ".join(qualities_strs)
-        while len(data) > 60:
-            # Know quality scores are either 1 or 2 digits, so there
-            # must be a space in any three consecutive characters.
-            if data[60] == " ":
-                out_handle.write(data[:60] + "\n")
-                data = data[61:]
-            elif data[59] == " ":
-                out_handle.write(data[:59] + "\n")
-                data = data[60:]
-            else:
-                assert data[58] == " ", "Internal logic failure in wrapping"
-                out_handle.write(data[:58] + "\n")
-                data = data[59:]
-        out_handle.write(data + "\n")
+        data = bytearray(3 * len(quals))
+        data[0::3] = quals.translate(spaces)
+        data[1::3] = quals.translate(tens)
+        data[2::3] = quals.translate(units)
+        data = bytes(data).translate(None, b"\x00")
+        # Do line wrapping, with each record's lines following a \x01
+        data = b"\n".join(_qual_lines.findall(data)) + b"\n"
+        data = data.split(b"\x01")[1:]
+        if b"\n" in data:
+            # Empty records still get a blank line
+            data = [b"\n\n" if record == b"\n" else record
+                    for record in data]
+        lines = [None] * (2 * len(titles))
+        lines[0::2] = (b">" + b"\n>".join(titles)).split(b"\n")
+        lines[1::2] = data
+        out_handle.write(_bytes_to_string(b"".join(lines)))
     return count
 
 
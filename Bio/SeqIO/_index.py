@@ -31,11 +31,16 @@ from __future__ import print_function
 import re
 from io import BytesIO
 from Bio._py3k import StringIO
-from Bio._py3k import _bytes_to_string
+from Bio._py3k import _as_bytes, _bytes_to_string
 
 from Bio import SeqIO
 from Bio import Alphabet
+from Bio.Alphabet import single_letter_alphabet
+from Bio.bgzf import BgzfReader
 from Bio.File import _IndexedSeqFileProxy, _open_for_random_access
+from Bio.File import _SequenceLayout
+from Bio.Seq import FileSeq, UnknownSeq
+from Bio.SeqRecord import SeqRecord
 
 
 class SeqFileRandomAccess(_IndexedSeqFileProxy):
@@ -68,6 +73,12 @@ class SeqFileRandomAccess(_IndexedSeqFileProxy):
         # Should be overridden for binary file formats etc:
         return self._parse(StringIO(_bytes_to_string(self.get_raw(offset))))
 
+    def _read(self, offset, size):
+        """Read size bytes from the given offset (PRIVATE)."""
+        handle = self._handle
+        handle.seek(offset)
+        return handle.read(size)
+
 
 ####################
 # Special indexers #
@@ -664,6 +675,126 @@ class FastqRandomAccess(SeqFileRandomAccess):
         return data
 
 
+##################
+# Lazy indexers  #
+##################
+# These give SeqRecord objects where the sequence is a FileSeq, which only
+# reads the letters from the file when used. This needs the lines of each
+# sequence to have a fixed width, so that the file offset of any letter can
+# be calculated. Any record not laid out like this is parsed in full as usual.
+
+class LazyFastaRandomAccess(SequentialSeqFileRandomAccess):
+    """Indexed dictionary like access to a FASTA file, with lazy sequences."""
+
+    def _full_line(self, offset, width):
+        """Is there a sequence line of this width starting at offset (PRIVATE)."""
+        handle = self._handle
+        handle.seek(offset - 1)
+        data = handle.read(width + 1)
+        return (len(data) == width + 1 and data[:1] == b"\n" and
+                data[1:2] != b">" and data.find(b"\n", 1) == width)
+
+    def get(self, offset):
+        """Return SeqRecord, with the sequence read on demand if possible."""
+        handle = self._handle
+        if isinstance(handle, BgzfReader):
+            # The offsets are BGZF virtual offsets, can't do sums with them
+            return SeqFileRandomAccess.get(self, offset)
+        handle.seek(offset)
+        title = handle.readline()
+        start = handle.tell()
+        line = handle.readline()
+        width = len(line)
+        bases = len(line.rstrip(b"\r\n"))
+        if not line.endswith(b"\n") or not bases or line.startswith(b">") \
+                or len(line.split()) != 1:
+            return SeqFileRandomAccess.get(self, offset)
+        # Find the number of full width lines, without reading them all
+        lines = 1
+        step = 1
+        while self._full_line(start + (lines + step - 1) * width, width):
+            lines += step
+            step *= 2
+        while step > 1:
+            step //= 2
+            if self._full_line(start + (lines + step - 1) * width, width):
+                lines += step
+        # Should now have any short final line, then the next record
+        handle.seek(start + lines * width)
+        line = handle.readline()
+        length = lines * bases
+        if line.strip() and not line.startswith(b">"):
+            length += len(line.rstrip(b"\r\n"))
+            if len(line.split()) != 1 or len(line) > width:
+                return SeqFileRandomAccess.get(self, offset)
+            line = handle.readline()
+        while line and not line.startswith(b">"):
+            if line.strip():
+                return SeqFileRandomAccess.get(self, offset)
+            line = handle.readline()
+        title = _bytes_to_string(title[1:].rstrip())
+        try:
+            first_word = title.split(None, 1)[0]
+        except IndexError:
+            first_word = ""
+        layout = _SequenceLayout(self._read, start, bases, width)
+        seq = FileSeq(layout, self._alphabet or single_letter_alphabet,
+                      0, length)
+        return SeqRecord(seq, id=first_word, name=first_word,
+                         description=title)
+
+
+class LazyGenBankRandomAccess(GenBankRandomAccess):
+    """Indexed dictionary like access to a GenBank file, with lazy sequences."""
+
+    def get(self, offset):
+        """Return SeqRecord, with the sequence read on demand if possible."""
+        handle = self._handle
+        if isinstance(handle, BgzfReader):
+            # The offsets are BGZF virtual offsets, can't do sums with them
+            return SeqFileRandomAccess.get(self, offset)
+        handle.seek(offset)
+        lines = [handle.readline()]
+        while not lines[-1].startswith(b"ORIGIN"):
+            line = handle.readline()
+            if not line or line.startswith(b"//") or \
+                    self._marker_re.match(line):
+                # No sequence, e.g. a CONTIG record
+                return SeqFileRandomAccess.get(self, offset)
+            lines.append(line)
+        start = handle.tell()
+        # Parse everything but the sequence, which the parser will
+        # replace with an UnknownSeq of the length on the LOCUS line:
+        lines.append(b"//\n")
+        record = self._parse(StringIO(_bytes_to_string(b"".join(lines))))
+        length = len(record.seq)
+        if not length or not isinstance(record.seq, UnknownSeq):
+            return SeqFileRandomAccess.get(self, offset)
+        if self._alphabet is None and isinstance(
+                Alphabet._get_base_alphabet(record.seq.alphabet),
+                Alphabet.RNAAlphabet):
+            # The parser looks at the sequence to decide if it is really RNA
+            return SeqFileRandomAccess.get(self, offset)
+        # Expect 60 letters per line, in blocks of ten after the position
+        line = handle.readline()
+        width = len(line)
+        if not line.startswith(b"        1 ") or \
+                (length > 60 and len(line.split()) != 7):
+            return SeqFileRandomAccess.get(self, offset)
+        # Check the last line, and the end of record marker after it
+        lines = (length - 1) // 60
+        handle.seek(start + lines * width)
+        line = handle.readline()
+        if not line.startswith(_as_bytes("%9i " % (lines * 60 + 1))) or \
+                len(b"".join(line.split()[1:])) != length - lines * 60 or \
+                not handle.readline().startswith(b"//"):
+            return SeqFileRandomAccess.get(self, offset)
+        layout = _SequenceLayout(self._read, start, 60, width,
+                                 prefix=10, group=10, upper=True)
+        record.seq = FileSeq(layout, record.seq.alphabet, 0, length)
+        return record
+
+
 ###############################################################################
 
 _FormatToRandomAccess = {"ace": SequentialSeqFileRandomAccess,
@@ -686,3 +817,8 @@ _FormatToRandomAccess = {"ace": SequentialSeqFileRandomAccess,
                          "qual": SequentialSeqFileRandomAccess,
                          "uniprot-xml": UniprotRandomAccess,
                          }
+
+_FormatToLazyRandomAccess = {"fasta": LazyFastaRandomAccess,
+                             "genbank": LazyGenBankRandomAccess,
+                             "gb": LazyGenBankRandomAccess,
+                             }
@@ -0,0 +1,156 @@
+# Copyright 2018 by the Biopython developers.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Parallel parsing of large sequence files (PRIVATE).
+
+You are not expected to access this module, or any of its code, directly. This
+is all handled internally by the Bio.SeqIO.parallel_parse(...) function which
+is the public interface for this functionality.
+
+The basic idea is that we split the file into byte ranges, and then move the
+start of each range forward to the next new record marker (a line starting
+with a format specific prefix, such as ">" for FASTA). Each range then holds
+complete records, and can be parsed on its own in a worker process.
+
+This only works for file formats where a record start can be recognised
+from a single line, without any context. It does not work for FASTQ, for
+example, where a quality string line can start with "@".
+"""
+
+from __future__ import print_function
+
+import pickle
+
+from Bio._py3k import StringIO
+from Bio._py3k import _bytes_to_string
+
+from Bio import SeqIO
+
+
+# Line prefixes marking the start of a new record
+_FormatToRecordStart = {"fasta": b">",
+                        "embl": b"ID   ",
+                        "genbank": b"LOCUS ",
+                        "gb": b"LOCUS ",
+                        "imgt": b"ID   ",
+                        "swiss": b"ID   ",
+                        }
+
+# Target size of each byte range; smaller ranges balance the load between
+# the workers better, while larger ranges have less overhead.
+_chunk_size = 16 * 1024 * 1024
+
+
+def _split_file(handle, marker, count):
+    """Split a file into byte ranges starting at record boundaries (PRIVATE).
+
+    Expects a file opened in binary mode. Returns a list of (start, end)
+    offset tuples, with the first range starting at zero (so it includes
+    any file header) and the last ending at the end of the file. Aims for
+    the given count of ranges, but may return fewer if records are large.
+    """
+    handle.seek(0, 2)
+    size = handle.tell()
+    starts = [0]
+    for i in range(1, count):
+        offset = size * i // count
+        if offset <= starts[-1]:
+            continue
+        # Finish the line containing offset - 1, so if offset was
+        # already at the start of a line, we don't skip that line.
+        handle.seek(offset - 1)
+        handle.readline()
+        while True:
+            start = handle.tell()
+            line = handle.readline()
+            if not line:
+                start = size
+                break
+            if line.startswith(marker):
+                break
+        if starts[-1] < start < size:
+            starts.append(start)
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _parse_range(task):
+    """Parse a byte range of a file, and apply the function to each record (PRIVATE).
+
+    Used in the worker processes, returns a list of the function's results
+    (or of the SeqRecord objects if there is no function).
+    """
+    filename, format, alphabet, func, start, end = task
+    with open(filename, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    records = SeqIO.parse(StringIO(_bytes_to_string(data)), format, alphabet)
+    if func is None:
+        return list(records)
+    return [func(record) for record in records]
+
+
+def _parse_range_pickled(task):
+    """Parse a byte range of a file, returning the results pickled (PRIVATE).
+
+    Used in the worker processes. The results are pickled here and unpickled
+    by _parallel_results, rather than by the multiprocessing pool, as if
+    the pool fails to unpickle them its result handler thread dies, leaving
+    the parent process waiting forever rather than raising an exception.
+    """
+    return pickle.dumps(_parse_range(task), pickle.HIGHEST_PROTOCOL)
+
+
+def _parallel_parse(filename, format, alphabet, func, workers, ordered):
+    """Iterate over the results of parsing a file in parallel (PRIVATE).
+
+    See Bio.SeqIO.parallel_parse for details. This is not a generator
+    function, so that an unsupported format or a compressed file is
+    reported here, rather than on first use of the returned iterator.
+    """
+    try:
+        marker = _FormatToRecordStart[format]
+    except KeyError:
+        raise ValueError("Format %r not supported for parallel parsing"
+                         % format)
+    with open(filename, "rb") as handle:
+        if handle.read(2) == b"\x1f\x8b":
+            raise ValueError("Compressed files are not supported for "
+                             "parallel parsing")
+        handle.seek(0, 2)
+        count = max(4 * workers, handle.tell() // _chunk_size + 1)
+        ranges = _split_file(handle, marker, count)
+    tasks = [(filename, format, alphabet, func, start, end)
+             for start, end in ranges]
+    return _parallel_results(tasks, workers, ordered)
+
+
+def _parallel_results(tasks, workers, ordered):
+    """Iterate over the results of parsing the byte ranges of a file (PRIVATE).
+
+    Uses a pool of worker processes, unless there is only one worker.
+    """
+    if workers == 1:
+        for task in tasks:
+            for result in _parse_range(task):
+                yield result
+        return
+    import multiprocessing
+    pool = multiprocessing.Pool(min(workers, len(tasks)))
+    try:
+        if ordered:
+            results = pool.imap(_parse_range_pickled, tasks)
+        else:
+            results = pool.imap_unordered(_parse_range_pickled, tasks)
+        for batch in results:
+            for result in pickle.loads(batch):
+                yield result
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
@@ -9,6 +9,9 @@
 """Represent a Sequence Record, a sequence with annotation."""
 
 
+from array import array
+from bisect import bisect_left, bisect_right
+
 from Bio._py3k import basestring
 
 # NEEDS TO BE SYNCH WITH THE REST OF BIOPYTHON AND BIOPERL
@@ -25,10 +28,10 @@ class _RestrictedDict(dict):
     This simple subclass of the Python dictionary is used in the SeqRecord
     object for holding per-letter-annotations.  This class is intended to
     prevent simple errors by only allowing python sequences (e.g. lists,
-    strings and tuples) to be stored, and only if their length matches that
-    expected (the length of the SeqRecord's seq object).  It cannot however
-    prevent the entries being edited in situ (for example appending entries
-    to a list).
+    strings and tuples, or arrays) to be stored, and only if their length
+    matches that expected (the length of the SeqRecord's seq object).  It
+    cannot however prevent the entries being edited in situ (for example
+    appending entries to a list).
 
     >>> x = _RestrictedDict(5)
     >>> x["test"] = "hello"
@@ -90,6 +93,294 @@ class _RestrictedDict(dict):
             self[key] = value
 
 
+class LetterAnnotationArray(array):
+    """Compact array of integers, e.g. quality scores, for letter_annotations.
+
+    This is a subclass of the Python array (from the array module), which
+    Bio.SeqIO uses for the quality scores when parsing FASTQ, QUAL, SFF and
+    ABI files. Using the typecode "B" (or "b" for signed values, as used for
+    Solexa scores) this takes one byte per letter, rather than the eight or
+    more bytes per entry of a list of integers:
+
+    >>> from Bio.SeqRecord import LetterAnnotationArray
+    >>> quals = LetterAnnotationArray("B", [40, 40, 38, 30, 20])
+    >>> quals
+    LetterAnnotationArray('B', [40, 40, 38, 30, 20])
+
+    To work in place of a list, this prints and compares like a list:
+
+    >>> print(quals)
+    [40, 40, 38, 30, 20]
+    >>> quals == [40, 40, 38, 30, 20]
+    True
+
+    Slicing it, or adding another array or a list, gives a new array:
+
+    >>> quals[1:3]
+    LetterAnnotationArray('B', [40, 38])
+    >>> quals[::-1] + [10, 5]
+    LetterAnnotationArray('B', [20, 30, 38, 40, 40, 10, 5])
+    >>> quals[:2] * 2
+    LetterAnnotationArray('B', [40, 40, 40, 40])
+
+    Adding values which do not fit (e.g. floats) gives a list instead.
+    Unlike a list, values which do not fit can't be stored in the array,
+    so for example quals.append(300) raises an OverflowError.
+    The array supports the buffer protocol, so for quality calculations
+    it can be used as a NumPy array without copying, for example with
+    numpy.frombuffer(quals, numpy.uint8).
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        """Return a string representation of the array for debugging."""
+        return "%s(%r, %r)" % (self.__class__.__name__, self.typecode,
+                               self.tolist())
+
+    def __str__(self):
+        """Return the values as a string, formatted like a list."""
+        return str(self.tolist())
+
+    def __eq__(self, other):
+        """Compare to another array, or to a list."""
+        if isinstance(other, list):
+            return self.tolist() == other
+        return array.__eq__(self, other)
+
+    def __ne__(self, other):
+        """Compare to another array, or to a list."""
+        if isinstance(other, list):
+            return self.tolist() != other
+        return array.__ne__(self, other)
+
+    __hash__ = None
+
+    def __getitem__(self, index):
+        """Return a value, or a slice as a new LetterAnnotationArray."""
+        if isinstance(index, slice):
+            return self.__class__(self.typecode,
+                                  array.__getitem__(self, index))
+        return array.__getitem__(self, index)
+
+    def __getslice__(self, i, j):
+        """Return a slice as a new LetterAnnotationArray (Python 2 only)."""
+        return self.__getitem__(slice(max(0, i), max(0, j)))
+
+    def _as_array(self, other):
+        """Return the other values as an array of the same type (PRIVATE).
+
+        Returns None if they do not fit (e.g. floats, or large values).
+        """
+        if isinstance(other, array) and other.typecode == self.typecode:
+            return other
+        try:
+            return array(self.typecode, other)
+        except (TypeError, OverflowError):
+            return None
+
+    def __add__(self, other):
+        """Join another array or list on to the end of this array."""
+        values = self._as_array(other)
+        if values is None:
+            return self.tolist() + list(other)
+        return self.__class__(self.typecode, array.__add__(self, values))
+
+    def __radd__(self, other):
+        """Join another array or list on to the start of this array."""
+        values = self._as_array(other)
+        if values is None:
+            return list(other) + self.tolist()
+        return self.__class__(self.typecode, array.__add__(values, self))
+
+    def __iadd__(self, other):
+        """Join another array or list on to the end of this array in place.
+
+        If the values do not fit, this gives a list instead (as for adding).
+        """
+        values = self._as_array(other)
+        if values is None:
+            return self.tolist() + list(other)
+        return array.__iadd__(self, values)
+
+    def __mul__(self, count):
+        """Repeat the values, giving a new LetterAnnotationArray."""
+        return self.__class__(self.typecode, array.__mul__(self, count))
+
+    __rmul__ = __mul__
+
+    def __copy__(self):
+        """Return a copy of the array."""
+        return self.__class__(self.typecode, self)
+
+    def __deepcopy__(self, memo):
+        """Return a copy of the array (the values are immutable)."""
+        return self.__class__(self.typecode, self)
+
+
+def _join_letter_annotations(first, second):
+    """Join two per-letter-annotation values end to end (PRIVATE).
+
+    This is usually just first + second, but NumPy arrays must be joined
+    with numpy.concatenate (adding them would sum the values). Plain Python
+    arrays are treated as LetterAnnotationArray objects, so that a list can
+    be added to them.
+    """
+    if hasattr(first, "__array_interface__") \
+            or hasattr(second, "__array_interface__"):
+        import numpy
+        return numpy.concatenate([first, second])
+    if type(first) is array:
+        first = LetterAnnotationArray(first.typecode, first)
+    elif type(second) is array:
+        second = LetterAnnotationArray(second.typecode, second)
+    return first + second
+
+
+class _CachedFeatureIndex(object):
+    """Base class for the indexes of a record's features (PRIVATE).
+
+    These are cached on the SeqRecord, and rebuilt if stale.
+    """
+
+    def __init__(self, features):
+        """Record the SeqFeature objects indexed, and their locations."""
+        self.features = list(features)
+        self.locations = [feature.location for feature in features]
+
+    def stale(self, features):
+        """Check if the features or their locations have changed.
+
+        This checks the list holds the same SeqFeature objects as when
+        indexed, with the same locations. Comparing the lists is quick, as
+        the objects are usually identical.
+        """
+        return features != self.features or \
+            [feature.location for feature in features] != self.locations
+
+
+class _FeatureIndex(_CachedFeatureIndex):
+    """Nested containment list of feature locations for overlap queries (PRIVATE).
+
+    Each part of each feature location is an interval, sorted by start (and
+    longest first). Any interval contained within the previous one is put
+    in that interval's sub-list, so within each list neither the starts nor
+    the ends decrease, and bisection finds the first overlapping interval.
+    See Alekseyenko and Lee (2007), https://doi.org/10.1093/bioinformatics/btl647
+
+    The lists are stored flat, one after another in the same few lists (the
+    top level list first), with the offsets of each interval's sub-list, so
+    that deeply nested features do not give deeply nested containers.
+
+    The whole feature locations are also kept sorted by start, so that
+    slicing a record can find the features within the slice by bisection.
+    """
+
+    def __init__(self, features):
+        """Index the given list of SeqFeature objects."""
+        _CachedFeatureIndex.__init__(self, features)
+        intervals = []
+        for i, feature in enumerate(features):
+            if feature.location is None:
+                continue
+            for part in feature.location.parts:
+                try:
+                    start = int(part.start)
+                    end = int(part.end)
+                except TypeError:
+                    # Unknown position
+                    continue
+                intervals.append((start, end, part.strand, i))
+        intervals.sort(key=lambda interval: (interval[0], -interval[1]))
+        # Find the intervals in each sub-list (in order), using a stack of
+        # the enclosing intervals; None is the key for the top level list.
+        children = {None: []}
+        stack = []
+        for k, (start, end, strand, i) in enumerate(intervals):
+            while stack and intervals[stack[-1]][1] < end:
+                stack.pop()
+            if stack:
+                children.setdefault(stack[-1], []).append(k)
+            else:
+                children[None].append(k)
+            stack.append(k)
+        # Lay out the lists one after another, top level first (the loop
+        # also visits the intervals added to the order as it goes)
+        order = children[None]
+        self.top = len(order)
+        self.sub_starts = []
+        self.sub_ends = []
+        for k in order:
+            sub = children.get(k, ())
+            self.sub_starts.append(len(order))
+            order.extend(sub)
+            self.sub_ends.append(len(order))
+        self.starts = [intervals[k][0] for k in order]
+        self.ends = [intervals[k][1] for k in order]
+        self.strands = [intervals[k][2] for k in order]
+        self.indexes = [intervals[k][3] for k in order]
+
+    def overlapping(self, start, end, strand=None):
+        """Return the indexes of the features overlapping a region (sorted)."""
+        found = set()
+        starts = self.starts
+        ends = self.ends
+        strands = self.strands
+        sub_starts = self.sub_starts
+        sub_ends = self.sub_ends
+        pending = [(0, self.top)]
+        while pending:
+            low, high = pending.pop()
+            for k in range(bisect_right(ends, start, low, high), high):
+                if starts[k] >= end:
+                    break
+                if strand is None or strands[k] == strand:
+                    found.add(self.indexes[k])
+                if sub_starts[k] < sub_ends[k]:
+                    pending.append((sub_starts[k], sub_ends[k]))
+        return sorted(found)
+
+
+class _FeatureRanges(_CachedFeatureIndex):
+    """Whole feature locations sorted by start, for slicing a record (PRIVATE).
+
+    Slicing a record only needs the features within the slice, which are
+    found by bisection on these, so this is kept apart from _FeatureIndex.
+    Features referencing other sequences are not included.
+    """
+
+    def __init__(self, features):
+        """Index the given list of SeqFeature objects."""
+        _CachedFeatureIndex.__init__(self, features)
+        self.referenced = False
+        whole = []
+        for i, feature in enumerate(features):
+            if feature.ref or feature.ref_db:
+                self.referenced = True
+                continue
+            if feature.location is None:
+                continue
+            start = feature.location.nofuzzy_start
+            end = feature.location.nofuzzy_end
+            if start is not None and end is not None:
+                whole.append((start, end, i))
+        whole.sort()
+        self.starts = [start for start, end, i in whole]
+        self.ends = [end for start, end, i in whole]
+        self.whole = [i for start, end, i in whole]
+
+    def contained(self, start, end):
+        """Return the indexes of the features within a region (sorted)."""
+        found = []
+        ends = self.ends
+        starts = self.starts
+        for k in range(bisect_left(starts, start), bisect_right(starts, end)):
+            if ends[k] <= end:
+                found.append(self.whole[k])
+        found.sort()
+        return found
+
+
 class SeqRecord(object):
     """A SeqRecord object holds a sequence and information about it.
 
@@ -166,7 +457,8 @@ class SeqRecord(object):
          - features    - Any (sub)features, optional (list of SeqFeature objects)
          - annotations - Dictionary of annotations for the whole sequence
          - letter_annotations - Dictionary of per-letter-annotations, values
-           should be strings, list or tuples of the same length as the full
+           should be strings, lists, tuples or arrays (e.g. NumPy arrays or
+           LetterAnnotationArray objects) of the same length as the full
            sequence.
 
         You will typically use Bio.SeqIO to read in sequences from files as
@@ -320,6 +612,27 @@ class SeqRecord(object):
                    fset=_set_seq,
                    doc="The sequence itself, as a Seq or MutableSeq object.")
 
+    def _set_features(self, value):
+        self._features = value
+        self._clear_feature_index()
+
+    features = property(fget=lambda self: self._features,
+                        fset=_set_features,
+                        doc="""List of SeqFeature objects for the sequence.
+
+        An index of the feature locations is built when first needed (by the
+        features_overlapping and features_at methods, and by slicing), and
+        is rebuilt if the features in the list change, or a feature is given
+        a new location. Changing the strand or reference of an existing
+        location object in place is not noticed, so after doing that reassign
+        the list (e.g. record.features = record.features).
+        """)
+
+    def _clear_feature_index(self):
+        """Discard any cached index of the features (PRIVATE)."""
+        self.__dict__.pop("_feature_index", None)
+        self.__dict__.pop("_feature_ranges", None)
+
     def __getitem__(self, index):
         """Return a sub-sequence or an individual letter.
 
@@ -330,7 +643,10 @@ class SeqRecord(object):
         Any per-letter-annotations are sliced to match the requested
         sub-sequence.  Unless a stride is used, all those features
         which fall fully within the subsequence are included (with
-        their locations adjusted accordingly).
+        their locations adjusted accordingly). As with the
+        features_overlapping method, these are found using an index of
+        the features, so slicing a record with many features many times
+        is fast.
 
         However, the annotations dictionary and the dbxrefs list are
         not used for the new SeqRecord, as in general they may not
@@ -468,17 +784,17 @@ class SeqRecord(object):
             if step == 1:
                 # Select relevant features, add them with shifted locations
                 # assert str(self.seq)[index] == str(self.seq)[start:stop]
-                for f in self.features:
-                    if f.ref or f.ref_db:
-                        # TODO - Implement this (with lots of tests)?
-                        import warnings
-                        warnings.warn("When slicing SeqRecord objects, any "
-                                      "SeqFeature referencing other sequences (e.g. "
-                                      "from segmented GenBank records) are ignored.")
-                        continue
-                    if start <= f.location.nofuzzy_start \
-                            and f.location.nofuzzy_end <= stop:
-                        answer.features.append(f._shift(-start))
+                # using the (cached) feature locations sorted by start
+                features = self.features
+                feature_ranges = self._get_feature_ranges()
+                if feature_ranges.referenced:
+                    # TODO - Implement this (with lots of tests)?
+                    import warnings
+                    warnings.warn("When slicing SeqRecord objects, any "
+                                  "SeqFeature referencing other sequences (e.g. "
+                                  "from segmented GenBank records) are ignored.")
+                for i in feature_ranges.contained(start, stop):
+                    answer.features.append(features[i]._shift(-start))
 
             # Slice all the values to match the sliced sequence
             # (this should also work with strides, even negative strides):
@@ -574,6 +890,101 @@ class SeqRecord(object):
         """
         return char in self.seq
 
+    def features_overlapping(self, start, end, strand=None):
+        """Return a list of the features overlapping the given region.
+
+        Arguments:
+         - start - Start of the region (integer, zero based)
+         - end - End of the region (integer, exclusive)
+         - strand - Optional strand (1 or -1), to consider only the parts
+           of the feature locations on that strand
+
+        For example,
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        >>> for feature in record.features_overlapping(4700, 4900):
+        ...     print("%s %s" % (feature.type, feature.qualifiers.get("locus_tag")))
+        source None
+        gene ['YP_pPCP05']
+        CDS ['YP_pPCP05']
+        gene ['YP_pPCP06']
+        CDS ['YP_pPCP06']
+        >>> for feature in record.features_overlapping(4700, 4900, strand=-1):
+        ...     print("%s %s" % (feature.type, feature.qualifiers.get("locus_tag")))
+        gene ['YP_pPCP06']
+        CDS ['YP_pPCP06']
+
+        The features are returned in the same order as in the features list.
+        A feature with a compound location (e.g. a join) is included if any
+        of its parts overlaps the region.
+
+        The first call builds an index of the feature locations, so that
+        later calls are fast (even with many features). This is rebuilt if
+        the features in the list change, or a feature is given a new
+        location (but see the features property about changing a location
+        object in place).
+        """
+        features = self.features
+        index = self._get_feature_index()
+        return [features[i] for i in index.overlapping(start, end, strand)]
+
+    def _get_feature_index(self):
+        """Return the index of the features, building it if needed (PRIVATE)."""
+        features = self.features
+        index = getattr(self, "_feature_index", None)
+        if index is None or index.stale(features):
+            index = _FeatureIndex(features)
+            self._feature_index = index
+        return index
+
+    def _get_feature_ranges(self):
+        """Return the feature locations sorted by start, for slicing (PRIVATE)."""
+        features = self.features
+        ranges = getattr(self, "_feature_ranges", None)
+        if ranges is None or ranges.stale(features):
+            ranges = _FeatureRanges(features)
+            self._feature_ranges = ranges
+        return ranges
+
+    def __getstate__(self):
+        """Return the state for pickling and copying, without any cached index.
+
+        The feature indexes are rebuilt when needed, so are not worth storing
+        (this applies to copy.copy and copy.deepcopy as well as to pickle).
+        """
+        state = self.__dict__.copy()
+        state.pop("_feature_index", None)
+        state.pop("_feature_ranges", None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state from pickling or copying."""
+        if "features" in state:
+            # Pickled before features became a property
+            state = state.copy()
+            state["_features"] = state.pop("features")
+        self.__dict__.update(state)
+
+    def features_at(self, position, strand=None):
+        """Return a list of the features which include the given position.
+
+        Arguments:
+         - position - Position in the sequence (integer, zero based)
+         - strand - Optional strand (1 or -1), to consider only the parts
+           of the feature locations on that strand
+
+        This is a shortcut for the features_overlapping method, e.g.
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        >>> [feature.type for feature in record.features_at(7800)]
+        ['source', 'gene', 'CDS']
+        >>> [feature.type for feature in record.features_at(7800, strand=1)]
+        ['source']
+        """
+        return self.features_overlapping(position, position + 1, strand)
+
     def __str__(self):
         """Return a human readable summary of the record and its annotation (string).
 
@@ -886,7 +1297,8 @@ class SeqRecord(object):
         # Can append matching per-letter-annotation
         for k, v in self.letter_annotations.items():
             if k in other.letter_annotations:
-                answer.letter_annotations[k] = v + other.letter_annotations[k]
+                answer.letter_annotations[k] = _join_letter_annotations(
+                    v, other.letter_annotations[k])
         return answer
 
     def __radd__(self, other):
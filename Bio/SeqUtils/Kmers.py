@@ -0,0 +1,460 @@
+# Copyright 2018 by the Biopython developers.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Count k-mers and find minimizers in nucleotide sequences.
+
+Each k-mer (a word of k letters, here for k up to 31) is encoded using two
+bits per letter (A=0, C=1, G=2, T=3), giving an integer code. The codes are
+computed for a whole chunk of sequence at a time using NumPy, so no Python
+string is made for each k-mer. Any k-mer including a letter other than A, C,
+G, T (or U) such as an N is skipped. Lower case letters are treated as upper
+case.
+
+>>> from Bio.Seq import Seq
+>>> from Bio.SeqUtils.Kmers import count_kmers
+>>> counts = count_kmers(Seq("ACGTTGCANACGT"), 3, canonical=False)
+>>> counts
+<KmerCounts of 6 distinct 3-mers (8 in total)>
+>>> counts["ACG"]
+2
+>>> for kmer, count in counts.items():
+...     print("%s %i" % (kmer, count))
+ACG 2
+CGT 2
+GCA 1
+GTT 1
+TGC 1
+TTG 1
+
+By default the k-mers are canonical, meaning each k-mer is counted together
+with its reverse complement (using whichever comes first alphabetically),
+as is usual when the strand of the reads is unknown:
+
+>>> counts = count_kmers(Seq("ACGTTGCANACGT"), 3)
+>>> counts["ACG"], counts["CGT"]
+(4, 4)
+
+You can also give count_kmers an iterator of sequences or SeqRecord objects
+(e.g. from Bio.SeqIO), or FastqBatch objects from the FastqBatchIterator
+function in Bio.SeqIO.QualityIO. Short sequences (such as sequencing reads)
+are joined into chunks to be processed together. Minimizers are found with
+the minimizers function.
+"""
+
+from __future__ import print_function
+
+try:
+    import numpy
+    from numpy.lib.stride_tricks import as_strided
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.Kmers.")
+
+from Bio._py3k import _as_bytes, basestring
+
+from Bio.Seq import Seq, MutableSeq
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqIO.QualityIO import FastqBatch
+
+
+# The largest k for which the two bit codes fit in an unsigned 64 bit integer
+# (with one value to spare for marking invalid k-mers)
+MAX_K = 31
+
+_letters = "ACGT"
+
+# Two bit value of each byte, with 4 for anything else
+_letter_values = numpy.full(256, 4, numpy.uint8)
+for _value, _letter in enumerate(_letters):
+    _letter_values[ord(_letter)] = _value
+    _letter_values[ord(_letter.lower())] = _value
+_letter_values[ord("U")] = _letter_values[ord("u")] = 3
+del _value, _letter
+
+_invalid = numpy.uint64(2 ** 64 - 1)
+_two = numpy.uint64(2)
+_three = numpy.uint64(3)
+
+
+def _check_k(k):
+    """Raise a ValueError unless k is a valid k-mer size (PRIVATE)."""
+    if not 0 < k <= MAX_K:
+        raise ValueError("The k-mer size k must be from 1 to %i, not %r"
+                         % (MAX_K, k))
+
+
+def kmer_code(kmer):
+    """Return the two bit code of a k-mer (as an integer).
+
+    >>> kmer_code("ACGT")
+    27
+    >>> kmer_code("T" * 31) == 4 ** 31 - 1
+    True
+
+    Letters other than A, C, G, T (or U) in upper or lower case are rejected:
+
+    >>> kmer_code("ACGN")
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid letter in k-mer 'ACGN'
+    """
+    _check_k(len(kmer))
+    values = _letter_values[numpy.frombuffer(_as_bytes(str(kmer)), numpy.uint8)]
+    if values.max() > 3:
+        raise ValueError("Invalid letter in k-mer %r" % str(kmer))
+    code = 0
+    for value in values:
+        code = 4 * code + int(value)
+    return code
+
+
+def kmer_from_code(code, k):
+    """Return the k-mer (as a string) for a two bit code.
+
+    >>> kmer_from_code(27, 4)
+    'ACGT'
+    >>> kmer_from_code(27, 6)
+    'AAACGT'
+    """
+    _check_k(k)
+    code = int(code)
+    letters = []
+    for i in range(k):
+        letters.append(_letters[code & 3])
+        code >>= 2
+    return "".join(reversed(letters))
+
+
+def _reverse_complement_code(code, k):
+    """Return the two bit code for the reverse complement of a k-mer (PRIVATE)."""
+    answer = 0
+    for i in range(k):
+        answer = 4 * answer + 3 - (code & 3)
+        code >>= 2
+    return answer
+
+
+def _kmer_codes(letters, k, canonical):
+    """Return the codes of all the k-mers in an array of letters (PRIVATE).
+
+    Arguments:
+     - letters - NumPy array of bytes (uint8), the ASCII sequence letters
+     - k - the k-mer size
+     - canonical - use the smaller of each code and that of the reverse
+       complement?
+
+    Returns a NumPy array of unsigned 64 bit integers, one for the k-mer
+    starting at each position, with any invalid k-mers (e.g. including an N)
+    given the largest possible value.
+
+    The codes are built up letter by letter across the whole array, i.e.
+    shifting the codes two bits and adding the next letter, which is the
+    rolling two bit encoding done for every position at once.
+    """
+    count = len(letters) - k + 1
+    if count <= 0:
+        return numpy.zeros(0, numpy.uint64)
+    values = _letter_values[letters]
+    # Count the invalid letters so far, to find the windows including any
+    invalid = numpy.zeros(len(values) + 1, numpy.int64)
+    numpy.cumsum(values > 3, out=invalid[1:])
+    invalid = invalid[k:] != invalid[:-k]
+    values = (values & 3).astype(numpy.uint64)
+    codes = numpy.zeros(count, numpy.uint64)
+    for i in range(k):
+        codes <<= _two
+        codes |= values[i:i + count]
+    if canonical:
+        reverse = numpy.zeros(count, numpy.uint64)
+        for i in range(k - 1, -1, -1):
+            reverse <<= _two
+            reverse |= _three - values[i:i + count]
+        numpy.minimum(codes, reverse, out=codes)
+    codes[invalid] = _invalid
+    return codes
+
+
+def _sequence_letters(sequence, start=0, end=None):
+    """Return (part of) a sequence as a NumPy array of bytes (PRIVATE).
+
+    Only the requested part of the sequence is turned into a string, so
+    for example a long sequence held on disk can be processed in chunks.
+    """
+    if isinstance(sequence, SeqRecord):
+        sequence = sequence.seq
+    if start or end is not None:
+        sequence = sequence[start:end]
+    if not isinstance(sequence, (bytes, bytearray)):
+        sequence = _as_bytes(str(sequence))
+    return numpy.frombuffer(sequence, numpy.uint8)
+
+
+def _batch_letters(batch):
+    """Return the letters of a FastqBatch, with an N between reads (PRIVATE)."""
+    return numpy.insert(batch.sequences, batch.offsets[1:-1], ord("N"))
+
+
+def _letter_chunks(sequences, k, chunk_size):
+    """Iterate over the sequences as NumPy arrays of letters (PRIVATE).
+
+    Short sequences are joined (with an N between them, so that no k-mer
+    spans two sequences) into chunks of about chunk_size letters, while
+    long sequences are split into chunks overlapping by k - 1 letters (so
+    that every k-mer is in exactly one chunk).
+    """
+    if isinstance(sequences, (basestring, bytes, Seq, MutableSeq, SeqRecord,
+                              FastqBatch)):
+        sequences = [sequences]
+    pending = []
+    size = 0
+    for sequence in sequences:
+        if isinstance(sequence, FastqBatch):
+            letters = _batch_letters(sequence)
+            length = len(letters)
+        else:
+            letters = None
+            length = len(sequence)
+        if length < k:
+            continue
+        if size + length > chunk_size and pending:
+            yield numpy.concatenate(pending)
+            pending = []
+            size = 0
+        if letters is None and length > chunk_size:
+            for start in range(0, length - k + 1, chunk_size):
+                yield _sequence_letters(sequence, start,
+                                        start + chunk_size + k - 1)
+            continue
+        if letters is None:
+            letters = _sequence_letters(sequence)
+        pending.append(letters)
+        pending.append(numpy.array([ord("N")], numpy.uint8))
+        size += length + 1
+    if pending:
+        yield numpy.concatenate(pending)
+
+
+def _merge_counts(codes, counts):
+    """Combine lists of sorted k-mer codes and counts (PRIVATE).
+
+    Returns a single sorted array of the distinct codes, and their counts
+    (summed over all the arrays).
+    """
+    if len(codes) == 1:
+        return codes[0], counts[0]
+    codes = numpy.concatenate(codes)
+    counts = numpy.concatenate(counts)
+    if len(codes) == 0:
+        return codes, counts
+    # A stable sort is quick here, as the codes are in sorted runs
+    order = numpy.argsort(codes, kind="mergesort")
+    codes = codes[order]
+    totals = numpy.zeros(len(codes) + 1, numpy.int64)
+    numpy.cumsum(counts[order], out=totals[1:])
+    starts = numpy.flatnonzero(numpy.concatenate(([True],
+                                                  codes[1:] != codes[:-1])))
+    ends = numpy.append(starts[1:], len(codes))
+    return codes[starts], totals[ends] - totals[starts]
+
+
+class KmerCounts(object):
+    """Counts of the k-mers in some sequences, held as NumPy arrays.
+
+    These are created by the count_kmers function. The counts can be looked
+    up by k-mer (as a string), and the object holds:
+
+     - k - the k-mer size
+     - canonical - are the k-mers counted together with their reverse
+       complements?
+     - codes - NumPy array of the two bit codes of the k-mers found (sorted)
+     - counts - NumPy array of the number of times each k-mer was found
+
+    >>> from Bio.SeqUtils.Kmers import count_kmers
+    >>> counts = count_kmers(["GATTACA", "TTACAGG"], 4, canonical=False)
+    >>> len(counts)
+    6
+    >>> counts["TTAC"], counts["GGGG"]
+    (2, 0)
+    >>> counts.most_common(2)
+    [('TACA', 2), ('TTAC', 2)]
+    >>> print(counts.spectrum())
+    [0 4 2]
+    """
+
+    def __init__(self, k, codes, counts, canonical=True):
+        """Initialize the class."""
+        self.k = k
+        self.codes = codes
+        self.counts = counts
+        self.canonical = canonical
+
+    def __repr__(self):
+        """Return a concise summary of the k-mer counts."""
+        return "<%s of %i distinct %i-mers (%i in total)>" \
+            % (self.__class__.__name__, len(self), self.k, self.total)
+
+    def __len__(self):
+        """Return the number of distinct k-mers found."""
+        return len(self.codes)
+
+    def __getitem__(self, kmer):
+        """Return the number of times the given k-mer (string) was found."""
+        if len(kmer) != self.k:
+            raise ValueError("Expected a %i-mer, not %r" % (self.k, kmer))
+        code = kmer_code(kmer)
+        if self.canonical:
+            code = min(code, _reverse_complement_code(code, self.k))
+        index = numpy.searchsorted(self.codes, numpy.uint64(code))
+        if index < len(self.codes) and self.codes[index] == code:
+            return int(self.counts[index])
+        return 0
+
+    def __iter__(self):
+        """Iterate over the k-mers found (as strings, sorted)."""
+        for code in self.codes:
+            yield kmer_from_code(code, self.k)
+
+    def items(self):
+        """Iterate over the k-mers found (as strings, sorted) and their counts."""
+        for code, count in zip(self.codes, self.counts):
+            yield kmer_from_code(code, self.k), int(count)
+
+    @property
+    def total(self):
+        """Total number of k-mers counted."""
+        return int(self.counts.sum())
+
+    def most_common(self, n=None):
+        """Return a list of the n most common k-mers and their counts.
+
+        As for the Counter class in the Python collections module, if n is
+        omitted all the k-mers are returned (most common first).
+        """
+        order = numpy.argsort(-self.counts, kind="mergesort")
+        if n is not None:
+            order = order[:n]
+        return [(kmer_from_code(self.codes[i], self.k), int(self.counts[i]))
+                for i in order]
+
+    def spectrum(self):
+        """Return the k-mer spectrum as a NumPy array.
+
+        Entry i of the array is the number of distinct k-mers found exactly i
+        times (so entry zero is always zero).
+        """
+        return numpy.bincount(self.counts)
+
+
+def count_kmers(sequences, k, canonical=True, chunk_size=1000000):
+    """Count the k-mers in one or more sequences, returning a KmerCounts object.
+
+    Arguments:
+     - sequences - A sequence (a Seq or SeqRecord object, or a string), or
+       an iterable of sequences (e.g. an iterator of SeqRecord objects from
+       Bio.SeqIO), or of FastqBatch objects from Bio.SeqIO.QualityIO.
+     - k - The k-mer size, up to 31.
+     - canonical - Count each k-mer together with its reverse complement
+       (default True).
+     - chunk_size - Approximate number of letters to process at once.
+
+    The sequences are processed one chunk at a time, and the codes of the
+    distinct k-mers and their counts are merged as they grow, so memory use
+    depends on the number of distinct k-mers, not the length of the input.
+    e.g. to count 21-mers in an Illumina run::
+
+        from Bio.SeqIO.QualityIO import FastqBatchIterator
+        with open("reads.fastq", "rb") as handle:
+            counts = count_kmers(FastqBatchIterator(handle), 21)
+        spectrum = counts.spectrum()
+
+    """
+    _check_k(k)
+    all_codes = []
+    all_counts = []
+    merged = 0
+    pending = 0
+    for letters in _letter_chunks(sequences, k, chunk_size):
+        codes = _kmer_codes(letters, k, canonical)
+        codes, counts = numpy.unique(codes[codes != _invalid],
+                                     return_counts=True)
+        all_codes.append(codes)
+        all_counts.append(counts.astype(numpy.int64))
+        pending += len(codes)
+        # Merge once the new codes outnumber those already merged (so
+        # each code is only merged a few times), or more than chunk_size
+        if pending > max(merged, chunk_size):
+            codes, counts = _merge_counts(all_codes, all_counts)
+            all_codes = [codes]
+            all_counts = [counts]
+            merged = len(codes)
+            pending = 0
+    if not all_codes:
+        return KmerCounts(k, numpy.zeros(0, numpy.uint64),
+                          numpy.zeros(0, numpy.int64), canonical)
+    codes, counts = _merge_counts(all_codes, all_counts)
+    return KmerCounts(k, codes, counts, canonical)
+
+
+def minimizers(sequence, k, w, canonical=True, chunk_size=1000000):
+    """Iterate over the minimizers of a sequence, as (position, code) tuples.
+
+    Arguments:
+     - sequence - A Seq or SeqRecord object, or a string.
+     - k - The k-mer size, up to 31.
+     - w - The window size, as a number of consecutive k-mers.
+     - canonical - Use the canonical k-mers, i.e. compare each k-mer code
+       with that of its reverse complement (default True).
+     - chunk_size - Approximate number of letters to process at once.
+
+    The minimizer of a window of w consecutive k-mers is the one with the
+    smallest two bit code (the first if tied). As neighbouring windows
+    usually share a minimizer, each is given only once, as the position
+    (start of the k-mer) and code, in order of position. Windows where all
+    the k-mers include invalid letters (e.g. N) have no minimizer.
+
+    >>> from Bio.Seq import Seq
+    >>> from Bio.SeqUtils.Kmers import minimizers, kmer_from_code
+    >>> for position, code in minimizers(Seq("TTGACCATGACTT"), 3, 4):
+    ...     print("%i %s" % (position, kmer_from_code(code, 3)))
+    3 ACC
+    5 ATG
+    9 ACT
+    10 AAG
+
+    The sequence is processed a chunk at a time, so this can be used on long
+    sequences, such as whole chromosomes, without the codes for every k-mer
+    being held in memory at once.
+    """
+    _check_k(k)
+    if w < 1:
+        raise ValueError("The window size w must be at least one, not %r" % w)
+    last = -1
+    # Each chunk holds the k-mers for chunk_size windows (starting at start)
+    for start in range(0, max(0, len(sequence) - k - w + 2), chunk_size):
+        letters = _sequence_letters(sequence, start,
+                                    start + chunk_size + k + w - 2)
+        codes = _kmer_codes(letters, k, canonical)
+        count = len(codes) - w + 1
+        windows = as_strided(codes, shape=(count, w),
+                             strides=(codes.strides[0], codes.strides[0]))
+        positions = windows.argmin(axis=1) + numpy.arange(count)
+        keep = codes[positions] != _invalid
+        keep[1:] &= positions[1:] != positions[:-1]
+        # The minimizer position never decreases, so just skip any already
+        # given at the end of the previous chunk
+        keep &= positions + start > last
+        positions = positions[keep]
+        if len(positions):
+            for position, code in zip((positions + start).tolist(),
+                                      codes[positions].tolist()):
+                yield position, code
+            last = position
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
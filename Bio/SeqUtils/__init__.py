@@ -16,8 +16,11 @@ from __future__ import print_function
 import re
 from math import pi, sin, cos
 
+from Bio._py3k import _as_bytes
 from Bio.Seq import Seq, MutableSeq
+from Bio.Seq import _codon_numbers, _dna_complement_bytes_table
 from Bio import Alphabet
+from Bio.Data import CodonTable
 from Bio.Data import IUPACData
 
 
@@ -519,6 +522,159 @@ def six_frame_translations(seq, genetic_code=1):
     return res
 
 
+# Number of letters of the sequence scanned at a time by find_orfs
+_orf_window = 3 * 1024 * 1024
+
+
+def _orf_codon_classes(table):
+    """Make a bytes table mapping codon numbers to M (start), S (stop) or . (PRIVATE).
+
+    The codon numbers are as from the _codon_numbers function in Bio.Seq,
+    and both T and U are allowed. Any ambiguous codon counts as neither a
+    start nor a stop codon.
+    """
+    if not isinstance(table, CodonTable.CodonTable):
+        try:
+            table = CodonTable.unambiguous_dna_by_id[int(table)]
+        except ValueError:
+            table = CodonTable.unambiguous_dna_by_name[table]
+    starts = set(codon.upper().replace("U", "T")
+                 for codon in table.start_codons)
+    stops = set(codon.upper().replace("U", "T")
+                for codon in table.stop_codons)
+    classes = bytearray(b"." * 256)
+    letters = "ACGTU"
+    for i, first in enumerate(letters):
+        for j, second in enumerate(letters):
+            for k, third in enumerate(letters):
+                codon = (first + second + third).replace("U", "T")
+                if codon in stops:
+                    classes[36 * i + 6 * j + k] = ord("S")
+                elif codon in starts:
+                    classes[36 * i + 6 * j + k] = ord("M")
+    return bytes(classes)
+
+
+def _orf_windows(seq, strand, window):
+    """Iterate over overlapping windows of the sequence as upper case bytes (PRIVATE).
+
+    For the reverse strand (-1), the windows are of the reverse complement,
+    starting from the end of the sequence. Each window is the given number
+    of letters (a multiple of three) plus two, so the codons of all three
+    frames in the window can be found from it. Yields tuples of the offset
+    (from the start of the strand) and the bytes.
+    """
+    length = len(seq)
+    for offset in range(0, length, window):
+        if strand == 1:
+            data = seq[offset:offset + window + 2]
+        else:
+            data = seq[max(0, length - offset - window - 2):length - offset]
+        data = _as_bytes(str(data)).upper()
+        if strand == -1:
+            data = data.translate(_dna_complement_bytes_table)[::-1]
+        yield offset, data
+
+
+def _orf_scan(seq, classes, min_length, window):
+    """Find ORFs on both strands, giving (start, end, strand, frame) tuples (PRIVATE).
+
+    See the find_orfs function for details.
+    """
+    length = len(seq)
+    # Looking at the codons of a frame as a string of M (start codons),
+    # S (stop codons) and dots, an ORF is the first M after an S (or the
+    # start of the sequence) up to the next S. An ORF at the end of a window
+    # with no S yet is pending, and may be continued in the next window.
+    min_codons = max(2, (min_length + 2) // 3)
+    pattern = re.compile(_as_bytes("M[^S]{%i,}S|M[^S]*$" % (min_codons - 2)))
+    for strand in (1, -1):
+        pending = [None, None, None]
+        for offset, data in _orf_windows(seq, strand, window):
+            for frame in range(3):
+                codons = _codon_numbers(data[frame:frame + window])
+                codons = codons.translate(classes)
+                first = offset + frame
+                orfs = []
+                i = 0
+                if pending[frame] is not None:
+                    i = codons.find(b"S")
+                    if i == -1:
+                        continue
+                    i += 1
+                    orfs.append((pending[frame], first + 3 * i))
+                    pending[frame] = None
+                for match in pattern.finditer(codons, i):
+                    if match.group().endswith(b"S"):
+                        orfs.append((first + 3 * match.start(),
+                                     first + 3 * match.end()))
+                    else:
+                        pending[frame] = first + 3 * match.start()
+                for start, end in orfs:
+                    if end - start < min_length:
+                        continue
+                    if strand == 1:
+                        yield start, end, strand, frame
+                    else:
+                        yield length - end, length - start, strand, frame
+
+
+def find_orfs(seq, table=1, min_length=75, as_features=False):
+    """Find the open reading frames (ORFs) on both strands of a sequence.
+
+    Arguments:
+     - seq - The nucleotide sequence, as a string, Seq (including the FileSeq
+       from an indexed FASTA file) or MutableSeq object.
+     - table - Which codon table to use for the start and stop codons, an
+       NCBI identifier (integer), name (string), or CodonTable object.
+     - min_length - Minimum length of the ORFs to report (in nucleotides,
+       including the stop codon), defaults to 75.
+     - as_features - Boolean, if True gives SeqFeature objects.
+
+    An ORF here runs from the first start codon after a stop codon (or from
+    the start of the sequence) up to and including the next stop codon in
+    the same frame. Ambiguous codons are not regarded as start or stop
+    codons, and open reading frames without a stop codon before the end
+    of the sequence are not reported.
+
+    Returns an iterator giving (start, end, strand, frame) tuples, with the
+    start and end as Python style slice coordinates of the ORF on the
+    forward strand, the strand as +1 or -1, and the frame (0, 1 or 2) as
+    the offset of the ORF from the start of that strand (i.e. for the
+    reverse strand, from the end of the sequence), e.g.
+
+    >>> from Bio.SeqUtils import find_orfs
+    >>> seq = "CCATGAAATTTGGGTAACCTTACCCAAATTTCATGG"
+    >>> for start, end, strand, frame in find_orfs(seq, min_length=12):
+    ...     print("%i %i %i %i" % (start, end, strand, frame))
+    2 17 1 2
+    19 34 -1 2
+    >>> print(seq[2:17])
+    ATGAAATTTGGGTAA
+
+    With as_features=True the ORFs are given as SeqFeature objects, with a
+    feature type of ORF, which can be used to extract the sequence:
+
+    >>> for feature in find_orfs(seq, min_length=12, as_features=True):
+    ...     print("%s %s" % (feature.strand, feature.extract(seq)))
+    1 ATGAAATTTGGGTAA
+    -1 ATGAAATTTGGGTAA
+
+    All six frames are found in a single pass over the sequence, a few
+    megabases at a time, so this works on large sequences such as those
+    from an IndexedFasta file without loading them into memory all at once.
+    Note the ORFs are given a window and frame at a time, starting with the
+    forward strand, so are not sorted.
+    """
+    classes = _orf_codon_classes(table)
+    orfs = _orf_scan(seq, classes, min_length, _orf_window)
+    if as_features:
+        from Bio.SeqFeature import SeqFeature, FeatureLocation
+        return (SeqFeature(FeatureLocation(start, end, strand), type="ORF")
+                for start, end, strand, frame in orfs)
+    return orfs
+
+
 if __name__ == "__main__":
     from Bio._utils import run_doctest
     run_doctest()
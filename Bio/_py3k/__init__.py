@@ -50,6 +50,7 @@ import sys
 if sys.version_info[0] >= 3:
     # Code for Python 3
     from builtins import open, zip, map, filter, range, input
+    from sys import intern
 
     import codecs
 
@@ -143,6 +144,7 @@ else:
     from future_builtins import zip, map, filter
     from __builtin__ import xrange as range
     from __builtin__ import raw_input as input
+    from __builtin__ import intern
 
     _bytes_to_string = lambda b: b  # bytes to string, i.e. do nothing
     _string_to_bytes = lambda s: str(s)  # str (or unicode) to bytes string
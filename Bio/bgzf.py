@@ -226,6 +226,8 @@ import sys
 import zlib
 import struct
 
+from collections import deque
+
 from Bio._py3k import _as_bytes, _as_string
 from Bio._py3k import open as _open
 
@@ -238,12 +240,18 @@ _bgzf_eof = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00\x1b\x00
 _bytes_BC = b"BC"
 
 
-def open(filename, mode="rb"):
-    """Open a BGZF file for reading, writing or appending."""
+def open(filename, mode="rb", threads=1):
+    """Open a BGZF file for reading, writing or appending.
+
+    The optional threads argument (default 1) sets the number of worker
+    threads used to decompress (when reading) or compress (when writing)
+    BGZF blocks in the background, see the BgzfReader and BgzfWriter
+    classes for details.
+    """
     if "r" in mode.lower():
-        return BgzfReader(filename, mode)
+        return BgzfReader(filename, mode, threads=threads)
     elif "w" in mode.lower() or "a" in mode.lower():
-        return BgzfWriter(filename, mode)
+        return BgzfWriter(filename, mode, threads=threads)
     else:
         raise ValueError("Bad mode %r" % mode)
 
@@ -391,15 +399,105 @@ def BgzfBlocks(handle):
     data_start = 0
     while True:
         start_offset = handle.tell()
-        # This may raise StopIteration which is perfect here
-        block_length, data = _load_bgzf_block(handle)
+        try:
+            block_length, data = _load_bgzf_block(handle)
+        except StopIteration:
+            # End of file (can't let this escape a generator, see PEP 479)
+            break
         data_len = len(data)
         yield start_offset, block_length, data_start, data_len
         data_start += data_len
 
 
-def _load_bgzf_block(handle, text_mode=False):
-    """Load the next BGZF block of compressed data (PRIVATE)."""
+def build_gzi(handle):
+    """Build a block index for a BGZF file, as used in samtools .gzi files.
+
+    Expects a BGZF compressed file opened in binary read mode using
+    the builtin open function (as for the BgzfBlocks function). Only
+    the block headers and footers are read, the blocks are not
+    decompressed.
+
+    Returns a list of (raw start, data start) tuples, one for each
+    non-empty BGZF block, always starting with (0, 0) for the first.
+    i.e. The compressed and uncompressed offsets of each block start.
+
+    >>> try:
+    ...     from __builtin__ import open # Python 2
+    ... except ImportError:
+    ...     from builtins import open # Python 3
+    ...
+    >>> with open("SamBam/ex1.bam", "rb") as handle:
+    ...     for raw_start, data_start in build_gzi(handle):
+    ...         print("Raw start %i, data start %i" % (raw_start, data_start))
+    Raw start 0, data start 0
+    Raw start 18239, data start 65536
+    Raw start 36462, data start 131072
+    Raw start 54479, data start 196608
+    Raw start 71821, data start 262144
+    Raw start 89536, data start 327680
+    Raw start 107264, data start 393216
+
+    """
+    index = [(0, 0)]
+    start_offset = handle.tell()
+    data_start = 0
+    while True:
+        try:
+            block_length, deflated, crc, data_len = _read_bgzf_block(handle)
+        except StopIteration:
+            break
+        if data_len and start_offset:
+            index.append((start_offset, data_start))
+        start_offset += block_length
+        data_start += data_len
+    return index
+
+
+def read_gzi(handle):
+    """Read a samtools style .gzi block index for a BGZF file.
+
+    Expects a handle opened in binary mode. The file is a little endian
+    64 bit count, followed by that many pairs of 64 bit integers giving
+    the compressed and uncompressed offsets of each block start (except
+    the first block).
+
+    Returns a list of (raw start, data start) tuples as in build_gzi,
+    starting with (0, 0) for the first block.
+    """
+    data = handle.read(8)
+    if len(data) != 8:
+        raise ValueError("Premature end of GZI file")
+    count = struct.unpack("<Q", data)[0]
+    data = handle.read(16 * count)
+    if len(data) != 16 * count:
+        raise ValueError("Premature end of GZI file, expected %i entries"
+                         % count)
+    values = struct.unpack("<%iQ" % (2 * count), data)
+    index = [(0, 0)]
+    index.extend(zip(values[0::2], values[1::2]))
+    return index
+
+
+def write_gzi(handle, index):
+    """Write a samtools style .gzi block index for a BGZF file.
+
+    Expects a handle opened in binary mode, and a list of (raw start,
+    data start) tuples as from build_gzi. Any (0, 0) entry for the first
+    block is omitted from the file, as in samtools.
+    """
+    index = [entry for entry in index if entry != (0, 0)]
+    handle.write(struct.pack("<Q", len(index)))
+    for raw_start, data_start in index:
+        handle.write(struct.pack("<QQ", raw_start, data_start))
+
+
+def _read_bgzf_block(handle):
+    """Read the next BGZF block of compressed data without decompressing it (PRIVATE).
+
+    Returns a tuple of the raw block size, the deflated payload, the
+    expected CRC (as 4 bytes), and the expected decompressed length.
+    Raises StopIteration at the end of the file.
+    """
     magic = handle.read(4)
     if not magic:
         # End of file
@@ -426,10 +524,21 @@ def _load_bgzf_block(handle, text_mode=False):
     assert block_size is not None, "Missing BC, this isn't a BGZF file!"
     # Now comes the compressed data, CRC, and length of uncompressed data.
     deflate_size = block_size - 1 - extra_len - 19
-    d = zlib.decompressobj(-15)  # Negative window size means no headers
-    data = d.decompress(handle.read(deflate_size)) + d.flush()
+    deflated = handle.read(deflate_size)
     expected_crc = handle.read(4)
     expected_size = struct.unpack("<I", handle.read(4))[0]
+    return block_size, deflated, expected_crc, expected_size
+
+
+def _decompress_bgzf_block(block_size, deflated, expected_crc, expected_size,
+                           text_mode=False):
+    """Decompress and check a raw BGZF block from _read_bgzf_block (PRIVATE).
+
+    This does not touch the file handle, so it is safe to call from a
+    worker thread (zlib releases the GIL while decompressing).
+    """
+    d = zlib.decompressobj(-15)  # Negative window size means no headers
+    data = d.decompress(deflated) + d.flush()
     assert expected_size == len(data), \
         "Decompressed to %i, not %i" % (len(data), expected_size)
     # Should cope with a mix of Python platforms...
@@ -446,6 +555,62 @@ def _load_bgzf_block(handle, text_mode=False):
         return block_size, data
 
 
+def _load_bgzf_block(handle, text_mode=False):
+    """Load the next BGZF block of compressed data (PRIVATE)."""
+    block_size, deflated, expected_crc, expected_size = _read_bgzf_block(handle)
+    return _decompress_bgzf_block(block_size, deflated, expected_crc,
+                                  expected_size, text_mode)
+
+
+def _compress_bgzf_block(block, compresslevel=6):
+    """Compress data as a single BGZF block, returning the raw bytes (PRIVATE).
+
+    This does not touch any file handle, so it is safe to call from a
+    worker thread (zlib releases the GIL while compressing).
+    """
+    assert len(block) <= 65536
+    # Giving a negative window bits means no gzip/zlib headers,
+    # -15 used in samtools
+    c = zlib.compressobj(compresslevel,
+                         zlib.DEFLATED,
+                         -15,
+                         zlib.DEF_MEM_LEVEL,
+                         0)
+    compressed = c.compress(block) + c.flush()
+    del c
+    assert len(compressed) < 65536, \
+        "TODO - Didn't compress enough, try less data in this block"
+    bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
+    crc = struct.pack("<I", zlib.crc32(block) & 0xffffffff)
+    uncompressed_length = struct.pack("<I", len(block))
+    # Fixed 16 bytes,
+    # gzip magic bytes (4) mod time (4),
+    # gzip flag (1), os (1), extra length which is six (2),
+    # sub field which is BC (2), sub field length of two (2),
+    # Variable data,
+    # 2 bytes: block length as BC sub field (2)
+    # X bytes: the data
+    # 8 bytes: crc (4), uncompressed data length (4)
+    return _bgzf_header + bsize + compressed + crc + uncompressed_length
+
+
+def _make_thread_pool(threads):
+    """Return a thread pool for BGZF (de)compression, or None if threads is 1 (PRIVATE)."""
+    if threads < 1:
+        raise ValueError("Use threads with a minimum of 1")
+    if threads == 1:
+        return None
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        # Python 2 without the futures backport
+        from Bio import MissingPythonDependencyError
+        raise MissingPythonDependencyError(
+            "Using more than one BGZF thread requires concurrent.futures "
+            "(on Python 2, install the 'futures' backport).")
+    return ThreadPoolExecutor(max_workers=threads)
+
+
 class BgzfReader(object):
     r"""BGZF reader, acts like a read only handle but seek/tell differ.
 
@@ -513,9 +678,27 @@ class BgzfReader(object):
     block can be up to 64kb, the default cache could take up to 6MB of
     RAM. The cache is not important for reading through the file in one
     pass, but is important for improving performance of random access.
+
+    The threads argument (default 1) can be used to decompress blocks in
+    the background using a pool of worker threads. While you consume one
+    block, the following blocks are read from disk and handed to the pool,
+    which helps when reading large files sequentially:
+
+    >>> with BgzfReader("SamBam/ex1.bam", "rb", threads=2) as handle:
+    ...     data = handle.read(65536)
+    ...     offset = handle.tell()
+    ...
+    >>> split_virtual_offset(offset)
+    (18239, 0)
+
+    The virtual offsets returned by tell, and accepted by seek, are the
+    same as in single threaded mode. Seeking outside the blocks already
+    being read ahead discards them and restarts the read ahead from the
+    new position.
     """
 
-    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100):
+    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100,
+                 threads=1):
         """Initialize the class."""
         # TODO - Assuming we can seek, check for 28 bytes EOF empty block
         # and if missing warn about possible truncation (as in samtools)?
@@ -542,6 +725,13 @@ class BgzfReader(object):
         self._buffers = {}
         self._block_start_offset = None
         self._block_raw_length = None
+        self._pool = _make_thread_pool(threads)
+        if self._pool is not None:
+            # Blocks submitted for decompression, in file order, keyed
+            # by their start offset; and where to read the next one from
+            self._read_ahead = {}
+            self._read_ahead_offset = None
+            self._read_ahead_limit = 2 * threads
         self._load_block(handle.tell())
 
     def _load_block(self, start_offset=None):
@@ -564,6 +754,9 @@ class BgzfReader(object):
             # TODO - Implemente LRU cache removal?
             self._buffers.popitem()
         # Now load the block
+        if self._pool is not None:
+            self._load_block_threaded(start_offset)
+            return
         handle = self._handle
         if start_offset is not None:
             handle.seek(start_offset)
@@ -582,6 +775,70 @@ class BgzfReader(object):
         # Finally save the block in our cache,
         self._buffers[self._block_start_offset] = self._buffer, block_size
 
+    def _load_block_threaded(self, start_offset):
+        """Load a block via the read ahead decompression pool (PRIVATE)."""
+        if start_offset not in self._read_ahead:
+            # Random access (or the first block), restart the read ahead
+            self._cancel_read_ahead()
+            self._read_ahead_offset = start_offset
+            self._fill_read_ahead()
+        future = self._read_ahead.pop(start_offset, None)
+        for offset in [o for o in self._read_ahead if o < start_offset]:
+            # Skipped over by a seek, won't be needed
+            self._read_ahead.pop(offset).cancel()
+        # Keep the pool busy while we wait for (and then use) this block
+        self._fill_read_ahead()
+        if future is None:
+            # EOF
+            block_size = 0
+            if self._text:
+                self._buffer = ""
+            else:
+                self._buffer = b""
+        else:
+            block_size, self._buffer = future.result()
+        self._block_start_offset = start_offset
+        self._within_block_offset = 0
+        self._block_raw_length = block_size
+        # Finally save the block in our cache,
+        self._buffers[self._block_start_offset] = self._buffer, block_size
+
+    def _fill_read_ahead(self):
+        """Read raw blocks from disk and submit them for decompression (PRIVATE)."""
+        handle = self._handle
+        while self._read_ahead_offset is not None and \
+                len(self._read_ahead) < self._read_ahead_limit:
+            start_offset = self._read_ahead_offset
+            if start_offset in self._buffers:
+                # Already decompressed, but must read past it on disk
+                self._read_ahead_offset += self._buffers[start_offset][1]
+                continue
+            handle.seek(start_offset)
+            try:
+                raw = _read_bgzf_block(handle)
+            except StopIteration:
+                # EOF, nothing more to read ahead
+                self._read_ahead_offset = None
+                return
+            except Exception as err:
+                # Don't raise this until the caller asks for this block
+                from concurrent.futures import Future
+                future = Future()
+                future.set_exception(err)
+                self._read_ahead[start_offset] = future
+                self._read_ahead_offset = None
+                return
+            self._read_ahead[start_offset] = self._pool.submit(
+                _decompress_bgzf_block, *raw, text_mode=self._text)
+            self._read_ahead_offset = start_offset + raw[0]
+
+    def _cancel_read_ahead(self):
+        """Discard any blocks being read ahead (PRIVATE)."""
+        for future in self._read_ahead.values():
+            future.cancel()
+        self._read_ahead = {}
+        self._read_ahead_offset = None
+
     def tell(self):
         """Return a 64-bit unsigned BGZF virtual offset."""
         if 0 < self._within_block_offset and \
@@ -697,6 +954,10 @@ class BgzfReader(object):
 
     def close(self):
         """Close BGZF file."""
+        if self._pool is not None:
+            self._cancel_read_ahead()
+            self._pool.shutdown(wait=True)
+            self._pool = None
         self._handle.close()
         self._buffer = None
         self._block_start_offset = None
@@ -724,9 +985,17 @@ class BgzfReader(object):
 
 
 class BgzfWriter(object):
-    """Define a BGZFWriter object."""
+    """Define a BGZFWriter object.
 
-    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6):
+    The threads argument (default 1) can be used to compress full BGZF
+    blocks in the background using a pool of worker threads. The blocks
+    are still written to disk in order, so the output is identical to
+    single threaded mode. Note that calling tell, flush or close must
+    first wait for all the pending blocks to be written.
+    """
+
+    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6,
+                 threads=1):
         """Initilize the class."""
         if fileobj:
             assert filename is None
@@ -742,42 +1011,26 @@ class BgzfWriter(object):
         self._handle = handle
         self._buffer = b""
         self.compresslevel = compresslevel
+        self._pool = _make_thread_pool(threads)
+        # Blocks submitted for compression, oldest first
+        self._pending = deque()
+        self._pending_limit = 2 * threads
 
     def _write_block(self, block):
         """Write provided data to file as a single BGZF compressed block (PRIVATE)."""
         # print("Saving %i bytes" % len(block))
-        start_offset = self._handle.tell()
-        assert len(block) <= 65536
-        # Giving a negative window bits means no gzip/zlib headers,
-        # -15 used in samtools
-        c = zlib.compressobj(self.compresslevel,
-                             zlib.DEFLATED,
-                             -15,
-                             zlib.DEF_MEM_LEVEL,
-                             0)
-        compressed = c.compress(block) + c.flush()
-        del c
-        assert len(compressed) < 65536, \
-            "TODO - Didn't compress enough, try less data in this block"
-        crc = zlib.crc32(block)
-        # Should cope with a mix of Python platforms...
-        if crc < 0:
-            crc = struct.pack("<i", crc)
-        else:
-            crc = struct.pack("<I", crc)
-        bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
-        crc = struct.pack("<I", zlib.crc32(block) & 0xffffffff)
-        uncompressed_length = struct.pack("<I", len(block))
-        # Fixed 16 bytes,
-        # gzip magic bytes (4) mod time (4),
-        # gzip flag (1), os (1), extra length which is six (2),
-        # sub field which is BC (2), sub field length of two (2),
-        # Variable data,
-        # 2 bytes: block length as BC sub field (2)
-        # X bytes: the data
-        # 8 bytes: crc (4), uncompressed data length (4)
-        data = _bgzf_header + bsize + compressed + crc + uncompressed_length
-        self._handle.write(data)
+        if self._pool is None:
+            self._handle.write(_compress_bgzf_block(block, self.compresslevel))
+            return
+        self._pending.append(self._pool.submit(_compress_bgzf_block,
+                                               block, self.compresslevel))
+        while len(self._pending) > self._pending_limit:
+            self._handle.write(self._pending.popleft().result())
+
+    def _write_pending(self):
+        """Wait for and write out all the blocks being compressed (PRIVATE)."""
+        while self._pending:
+            self._handle.write(self._pending.popleft().result())
 
     def write(self, data):
         """Write method for the class."""
@@ -792,9 +1045,14 @@ class BgzfWriter(object):
         else:
             # print("Got %r, writing out some data..." % data)
             self._buffer += data
-            while len(self._buffer) >= 65536:
-                self._write_block(self._buffer[:65536])
-                self._buffer = self._buffer[65536:]
+            # Walk along the buffer rather than repeatedly slicing off
+            # the front, which would copy the remainder each time
+            buffer = self._buffer
+            start = 0
+            while len(buffer) - start >= 65536:
+                self._write_block(buffer[start:start + 65536])
+                start += 65536
+            self._buffer = buffer[start:]
 
     def flush(self):
         """Flush data explicitally."""
@@ -803,6 +1061,7 @@ class BgzfWriter(object):
             self._buffer = self._buffer[65535:]
         self._write_block(self._buffer)
         self._buffer = b""
+        self._write_pending()
         self._handle.flush()
 
     def close(self):
@@ -815,12 +1074,17 @@ class BgzfWriter(object):
         """
         if self._buffer:
             self.flush()
+        self._write_pending()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
         self._handle.write(_bgzf_eof)
         self._handle.flush()
         self._handle.close()
 
     def tell(self):
         """Return a BGZF 64-bit virtual offset."""
+        self._write_pending()
         return make_virtual_offset(self._handle.tell(), len(self._buffer))
 
     def seekable(self):
@@ -218,6 +218,7 @@ type ``help(pairwise2.align.localds``) at the Python prompt.
 """  # noqa: W291
 from __future__ import print_function
 
+import numbers
 import warnings
 
 from Bio import BiopythonWarning
@@ -460,6 +461,12 @@ def _align(sequenceA, sequenceB, match_fn, gap_A_fn, gap_B_fn,
             sequenceA, sequenceB, match_fn, open_A, extend_A, open_B,
             extend_B, penalize_extend_when_opening, penalize_end_gaps,
             align_globally, score_only)
+    elif (not force_generic) and \
+            isinstance(match_fn, (identity_match, dictionary_match)) \
+            and _have_numpy():
+        matrices = _make_score_matrix_numpy(
+            sequenceA, sequenceB, match_fn, gap_A_fn, gap_B_fn,
+            penalize_end_gaps, align_globally, score_only)
     else:
         matrices = _make_score_matrix_generic(
             sequenceA, sequenceB, match_fn, gap_A_fn, gap_B_fn,
@@ -510,8 +517,9 @@ def _make_score_matrix_generic(sequenceA, sequenceB, match_fn, gap_A_fn,
 
     This implementation according to Needleman-Wunsch allows the usage of
     general gap functions and is rather slow. It is automatically called if
-    you define your own gap functions. You can force the usage of this method
-    with ``force_generic=True``.
+    you define your own gap functions and NumPy is not available, or the
+    match function is not an identity_match or dictionary_match. You can
+    force the usage of this method with ``force_generic=True``.
     """
     # Create the score and traceback matrices. These should be in the
     # shape:
@@ -601,6 +609,206 @@ def _make_score_matrix_generic(sequenceA, sequenceB, match_fn, gap_A_fn,
     return score_matrix, trace_matrix
 
 
+def _have_numpy():
+    """Return True if NumPy can be imported (PRIVATE)."""
+    try:
+        import numpy
+    except ImportError:
+        return False
+    del numpy
+    return True
+
+
+def _make_score_matrix_numpy(sequenceA, sequenceB, match_fn, gap_A_fn,
+                             gap_B_fn, penalize_end_gaps, align_globally,
+                             score_only):
+    """Generate a score and traceback matrix using NumPy (PRIVATE).
+
+    This calculates the same score and traceback matrices as
+    _make_score_matrix_generic, but fills in all cells on an anti-diagonal
+    of the matrices at once, as they do not depend on each other.  The
+    match scores are looked up once for each pair of letters, and the gap
+    functions are called once for each position and gap length.  It is used
+    instead of _make_score_matrix_generic if NumPy is available and the match
+    function is an identity_match or a dictionary_match.
+
+    As in _make_score_matrix_generic, a score is an integer if it was added
+    up from integer match and gap scores only, so the score arrays are kept
+    together with arrays of flags that record which scores are integers.
+    """
+    import numpy
+
+    lenA, lenB = len(sequenceA), len(sequenceB)
+
+    # Look up the match score of each pair of letters only once.
+    lettersA, lettersB = {}, {}
+    codesA = [lettersA.setdefault(c, len(lettersA)) for c in sequenceA]
+    codesB = [lettersB.setdefault(c, len(lettersB)) for c in sequenceB]
+    lettersA = sorted(lettersA, key=lettersA.get)
+    lettersB = sorted(lettersB, key=lettersB.get)
+    scores = [[match_fn(charA, charB) for charB in lettersB]
+              for charA in lettersA]
+    integers = [[isinstance(score, numbers.Integral) for score in row]
+                for row in scores]
+    match_scores = numpy.array(scores, float)[numpy.ix_(codesA, codesB)]
+    match_integers = numpy.array(integers, bool)[numpy.ix_(codesA, codesB)]
+
+    # The gap scores of each position and length, as they are used below.
+    # Gaps at the end are free if they are not penalized.
+    gap_A_scores, gap_A_integers = _gap_score_table(gap_A_fn, lenA, lenB)
+    if not penalize_end_gaps[0]:
+        gap_A_scores[:, lenA] = 0
+        gap_A_integers[:, lenA] = True
+    gap_B_scores, gap_B_integers = _gap_score_table(gap_B_fn, lenB, lenA)
+    if not penalize_end_gaps[1]:
+        gap_B_scores[:, lenB] = 0
+        gap_B_integers[:, lenB] = True
+
+    # The scores are stored by anti-diagonal, so that the cells needed for
+    # the cells on an anti-diagonal are slices of these arrays: the score of
+    # cell (row, col) is stored in by_row[row + col, row] and in
+    # by_col[row + col, col].  Cells outside of the matrix score -inf.
+    size = lenA + lenB + 1
+    by_row = numpy.empty((size, lenA + 1))
+    by_row.fill(-numpy.inf)
+    by_col = numpy.empty((size, lenB + 1))
+    by_col.fill(-numpy.inf)
+    row_integers = numpy.zeros((size, lenA + 1), bool)
+    col_integers = numpy.zeros((size, lenB + 1), bool)
+    trace_matrix = numpy.zeros((lenA + 1, lenB + 1), int)
+
+    # Initialize first row and column with gap scores, in the same way as
+    # _make_score_matrix_generic.
+    for i in range(lenA + 1):
+        if penalize_end_gaps[1]:  # [1]:gap in sequence B
+            score = gap_B_fn(0, i)
+        else:
+            score = 0
+        by_row[i, i] = by_col[i, 0] = score
+        row_integers[i, i] = col_integers[i, 0] = \
+            isinstance(score, numbers.Integral)
+    for i in range(lenB + 1):
+        if penalize_end_gaps[0]:  # [0]:gap in sequence A
+            score = gap_A_fn(0, i)
+        else:
+            score = 0
+        by_row[i, 0] = by_col[i, i] = score
+        row_integers[i, 0] = col_integers[i, i] = \
+            isinstance(score, numbers.Integral)
+
+    for diagonal in range(2, size):
+        first = max(1, diagonal - lenB)
+        last = min(lenA, diagonal - 1)
+        rows = numpy.arange(first, last + 1)
+        cols = diagonal - rows
+        cells = numpy.arange(len(rows))
+        nogap_score = by_row[diagonal - 2, first - 1:last] + \
+            match_scores[rows - 1, cols - 1]
+        nogap_integer = row_integers[diagonal - 2, first - 1:last] & \
+            match_integers[rows - 1, cols - 1]
+
+        # Gaps in sequenceA ending at each cell, from the longest to the
+        # shortest (length 1) gap.  As max() does, use the first of equal
+        # scores, which is the longest gap.
+        n = diagonal - first
+        row_scores = by_row[diagonal - n:diagonal, first:last + 1] + \
+            gap_A_scores[n:0:-1, first:last + 1]
+        row_open = row_scores[-1]
+        row_open_integer = row_integers[diagonal - 1, first:last + 1] & \
+            gap_A_integers[1, first:last + 1]
+        k = row_scores.argmax(axis=0)
+        row_extend = row_scores[k, cells]
+        row_extend_integer = row_integers[diagonal - n + k, rows] & \
+            gap_A_integers[n - k, rows]
+
+        # The same for sequenceB; here the cells are in the reverse order.
+        n = last
+        col_scores = by_col[diagonal - n:diagonal, cols[-1]:cols[0] + 1] + \
+            gap_B_scores[n:0:-1, cols[-1]:cols[0] + 1]
+        col_open = col_scores[-1, ::-1]
+        col_open_integer = col_integers[diagonal - 1, cols] & \
+            gap_B_integers[1, cols]
+        k = col_scores.argmax(axis=0)[::-1]
+        col_extend = col_scores[k, cells[::-1]]
+        col_extend_integer = col_integers[diagonal - n + k, cols] & \
+            gap_B_integers[n - k, cols]
+
+        candidates = numpy.array([nogap_score, row_open, row_extend,
+                                  col_open, col_extend])
+        k = candidates.argmax(axis=0)
+        best_score = candidates[k, cells]
+        integer = numpy.array([nogap_integer, row_open_integer,
+                               row_extend_integer, col_open_integer,
+                               col_extend_integer])[k, cells]
+        if align_globally:
+            score = best_score
+        else:
+            score = numpy.where(best_score < 0, 0, best_score)
+            integer = integer | (best_score < 0)
+        by_row[diagonal, first:last + 1] = score
+        by_col[diagonal, cols[-1]:cols[0] + 1] = score[::-1]
+        row_integers[diagonal, first:last + 1] = integer
+        col_integers[diagonal, cols[-1]:cols[0] + 1] = integer[::-1]
+
+        # The backtrace is encoded binary. See _make_score_matrix_fast
+        # for details.
+        if not score_only:
+            best_score_rint = _rint_array(best_score)
+            trace_score = 2 * (_rint_array(nogap_score) == best_score_rint)
+            trace_score += _rint_array(row_open) == best_score_rint
+            trace_score += 8 * (_rint_array(row_extend) == best_score_rint)
+            trace_score += 4 * (_rint_array(col_open) == best_score_rint)
+            trace_score += 16 * (_rint_array(col_extend) == best_score_rint)
+            trace_matrix[rows, cols] = trace_score
+
+    rows = numpy.arange(lenA + 1)[:, None]
+    cols = numpy.arange(lenB + 1)
+    score_matrix = by_row[rows + cols, rows]
+    integers = row_integers[rows + cols, rows]
+    if integers.all():
+        score_matrix = score_matrix.astype(int).tolist()
+    elif not integers.any():
+        score_matrix = score_matrix.tolist()
+    else:
+        score_matrix = [[int(score) if integer else score
+                         for score, integer in zip(*row)]
+                        for row in zip(score_matrix.tolist(),
+                                       integers.tolist())]
+    if score_only:
+        return score_matrix, []
+    trace_matrix = trace_matrix.tolist()
+    for i in range(lenA + 1):
+        trace_matrix[i][0] = None
+    for i in range(lenB + 1):
+        trace_matrix[0][i] = None
+    return score_matrix, trace_matrix
+
+
+def _gap_score_table(gap_fn, positions, lengths):
+    """Return the gap scores for each gap length and position (PRIVATE).
+
+    Element [n, i] of the returned arrays is the score of a gap of length n
+    at position i, for n and i starting from 1, and whether it is an integer.
+    """
+    import numpy
+
+    table = numpy.zeros((lengths + 1, positions + 1))
+    integers = numpy.ones((lengths + 1, positions + 1), bool)
+    if isinstance(gap_fn, affine_penalty):
+        # The gap score does not depend on the position.
+        for n in range(1, lengths + 1):
+            score = gap_fn(0, n)
+            table[n, 1:] = score
+            integers[n, 1:] = isinstance(score, numbers.Integral)
+    else:
+        for i in range(1, positions + 1):
+            scores = [gap_fn(i, n) for n in range(1, lengths + 1)]
+            table[1:, i] = scores
+            integers[1:, i] = [isinstance(score, numbers.Integral)
+                               for score in scores]
+    return table, integers
+
+
 def _make_score_matrix_fast(sequenceA, sequenceB, match_fn, open_A, extend_A,
                             open_B, extend_B, penalize_extend_when_opening,
                             penalize_end_gaps, align_globally, score_only):
@@ -988,6 +1196,13 @@ def rint(x, precision=_PRECISION):
     return int(x * precision + 0.5)
 
 
+def _rint_array(x, precision=_PRECISION):
+    """Apply rint to each number in a NumPy array (PRIVATE)."""
+    import numpy
+
+    return numpy.trunc(x * precision + 0.5)
+
+
 class identity_match(object):
     """Create a match function for use in an alignment.
 
@@ -603,6 +603,7 @@ class DBSeqRecord(SeqRecord):
 
     def __set_features(self, features):
         self._features = features
+        self._clear_feature_index()
 
     def __del_features(self):
         del self._features
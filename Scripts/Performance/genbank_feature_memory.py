@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Measure the memory used by parsed GenBank records and their features.
+
+Parses the GenBank files given on the command line (by default those in
+Tests/GenBank), keeping all the records in memory, and reports the memory
+allocated and the number of features. Requires Python 3.4 or later for
+the tracemalloc module.
+
+Run from the Tests directory (for the default files), e.g.::
+
+    cd Tests
+    python ../Scripts/Performance/genbank_feature_memory.py
+
+Running this with an older copy of Biopython on the path gives a baseline.
+"""
+from __future__ import print_function
+
+import glob
+import os
+import sys
+import tracemalloc
+
+from Bio import BiopythonParserWarning
+from Bio import SeqIO
+
+import warnings
+warnings.simplefilter("ignore", BiopythonParserWarning)
+
+
+def records_from(filenames):
+    """Return a list of all the records in the given GenBank files."""
+    records = []
+    for filename in filenames:
+        try:
+            records.extend(SeqIO.parse(filename, "genbank"))
+        except (ValueError, AssertionError):
+            # Some test files are deliberately invalid
+            pass
+    return records
+
+
+if len(sys.argv) > 1:
+    filenames = sys.argv[1:]
+else:
+    filenames = sorted(glob.glob(os.path.join("GenBank", "*.gb")) +
+                       glob.glob(os.path.join("GenBank", "*.gbk")) +
+                       glob.glob(os.path.join("GenBank", "*.gbwithparts")))
+if not filenames:
+    sys.exit("No GenBank files found, run this from the Tests directory.")
+
+# Parse once first to load any modules etc (so they are not counted)
+records_from(filenames)
+tracemalloc.start()
+records = records_from(filenames)
+total = tracemalloc.get_traced_memory()[0]
+features = sum(len(r.features) for r in records)
+# The memory freed by discarding the features is what they used
+for record in records:
+    record.features = []
+feature_memory = total - tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print("%i files, %i records, %i features" % (len(filenames), len(records),
+                                             features))
+print("Memory for the records: %0.2f MB" % (total / 1048576.0))
+print("Memory for the features: %0.2f MB (%i bytes per feature)"
+      % (feature_memory / 1048576.0, feature_memory / max(features, 1)))
@@ -138,6 +138,7 @@ DOCTEST_MODULES = [
     "Bio.SeqIO.QualityIO",
     "Bio.SeqIO.SffIO",
     "Bio.SeqIO.TabIO",
+    "Bio.SeqIO.TwoBitIO",
     "Bio.SeqFeature",
     "Bio.SeqRecord",
     "Bio.SeqUtils",
@@ -160,6 +161,7 @@ if numpy:
         "Bio.PDB.Polypeptide",
         "Bio.PDB.Selection",
         "Bio.SeqIO.PdbIO",
+        "Bio.SeqUtils.Kmers",
         "Bio.Statistics.lowess",
         "Bio.SVDSuperimposer",
     ])
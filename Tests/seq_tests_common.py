@@ -12,6 +12,17 @@ from Bio.SeqFeature import FeatureLocation, CompoundLocation, SeqFeature
 from Bio.SeqRecord import SeqRecord
 
 
+class Index(object):
+    """An integer-like object, such as a NumPy integer."""
+
+    def __init__(self, value):
+        """Create an object to use as the given integer index."""
+        self.value = value
+
+    def __index__(self):
+        return self.value
+
+
 def checksum_summary(record):
     """Abbreviated string showing sequence, checksum, and length."""
     if isinstance(record.seq, UnknownSeq):
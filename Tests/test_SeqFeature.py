@@ -5,11 +5,14 @@
 
 """Tests Bio.SeqFeature.
 """
+import copy
+import pickle
 import unittest
 from os import path
 from Bio import SeqIO
 from Bio.SeqFeature import FeatureLocation, AfterPosition, BeforePosition
 from Bio.SeqFeature import CompoundLocation, UnknownPosition
+from Bio.SeqFeature import SeqFeature, ExactPosition
 
 
 class TestReference(unittest.TestCase):
@@ -134,3 +137,51 @@ class TestCompoundLocation(unittest.TestCase):
         loc1 = FeatureLocation(12, 17, 1) + FeatureLocation(23, 42, 1)
         loc2 = 5
         self.assertNotEqual(loc1, loc2)
+
+
+class TestSlots(unittest.TestCase):
+    """Check the memory saving __slots__ still allow copying and pickling."""
+
+    def test_no_dictionary(self):
+        """Check positions and locations don't start with a dictionary."""
+        self.assertFalse(hasattr(ExactPosition(5), "__dict__"))
+        self.assertFalse(hasattr(BeforePosition(5), "__dict__"))
+        feature = SeqFeature(FeatureLocation(5, 10), type="gene")
+        self.assertEqual(feature.__dict__, {})
+        self.assertEqual(feature.location.__dict__, {})
+        # Other attributes can still be added
+        feature.sub_features = []
+        self.assertEqual(feature.__dict__, {"sub_features": []})
+
+    def test_pickle_and_copy(self):
+        """Check features can be pickled and copied."""
+        location = CompoundLocation([FeatureLocation(BeforePosition(5), 10, 1),
+                                     FeatureLocation(20, AfterPosition(30), 1,
+                                                     ref="X12345.1")])
+        feature = SeqFeature(location, type="CDS", id="cds1",
+                             qualifiers={"gene": ["abc"]})
+        feature.extra = "kept"
+        copies = [pickle.loads(pickle.dumps(feature, protocol))
+                  for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]
+        copies.append(copy.deepcopy(feature))
+        copies.append(copy.copy(feature))
+        for new in copies:
+            self.assertEqual(repr(new), repr(feature))
+            self.assertEqual(new.qualifiers, feature.qualifiers)
+            self.assertEqual(new.extra, "kept")
+            self.assertEqual(new.location, feature.location)
+
+    def test_genbank_sharing(self):
+        """Check the GenBank parser shares positions, types and keys."""
+        record = SeqIO.read(path.join("GenBank", "NC_005816.gb"), "genbank")
+        gene, cds = record.features[2:4]
+        self.assertEqual((gene.type, cds.type), ("gene", "CDS"))
+        self.assertTrue(gene.location.start is cds.location.start)
+        self.assertTrue(gene.location.end is cds.location.end)
+        self.assertTrue(gene.type is record.features[7].type)
+        self.assertTrue(gene.qualifiers["locus_tag"][0] is
+                        cds.qualifiers["locus_tag"][0])
+        gene_keys = dict((key, key) for key in gene.qualifiers)
+        for key in cds.qualifiers:
+            if key in gene_keys:
+                self.assertTrue(key is gene_keys[key])
@@ -6,13 +6,24 @@
 
 from __future__ import print_function
 
+import gzip
+import os
+import pickle
+import shutil
+import tempfile
 import unittest
+from io import BytesIO
 from Bio._py3k import StringIO
 
 from Bio import SeqIO
-from Bio.SeqIO.FastaIO import FastaIterator
+from Bio import bgzf
+from Bio.Seq import FileSeq
+from Bio.SeqIO.FastaIO import FastaIterator, IndexedFasta, make_faidx
+from Bio.SeqIO.FastaIO import SimpleFastaParser, _fasta_bytes_blocks
 from Bio.Alphabet import generic_nucleotide, generic_dna
 
+from seq_tests_common import Index
+
 
 def title_to_ids(title):
     """Function to convert a title into the id, name, and description.
@@ -127,6 +138,23 @@ class TitleFunctions(unittest.TestCase):
             self.assertEqual(new.description, descr)
             self.assertEqual(str(new.seq), str(old.seq))
             self.assertEqual(new.seq.alphabet, old.seq.alphabet)
+        # Now the lazy records, with and without the title function,
+        with open(filename) as handle:
+            lazy = list(FastaIterator(handle, alphabet, lazy=True))
+        with open(filename) as handle:
+            lazy_titled = list(FastaIterator(handle, alphabet, title_to_ids,
+                                             lazy=True))
+        self.assertEqual(len(lazy), len(default))
+        for old, new, titled in zip(default, lazy, lazy_titled):
+            self.assertEqual(len(new), len(old))
+            self.assertEqual(new.id, old.id)
+            self.assertEqual(new.name, old.name)
+            self.assertEqual(new.description, old.description)
+            self.assertEqual(str(new.seq), str(old.seq))
+            self.assertEqual(new.seq.alphabet, old.seq.alphabet)
+            self.assertEqual(new.format("fasta"), old.format("fasta"))
+            self.assertEqual((titled.id, titled.name, titled.description),
+                             title_to_ids(old.description))
         # Uncomment this for testing the methods are calling the right files:
         # print("{%s done}" % filename)
 
@@ -140,6 +168,216 @@ class TitleFunctions(unittest.TestCase):
         self.assertEqual("", record.name)
         self.assertEqual("", record.description)
 
+    def test_lazy(self):
+        """Test editing and slicing lazy FASTA records."""
+        handle = StringIO(">alpha first\nACGTACGT\n>beta second\nGGCC")
+        records = FastaIterator(handle, generic_dna, lazy=True)
+        record = next(records)
+        self.assertEqual(len(record), 8)
+        record.id = "gamma"
+        self.assertEqual(record.id, "gamma")
+        self.assertEqual(record.name, "alpha")
+        self.assertEqual(record.description, "alpha first")
+        sub = record[2:6]
+        self.assertEqual(str(sub.seq), "GTAC")
+        self.assertEqual(sub.id, "gamma")
+        self.assertEqual(record[-1], "T")
+        self.assertEqual(str(record.reverse_complement().seq), "ACGTACGT")
+        record.letter_annotations["dummy"] = "abcdefgh"
+        self.assertEqual(record[1:3].letter_annotations["dummy"], "bc")
+        record.letter_annotations = {}
+        record.seq = record.seq[:4]
+        self.assertEqual(len(record), 4)
+        self.assertEqual(record.format("fasta"), ">gamma alpha first\nACGT\n")
+        record = next(records)
+        self.assertEqual(record.id, "beta")
+        self.assertEqual(record.dbxrefs, [])
+        self.assertEqual(record.features, [])
+        self.assertEqual(record.annotations, {})
+        handle.close()
+
+    def test_lazy_pickle(self):
+        """Test pickling lazy FASTA records using a title2ids function."""
+        handle = StringIO(">alpha first\nACGT\n>beta second\nGGCC\n")
+        records = FastaIterator(handle, generic_dna, lazy=True,
+                                title2ids=lambda t: (t.upper(), t, t[::-1]))
+        for record in records:
+            other = pickle.loads(pickle.dumps(record))
+            self.assertEqual((other.id, other.name, other.description),
+                             (record.id, record.name, record.description))
+            self.assertEqual(str(other.seq), str(record.seq))
+            self.assertEqual(repr(other.seq.alphabet), repr(generic_dna))
+            self.assertEqual(len(other), 4)
+
+    def test_lazy_layouts(self):
+        """Test lazy FASTA records match SimpleFastaParser."""
+        examples = ["", "\n", "ACGT\n", ">", ">\n", ">alpha", "#comment\n>a\nAC",
+                    ">a\nAC\n>b\n\n>c\nGG TT \nAA\n", ">a b  \n AC\t\nG\r\n",
+                    "\n\n>x y\nA\nC\n\n>z\nG>G\n>>w\nT\n",
+                    ">a b \nAC GT\n>c\nTT\n>  \nGG\n", ">a\r\nAC\r\n>b\r\nG\r\n",
+                    ">a\nACGT\nAC\nGT\n>b\nA\n", ">a\nAC\x00GT\n>b\n",
+                    ">a\nAC\nG T\n>b\nTT\nGG\n>c\n\nA\n"]
+        for text in examples:
+            expected = list(SimpleFastaParser(StringIO(text)))
+            for handle in [StringIO(text), BytesIO(text.encode())]:
+                records = list(FastaIterator(handle, lazy=True))
+                self.assertEqual([(r.description, str(r.seq)) for r in records],
+                                 expected)
+                self.assertEqual([len(r) for r in records],
+                                 [len(seq) for title, seq in expected])
+            # Try splitting the file in all sorts of places
+            for chunk_size in [1, 2, 3, 7]:
+                blocks = _fasta_bytes_blocks(BytesIO(text.encode()),
+                                             chunk_size)
+                found = [(title, seq.decode())
+                         for titles, seqs in blocks
+                         for title, seq in zip(titles, seqs)]
+                self.assertEqual(found, expected)
+
+
+class Faidx(unittest.TestCase):
+    """Test random access to FASTA files via samtools style indexes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.sequences = [("alpha", "ACGT" * 50),
+                          ("beta", "G"),
+                          ("gamma", ""),
+                          ("delta", "ACGTTGCA" * 1000 + "ACG")]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_fasta(self, filename, wrap=60, newline="\n", compressed=False):
+        filename = os.path.join(self.temp_dir, filename)
+        lines = []
+        for name, seq in self.sequences:
+            lines.append(">%s some description" % name)
+            lines.extend(seq[i:i + wrap] for i in range(0, len(seq), wrap))
+        data = newline.join(lines) + newline
+        if compressed:
+            with bgzf.BgzfWriter(filename, "wb") as handle:
+                # Use lots of small blocks so regions span several
+                for i in range(0, len(data), 1000):
+                    handle.write(data[i:i + 1000])
+                    handle.flush()
+        else:
+            with open(filename, "w") as handle:
+                handle.write(data)
+        return filename
+
+    def check_regions(self, filename):
+        with IndexedFasta(filename) as fasta:
+            self.assertEqual(fasta.keys(), [n for n, s in self.sequences])
+            self.assertEqual(len(fasta), len(self.sequences))
+            self.assertIn("beta", fasta)
+            self.assertNotIn("omega", fasta)
+            for name, seq in self.sequences:
+                self.assertEqual(fasta.get_length(name), len(seq))
+                self.assertEqual(str(fasta.get_seq(name)), seq)
+                self.assertEqual(str(fasta.fetch(name)), seq)
+                for start in [0, 1, 59, 60, 61, 999, 1000, 1001, 7990]:
+                    for end in [start + 1, start + 60, start + 1500, None]:
+                        self.assertEqual(str(fasta.get_seq(name, start, end)),
+                                         seq[start:end])
+                        if start < len(seq):
+                            if end is None:
+                                region = "%s:%i" % (name, start + 1)
+                            else:
+                                region = "%s:%i-%i" % (name, start + 1, end)
+                            self.assertEqual(str(fasta.fetch(region)),
+                                             seq[start:end])
+            self.assertEqual(str(fasta.fetch("delta:1,001-1,008")), "ACGTTGCA")
+            self.assertRaises(KeyError, fasta.fetch, "omega:1-10")
+            self.assertRaises(ValueError, fasta.fetch, "delta:10-1")
+            self.assertRaises(ValueError, fasta.fetch, "delta:0-10")
+            self.assertRaises(ValueError, fasta.fetch, "delta:x-10")
+
+    def check_file(self, filename):
+        # Without any index files, builds the index in memory
+        self.check_regions(filename)
+        self.assertFalse(os.path.isfile(filename + ".fai"))
+        entries = make_faidx(filename)
+        self.assertEqual([e[0] for e in entries],
+                         [n for n, s in self.sequences])
+        self.assertEqual([e[1] for e in entries],
+                         [len(s) for n, s in self.sequences])
+        self.assertTrue(os.path.isfile(filename + ".fai"))
+        # Now using the index files
+        self.check_regions(filename)
+
+    def test_plain(self):
+        """Fetch regions from plain FASTA files."""
+        for wrap in [1, 60, 70, 100000]:
+            self.check_file(self.write_fasta("wrap%i.fasta" % wrap, wrap))
+
+    def test_dos(self):
+        """Fetch regions from a FASTA file with DOS line endings."""
+        self.check_file(self.write_fasta("dos.fasta", 70, "\r\n"))
+
+    def test_bgzf(self):
+        """Fetch regions from BGZF compressed FASTA files."""
+        for wrap in [1, 60]:
+            filename = self.write_fasta("wrap%i.fasta.bgz" % wrap, wrap,
+                                        compressed=True)
+            self.check_file(filename)
+            self.assertTrue(os.path.isfile(filename + ".gzi"))
+
+    def test_file_seq(self):
+        """Slice the FileSeq objects from an indexed FASTA file."""
+        for compressed in [False, True]:
+            filename = self.write_fasta("file_seq.fasta", 60,
+                                        compressed=compressed)
+            with IndexedFasta(filename, generic_dna) as fasta:
+                for name, seq in self.sequences:
+                    file_seq = fasta[name]
+                    self.assertIsInstance(file_seq, FileSeq)
+                    self.assertEqual(len(file_seq), len(seq))
+                    self.assertEqual(str(file_seq), seq)
+                    for start in [None, 0, 1, 59, 60, 61, -1, -61, 7990]:
+                        for end in [None, 1, 60, 1500, -1, -60]:
+                            for step in [None, 1, 3, -1, -7]:
+                                index = slice(start, end, step)
+                                self.assertEqual(str(file_seq[index]),
+                                                 seq[index])
+                    if len(seq) > 1:
+                        self.assertEqual(file_seq[Index(1)], seq[1])
+                        self.assertEqual(file_seq[-1], seq[-1])
+                        self.assertEqual(file_seq[1:][-1], seq[-1])
+                    self.assertRaises(IndexError, file_seq.__getitem__,
+                                      len(seq))
+                file_seq = fasta["delta"][1000:1010]
+                self.assertEqual(file_seq.alphabet, generic_dna)
+                self.assertEqual(str(file_seq.reverse_complement()),
+                                 "GTTGCAACGT")
+                self.assertEqual(str(file_seq + "A"), "ACGTTGCAACA")
+                self.assertEqual(str("A" + file_seq), "AACGTTGCAAC")
+                self.assertEqual(str(file_seq[:2] * 2), "ACAC")
+                self.assertEqual(str(pickle.loads(pickle.dumps(file_seq))),
+                                 "ACGTTGCAAC")
+                self.assertRaises(KeyError, fasta.__getitem__, "omega")
+            os.remove(filename)
+            if os.path.isfile(filename + ".gzi"):
+                os.remove(filename + ".gzi")
+
+    def test_bad_lines(self):
+        """Check a FASTA file with uneven line lengths is rejected."""
+        filename = os.path.join(self.temp_dir, "bad.fasta")
+        with open(filename, "w") as handle:
+            handle.write(">alpha\nACGT\nAC\nACGT\n")
+        self.assertRaises(ValueError, IndexedFasta, filename)
+        with open(filename, "w") as handle:
+            handle.write(">alpha\nACGT\nACGTA\n")
+        self.assertRaises(ValueError, IndexedFasta, filename)
+
+    def test_gzip(self):
+        """Check a plain GZIP compressed FASTA file is rejected."""
+        filename = os.path.join(self.temp_dir, "plain.fasta.gz")
+        handle = gzip.open(filename, "wb")
+        handle.write(b">alpha\nACGT\n")
+        handle.close()
+        self.assertRaises(ValueError, IndexedFasta, filename)
+
 
 single_nucleic_files = ['Fasta/lupine.nu', 'Fasta/elderberry.nu',
                         'Fasta/phlox.nu', 'Fasta/centaurea.nu',
@@ -21,9 +21,14 @@ from Bio.Alphabet import generic_dna
 from Bio.SeqIO import QualityIO
 from Bio import SeqIO
 from Bio.Seq import Seq, UnknownSeq, MutableSeq
-from Bio.SeqRecord import SeqRecord
+from Bio.SeqRecord import SeqRecord, LetterAnnotationArray
 from Bio.Data.IUPACData import ambiguous_dna_letters, ambiguous_rna_letters
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 BINARY_FORMATS = ["sff", "sff-trim"]
 
 
@@ -155,6 +160,13 @@ class TestFastqErrors(unittest.TestCase):
             title, seq, qual = next(tuples)  # Make sure no errors!
         self.assertRaises(ValueError, next, tuples)
         handle.close()
+        # Now the same with the binary mode parser,
+        for chunk_size in (7, 1048576):
+            with open(filename, "rb") as handle:
+                tuples = QualityIO.FastqBytesIterator(handle, chunk_size)
+                for i in range(good_count):
+                    title, seq, qual = next(tuples)  # Make sure no errors!
+                self.assertRaises(ValueError, next, tuples)
 
     def check_general_passes(self, filename, record_count):
         handle = open(filename, _universal_read_mode)
@@ -167,6 +179,12 @@ class TestFastqErrors(unittest.TestCase):
             count += 1
         self.assertEqual(count, record_count)
         handle.close()
+        with open(filename, "rb") as handle:
+            count = 0
+            for title, seq, qual in QualityIO.FastqBytesIterator(handle):
+                self.assertEqual(len(seq), len(qual))
+                count += 1
+        self.assertEqual(count, record_count)
 
     def check_all_fail(self, filename, count):
         self.check_fails(filename, count)
@@ -222,6 +240,400 @@ for base_name, good_count, full_count in tests:
     del funct
 
 
+class TestFastqBytes(unittest.TestCase):
+    """Compare the binary mode FASTQ parsers to FastqGeneralIterator."""
+
+    def check_bytes(self, filename):
+        with open(filename, _universal_read_mode) as handle:
+            expected = list(QualityIO.FastqGeneralIterator(handle))
+        for chunk_size in (1, 5, 64, 1048576):
+            with open(filename, "rb") as handle:
+                tuples = list(QualityIO.FastqBytesIterator(handle, chunk_size))
+            self.assertEqual(len(tuples), len(expected))
+            for (title, seq, qual), old in zip(tuples, expected):
+                self.assertTrue(isinstance(title, bytes))
+                self.assertEqual((title.decode(), seq.decode(), qual.decode()),
+                                 old)
+
+    def test_example(self):
+        self.check_bytes("Quality/example.fastq")
+
+    def test_dos(self):
+        self.check_bytes("Quality/example_dos.fastq")
+
+    def test_tricky(self):
+        self.check_bytes("Quality/tricky.fastq")
+
+    def test_wrapping(self):
+        self.check_bytes("Quality/wrapping_original_sanger.fastq")
+
+    def test_zero_length(self):
+        self.check_bytes("Quality/zero_length.fastq")
+
+    def test_text_mode(self):
+        with open("Quality/example.fastq", _universal_read_mode) as handle:
+            tuples = QualityIO.FastqBytesIterator(handle)
+            self.assertRaises(ValueError, next, tuples)
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_batches(self):
+        records = list(SeqIO.parse("Quality/tricky.fastq", "fastq"))
+        with open("Quality/tricky.fastq", "rb") as handle:
+            batches = list(QualityIO.FastqBatchIterator(handle, batch_size=3))
+        self.assertEqual([len(b) for b in batches], [3, 1])
+        index = 0
+        for batch in batches:
+            self.assertEqual(batch.offsets[-1], len(batch.sequences))
+            self.assertEqual(len(batch.qualities), len(batch.sequences))
+            for i, id in enumerate(batch.ids):
+                record = records[index]
+                self.assertEqual(id, record.id)
+                self.assertEqual(batch.titles[i], record.description)
+                self.assertEqual(batch.sequence(i), str(record.seq))
+                self.assertEqual(batch.lengths[i], len(record))
+                self.assertEqual(batch.quality(i).tolist(),
+                                 record.letter_annotations["phred_quality"])
+                index += 1
+        self.assertEqual(index, len(records))
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_batches_illumina(self):
+        record = SeqIO.read("Quality/illumina_faked.fastq", "fastq-illumina")
+        with open("Quality/illumina_faked.fastq", "rb") as handle:
+            batch, = QualityIO.FastqBatchIterator(handle, offset=64)
+        self.assertEqual(batch.quality(0).tolist(),
+                         record.letter_annotations["phred_quality"])
+        with open("Quality/solexa_faked.fastq", "rb") as handle:
+            batches = QualityIO.FastqBatchIterator(handle, offset=64)
+            self.assertRaises(ValueError, next, batches)
+
+
+class TestFastqLazy(unittest.TestCase):
+    """Compare the lazy FASTQ records to the normal SeqRecord objects."""
+
+    def check_lazy(self, filename, format):
+        with open(filename) as handle:
+            records = list(SeqIO.parse(handle, format))
+        iterator = {"fastq": QualityIO.FastqPhredIterator,
+                    "fastq-solexa": QualityIO.FastqSolexaIterator,
+                    "fastq-illumina": QualityIO.FastqIlluminaIterator}[format]
+        with open(filename) as handle:
+            lazy = list(iterator(handle, lazy=True))
+        self.assertEqual(len(lazy), len(records))
+        # The lazy records are parsed from blocks of bytes, so binary works too
+        with open(filename, "rb") as handle:
+            self.assertEqual([r.format(format) for r in iterator(handle, lazy=True)],
+                             [r.format(format) for r in lazy])
+        for old, new in zip(records, lazy):
+            self.assertEqual(len(new), len(old))
+            self.assertEqual(new.id, old.id)
+            self.assertEqual(new.description, old.description)
+            self.assertEqual(new.letter_annotations, old.letter_annotations)
+            self.assertEqual(str(new.seq), str(old.seq))
+            self.assertEqual(new.format(format), old.format(format))
+            self.assertEqual(new[3:10].format(format),
+                             old[3:10].format(format))
+
+    def test_sanger(self):
+        self.check_lazy("Quality/sanger_faked.fastq", "fastq")
+        self.check_lazy("Quality/tricky.fastq", "fastq")
+
+    def test_solexa(self):
+        self.check_lazy("Quality/solexa_faked.fastq", "fastq-solexa")
+
+    def test_illumina(self):
+        self.check_lazy("Quality/illumina_faked.fastq", "fastq-illumina")
+
+    def test_invalid(self):
+        with open("Quality/solexa_faked.fastq") as handle:
+            records = QualityIO.FastqIlluminaIterator(handle, lazy=True)
+            self.assertRaises(ValueError, next, records)
+        with open("Quality/error_qual_del.fastq") as handle:
+            records = QualityIO.FastqPhredIterator(handle, lazy=True)
+            for i in range(3):
+                next(records)
+            self.assertRaises(ValueError, next, records)
+
+
+class TestQualityArrays(unittest.TestCase):
+    """Check the parsers give quality scores as LetterAnnotationArray objects."""
+
+    def check_arrays(self, filename, format, key, typecode):
+        with open(filename, "rb" if format in BINARY_FORMATS else "r") as handle:
+            records = list(SeqIO.parse(handle, format))
+        for record in records:
+            quals = record.letter_annotations[key]
+            self.assertTrue(isinstance(quals, LetterAnnotationArray))
+            self.assertEqual(quals.typecode, typecode)
+            self.assertTrue(isinstance(record[5:20].letter_annotations[key],
+                                       LetterAnnotationArray))
+            self.assertTrue(isinstance((record + record).letter_annotations[key],
+                                       LetterAnnotationArray))
+            self.assertEqual(record.reverse_complement(
+                letter_annotations=True).letter_annotations[key],
+                list(quals)[::-1])
+        return records
+
+    def test_fastq(self):
+        records = self.check_arrays("Quality/sanger_faked.fastq", "fastq",
+                                    "phred_quality", "B")
+        self.assertEqual(records[0].letter_annotations["phred_quality"],
+                         list(range(40, -1, -1)))
+
+    def test_solexa(self):
+        records = self.check_arrays("Quality/solexa_faked.fastq",
+                                    "fastq-solexa", "solexa_quality", "b")
+        self.assertEqual(min(records[0].letter_annotations["solexa_quality"]),
+                         -5)
+
+    def test_illumina(self):
+        self.check_arrays("Quality/illumina_faked.fastq", "fastq-illumina",
+                          "phred_quality", "B")
+
+    def test_qual(self):
+        self.check_arrays("Quality/example.qual", "qual", "phred_quality", "B")
+
+    def test_qual_large(self):
+        """Check large QUAL scores give arrays of a wider type."""
+        handle = StringIO(">small\n10 20\n>large\n10 300\n")
+        small, large = SeqIO.parse(handle, "qual")
+        self.assertEqual(small.letter_annotations["phred_quality"].typecode,
+                         "B")
+        quals = large.letter_annotations["phred_quality"]
+        self.assertTrue(isinstance(quals, LetterAnnotationArray))
+        self.assertEqual(quals.typecode, "H")
+        self.assertEqual(quals, [10, 300])
+
+    def test_sff(self):
+        self.check_arrays("Roche/E3MFGYR02_random_10_reads.sff", "sff",
+                          "phred_quality", "B")
+        self.check_arrays("Roche/E3MFGYR02_random_10_reads.sff", "sff-trim",
+                          "phred_quality", "B")
+
+    def test_write(self):
+        """Check arrays are written the same as lists of the same scores."""
+        for format in ["fastq", "fastq-solexa", "fastq-illumina", "qual"]:
+            for key, typecode, scores in [
+                    ("phred_quality", "B", [0, 1, 2, 10, 40, 62]),
+                    ("phred_quality", "B", [0, 1, 63, 93, 94, 255]),
+                    ("solexa_quality", "b", [-5, -4, 0, 10, 40, 62]),
+                    ("solexa_quality", "b", [-5, -4, 0, 10, 93, 127])]:
+                as_list = SeqRecord(Seq("ACGTAC"), id="test",
+                                    letter_annotations={key: scores})
+                as_array = SeqRecord(Seq("ACGTAC"), id="test",
+                                     letter_annotations={
+                                         key: LetterAnnotationArray(typecode,
+                                                                    scores)})
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", BiopythonWarning)
+                    self.assertEqual(as_array.format(format),
+                                     as_list.format(format))
+
+
+class TestFastqPipeline(unittest.TestCase):
+    """Compare the FASTQ pipeline to simple loops over FastqGeneralIterator."""
+
+    def reference(self, filename, threshold, length, max_n):
+        # Trim the right end, then filter on length, ambiguity and mean quality
+        answer = []
+        with open(filename, _universal_read_mode) as handle:
+            for title, seq, qual in QualityIO.FastqGeneralIterator(handle):
+                while qual and ord(qual[-1]) - 33 < threshold:
+                    seq = seq[:-1]
+                    qual = qual[:-1]
+                if len(seq) < length or seq.upper().count("N") > max_n:
+                    continue
+                scores = [ord(letter) - 33 for letter in qual]
+                if not scores or sum(scores) < threshold * len(scores):
+                    continue
+                answer.append((title, seq, qual))
+        return answer
+
+    def pipeline(self, threshold, length, max_n, chunk_size=1048576):
+        pipeline = QualityIO.FastqPipeline(chunk_size=chunk_size)
+        return pipeline.trim_quality(threshold).min_length(length) \
+            .max_n(max_n).min_mean_quality(threshold)
+
+    def test_filters(self):
+        for filename in ["Quality/example.fastq", "Quality/tricky.fastq",
+                         "Quality/misc_dna_original_sanger.fastq",
+                         "Quality/sanger_full_range_original_sanger.fastq"]:
+            for threshold, length, max_n in [(0, 0, 100), (20, 10, 0),
+                                             (30, 5, 1), (35, 1, 2)]:
+                expected = self.reference(filename, threshold, length, max_n)
+                for chunk_size in [10, 1048576]:
+                    pipeline = self.pipeline(threshold, length, max_n,
+                                             chunk_size)
+                    reads = [(t.decode(), s.decode(), q.decode())
+                             for t, s, q in pipeline.iterate(filename)]
+                    self.assertEqual(reads, expected)
+                out_handle = BytesIO()
+                counts = pipeline.run(filename, out_handle)
+                out_handle.seek(0)
+                with open(filename, "rb") as handle:
+                    total = len(list(QualityIO.FastqBytesIterator(handle)))
+                self.assertEqual(counts, (total, len(expected)))
+                reads = list(QualityIO.FastqBytesIterator(out_handle))
+                self.assertEqual([(t.decode(), s.decode(), q.decode())
+                                  for t, s, q in reads], expected)
+
+    def test_trim_left(self):
+        handle = BytesIO(b"@r1\nACGTACGT\n+\n##II##I#\n@r2\nACGT\n+\n####\n")
+        pipeline = QualityIO.FastqPipeline().trim_quality(10, ends="both")
+        self.assertEqual(list(pipeline.iterate(handle)),
+                         [(b"r1", b"GTACG", b"II##I"), (b"r2", b"", b"")])
+        handle.seek(0)
+        pipeline = QualityIO.FastqPipeline().trim_quality(10, ends="left")
+        pipeline.truncate(3).add_filter(lambda t, s, q: t != b"r2")
+        self.assertEqual(list(pipeline.iterate(handle)),
+                         [(b"r1", b"GTA", b"II#")])
+        self.assertRaises(ValueError, pipeline.trim_quality, 10, "middle")
+
+    def test_min_mean_quality(self):
+        # Empty reads are rejected, including before and after other reads
+        handle = BytesIO(b"@r1\n\n+\n\n@r2\nACGT\n+\n5555\n@r3\nAC\n+\n4I\n"
+                         b"@r4\nACG\n+\n445\n@r5\n\n+\n\n")
+        pipeline = QualityIO.FastqPipeline().min_mean_quality(20)
+        self.assertEqual([read[0] for read in pipeline.iterate(handle)],
+                         [b"r2", b"r3"])
+        handle = BytesIO(b"@r1\n\n+\n\n@r2\n\n+\n\n")
+        self.assertEqual(list(pipeline.iterate(handle)), [])
+
+    def make_pair(self, filename):
+        with open(filename, "rb") as handle:
+            reads = list(QualityIO.FastqBytesIterator(handle))
+        data1 = []
+        data2 = []
+        # Give the second read in each pair the sequence of the next read
+        for (title, seq, qual), (_, seq2, qual2) in zip(reads,
+                                                         reads[1:] + reads):
+            name = title.split()[0]
+            data1.append(b"@" + name + b"/1\n" + seq + b"\n+\n" + qual + b"\n")
+            data2.append(b"@" + name + b"/2\n" + seq2 + b"\n+\n" + qual2 +
+                         b"\n")
+        return b"".join(data1), b"".join(data2)
+
+    def test_paired(self):
+        data1, data2 = self.make_pair("Quality/longreads_original_sanger.fastq")
+        pipeline = QualityIO.FastqPipeline(chunk_size=50)
+        pipeline.trim_quality(20).min_length(300)
+        single1 = [r[0] for r in pipeline.iterate(BytesIO(data1))]
+        single2 = [r[0] for r in pipeline.iterate(BytesIO(data2))]
+        pairs = list(pipeline.iterate_paired(BytesIO(data1), BytesIO(data2)))
+        self.assertTrue(0 < len(pairs) < min(len(single1), len(single2)))
+        for read1, read2 in pairs:
+            self.assertEqual(read1[0][:-2], read2[0][:-2])
+            self.assertTrue(read1[0] in single1)
+            self.assertTrue(read2[0] in single2)
+            self.assertTrue(len(read1[1]) >= 300 and len(read2[1]) >= 300)
+        out1 = BytesIO()
+        out2 = BytesIO()
+        counts = pipeline.run_paired(BytesIO(data1), BytesIO(data2),
+                                     out1, out2)
+        self.assertEqual(counts, (data1.count(b"\n+\n"), len(pairs)))
+        out1.seek(0)
+        out2.seek(0)
+        self.assertEqual(list(zip(QualityIO.FastqBytesIterator(out1),
+                                  QualityIO.FastqBytesIterator(out2))),
+                         pairs)
+
+    def test_paired_subsample(self):
+        data1, data2 = self.make_pair("Quality/longreads_original_sanger.fastq")
+        pipeline = QualityIO.FastqPipeline().subsample(0.5, seed=1)
+        pairs = list(pipeline.iterate_paired(BytesIO(data1), BytesIO(data2)))
+        again = list(pipeline.iterate_paired(BytesIO(data1), BytesIO(data2)))
+        self.assertEqual([(r1[0], r2[0]) for r1, r2 in pairs],
+                         [(r1[0], r2[0]) for r1, r2 in again])
+        self.assertRaises(ValueError, pipeline.subsample, 1.5)
+
+    def test_paired_errors(self):
+        data1, data2 = self.make_pair("Quality/misc_dna_original_sanger.fastq")
+        pipeline = QualityIO.FastqPipeline(chunk_size=30)
+        for handle1, handle2 in [(data1, data2[:data2.rindex(b"@")]),
+                                 (data1[:data1.rindex(b"@")], data2),
+                                 (data1, data2.replace(b"/2", b"x/2", 1))]:
+            pairs = pipeline.iterate_paired(BytesIO(handle1), BytesIO(handle2))
+            self.assertRaises(ValueError, list, pairs)
+
+
+class TestPairedFastq(unittest.TestCase):
+    """Tests for the paired end FASTQ iterator and writer."""
+
+    def setUp(self):
+        with open("Quality/longreads_original_sanger.fastq", "rb") as handle:
+            reads = list(QualityIO.FastqBytesIterator(handle))
+        self.pairs = []
+        for (title, seq, qual), (_, seq2, qual2) in zip(reads,
+                                                         reads[1:] + reads):
+            name = title.split()[0]
+            self.pairs.append(((name + b"/1", seq, qual),
+                               (name + b"/2 mate", seq2, qual2)))
+
+    def test_round_trip(self):
+        handle1 = BytesIO()
+        handle2 = BytesIO()
+        interleaved = BytesIO()
+        self.assertEqual(QualityIO.PairedFastqWriter(handle1, handle2)
+                         .write_pairs(self.pairs), len(self.pairs))
+        self.assertEqual(QualityIO.PairedFastqWriter(interleaved)
+                         .write_pairs(iter(self.pairs)), len(self.pairs))
+        self.assertEqual(len(interleaved.getvalue()),
+                         len(handle1.getvalue()) + len(handle2.getvalue()))
+        for chunk_size in [1, 100, 1048576]:
+            handle1.seek(0)
+            handle2.seek(0)
+            interleaved.seek(0)
+            self.assertEqual(list(QualityIO.PairedFastqIterator(
+                handle1, handle2, chunk_size=chunk_size)), self.pairs)
+            self.assertEqual(list(QualityIO.PairedFastqIterator(
+                interleaved, chunk_size=chunk_size)), self.pairs)
+
+    def test_records(self):
+        handle = BytesIO()
+        QualityIO.PairedFastqWriter(handle).write_pairs(self.pairs)
+        handle.seek(0)
+        records = list(SeqIO.parse(StringIO(handle.getvalue().decode()),
+                                   "fastq"))
+        handle.seek(0)
+        pairs = list(QualityIO.PairedFastqIterator(handle, as_records=True,
+                                                   alphabet=generic_dna))
+        self.assertEqual(len(pairs), len(self.pairs))
+        for (record1, record2), old1, old2 in zip(pairs, records[::2],
+                                                  records[1::2]):
+            for new, old in [(record1, old1), (record2, old2)]:
+                self.assertEqual(new.id, old.id)
+                self.assertEqual(new.description, old.description)
+                self.assertEqual(str(new.seq), str(old.seq))
+                self.assertEqual(new.seq.alphabet, generic_dna)
+                self.assertEqual(new.letter_annotations, old.letter_annotations)
+        # Writing records rather than tuples gives the same output
+        handle2 = BytesIO()
+        QualityIO.PairedFastqWriter(handle2).write_pairs(pairs)
+        self.assertEqual(handle2.getvalue(), handle.getvalue())
+
+    def test_errors(self):
+        handle = BytesIO()
+        QualityIO.PairedFastqWriter(handle).write_pairs(self.pairs)
+        data = handle.getvalue()
+        odd = data[:data.rindex(b"@")]
+        swapped = data.replace(b"/2 mate", b"x/2", 1)
+        for bad in [odd, swapped]:
+            pairs = QualityIO.PairedFastqIterator(BytesIO(bad))
+            self.assertRaises(ValueError, list, pairs)
+        handle1 = BytesIO()
+        handle2 = BytesIO()
+        QualityIO.PairedFastqWriter(handle1, handle2).write_pairs(self.pairs)
+        pairs = QualityIO.PairedFastqIterator(BytesIO(handle1.getvalue()),
+                                              BytesIO(odd))
+        self.assertRaises(ValueError, list, pairs)
+        bad = BytesIO(b"@r/1\nACG\n+\nI I\n@r/2\nACG\n+\nIII\n")
+        pairs = QualityIO.PairedFastqIterator(bad, as_records=True)
+        self.assertRaises(ValueError, list, pairs)
+        writer = QualityIO.PairedFastqWriter(BytesIO())
+        self.assertRaises(ValueError, writer.write_pairs,
+                          [(("r/1", "ACGT", "III"), ("r/2", "ACG", "III"))])
+
+
 class TestReferenceSffConversions(unittest.TestCase):
     def check(self, sff_name, sff_format, out_name, format):
         wanted = list(SeqIO.parse(out_name, format))
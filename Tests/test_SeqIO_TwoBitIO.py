@@ -0,0 +1,122 @@
+# Copyright 2018 by the Biopython developers.  All rights reserved.
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqIO.TwoBitIO module (UCSC .2bit files)."""
+
+import struct
+import unittest
+from io import BytesIO
+
+from Bio import SeqIO
+from Bio.Seq import Seq, PackedSeq
+from Bio.SeqRecord import SeqRecord
+
+
+def big_endian(data):
+    """Convert a little endian .2bit file with one record to big endian."""
+    header = struct.unpack("<4I", data[:16])
+    size = ord(data[16:17])
+    offset, length, n_count = struct.unpack("<3I",
+                                            data[17 + size:29 + size])
+    answer = [struct.pack(">4I", *header), data[16:17 + size],
+              struct.pack(">3I", offset, length, n_count)]
+    values = struct.unpack("<%iI" % (2 * n_count + 1),
+                           data[29 + size:33 + size + 8 * n_count])
+    answer.append(struct.pack(">%iI" % len(values), *values))
+    mask_count = values[-1]
+    start = 33 + size + 8 * n_count
+    values = struct.unpack("<%iI" % (2 * mask_count + 1),
+                           data[start:start + 4 + 8 * mask_count])
+    answer.append(struct.pack(">%iI" % len(values), *values))
+    answer.append(data[start + 4 + 8 * mask_count:])
+    return b"".join(answer)
+
+
+class TwoBitTests(unittest.TestCase):
+    """Write and read back .2bit files."""
+
+    def round_trip(self, records):
+        handle = BytesIO()
+        self.assertEqual(SeqIO.write(records, handle, "twobit"), len(records))
+        handle.seek(0)
+        new_records = list(SeqIO.parse(handle, "twobit"))
+        self.assertEqual(len(new_records), len(records))
+        for record, new_record in zip(records, new_records):
+            self.assertEqual(record.id, new_record.id)
+            self.assertEqual(str(record.seq), str(new_record.seq))
+            self.assertTrue(isinstance(new_record.seq, PackedSeq))
+        return handle.getvalue()
+
+    def test_example(self):
+        """Check the layout of a simple file."""
+        record = SeqRecord(Seq("NNACGTacgtNA"), id="chrZ")
+        data = self.round_trip([record])
+        self.assertEqual(data[:16], struct.pack("<4I", 0x1A412743, 0, 1, 0))
+        self.assertEqual(data[16:21], b"\x04chrZ")
+        self.assertEqual(struct.unpack("<I", data[21:25]), (25,))
+        # Length, two N blocks, one mask block, reserved, then the bases
+        self.assertEqual(struct.unpack("<10I", data[25:65]),
+                         (12, 2, 0, 10, 2, 1, 1, 6, 4, 0))
+        self.assertEqual(data[65:], b"\x09\xc9\xc2")
+        handle = BytesIO(big_endian(data))
+        self.assertEqual(str(SeqIO.read(handle, "twobit").seq),
+                         "NNACGTacgtNA")
+
+    def test_genome(self):
+        """Check several records, including packed sequences and views."""
+        record = SeqIO.read("GenBank/NC_005816.fna", "fasta")
+        seq = str(record.seq)
+        seq = seq[:100] + "N" * 50 + seq[150:500].lower() + seq[500:]
+        records = [SeqRecord(Seq(seq), id="plain"),
+                   SeqRecord(Seq(""), id="empty"),
+                   SeqRecord(PackedSeq(seq), id="packed"),
+                   SeqRecord(PackedSeq(seq)[2:-3], id="view"),
+                   SeqRecord(PackedSeq(seq)[96:].reverse_complement(),
+                             id="reverse"),
+                   SeqRecord(PackedSeq(seq, bits=4)[1:1000], id="four")]
+        data = self.round_trip(records)
+        handle = BytesIO(data)
+        record = list(SeqIO.parse(handle, "twobit"))[2]
+        self.assertEqual(record.seq.count("N"), 50)
+        self.assertEqual(record.seq.count("a"), seq.count("a"))
+        # Write the records we read back in again:
+        handle.seek(0)
+        self.assertEqual(self.round_trip(list(SeqIO.parse(handle, "twobit"))),
+                         data)
+
+    def test_errors(self):
+        """Check invalid letters, identifiers and files are rejected."""
+        handle = BytesIO()
+        self.assertRaises(ValueError, SeqIO.write,
+                          SeqRecord(Seq("ACGTRY"), id="ambiguous"),
+                          handle, "twobit")
+        self.assertRaises(ValueError, SeqIO.write,
+                          SeqRecord(Seq("ACGT"), id="X" * 256),
+                          handle, "twobit")
+        handle = BytesIO(b"This is not a 2bit file")
+        self.assertRaises(ValueError, list, SeqIO.parse(handle, "twobit"))
+        handle = BytesIO()
+        SeqIO.write(SeqRecord(Seq("ACGT" * 10), id="short"), handle, "twobit")
+        handle = BytesIO(handle.getvalue()[:-2])
+        self.assertRaises(ValueError, list, SeqIO.parse(handle, "twobit"))
+        self.assertEqual(list(SeqIO.parse(BytesIO(), "twobit")), [])
+
+    def test_truncated(self):
+        """Check truncated files raise a ValueError."""
+        records = [SeqRecord(Seq("NNACGTacgtNA"), id="chrZ"),
+                   SeqRecord(Seq("ACGT" * 10), id="chrY")]
+        handle = BytesIO()
+        SeqIO.write(records, handle, "twobit")
+        data = handle.getvalue()
+        for end in range(1, len(data)):
+            handle = BytesIO(data[:end])
+            with self.assertRaises(ValueError) as context:
+                list(SeqIO.parse(handle, "twobit"))
+            self.assertTrue(str(context.exception).startswith(
+                "Premature end of file"), end)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
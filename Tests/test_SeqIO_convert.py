@@ -168,6 +168,29 @@ class ConvertTests(unittest.TestCase):
     def failure_check(self, filename, in_format, out_format, alphabet):
         check_convert_fails(filename, in_format, out_format, alphabet)
 
+    def test_fastq_many_blocks(self):
+        """Convert FASTQ with more records than fit in one block."""
+        records = list(SeqIO.parse("Quality/sanger_faked.fastq", "fastq"))
+        # Include records long enough to need line wrapping
+        records = [(r + r + r)[:i] for i in range(1, 124) for r in records] * 20
+        self.assertTrue(len(records) > 2000)
+        handle = StringIO()
+        SeqIO.write(records, handle, "fastq")
+        data = handle.getvalue()
+        for out_format in ["fastq-sanger", "fastq-illumina", "fastq-solexa",
+                           "fasta", "tab", "qual"]:
+            handle = StringIO()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', BiopythonWarning)
+                SeqIO.write(records, handle, out_format)
+            handle2 = StringIO()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', BiopythonWarning)
+                count = SeqIO.convert(StringIO(data), "fastq",
+                                      handle2, out_format)
+            self.assertEqual(count, len(records))
+            self.assertEqual(handle.getvalue(), handle2.getvalue())
+
 
 tests = [
     ("Quality/example.fastq", "fastq", None),
@@ -30,6 +30,7 @@ except NameError:
     # Python 2 does not have this,
     FileNotFoundError = IOError
 
+from Bio.Seq import FileSeq
 from Bio.SeqRecord import SeqRecord
 from Bio import SeqIO
 from Bio.SeqIO._index import _FormatToRandomAccess
@@ -329,6 +330,17 @@ class IndexDictTests(unittest.TestCase):
             rec_dict.close()
             del rec_dict
 
+            # With an offset cache, first building it then reusing it
+            os.remove(self.index_tmp)
+            for i in range(2):
+                rec_dict = SeqIO.index(filename, format, alphabet,
+                                       cache=self.index_tmp)
+                self.assertTrue(os.path.isfile(self.index_tmp))
+                if id_list:
+                    self.assertEqual(rec_dict[id_list[-1]].id, id_list[-1])
+                self.check_dict_methods(rec_dict, id_list, id_list)
+                del rec_dict
+
             if not sqlite3:
                 return
 
@@ -404,6 +416,16 @@ class IndexDictTests(unittest.TestCase):
             rec_dict.close()
             del rec_dict
 
+            # With an offset cache, first building it then reusing it
+            os.remove(self.index_tmp)
+            for i in range(2):
+                rec_dict = SeqIO.index(filename, format, alphabet, add_prefix,
+                                       cache=self.index_tmp)
+                if key_list:
+                    self.assertEqual(rec_dict[key_list[-1]].id, id_list[-1])
+                self.check_dict_methods(rec_dict, key_list, id_list)
+                del rec_dict
+
             if not sqlite3:
                 return
 
@@ -596,10 +618,137 @@ class IndexDictTests(unittest.TestCase):
             self.assertRaises(ValueError, SeqIO.index_db, ":memory:",
                               ["Fasta/dups.fasta"], "fasta")
 
+        def test_index_db_workers(self):
+            """Index several files with Bio.SeqIO.index_db() using worker processes"""
+            files = ["GenBank/NC_000932.faa", "GenBank/NC_005816.faa",
+                     "GenBank/NC_005816.ffn"]
+            tables = []
+            for workers in [1, 2]:
+                done = []
+                progress = lambda filename, count: done.append((filename, count))
+                rec_dict = SeqIO.index_db(":memory:", files, "fasta",
+                                          key_function=add_prefix,
+                                          workers=workers, progress=progress)
+                self.assertEqual(len(rec_dict), 85 + 10 + 10)
+                self.assertEqual(done, [("GenBank/NC_000932.faa", 85),
+                                        ("GenBank/NC_005816.faa", 10),
+                                        ("GenBank/NC_005816.ffn", 10)])
+                key = add_prefix("gi|45478717|ref|NP_995572.1|")
+                self.assertEqual(rec_dict[key].description,
+                                 "gi|45478717|ref|NP_995572.1| pesticin "
+                                 "[Yersinia pestis biovar Microtus str. 91001]")
+                tables.append(rec_dict._con.execute(
+                    "SELECT key, file_number, offset, length FROM offset_data "
+                    "ORDER BY rowid;").fetchall())
+                rec_dict.close()
+            self.assertEqual(tables[0], tables[1])
+            self.assertRaises(ValueError, SeqIO.index_db, ":memory:",
+                              ["Fasta/dups.fasta", "Fasta/f002"], "fasta",
+                              workers=2)
+            self.assertRaises(ValueError, SeqIO.index_db, ":memory:",
+                              files, "fasta", workers=0)
+
     def test_duplicates_index(self):
         """Index file with duplicate identifiers with Bio.SeqIO.index()"""
         self.assertRaises(ValueError, SeqIO.index, "Fasta/dups.fasta", "fasta")
 
+    def test_duplicates_index_cache(self):
+        """Index file with duplicate identifiers with an offset cache"""
+        os.remove(self.index_tmp)
+        self.assertRaises(ValueError, SeqIO.index, "Fasta/dups.fasta", "fasta",
+                          cache=self.index_tmp)
+        self.assertFalse(os.path.isfile(self.index_tmp))
+
+    def test_cache_stale(self):
+        """Check an out of date or invalid offset cache is replaced"""
+        h, filename = tempfile.mkstemp(".fastq")
+        os.close(h)
+        cache = filename + ".bioidx"
+        try:
+            with open(filename, "w") as handle:
+                handle.write("@alpha\nACGT\n+\nIIII\n")
+            os.utime(filename, (1000000000, 1000000000))
+            records = SeqIO.index(filename, "fastq", cache=True)
+            self.assertEqual(list(records), ["alpha"])
+            records.close()
+            with open(filename, "a") as handle:
+                handle.write("@beta\nACGT\n+\nIIII\n")
+            records = SeqIO.index(filename, "fastq", cache=True)
+            self.assertEqual(list(records), ["alpha", "beta"])
+            self.assertEqual(str(records["beta"].seq), "ACGT")
+            records.close()
+            # Same file, but indexed as a different format
+            records = SeqIO.index(filename, "fastq-solexa", cache=True)
+            self.assertEqual(records["beta"].letter_annotations,
+                             {"solexa_quality": [9, 9, 9, 9]})
+            records.close()
+            # No temporary files left behind after replacing the cache
+            self.assertEqual([name for name in os.listdir(os.path.dirname(cache))
+                              if name.startswith(os.path.basename(cache))],
+                             [os.path.basename(cache)])
+            # Not a cache file at all
+            with open(cache, "wb") as handle:
+                handle.write(b"Not an offset cache")
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                records = SeqIO.index(filename, "fastq", cache=True)
+            self.assertEqual(len(caught), 1)
+            self.assertEqual(list(records), ["alpha", "beta"])
+            records.close()
+            self.assertRaises(TypeError, SeqIO.index, filename, "fastq",
+                              cache=1.5)
+        finally:
+            for name in (filename, cache):
+                if os.path.isfile(name):
+                    os.remove(name)
+
+    def test_lazy(self):
+        """Index FASTA and GenBank files with lazy loading of the sequences"""
+        for filename, format in [("GenBank/NC_005816.fna", "fasta"),
+                                 ("GenBank/NC_000932.faa", "fasta"),
+                                 ("GenBank/NC_005816.gb", "genbank"),
+                                 ("GenBank/cor6_6.gb", "gb"),
+                                 ("GenBank/NC_000932.gb.bgz", "gb")]:
+            records = SeqIO.index(filename, format)
+            lazy_records = SeqIO.index(filename, format, lazy=True)
+            self.assertTrue(repr(lazy_records).endswith(", lazy=True)"))
+            self.assertEqual(list(records), list(lazy_records))
+            for key in records:
+                rec1 = records[key]
+                rec2 = lazy_records[key]
+                if not filename.endswith(".bgz"):
+                    self.assertIsInstance(rec2.seq, FileSeq)
+                self.assertTrue(compare_record(rec1, rec2))
+                seq = str(rec1.seq)
+                for start, end in [(0, 10), (55, 125), (-70, -5), (5, 1)]:
+                    self.assertEqual(str(rec2.seq[start:end]), seq[start:end])
+                self.assertEqual(str(rec2.seq[::-3]), seq[::-3])
+            records.close()
+            lazy_records.close()
+        self.assertRaises(ValueError, SeqIO.index, "Quality/example.fastq",
+                          "fastq", lazy=True)
+
+    def test_lazy_irregular(self):
+        """Check lazy indexing falls back on parsing irregular records"""
+        h, filename = tempfile.mkstemp(".fasta")
+        os.close(h)
+        try:
+            with open(filename, "w") as handle:
+                handle.write(">alpha\nACGTACGT\nACG\n\n"
+                             ">beta\nACGTACGT\nACGTAC\nACGTACGT\n"
+                             ">gamma\n"
+                             ">delta\nACGT ACGT\nAC\n"
+                             ">epsilon\r\nACGTA\r\nACGTA\r\nA\r\n")
+            records = SeqIO.index(filename, "fasta", lazy=True)
+            self.assertIsInstance(records["alpha"].seq, FileSeq)
+            self.assertIsInstance(records["epsilon"].seq, FileSeq)
+            self.assertEqual([str(r.seq) for r in records.values()],
+                             ["ACGTACGTACG", "ACGTACGTACGTACACGTACGT", "",
+                              "ACGTACGTAC", "ACGTAACGTAA"])
+            records.close()
+        finally:
+            os.remove(filename)
+
     def test_duplicates_to_dict(self):
         """Index file with duplicate identifiers with Bio.SeqIO.to_dict()"""
         handle = open("Fasta/dups.fasta", _universal_read_mode)
@@ -0,0 +1,139 @@
+# Copyright 2018 by the Biopython developers.  All rights reserved.
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Bio.SeqIO.parallel_parse."""
+
+import os
+import tempfile
+import unittest
+
+from Bio import SeqIO
+from Bio.Alphabet import generic_protein
+from Bio.SeqIO import _parallel
+
+
+def summary(record):
+    """Return the record identifier, length and feature count."""
+    return record.id, len(record), len(record.features)
+
+
+def _fail():
+    """Raise an exception, used when unpickling an Unpicklable object."""
+    raise ValueError("Can't unpickle this")
+
+
+class Unpicklable(object):
+    """An object which can be pickled, but raises an exception on unpickling."""
+
+    def __reduce__(self):
+        return _fail, ()
+
+
+def unpicklable(record):
+    """Return an object which cannot be unpickled."""
+    return Unpicklable()
+
+
+class ParallelParse(unittest.TestCase):
+    """Check parallel parsing gives the same records as SeqIO.parse."""
+
+    def check(self, filename, format, alphabet=None):
+        expected = [summary(r) for r in SeqIO.parse(filename, format, alphabet)]
+        for workers in [1, 2, 3]:
+            results = SeqIO.parallel_parse(filename, format, alphabet,
+                                           workers=workers, func=summary)
+            self.assertEqual(list(results), expected)
+            results = SeqIO.parallel_parse(filename, format, alphabet,
+                                           workers=workers, func=summary,
+                                           ordered=False)
+            self.assertEqual(sorted(results), sorted(expected))
+        # Without a function, get back the SeqRecord objects
+        records = list(SeqIO.parallel_parse(filename, format, alphabet,
+                                            workers=2))
+        self.assertEqual([summary(r) for r in records], expected)
+        self.assertEqual(str(records[-1].seq),
+                         str(list(SeqIO.parse(filename, format))[-1].seq))
+
+    def test_fasta(self):
+        """Parallel parsing of a FASTA file."""
+        self.check("GenBank/NC_000932.faa", "fasta", generic_protein)
+
+    def test_genbank(self):
+        """Parallel parsing of a GenBank file."""
+        self.check("GenBank/cor6_6.gb", "genbank")
+
+    def test_genbank_one_of(self):
+        """Parallel parsing of a GenBank file with one-of positions."""
+        self.check("GenBank/one_of.gb", "genbank")
+        records = list(SeqIO.parallel_parse("GenBank/one_of.gb", "genbank",
+                                            workers=3))
+        expected = list(SeqIO.parse("GenBank/one_of.gb", "genbank"))
+        self.assertEqual([[str(f.location) for f in r.features]
+                          for r in records],
+                         [[str(f.location) for f in r.features]
+                          for r in expected])
+
+    def test_unpickling_error(self):
+        """Check results which cannot be unpickled give an exception."""
+        results = SeqIO.parallel_parse("GenBank/cor6_6.gb", "genbank",
+                                       workers=2, func=unpicklable)
+        self.assertRaises(ValueError, list, results)
+
+    def test_embl(self):
+        """Parallel parsing of an EMBL file."""
+        self.check("EMBL/epo_prt_selection.embl", "embl")
+
+    def test_swiss(self):
+        """Parallel parsing of a SwissProt file."""
+        self.check("SwissProt/multi_ex.txt", "swiss")
+
+    def test_split_file(self):
+        """Check byte ranges start at records and cover the file."""
+        filename = "GenBank/NC_000932.faa"
+        with open(filename, "rb") as handle:
+            data = handle.read()
+            for count in [1, 2, 7, 50, 1000]:
+                ranges = _parallel._split_file(handle, b">", count)
+                self.assertTrue(len(ranges) <= count)
+                self.assertEqual(ranges[0][0], 0)
+                self.assertEqual(ranges[-1][1], len(data))
+                for (start, end), (start2, end2) in zip(ranges, ranges[1:]):
+                    self.assertEqual(end, start2)
+                for start, end in ranges:
+                    self.assertTrue(start < end)
+                    self.assertEqual(data[start:start + 1], b">")
+        self.assertEqual(len(ranges), data.count(b"\n>") + 1)
+
+    def test_errors(self):
+        """Check unsupported formats and compressed files are rejected."""
+        # These are reported straight away, not when iterating
+        self.assertRaises(ValueError, SeqIO.parallel_parse,
+                          "Quality/example.fastq", "fastq", workers=2)
+        self.assertRaises(ValueError, SeqIO.parallel_parse,
+                          "Quality/example.fastq.bgz", "fasta", workers=2)
+        self.assertRaises(ValueError, SeqIO.parallel_parse,
+                          "GenBank/cor6_6.gb", "genbank", workers=0)
+        self.assertRaises(TypeError, SeqIO.parallel_parse,
+                          open, "genbank")
+
+    def test_header(self):
+        """Check a file header before the first record is kept in range one."""
+        handle, filename = tempfile.mkstemp(".fasta")
+        os.close(handle)
+        try:
+            with open(filename, "w") as handle:
+                handle.write("Some free text before the first record\n")
+                for i in range(20):
+                    handle.write(">seq%i\nACGT\nACGT\n" % i)
+            results = SeqIO.parallel_parse(filename, "fasta", workers=2,
+                                           func=summary)
+            self.assertEqual(list(results),
+                             [("seq%i" % i, 8, 0) for i in range(20)])
+        finally:
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
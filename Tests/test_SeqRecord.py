@@ -8,14 +8,24 @@
 Initially this takes matched tests of GenBank and FASTA files from the NCBI
 and confirms they are consistent using our different parsers.
 """
+import copy
+import pickle
+import random
 import unittest
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from Bio import SeqIO
 from Bio.Alphabet import generic_dna, generic_protein
 from Bio.Seq import Seq, MutableSeq
-from Bio.SeqRecord import SeqRecord
+from Bio.SeqRecord import SeqRecord, LetterAnnotationArray
 from Bio.SeqFeature import SeqFeature, FeatureLocation, ExactPosition
 from Bio.SeqFeature import WithinPosition, BeforePosition, AfterPosition, OneOfPosition
+from Bio.SeqFeature import CompoundLocation, UnknownPosition
 
 
 class SeqRecordCreation(unittest.TestCase):
@@ -304,6 +314,136 @@ Seq('ABCDEFGHIJKLMNOPQRSTUVWZYX', ProteinAlphabet())"""
             self.assertTrue(len(rec.features) <= len(self.record.features))
 
 
+class SeqRecordFeatureQueries(unittest.TestCase):
+    """Test the features_at and features_overlapping methods."""
+
+    def setUp(self):
+        random.seed(42)
+        features = []
+        for i in range(300):
+            parts = []
+            for j in range(random.choice([1, 1, 1, 2, 3])):
+                start = random.randint(0, 990)
+                end = start + random.choice([0, 1, 5, 20, 100, 500])
+                parts.append(FeatureLocation(start, min(end, 1000),
+                                             random.choice([1, -1, None])))
+            if len(parts) == 1:
+                features.append(SeqFeature(parts[0]))
+            else:
+                features.append(SeqFeature(CompoundLocation(parts)))
+        features.append(SeqFeature(FeatureLocation(BeforePosition(10),
+                                                   AfterPosition(20), 1)))
+        features.append(SeqFeature(FeatureLocation(UnknownPosition(), 5)))
+        features.append(SeqFeature())
+        self.record = SeqRecord(Seq("N" * 1000), features=features)
+
+    def check(self):
+        features = self.record.features
+        for start, end in [(0, 1000), (0, 0), (10, 11), (500, 510),
+                           (990, 2000), (-10, 5), (333, 334), (20, 10)]:
+            for strand in [None, 1, -1]:
+                expected = [f for f in features if f.location is not None and
+                            any(part.start < end and part.end > start and
+                                strand in (None, part.strand)
+                                for part in f.location.parts
+                                if not isinstance(part.start,
+                                                  UnknownPosition))]
+                self.assertEqual(self.record.features_overlapping(start, end,
+                                                                  strand),
+                                 expected)
+        for position in range(-5, 1005, 7):
+            self.assertEqual(self.record.features_at(position),
+                             [f for f in features if f.location is not None and
+                              not isinstance(f.location.start,
+                                             UnknownPosition) and
+                              position in f])
+
+    def test_queries(self):
+        """Check the features found match those from a linear search."""
+        self.check()
+        self.assertTrue(self.record.features_at(15)[-1].location.start == 10)
+
+    def test_changes(self):
+        """Check the index is rebuilt after the features list changes."""
+        self.check()
+        self.record.features.append(SeqFeature(FeatureLocation(0, 1000)))
+        self.check()
+        del self.record.features[:10]
+        self.check()
+        self.record.features.reverse()
+        self.check()
+        self.record.features[5] = SeqFeature(FeatureLocation(100, 200, -1))
+        self.check()
+        self.record.features.sort(key=lambda f: str(f.location))
+        self.check()
+        self.record.features[7].location = FeatureLocation(300, 400, 1)
+        self.check()
+        self.record.features = self.record.features[::2]
+        self.check()
+        self.assertEqual(SeqRecord(Seq("ACGT")).features_at(0), [])
+
+    def test_slicing(self):
+        """Check slicing keeps the features from a linear search."""
+        # Those without a (known) location are never kept
+        features = [f for f in self.record.features[:-1]
+                    if not isinstance(f.location.start, UnknownPosition)]
+        for start, end in [(0, 1000), (0, 0), (10, 20), (10, 21), (500, 510),
+                           (990, 2000), (-10, 5), (333, 334), (20, 10)]:
+            sub = self.record[start:end]
+            start, end, step = slice(start, end).indices(1000)
+            expected = [f for f in features if start <= f.location.start and
+                        f.location.end <= end]
+            self.assertEqual([str(f.location) for f in sub.features],
+                             [str(f._shift(-start).location) for f in expected])
+        self.record.features = self.record.features[::3]
+        self.assertEqual(len(self.record[:].features), 101)
+        # Slicing does not need the index used for overlap queries
+        self.assertFalse(hasattr(self.record, "_feature_index"))
+
+    def test_slicing_changes(self):
+        """Check slicing again after the features have been changed."""
+        record = SeqRecord(Seq("N" * 100),
+                           features=[SeqFeature(FeatureLocation(0, 10)),
+                                     SeqFeature(FeatureLocation(50, 60))])
+        self.assertEqual(len(record[0:20].features), 1)
+        record.features[0].location = FeatureLocation(70, 80)
+        self.assertEqual(record[0:20].features, [])
+        record.features[1] = SeqFeature(FeatureLocation(5, 15))
+        self.assertEqual([(int(f.location.start), int(f.location.end))
+                          for f in record[0:20].features], [(5, 15)])
+
+    def test_nested(self):
+        """Check deeply nested features can be found."""
+        record = SeqRecord(Seq("N" * 5000),
+                           features=[SeqFeature(FeatureLocation(i, 5000 - i))
+                                     for i in range(2000)])
+        self.assertEqual(record.features_at(2500), record.features)
+        self.assertEqual(record.features_at(10), record.features[:11])
+        self.assertEqual(record.features_overlapping(4995, 5000),
+                         record.features[:5])
+
+    def test_pickle_and_copy(self):
+        """Check pickling or copying a record after a query."""
+        records = [self.record,
+                   SeqRecord(Seq("N" * 5000),
+                             features=[SeqFeature(FeatureLocation(i, 5000 - i))
+                                       for i in range(2000)])]
+        for record in records:
+            size = len(pickle.dumps(record))
+            record[10:1000]
+            self.assertEqual(len(pickle.dumps(record)), size)
+            record.features_at(10)
+            self.assertEqual(len(pickle.dumps(record)), size)
+            expected = [str(f.location) for f in record.features_at(500)]
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                other = pickle.loads(pickle.dumps(record, protocol))
+                self.assertEqual([str(f.location)
+                                  for f in other.features_at(500)], expected)
+            for other in [copy.copy(record), copy.deepcopy(record)]:
+                self.assertEqual([str(f.location)
+                                  for f in other.features_at(500)], expected)
+
+
 class SeqRecordMethodsMore(unittest.TestCase):
     """Test SeqRecord methods cont."""
     # This class does not have a setUp defining self.record
@@ -419,6 +559,77 @@ class SeqRecordMethodsMore(unittest.TestCase):
         self.assertRaises(TypeError, hash2)
 
 
+class LetterAnnotationArrays(unittest.TestCase):
+    """Test arrays as per-letter-annotations."""
+
+    def setUp(self):
+        self.quals = LetterAnnotationArray("b", [-5, 0, 10, 20, 40])
+        self.record = SeqRecord(Seq("ACGTN"), id="test",
+                                letter_annotations={"solexa_quality":
+                                                    self.quals})
+
+    def test_list_like(self):
+        quals = self.quals
+        self.assertEqual(quals, [-5, 0, 10, 20, 40])
+        self.assertEqual([-5, 0, 10, 20, 40], quals)
+        self.assertNotEqual(quals, [-5, 0, 10, 20])
+        self.assertEqual(str(quals), "[-5, 0, 10, 20, 40]")
+        self.assertEqual(quals[2], 10)
+        for value in [quals[1:3], quals[::-1], quals + [1], [1] + quals,
+                      quals + quals, array("b", [1]) + quals,
+                      quals * 2, 2 * quals,
+                      copy.copy(quals), copy.deepcopy(quals)]:
+            self.assertTrue(isinstance(value, LetterAnnotationArray))
+        self.assertEqual(quals[::-2], [40, 10, -5])
+        self.assertEqual([1] + quals, [1, -5, 0, 10, 20, 40])
+        # Values which do not fit give a list
+        self.assertEqual(quals + [0.5], [-5, 0, 10, 20, 40, 0.5])
+        self.assertEqual(quals[:1] + [500], [-5, 500])
+        self.assertEqual(quals[:2] * 2, [-5, 0, -5, 0])
+        values = quals[:2]
+        values += [1]
+        self.assertTrue(isinstance(values, LetterAnnotationArray))
+        self.assertEqual(values, [-5, 0, 1])
+        values += [500]
+        self.assertEqual(values, [-5, 0, 1, 500])
+        self.assertEqual(quals, [-5, 0, 10, 20, 40])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            value = pickle.loads(pickle.dumps(quals, protocol))
+            self.assertTrue(isinstance(value, LetterAnnotationArray))
+            self.assertEqual(value, quals)
+
+    def test_record(self):
+        record = self.record
+        for value in [record[1:4], record[::-1], record + record,
+                      record.reverse_complement(letter_annotations=True)]:
+            self.assertTrue(isinstance(value.letter_annotations["solexa_quality"],
+                                       LetterAnnotationArray))
+        self.assertEqual(record[1:4].letter_annotations["solexa_quality"],
+                         [0, 10, 20])
+        plain = SeqRecord(Seq("AC"), letter_annotations={
+            "solexa_quality": array("b", [1, 2])})
+        self.assertEqual((plain + record).letter_annotations["solexa_quality"],
+                         [1, 2, -5, 0, 10, 20, 40])
+        lists = SeqRecord(Seq("AC"), letter_annotations={
+            "solexa_quality": [1, 2]})
+        self.assertEqual((lists + record).letter_annotations["solexa_quality"],
+                         [1, 2, -5, 0, 10, 20, 40])
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_numpy(self):
+        record = SeqRecord(Seq("ACGT"), letter_annotations={
+            "phred_quality": numpy.array([10, 20, 30, 40], numpy.uint8)})
+        quals = record[1:3].letter_annotations["phred_quality"]
+        self.assertEqual(list(quals), [20, 30])
+        # Slicing a NumPy array gives a view
+        self.assertTrue(quals.base is record.letter_annotations["phred_quality"])
+        # Adding records joins rather than adds the arrays
+        quals = (record + record).letter_annotations["phred_quality"]
+        self.assertEqual(list(quals), [10, 20, 30, 40] * 2)
+        quals = numpy.frombuffer(self.quals, numpy.int8)
+        self.assertEqual(quals.sum(), 65)
+
+
 class TestTranslation(unittest.TestCase):
 
     def setUp(self):
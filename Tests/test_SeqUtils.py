@@ -10,7 +10,9 @@ from Bio import SeqIO
 from Bio.Alphabet import single_letter_alphabet
 from Bio.Seq import Seq, MutableSeq
 from Bio.SeqRecord import SeqRecord
-from Bio.SeqUtils import GC, seq1, seq3, GC_skew
+from Bio import SeqUtils
+from Bio.SeqIO.FastaIO import IndexedFasta
+from Bio.SeqUtils import GC, seq1, seq3, GC_skew, find_orfs
 from Bio.SeqUtils.lcc import lcc_simp, lcc_mult
 from Bio.SeqUtils.CheckSum import crc32, crc64, gcg, seguid
 from Bio.SeqUtils.CodonUsage import CodonAdaptationIndex
@@ -152,6 +154,70 @@ class SeqUtilsTests(unittest.TestCase):
         self.assertEqual(seq1(seq3(s1)), s1)
         self.assertEqual(seq3(seq1(s3)).upper(), s3.upper())
 
+    def test_find_orfs(self):
+        """Find the ORFs on both strands of a short sequence."""
+        seq = "TTATGTAACCATGCCCTAGATGAAATTACATCAT"
+        orfs = [(0, 12, -1, 1), (2, 8, 1, 2), (10, 19, 1, 1), (25, 34, -1, 0)]
+        self.assertEqual(sorted(find_orfs(seq, min_length=0)), orfs)
+        self.assertEqual(sorted(find_orfs(seq.lower(), min_length=6)), orfs)
+        self.assertEqual(sorted(find_orfs(Seq(seq), min_length=7)),
+                         [orfs[0], orfs[2], orfs[3]])
+        self.assertEqual(list(find_orfs(seq, min_length=10)), [orfs[0]])
+        self.assertEqual(list(find_orfs(seq)), [])
+        # GTG is an alternative start codon in the bacterial table
+        self.assertEqual(list(find_orfs("GTGAAATAA", min_length=0)), [])
+        self.assertEqual(list(find_orfs("GTGAAATAA", table=11, min_length=9)),
+                         [(0, 9, 1, 0)])
+        self.assertEqual(list(find_orfs(Seq("GUGAAAUAA"), table=11,
+                                        min_length=9)), [(0, 9, 1, 0)])
+        # No stop codon, or ambiguous stop codon
+        self.assertEqual(list(find_orfs("ATGAAAAAA", min_length=0)), [])
+        self.assertEqual(list(find_orfs("ATGAAATNA", min_length=0)), [])
+        self.assertRaises(KeyError, find_orfs, seq, table="Missing")
+
+    def test_find_orfs_genome(self):
+        """Find the ORFs of all the genes in a plasmid."""
+        record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        orfs = sorted(find_orfs(record.seq, table=11, min_length=150))
+        self.assertEqual(len(orfs), 72)
+        ends = set()
+        for start, end, strand, frame in orfs:
+            self.assertEqual((end - start) % 3, 0)
+            self.assertTrue(end - start >= 150)
+            if strand == 1:
+                self.assertEqual(frame, start % 3)
+                ends.add(end)
+            else:
+                self.assertEqual(frame, (len(record) - end) % 3)
+                ends.add(start)
+            protein = record.seq[start:end]
+            if strand == -1:
+                protein = protein.reverse_complement()
+            protein = protein.translate(table=11)
+            self.assertEqual(protein.find("*"), len(protein) - 1)
+        for feature in record.features:
+            if feature.type == "CDS":
+                if feature.strand == 1:
+                    self.assertIn(feature.location.end, ends)
+                else:
+                    self.assertIn(feature.location.start, ends)
+        # Same again using small windows, and reading from a FASTA file
+        window = SeqUtils._orf_window
+        try:
+            SeqUtils._orf_window = 999
+            with IndexedFasta("GenBank/NC_005816.fna") as fasta:
+                seq = fasta["gi|45478711|ref|NC_005816.1|"]
+                self.assertEqual(sorted(find_orfs(seq, table=11,
+                                                  min_length=150)), orfs)
+        finally:
+            SeqUtils._orf_window = window
+        features = list(find_orfs(record.seq, table=11, min_length=150,
+                                  as_features=True))
+        self.assertEqual(sorted((f.location.start, f.location.end,
+                                 f.location.strand) for f in features),
+                         [orf[:3] for orf in orfs])
+        self.assertEqual(set(f.type for f in features), set(["ORF"]))
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
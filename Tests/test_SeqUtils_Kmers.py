@@ -0,0 +1,155 @@
+# Copyright 2018 by the Biopython developers.  All rights reserved.
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for the Bio.SeqUtils.Kmers module."""
+
+import random
+import unittest
+from collections import Counter
+from io import BytesIO
+
+try:
+    import numpy
+    del numpy
+except ImportError:
+    from Bio import MissingExternalDependencyError
+    raise MissingExternalDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.Kmers.")
+
+from Bio.Seq import Seq, reverse_complement
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqIO.QualityIO import FastqBatchIterator
+from Bio.SeqUtils.Kmers import count_kmers, minimizers
+from Bio.SeqUtils.Kmers import kmer_code, kmer_from_code
+
+
+def simple_kmers(seq, k, canonical):
+    """Return a list of the k-mers in a sequence, as strings."""
+    seq = str(seq).upper().replace("U", "T")
+    kmers = []
+    for i in range(len(seq) - k + 1):
+        kmer = seq[i:i + k]
+        if set(kmer) <= set("ACGT"):
+            if canonical:
+                kmer = min(kmer, reverse_complement(kmer))
+            kmers.append(kmer)
+    return kmers
+
+
+def simple_minimizers(seq, k, w, canonical):
+    """Return a list of the minimizers of a sequence, as (position, k-mer)."""
+    seq = str(seq).upper().replace("U", "T")
+    kmers = []
+    for i in range(len(seq) - k + 1):
+        kmer = seq[i:i + k]
+        if set(kmer) <= set("ACGT"):
+            if canonical:
+                kmer = min(kmer, reverse_complement(kmer))
+            kmers.append(kmer)
+        else:
+            kmers.append("~")
+    answer = []
+    for i in range(len(kmers) - w + 1):
+        kmer = min(kmers[i:i + w])
+        if kmer != "~":
+            position = i + kmers[i:i + w].index(kmer)
+            if not answer or answer[-1][0] != position:
+                answer.append((position, kmer))
+    return answer
+
+
+def random_seq(length, letters="ACGTACGTACGTACGTacgtNU"):
+    return "".join(random.choice(letters) for i in range(length))
+
+
+class KmerTests(unittest.TestCase):
+    """Compare the k-mers found to a simple implementation."""
+
+    def setUp(self):
+        random.seed(123)
+        self.seq = random_seq(5000)
+
+    def check_counts(self, counts, expected):
+        self.assertEqual(dict(counts.items()), dict(expected))
+        self.assertEqual(counts.total, sum(expected.values()))
+        for kmer in list(expected)[:20]:
+            self.assertEqual(counts[kmer], expected[kmer])
+
+    def test_codes(self):
+        for k in [1, 5, 31]:
+            for i in range(20):
+                kmer = random_seq(k, "ACGT")
+                self.assertEqual(kmer_from_code(kmer_code(kmer), k), kmer)
+        self.assertRaises(ValueError, kmer_code, "")
+        self.assertRaises(ValueError, kmer_code, "A" * 32)
+        self.assertRaises(ValueError, count_kmers, "ACGT", 0)
+        self.assertRaises(ValueError, count_kmers, "ACGT", 32)
+
+    def test_count(self):
+        for k in [1, 2, 7, 16, 31]:
+            for canonical in [False, True]:
+                expected = Counter(simple_kmers(self.seq, k, canonical))
+                for chunk_size in [50, 1000, 1000000]:
+                    counts = count_kmers(Seq(self.seq), k, canonical,
+                                         chunk_size=chunk_size)
+                    self.check_counts(counts, expected)
+                    if canonical:
+                        kmer = counts.most_common(1)[0][0]
+                        self.assertEqual(counts[reverse_complement(kmer)],
+                                         counts[kmer])
+
+    def test_records(self):
+        reads = [random_seq(random.randint(0, 200)) for i in range(200)]
+        records = [SeqRecord(Seq(read)) for read in reads]
+        for k in [3, 21]:
+            expected = Counter()
+            for read in reads:
+                expected.update(simple_kmers(read, k, True))
+            for chunk_size in [100, 5000, 1000000]:
+                self.check_counts(count_kmers(iter(records), k,
+                                              chunk_size=chunk_size), expected)
+            self.check_counts(count_kmers(reads, k), expected)
+        self.assertEqual(len(count_kmers([], 5)), 0)
+
+    def test_no_kmers(self):
+        for sequences, chunk_size in [("N" * 5000, 50),
+                                      (["NNNN", "NNNN"], 1),
+                                      (Seq("ACNNN" * 100), 30)]:
+            counts = count_kmers(sequences, 3, chunk_size=chunk_size)
+            self.assertEqual(len(counts), 0)
+            self.assertEqual(counts.total, 0)
+            self.assertEqual(counts["ACG"], 0)
+
+    def test_fastq_batches(self):
+        reads = [random_seq(random.randint(1, 150), "ACGTN") for i in range(300)]
+        data = "".join("@r%i\n%s\n+\n%s\n" % (i, read, "I" * len(read))
+                       for i, read in enumerate(reads))
+        expected = Counter()
+        for read in reads:
+            expected.update(simple_kmers(read, 11, True))
+        handle = BytesIO(data.encode("ascii"))
+        counts = count_kmers(FastqBatchIterator(handle, batch_size=64), 11,
+                             chunk_size=1000)
+        self.check_counts(counts, expected)
+        self.assertEqual(sum(counts.spectrum() * range(len(counts.spectrum()))),
+                         counts.total)
+
+    def test_minimizers(self):
+        for k, w in [(1, 1), (3, 4), (5, 10), (15, 3), (31, 20)]:
+            for canonical in [False, True]:
+                expected = simple_minimizers(self.seq, k, w, canonical)
+                for chunk_size in [3, 100, 1000000]:
+                    found = [(position, kmer_from_code(code, k))
+                             for position, code in
+                             minimizers(Seq(self.seq), k, w, canonical,
+                                        chunk_size=chunk_size)]
+                    self.assertEqual(found, expected)
+        self.assertEqual(list(minimizers("ACGT", 3, 3)), [])
+        self.assertEqual(list(minimizers("NNNNNNN", 3, 2)), [])
+        self.assertRaises(ValueError, next, minimizers("ACGT", 3, 0))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
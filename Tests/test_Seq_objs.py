@@ -6,6 +6,7 @@
 """Unittests for the Seq objects."""
 from __future__ import print_function
 
+import pickle
 import warnings
 import unittest
 import sys
@@ -17,9 +18,12 @@ from Bio.Alphabet import generic_dna, generic_rna
 from Bio.Alphabet.IUPAC import protein, extended_protein
 from Bio.Alphabet.IUPAC import unambiguous_dna, ambiguous_dna, ambiguous_rna
 from Bio.Data.IUPACData import ambiguous_dna_values, ambiguous_rna_values
-from Bio.Seq import Seq, UnknownSeq, MutableSeq, translate
+from Bio.Seq import Seq, BytesSeq, PackedSeq, UnknownSeq, MutableSeq
+from Bio.Seq import translate
 from Bio.Data.CodonTable import TranslationError, CodonTable
 
+from seq_tests_common import Index
+
 if sys.version_info[0] < 3:
     from string import maketrans
 else:
@@ -740,6 +744,216 @@ class StringMethodTests(unittest.TestCase):
     # TODO - Addition...
 
 
+class BytesSeqTests(unittest.TestCase):
+    """Check BytesSeq objects (and views of them) act like Seq objects."""
+
+    def examples(self):
+        parent = BytesSeq(b"TTACGTGGGGTNACGUGGGGUAACCTGAGCAGGT", generic_nucleotide)
+        answer = [(BytesSeq(b"ACGTGGGGT", generic_dna),
+                   Seq("ACGTGGGGT", generic_dna)),
+                  (BytesSeq(bytearray(b"ACGUGGGGU"), generic_rna),
+                   Seq("ACGUGGGGU", generic_rna)),
+                  (BytesSeq("GGAACCT", generic_dna),
+                   Seq("GGAACCT", generic_dna)),
+                  (BytesSeq(b""), Seq(""))]
+        for start, end in [(2, 11), (12, 21), (0, 5), (5, 5), (21, 34)]:
+            answer.append((parent[start:end],
+                           Seq(str(parent)[start:end], generic_nucleotide)))
+        return answer
+
+    def test_methods(self):
+        """Check string like methods match those of the Seq object."""
+        values = [None, 0, 1, 2, -1, -3, 5, 9, 15, 1000, -1000]
+        for bytes_seq, seq in self.examples():
+            self.assertEqual(len(bytes_seq), len(seq))
+            self.assertEqual(str(bytes_seq), str(seq))
+            self.assertEqual(bytes_seq, seq)
+            self.assertEqual(bytes_seq.tobytes(), str(seq).encode("ascii"))
+            self.assertEqual(repr(bytes_seq), "Bytes" + repr(seq))
+            for sub in ["G", "GG", "CGT", "", "X", ("T", "GG"),
+                        Seq("GG"), BytesSeq(b"GT")]:
+                for method in ["count", "find", "rfind", "startswith",
+                               "endswith"]:
+                    if isinstance(sub, tuple) and method not in ["startswith",
+                                                                  "endswith"]:
+                        continue
+                    self.assertEqual(getattr(bytes_seq, method)(sub),
+                                     getattr(seq, method)(sub))
+                    for start in values:
+                        for end in values:
+                            self.assertEqual(
+                                getattr(bytes_seq, method)(sub, start, end),
+                                getattr(seq, method)(sub, start, end),
+                                "%r.%s(%r, %r, %r)"
+                                % (bytes_seq, method, sub, start, end))
+                if not isinstance(sub, tuple):
+                    self.assertEqual(sub in bytes_seq, sub in seq)
+            for start in values:
+                for end in values:
+                    for step in [None, 1, 2, -1, -2]:
+                        index = slice(start, end, step)
+                        self.assertEqual(str(bytes_seq[index]), str(seq[index]))
+                        if step in (None, 1):
+                            self.assertTrue(bytes_seq[index]._bytes is
+                                            bytes_seq._bytes)
+            for i in range(-len(seq), len(seq)):
+                self.assertEqual(bytes_seq[i], seq[i])
+            self.assertRaises(IndexError, bytes_seq.__getitem__, len(seq))
+            for method in ["upper", "lower", "reverse_complement"]:
+                new = getattr(bytes_seq, method)()
+                old = getattr(seq, method)()
+                self.assertTrue(isinstance(new, BytesSeq))
+                self.assertEqual(str(new), str(old))
+                self.assertEqual(new.alphabet, old.alphabet)
+            with warnings.catch_warnings():
+                # Partial codons
+                warnings.simplefilter("ignore", BiopythonWarning)
+                self.assertEqual(str(bytes_seq.translate()),
+                                 str(seq.translate()))
+
+    def test_transcription(self):
+        """Check transcription, complements and addition."""
+        dna = BytesSeq(b"ATGGCCtag", ambiguous_dna)
+        self.assertEqual(repr(dna.transcribe()),
+                         "BytesSeq('AUGGCCuag', IUPACAmbiguousRNA())")
+        self.assertEqual(repr(dna.transcribe().back_transcribe()),
+                         "BytesSeq('ATGGCCtag', IUPACAmbiguousDNA())")
+        self.assertRaises(ValueError, dna.back_transcribe)
+        self.assertEqual(str(BytesSeq(b"ACGUN").complement()), "UGCAN")
+        self.assertRaises(ValueError, BytesSeq(b"ACGUT").complement)
+        self.assertRaises(ValueError, BytesSeq(b"MKL", protein).complement)
+        self.assertEqual(repr(dna[:3] + dna[6:]),
+                         "BytesSeq('ATGtag', IUPACAmbiguousDNA())")
+        self.assertEqual(repr(dna[:3] + "CCC"),
+                         "BytesSeq('ATGCCC', IUPACAmbiguousDNA())")
+        self.assertEqual(str(dna[:3] + Seq("CCC", generic_dna)), "ATGCCC")
+        self.assertRaises(TypeError, dna.__add__, BytesSeq(b"ACG", generic_rna))
+        self.assertRaises(TypeError, dna.find, BytesSeq(b"ACG", generic_rna))
+        self.assertRaises(TypeError, BytesSeq, Seq("ACGT"))
+
+    def test_index_types(self):
+        """Check integer-like indices are accepted."""
+        seq = BytesSeq(b"TTACGTGGGG")[2:]
+        self.assertEqual(seq[Index(1)], "C")
+        self.assertEqual(seq[Index(-1)], "G")
+        self.assertRaises(IndexError, seq.__getitem__, Index(8))
+        self.assertRaises(TypeError, seq.__getitem__, "1")
+
+    def test_pickle(self):
+        """Check pickling a view only stores its own letters."""
+        parent = BytesSeq(b"ACGT" * 1000, generic_dna)
+        view = parent[10:14]
+        copy = pickle.loads(pickle.dumps(view))
+        self.assertEqual(repr(copy), "BytesSeq('GTAC', DNAAlphabet())")
+        self.assertEqual(len(copy._bytes), 4)
+
+    def test_extract(self):
+        """Check extracting features from a BytesSeq."""
+        record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        parent = BytesSeq(str(record.seq), record.seq.alphabet)
+        for feature in record.features:
+            new = feature.extract(parent)
+            self.assertTrue(isinstance(new, BytesSeq))
+            self.assertEqual(str(new), str(feature.extract(record.seq)))
+
+
+class PackedSeqTests(unittest.TestCase):
+    """Check PackedSeq objects (and views of them) act like Seq objects."""
+
+    def examples(self):
+        two_bit = PackedSeq("NNTTACgtggggtNNNNACGTGGGGTAACCTGagcaggtnn")
+        four_bit = PackedSeq("TTACGTGGkGTNN-ACGTGGRGTAACCTGAGcagGTSWN")
+        self.assertEqual((two_bit.bits, four_bit.bits), (2, 4))
+        answer = [(PackedSeq("ACGTGGGGT", generic_dna),
+                   Seq("ACGTGGGGT", generic_dna)),
+                  (PackedSeq(b"ACGTNNNNGT", ambiguous_dna, bits=4),
+                   Seq("ACGTNNNNGT", ambiguous_dna)),
+                  (PackedSeq(b""), Seq("", generic_dna))]
+        for parent in (two_bit, four_bit):
+            for start, end in [(0, 50), (2, 11), (12, 21), (0, 5), (5, 5),
+                               (21, 34), (3, 38)]:
+                for seq in (parent, parent.reverse_complement()):
+                    answer.append((seq[start:end],
+                                   Seq(str(seq)[start:end], generic_dna)))
+        return answer
+
+    def test_methods(self):
+        """Check string like methods match those of the Seq object."""
+        values = [None, 0, 1, 2, -1, -3, 5, 9, 15, 1000, -1000]
+        for packed_seq, seq in self.examples():
+            self.assertEqual(len(packed_seq), len(seq))
+            self.assertEqual(str(packed_seq), str(seq))
+            self.assertEqual(packed_seq, seq)
+            self.assertEqual(repr(packed_seq), "Packed" + repr(seq))
+            for sub in ["G", "g", "N", "n", "-", "T", "GG", "X", Seq("GG")]:
+                self.assertEqual(packed_seq.count(sub), seq.count(sub))
+                for start in values:
+                    for end in values:
+                        self.assertEqual(packed_seq.count(sub, start, end),
+                                         seq.count(sub, start, end),
+                                         "%r.count(%r, %r, %r)"
+                                         % (packed_seq, sub, start, end))
+            for start in values:
+                for end in values:
+                    for step in [None, 1, 2, -1, -2]:
+                        index = slice(start, end, step)
+                        self.assertEqual(str(packed_seq[index]),
+                                         str(seq[index]))
+                        if step in (None, 1):
+                            self.assertTrue(packed_seq[index]._packed is
+                                            packed_seq._packed)
+            for i in range(-len(seq), len(seq)):
+                self.assertEqual(packed_seq[i], seq[i])
+            self.assertRaises(IndexError, packed_seq.__getitem__, len(seq))
+            for method in ["upper", "lower", "complement",
+                           "reverse_complement"]:
+                new = getattr(packed_seq, method)()
+                old = getattr(seq, method)()
+                self.assertTrue(isinstance(new, PackedSeq))
+                self.assertEqual(str(new), str(old))
+                self.assertEqual(new.alphabet, old.alphabet)
+                self.assertEqual(str(new.reverse_complement()),
+                                 str(old.reverse_complement()))
+            self.assertEqual(str(packed_seq + "ACGT"), str(seq) + "ACGT")
+            self.assertEqual(str("ACGT" + packed_seq), "ACGT" + str(seq))
+
+    def test_errors(self):
+        """Check invalid letters and alphabets are rejected."""
+        self.assertRaises(ValueError, PackedSeq, "ACGTR", bits=2)
+        self.assertRaises(ValueError, PackedSeq, "ACGU")
+        self.assertRaises(ValueError, PackedSeq, "ACGT", bits=8)
+        self.assertRaises(TypeError, PackedSeq, Seq("ACGT"))
+        self.assertRaises(ValueError,
+                          PackedSeq("ACGT", protein).complement)
+        self.assertRaises(TypeError, PackedSeq("ACGT").count,
+                          Seq("ACGU", generic_rna))
+
+    def test_index_types(self):
+        """Check integer-like indices are accepted."""
+        seq = PackedSeq("NNTTACgtggggtNN")[2:]
+        self.assertEqual(seq[Index(2)], "A")
+        self.assertEqual(seq[Index(-1)], "N")
+        self.assertRaises(IndexError, seq.__getitem__, Index(13))
+        self.assertRaises(TypeError, seq.__getitem__, "1")
+
+    def test_pickle(self):
+        """Check pickling a view only stores its own letters."""
+        parent = PackedSeq("ACGT" * 1000 + "nnnn", generic_dna)
+        view = parent[3998:4004]
+        copy = pickle.loads(pickle.dumps(view))
+        self.assertEqual(repr(copy), "PackedSeq('GTnnnn', DNAAlphabet())")
+        self.assertEqual(len(copy._packed), 2)
+
+    def test_extract(self):
+        """Check extracting features from a PackedSeq."""
+        record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        parent = PackedSeq(str(record.seq), record.seq.alphabet)
+        self.assertEqual(len(parent._packed), (len(record) + 3) // 4)
+        for feature in record.features:
+            self.assertEqual(str(feature.extract(parent)),
+                             str(feature.extract(record.seq)))
+
+
 class FileBasedTests(unittest.TestCase):
     """Test Seq objects created from files by SeqIO."""
 
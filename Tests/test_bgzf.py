@@ -416,6 +416,100 @@ class BgzfTests(unittest.TestCase):
 
         h.close()
 
+    def check_threads_by_line(self, filename):
+        """Check threaded reading matches single threaded, including tell/seek"""
+        for mode in ["r", "rb"]:
+            with bgzf.open(filename, mode) as h:
+                lines = []
+                offsets = []
+                while True:
+                    offsets.append(h.tell())
+                    line = h.readline()
+                    if not line:
+                        break
+                    lines.append(line)
+            for threads in [2, 3]:
+                with bgzf.open(filename, mode, threads=threads) as h:
+                    for offset, line in zip(offsets, lines):
+                        self.assertEqual(h.tell(), offset)
+                        self.assertEqual(h.readline(), line)
+                    self.assertEqual(h.tell(), offsets[-1])
+                    self.assertFalse(h.readline())
+                    # Random access, including jumping back in the file
+                    # and over the blocks already being read ahead
+                    order = list(range(len(lines)))
+                    shuffle(order)
+                    for index in order[:100]:
+                        h.seek(offsets[index])
+                        self.assertEqual(h.tell(), offsets[index])
+                        self.assertEqual(h.readline(), lines[index])
+
+    def test_threads_bam_ex1(self):
+        """Check threaded reading of SamBam/ex1.bam"""
+        self.check_threads_by_line("SamBam/ex1.bam")
+
+    def test_threads_wnts_xml(self):
+        """Check threaded reading of Blast/wnts.xml.bgz"""
+        self.check_threads_by_line("Blast/wnts.xml.bgz")
+
+    def test_threads_example_cor6(self):
+        """Check threaded reading of GenBank/cor6_6.gb.bgz"""
+        self.check_threads_by_line("GenBank/cor6_6.gb.bgz")
+
+    def test_threads_write(self):
+        """Check threaded writing gives the same BGZF file and offsets"""
+        with gzip.open("SamBam/ex1.bam", "rb") as h:
+            data = h.read()
+        expected = []
+        outputs = []
+        for threads in [1, 2, 3]:
+            offsets = []
+            with bgzf.open(self.temp_file, "wb", threads=threads) as h:
+                for start in range(0, len(data), 30000):
+                    h.write(data[start:start + 30000])
+                    offsets.append(h.tell())
+                h.flush()
+                offsets.append(h.tell())
+                h.write(data[:100000])
+            with open(self.temp_file, "rb") as h:
+                outputs.append(h.read())
+            if threads == 1:
+                expected = offsets
+            else:
+                self.assertEqual(offsets, expected)
+                self.assertEqual(outputs[-1], outputs[0])
+        with bgzf.open(self.temp_file, "rb", threads=2) as h:
+            self.assertEqual(h.read(len(data)), data)
+            self.assertEqual(h.read(100000), data[:100000])
+            self.assertFalse(h.read(1))
+
+    def test_gzi(self):
+        """Check building, writing and reading GZI block indexes"""
+        for filename in ["SamBam/ex1.bam", "GenBank/cor6_6.gb.bgz"]:
+            with open(filename, "rb") as h:
+                index = bgzf.build_gzi(h)
+            self.assertEqual(index[0], (0, 0))
+            # Check against the blocks, ignoring the empty EOF marker
+            with bgzf.open(filename, "rb") as h:
+                for raw_start, data_start in index:
+                    self.assertEqual(h.tell(), raw_start << 16)
+                    data = h.read(65536)
+                    if not data:
+                        break
+                self.assertFalse(h.read(1))
+            with open(self.temp_file, "wb") as h:
+                bgzf.write_gzi(h, index)
+            with open(self.temp_file, "rb") as h:
+                data = h.read()
+            self.assertEqual(len(data), 8 + 16 * (len(index) - 1))
+            with open(self.temp_file, "rb") as h:
+                self.assertEqual(bgzf.read_gzi(h), index)
+
+    def test_threads_invalid(self):
+        """Check threads must be at least one"""
+        self.assertRaises(ValueError, bgzf.open, "SamBam/ex1.bam", "rb", threads=0)
+        self.assertRaises(ValueError, bgzf.open, self.temp_file, "wb", threads=0)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
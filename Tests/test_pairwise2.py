@@ -3,9 +3,16 @@
 # This code is part of the Biopython distribution and governed by its
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
+import math
+import random
 import unittest
 import warnings
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from Bio import pairwise2
 from Bio.SubsMat.MatrixInfo import blosum62
 from Bio import BiopythonWarning
@@ -615,6 +622,110 @@ AAAABBBAAAACCCCCCCCCCCCCCAAAABBBAAAA
 """)  # noqa: W291
 
 
+@unittest.skipIf(numpy is None, "NumPy not installed")
+class TestScoreMatrixNumpy(unittest.TestCase):
+    """Compare the NumPy score matrix fill to the generic one."""
+
+    def gap_functions(self):
+        def gap_A(x, y):
+            return (-2 - y) if x in (0, 5) else (-4 - 0.5 * y)
+
+        def gap_B(x, y):
+            if y == 0:
+                return 0
+            return -(2 + y / 4.0 + math.log(y) / 2.0)
+
+        yield gap_A, gap_B
+        yield pairwise2.affine_penalty(-2, -0.5), pairwise2.affine_penalty(-3, -1)
+        yield pairwise2.affine_penalty(-1, -1, 1), gap_B
+
+        def gap_C(x, y):
+            return -3 if x < 4 else -1 - y
+
+        yield gap_C, pairwise2.affine_penalty(-2, -1)
+
+    def check(self, seqA, seqB, match_fn):
+        for gap_A_fn, gap_B_fn in self.gap_functions():
+            for align_globally in (True, False):
+                for penalize_end_gaps in ((True, True), (True, False),
+                                          (False, False)):
+                    if not align_globally and any(penalize_end_gaps):
+                        continue
+                    args = (seqA, seqB, match_fn, gap_A_fn, gap_B_fn,
+                            penalize_end_gaps, align_globally, False)
+                    expected = pairwise2._make_score_matrix_generic(*args)
+                    matrices = pairwise2._make_score_matrix_numpy(*args)
+                    self.assertEqual(matrices, expected)
+                    # Integer scores should stay integers
+                    self.assertEqual([[type(score) for score in row]
+                                      for row in matrices[0]],
+                                     [[type(score) for score in row]
+                                      for row in expected[0]])
+
+    def test_identity_match(self):
+        random.seed(11)
+        match_fn = pairwise2.identity_match(2, -1)
+        for i in range(10):
+            if i == 5:
+                match_fn = pairwise2.identity_match(1.5, 0)
+            seqA = "".join(random.choice("ACGT")
+                           for j in range(random.randint(1, 15)))
+            seqB = "".join(random.choice("ACGT")
+                           for j in range(random.randint(1, 15)))
+            self.check(seqA, seqB, match_fn)
+            self.check(list(seqA), list(seqB), match_fn)
+
+    def test_dictionary_match(self):
+        random.seed(12)
+        match_fn = pairwise2.dictionary_match(blosum62)
+        for i in range(5):
+            seqA = "".join(random.choice("ARNDCQEGHILKMFPSTWYV")
+                           for j in range(random.randint(1, 15)))
+            seqB = "".join(random.choice("ARNDCQEGHILKMFPSTWYV")
+                           for j in range(random.randint(1, 15)))
+            self.check(seqA, seqB, match_fn)
+
+    def test_align(self):
+        """The alignments do not depend on which fill is used."""
+        seq1 = "AAAABBBAAAACCCCCCCCCCCCCCAAAABBBAAAA"
+        seq2 = "AABBBAAAACCCCAAAABBBAA"
+
+        def gap_function(x, y):
+            return (-2 - y) if x in (0, 3, 11, len(seq2)) else (-20 - y)
+
+        have_numpy = pairwise2._have_numpy
+        alignments = pairwise2.align.localmc(seq1, seq2, 1, -1, gap_function,
+                                             gap_function)
+        try:
+            pairwise2._have_numpy = lambda: False
+            expected = pairwise2.align.localmc(seq1, seq2, 1, -1,
+                                               gap_function, gap_function)
+        finally:
+            pairwise2._have_numpy = have_numpy
+        self.assertEqual(alignments, expected)
+        for alignment, expected_alignment in zip(alignments, expected):
+            self.assertEqual(type(alignment[2]), type(expected_alignment[2]))
+        self.assertEqual(pairwise2.format_alignment(*alignments[0]),
+                         pairwise2.format_alignment(*expected[0]))
+
+    def test_force_generic(self):
+        """The NumPy fill is not used with force_generic=True."""
+        def gap_function(x, y):
+            return -2 - y
+
+        make_score_matrix_numpy = pairwise2._make_score_matrix_numpy
+        expected = pairwise2.align.globalmc("GAACT", "GAT", 1, -1,
+                                            gap_function, gap_function)
+        try:
+            pairwise2._make_score_matrix_numpy = None
+            alignments = pairwise2.align.globalmc("GAACT", "GAT", 1, -1,
+                                                  gap_function, gap_function,
+                                                  force_generic=True)
+        finally:
+            pairwise2._make_score_matrix_numpy = make_score_matrix_numpy
+        self.assertEqual(alignments, expected)
+
+
 class TestOtherFunctions(unittest.TestCase):
     """Test remaining non-tested private methods."""
 
@@ -5,8 +5,15 @@
 # as part of this package.
 
 
+import random
+import threading
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from Bio import Align
 
 
@@ -1143,6 +1150,48 @@ Pairwise sequence aligner with parameters
         self.assertAlmostEqual(score, 0.2)
 
 
+class TestPairwiseEmpty(unittest.TestCase):
+
+    def set_algorithm(self, aligner, algorithm):
+        if algorithm == "Gotoh":
+            aligner.open_gap_score = -2
+            aligner.extend_gap_score = -1
+        elif algorithm == "Waterman-Smith-Beyer":
+            def gap_score(i, n):
+                return -n
+            aligner.gap_score = gap_score
+
+    def test_empty_global(self):
+        for algorithm in ["Needleman-Wunsch", "Gotoh", "Waterman-Smith-Beyer"]:
+            aligner = Align.PairwiseAligner()
+            aligner.mode = "global"
+            self.set_algorithm(aligner, algorithm)
+            self.assertTrue(aligner.algorithm.startswith(algorithm))
+            alignments = aligner.align("", "")
+            self.assertEqual(alignments.score, 0.0)
+            self.assertEqual(len(alignments), 1)
+            alignments = list(alignments)
+            self.assertEqual(len(alignments), 1)
+            self.assertEqual(alignments[0].path, ((0, 0),))
+            self.assertEqual(str(alignments[0]), "\n\n\n")
+            alignments = list(aligner.align("", "ACG"))
+            self.assertEqual(len(alignments), 1)
+            self.assertEqual(alignments[0].path, ((0, 0), (0, 3)))
+            self.assertEqual(str(alignments[0]), "---\n---\nACG\n")
+
+    def test_empty_local(self):
+        for algorithm in ["Smith-Waterman", "Gotoh", "Waterman-Smith-Beyer"]:
+            aligner = Align.PairwiseAligner()
+            aligner.mode = "local"
+            self.set_algorithm(aligner, algorithm)
+            self.assertTrue(aligner.algorithm.startswith(algorithm))
+            for seqA, seqB in [("", ""), ("", "ACG"), ("ACG", "")]:
+                alignments = aligner.align(seqA, seqB)
+                self.assertEqual(alignments.score, 0.0)
+                self.assertEqual(len(alignments), 0)
+                self.assertEqual(list(alignments), [])
+
+
 class TestPerSiteGapPenalties(unittest.TestCase):
     """Check gap penalty callbacks use correct gap opening position.
 
@@ -1529,6 +1578,356 @@ TTGGAA
             alignments = list(alignments)
 
 
+@unittest.skipIf(numpy is None, "NumPy is needed for score_many")
+class TestScoreMany(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(11)
+        self.query = self.random_sequence(40)
+        self.targets = [self.random_sequence(random.randint(1, 60))
+                        for i in range(50)]
+
+    def random_sequence(self, length):
+        return "".join(random.choice("ACGTacgt") for i in range(length))
+
+    def check_scores(self, aligner):
+        scores = aligner.score_many(self.query, self.targets)
+        self.assertEqual(scores.shape, (len(self.targets),))
+        for target, score in zip(self.targets, scores):
+            self.assertAlmostEqual(score, aligner.score(target, self.query))
+
+    def test_score_many(self):
+        aligner = Align.PairwiseAligner()
+        aligner.match = 2
+        aligner.mismatch = -1
+        for mode in ["global", "local"]:
+            aligner.mode = mode
+            aligner.gap_score = -1
+            self.check_scores(aligner)
+            aligner.open_gap_score = -3
+            aligner.query_end_gap_score = 0
+            aligner.target_right_extend_gap_score = -0.5
+            self.check_scores(aligner)
+
+            def gap_score(i, n):
+                return -1 - n
+            aligner.query_gap_score = gap_score
+            self.check_scores(aligner)
+        self.assertEqual(len(aligner.score_many(self.query, [])), 0)
+
+    def test_empty(self):
+        aligner = Align.PairwiseAligner()
+        aligner.open_gap_score = -2
+        aligner.extend_gap_score = -1
+        self.assertEqual(aligner.score_many("ACG", ["", "ACG"]).tolist(),
+                         [-4.0, 3.0])
+        self.assertEqual(aligner.score("", ""), 0.0)
+        aligner.mode = "local"
+        self.assertEqual(aligner.score_many("", ["ACG", ""]).tolist(),
+                         [0.0, 0.0])
+
+    def test_score_all(self):
+        aligner = Align.PairwiseAligner()
+        aligner.mismatch = -1
+        aligner.gap_score = -1
+        sequences = self.targets[:10]
+        scores = aligner.score_all(sequences)
+        self.assertEqual(scores.shape, (10, 10))
+        for i, query in enumerate(sequences):
+            self.assertEqual(scores[i].tolist(),
+                             aligner.score_many(query, sequences).tolist())
+        scores = aligner.score_all(sequences[:3], self.targets)
+        self.assertEqual(scores.shape, (3, len(self.targets)))
+
+    def test_threads(self):
+        aligner = Align.PairwiseAligner()
+        aligner.mode = "local"
+        aligner.open_gap_score = -2
+        aligner.extend_gap_score = -1
+        expected = aligner.score_many(self.query, self.targets)
+        results = [None] * 5
+
+        def score_part(i):
+            results[i] = aligner.score_many(self.query, self.targets[i::5])
+        threads = [threading.Thread(target=score_part, args=(i,))
+                   for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(5):
+            self.assertEqual(results[i].tolist(), expected[i::5].tolist())
+
+    def test_long_local(self):
+        aligner = Align.PairwiseAligner()
+        aligner.mode = "local"
+        aligner.match = 10
+        aligner.mismatch = -1
+        aligner.gap_score = -1
+        seq = "ACGT" * 1000
+        self.assertEqual(aligner.score_many(seq, [seq, seq[:10]]).tolist(),
+                         [40000, 100])
+
+
+class TestLocalScoreIntegers(unittest.TestCase):
+    """Local scores with integer scores (the vectorised code, if available)."""
+
+    def random_sequence(self, letters, length):
+        return "".join(random.choice(letters) for i in range(length))
+
+    def check_scores(self, aligner, letters, length):
+        for i in range(20):
+            seqA = self.random_sequence(letters, random.randint(1, length))
+            if i % 2:
+                seqB = self.random_sequence(letters, random.randint(1, length))
+            else:
+                # similar sequences, so that the local alignment is long
+                start = random.randint(0, len(seqA) - 1)
+                seqB = "".join(c if random.random() < 0.9 else "A"
+                               for c in seqA[start:])
+            score = aligner.score(seqA, seqB)
+            alignments = aligner.align(seqA, seqB)
+            self.assertAlmostEqual(score, alignments.score)
+
+    def test_dna(self):
+        random.seed(5)
+        aligner = Align.PairwiseAligner()
+        aligner.mode = "local"
+        aligner.match = 2
+        aligner.mismatch = -3
+        self.check_scores(aligner, "ACGT", 100)
+        aligner.open_gap_score = -5
+        aligner.extend_gap_score = -2
+        self.check_scores(aligner, "ACGT", 100)
+        aligner.query_open_gap_score = -1
+        aligner.query_extend_gap_score = 0
+        self.check_scores(aligner, "ACGT", 100)
+        # Scores too large for 8-bit (and for 16-bit) integers
+        aligner.match = 250
+        self.check_scores(aligner, "ACGT", 100)
+        aligner.match = 1000
+        self.check_scores(aligner, "ACGT", 100)
+
+    def test_protein(self):
+        from Bio.SubsMat import MatrixInfo
+        random.seed(6)
+        aligner = Align.PairwiseAligner()
+        aligner.mode = "local"
+        aligner.substitution_matrix = MatrixInfo.blosum62
+        aligner.open_gap_score = -11
+        aligner.extend_gap_score = -1
+        self.check_scores(aligner, "ACDEFGHIKLMNPQRSTVWY", 200)
+        aligner.target_gap_score = -300
+        self.check_scores(aligner, "ACDEFGHIKLMNPQRSTVWY", 200)
+
+    def test_long(self):
+        aligner = Align.PairwiseAligner()
+        aligner.mode = "local"
+        aligner.mismatch = -1
+        aligner.gap_score = -1
+        seq = "ACGT" * 1000
+        self.assertEqual(aligner.score(seq, seq), 4000)
+        aligner.match = 10
+        self.assertEqual(aligner.score(seq, seq), 40000)
+
+
+class TestBandedAlignment(unittest.TestCase):
+    """Alignments restricted to a band of diagonals."""
+
+    def random_sequence(self, length):
+        return "".join(random.choice("ACGT") for i in range(length))
+
+    def random_aligners(self):
+        aligner = Align.PairwiseAligner()
+        for mode in ("global", "local"):
+            for open_score, extend_score in ((-2, -2), (-3, -1)):
+                aligner.mode = mode
+                aligner.match = 2
+                aligner.mismatch = -1
+                aligner.open_gap_score = open_score
+                aligner.extend_gap_score = extend_score
+                yield aligner
+
+    def check_band(self, alignment, lower, upper):
+        for i, j in alignment.path:
+            self.assertTrue(lower <= i - j <= upper)
+
+    def test_wide_band(self):
+        random.seed(7)
+        for aligner in self.random_aligners():
+            for k in range(20):
+                seqA = self.random_sequence(random.randint(1, 12))
+                seqB = self.random_sequence(random.randint(1, 12))
+                aligner.band = None
+                score = aligner.score(seqA, seqB)
+                alignments = aligner.align(seqA, seqB)
+                count = len(alignments)
+                expected = sorted(str(alignment) for alignment in alignments)
+                aligner.band = 25
+                aligner.band_diagonal = random.randint(-5, 5)
+                self.assertAlmostEqual(aligner.score(seqA, seqB), score)
+                alignments = aligner.align(seqA, seqB)
+                self.assertAlmostEqual(alignments.score, score)
+                self.assertEqual(len(alignments), count)
+                self.assertEqual(sorted(str(alignment)
+                                        for alignment in alignments),
+                                 expected)
+
+    def test_narrow_band(self):
+        random.seed(8)
+        for aligner in self.random_aligners():
+            for k in range(20):
+                seqA = self.random_sequence(random.randint(1, 30))
+                seqB = self.random_sequence(random.randint(1, 30))
+                aligner.band = None
+                full_score = aligner.score(seqA, seqB)
+                aligner.band = random.randint(0, 3)
+                aligner.band_diagonal = diagonal = random.randint(-10, 10)
+                lower = diagonal - aligner.band
+                upper = diagonal + aligner.band
+                if aligner.mode == "global":
+                    lower = min(lower, -aligner.band,
+                                len(seqA) - len(seqB) - aligner.band)
+                    upper = max(upper, aligner.band,
+                                len(seqA) - len(seqB) + aligner.band)
+                score = aligner.score(seqA, seqB)
+                self.assertTrue(score <= full_score + 1e-6)
+                alignments = aligner.align(seqA, seqB)
+                self.assertAlmostEqual(alignments.score, score)
+                for alignment in alignments:
+                    self.check_band(alignment, lower, upper)
+
+    def test_example(self):
+        aligner = Align.PairwiseAligner()
+        aligner.mismatch = -1
+        aligner.gap_score = -1
+        aligner.band = 1
+        self.assertEqual(aligner.band, 1)
+        self.assertEqual(aligner.band_diagonal, 0)
+        alignments = aligner.align("AACCGGTT", "CCGGTTAA")
+        self.assertEqual(alignments.score, -3)
+        self.assertEqual(len(alignments), 4)
+        for alignment in alignments:
+            self.check_band(alignment, -1, 1)
+        aligner.mode = "local"
+        aligner.band_diagonal = 2
+        alignments = list(aligner.align("AACCGGTT", "CCGGTTAA"))
+        self.assertEqual(len(alignments), 1)
+        alignment = alignments[0]
+        self.assertEqual(alignment.score, 6)
+        self.assertEqual(alignment.path, ((2, 0), (8, 6)))
+        aligner.band_diagonal = -2
+        self.assertEqual(aligner.score("AACCGGTT", "CCGGTTAA"), 0)
+        self.assertEqual(list(aligner.align("AACCGGTT", "CCGGTTAA")), [])
+        aligner.band = None
+        self.assertEqual(aligner.score("AACCGGTT", "CCGGTTAA"), 6)
+
+    def test_long(self):
+        seqA = "ACGGTCAGT" * 500
+        seqB = seqA[:2000] + "TT" + seqA[2000:3000] + seqA[3003:]
+        aligner = Align.PairwiseAligner()
+        aligner.mismatch = -1
+        aligner.open_gap_score = -3
+        aligner.extend_gap_score = -1
+        score = aligner.score(seqA, seqB)
+        aligner.band = 10
+        self.assertEqual(aligner.score(seqA, seqB), score)
+        alignment = next(iter(aligner.align(seqA, seqB)))
+        self.assertEqual(alignment.score, score)
+
+    def test_errors(self):
+        aligner = Align.PairwiseAligner()
+        with self.assertRaises(ValueError):
+            aligner.band = -1
+        aligner.band = 5
+
+        def gap_score(i, n):
+            return -n
+
+        aligner.target_gap_score = gap_score
+        self.assertRaises(ValueError, aligner.score, "ACGT", "ACT")
+        self.assertRaises(ValueError, aligner.align, "ACGT", "ACT")
+        aligner.band = None
+        self.assertEqual(aligner.score("ACGT", "ACT"), 3)
+
+
+class TestLinearSpaceAlignment(unittest.TestCase):
+    """Global alignments found using linear memory."""
+
+    def random_sequence(self, length):
+        return "".join(random.choice("ACGT") for i in range(length))
+
+    def test_random(self):
+        random.seed(9)
+        aligner = Align.PairwiseAligner()
+        for k in range(200):
+            aligner.match = random.choice([1, 2])
+            aligner.mismatch = random.choice([0, -1, -3])
+            aligner.target_open_gap_score = random.choice([0, -1, -5])
+            aligner.target_extend_gap_score = random.choice([0, -1, -0.5])
+            aligner.query_open_gap_score = random.choice([0, -1, -5])
+            aligner.query_extend_gap_score = random.choice([0, -1, -0.5])
+            aligner.target_end_gap_score = random.choice([0, -1, -0.5])
+            aligner.query_left_open_gap_score = random.choice([0, -3])
+            aligner.query_right_extend_gap_score = random.choice([0, -0.5])
+            seqA = self.random_sequence(random.randint(1, 10))
+            seqB = self.random_sequence(random.randint(1, 10))
+            alignments = aligner.align(seqA, seqB)
+            alignment = aligner.align_linear(seqA, seqB)
+            self.assertAlmostEqual(alignment.score, alignments.score)
+            paths = set(alignment.path for alignment in alignments)
+            self.assertIn(alignment.path, paths)
+
+    def test_long(self):
+        random.seed(10)
+        aligner = Align.PairwiseAligner()
+        aligner.mismatch = -2
+        aligner.open_gap_score = -5
+        aligner.extend_gap_score = -1
+        aligner.query_end_gap_score = 0
+        seqA = self.random_sequence(1500)
+        seqB = list(seqA[100:])
+        for k in range(100):
+            position = random.randrange(len(seqB))
+            if k % 2:
+                del seqB[position]
+            else:
+                seqB.insert(position, random.choice("ACGT"))
+        seqB = "".join(seqB)
+        score = aligner.score(seqA, seqB)
+        alignment = aligner.align_linear(seqA, seqB)
+        self.assertAlmostEqual(alignment.score, score)
+        self.assertEqual(alignment.path[0], (0, 0))
+        self.assertEqual(alignment.path[-1], (len(seqA), len(seqB)))
+        self.assertEqual(alignment.score,
+                         next(iter(aligner.align(seqA, seqB))).score)
+
+    def test_example(self):
+        aligner = Align.PairwiseAligner()
+        alignment = aligner.align_linear("AACGTT", "AAGTT")
+        self.assertEqual(alignment.score, 5)
+        self.assertEqual(str(alignment), """\
+AACGTT
+||-|||
+AA-GTT
+""")
+
+    def test_errors(self):
+        aligner = Align.PairwiseAligner()
+        aligner.mode = "local"
+        self.assertRaises(ValueError, aligner.align_linear, "ACGT", "ACT")
+        aligner.mode = "global"
+        aligner.band = 3
+        self.assertRaises(ValueError, aligner.align_linear, "ACGT", "ACT")
+        aligner.band = None
+
+        def gap_score(i, n):
+            return -n
+
+        aligner.target_gap_score = gap_score
+        self.assertRaises(ValueError, aligner.align_linear, "ACGT", "ACT")
+
+
 if __name__ == '__main__':
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
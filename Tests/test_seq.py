@@ -1335,6 +1335,56 @@ class TestTranslating(unittest.TestCase):
             self.assertTrue(message.startswith("This table contains"))
             self.assertTrue(message.endswith("be translated as amino acid."))
 
+    def test_translation_of_long_sequences(self):
+        """Check codons needing special handling within longer sequences."""
+        codons = ["ATG", "TAA", "TAR", "NNN", "TAN", "AUG", "---", "atg",
+                  "GCC", "TGA", "RAY", "YTA"]
+        seq = "".join(codons * 50)
+        protein = "".join(Seq.translate(codon, gap="-") for codon in codons)
+        self.assertEqual(Seq.translate(seq, gap="-"), protein * 50)
+        self.assertEqual(Seq.translate(seq, gap="-", stop_symbol="@"),
+                         protein.replace("*", "@") * 50)
+        self.assertEqual(Seq.translate(seq, gap="-", to_stop=True), "M")
+        self.assertEqual(Seq.translate("ATG" * 100 + "TAG", cds=True),
+                         "M" * 100)
+        with self.assertRaises(TranslationError):
+            Seq.translate("ATG" * 100 + "TAGTAG", cds=True)
+        with self.assertRaises(TranslationError):
+            Seq.translate("ATG" * 100 + "T-A")
+        with self.assertRaises(TranslationError):
+            # Not valid with this table for DNA only
+            Seq._translate_str("ATG" * 100 + "AUG", standard_dna_table)
+        # Multi-character stop symbols are not in the lookup table
+        self.assertEqual(Seq.translate("TAGATG" * 20, stop_symbol="<*>"),
+                         "<*>M" * 20)
+
+    def test_translate_many(self):
+        """Check translating many sequences in one go."""
+        seqs = [seq[:3 * (len(seq) // 3)] for seq in self.test_seqs
+                if "X" not in str(seq)]
+        for table in [1, 2, "Vertebrate Mitochondrial"]:
+            proteins = Seq.translate_many(seqs, table)
+            self.assertEqual([str(protein) for protein in proteins],
+                             [Seq.translate(str(seq), table) for seq in seqs])
+            for protein in proteins:
+                self.assertIsInstance(protein, Seq.Seq)
+                self.assertIsInstance(protein.alphabet,
+                                      Alphabet.ProteinAlphabet)
+        strings = ["ATGAAATAGTAG", "", "ATGTAAAAA", "AUGNNNYTGTAR"]
+        for kwargs in [{}, {"stop_symbol": "@"}, {"to_stop": True}]:
+            self.assertEqual(Seq.translate_many(strings, **kwargs),
+                             [Seq.translate(seq, **kwargs)
+                              for seq in strings])
+        self.assertEqual(Seq.translate_many(["ATGAAATAG", "GTGTAA"],
+                                            table=11, cds=True), ["MK", "M"])
+        self.assertRaises(TranslationError, Seq.translate_many,
+                          ["ATGAAATAG", "AAATAA"], cds=True)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            self.assertEqual(Seq.translate_many(["ATGA", "TTTC"]),
+                             ["M", "F"])
+            self.assertEqual(len(w), 1)
+
 
 class TestStopCodons(unittest.TestCase):
     def setUp(self):